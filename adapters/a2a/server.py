@@ -240,26 +240,39 @@ class A2AServer:
         last_state = ""
         terminal_states = {"completed", "failed", "canceled"}
 
-        while time.time() < deadline:
-            task = self._bridge.get_task_status(a2a_id)
-            current_state = task.status.state
-
-            # Emit event on state change or periodically
-            if current_state != last_state:
-                yield self._sse_event("status", task.status.to_dict())
-                last_state = current_state
-
-                # Emit artifacts on completion
-                if current_state == "completed" and task.artifacts:
-                    for art in task.artifacts:
-                        yield self._sse_event("artifact", art.to_dict())
-
-                # Stop on terminal state
-                if current_state in terminal_states:
-                    yield self._sse_event("done", {"state": current_state})
-                    return
-
-            time.sleep(poll_interval)
+        # Wake as soon as the Cleo task's token stream closes (terminal
+        # state) instead of sleeping out the full poll interval
+        from core.task_stream import StreamTail
+        cleo_id = self._bridge.cleo_id_for(a2a_id)
+        tail = StreamTail(cleo_id) if cleo_id else None
+
+        try:
+            while time.time() < deadline:
+                task = self._bridge.get_task_status(a2a_id)
+                current_state = task.status.state
+
+                # Emit event on state change or periodically
+                if current_state != last_state:
+                    yield self._sse_event("status", task.status.to_dict())
+                    last_state = current_state
+
+                    # Emit artifacts on completion
+                    if current_state == "completed" and task.artifacts:
+                        for art in task.artifacts:
+                            yield self._sse_event("artifact", art.to_dict())
+
+                    # Stop on terminal state
+                    if current_state in terminal_states:
+                        yield self._sse_event("done", {"state": current_state})
+                        return
+
+                if tail and not tail.ended:
+                    tail.wait_end(poll_interval)
+                else:
+                    time.sleep(poll_interval)
+        finally:
+            if tail:
+                tail.close()
 
         # Timeout
         yield self._sse_event("error", {"message": "Stream timeout"})
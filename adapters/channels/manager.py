@@ -5,8 +5,9 @@ Central coordinator for all channel adapters.
 Responsibilities:
   - Load and start enabled channel adapters from config
   - Receive normalized messages from all channels
-  - Serialize task submissions through a sequential queue
-  - Monitor task completion via TaskBoard polling
+  - Schedule task submissions: concurrent across sessions, ordered
+    within a session (see scheduler.py)
+  - Await task-tree completion via push-based TaskWatcher subscriptions
   - Deliver results back to the originating channel/chat
 """
 
@@ -24,6 +25,7 @@ from threading import Thread
 from typing import Optional
 
 from .base import ChannelAdapter, ChannelMessage
+from .scheduler import SessionScheduler
 from .session import SessionStore
 
 logger = logging.getLogger(__name__)
@@ -37,7 +39,7 @@ PLATFORM_LIMITS = {
 }
 
 TASK_TIMEOUT = 600  # 10 minutes
-POLL_INTERVAL = 2   # seconds between TaskBoard polls
+TYPING_INTERVAL = 4  # seconds between typing refreshes (Telegram shows 5s)
 
 # Regex to extract generated-but-unsent file paths from subtask results.
 # Matches JSON "path" fields and bare /tmp/doc_* patterns.
@@ -48,6 +50,10 @@ _FILE_PATH_RE = _re.compile(
 STATUS_INTERVAL = 30  # seconds before sending "still processing" message
 HEALTH_CHECK_INTERVAL = 60  # seconds between health checks
 
+# channels.scheduler defaults — max sessions processed at once, and the
+# board backlog (pending tasks) at which dispatch pauses
+SCHEDULER_DEFAULTS = {"max_concurrent": 4, "max_pending_tasks": 8}
+
 
 @dataclass
 class PendingChannelTask:
@@ -76,9 +82,13 @@ class ChannelManager:
         self.config = config
         self.channels_config = config.get("channels", {})
         self.adapters: list[ChannelAdapter] = []
-        # NOTE: Queue is created lazily in start() to ensure it's bound to
-        # the correct event loop (critical for Python 3.9 compatibility).
-        self._queue: Optional[asyncio.Queue] = None
+        self._scheduler = SessionScheduler(self._handle_message,
+                                           pressure=self._pool_saturated)
+        self._max_pending_tasks = SCHEDULER_DEFAULTS["max_pending_tasks"]
+        self._apply_scheduler_config()
+        # Root task ids whose results are still being awaited/delivered
+        self._active_roots: set[str] = set()
+        self._watcher = None   # TaskWatcher, bound to the manager's loop
         self._sessions = SessionStore()
         self._running = False
         self._processor_task: Optional[asyncio.Task] = None
@@ -92,8 +102,6 @@ class ChannelManager:
         """Load and start all enabled channel adapters."""
         self._running = True
         self._loop = asyncio.get_event_loop()
-        # Create queue inside the running event loop (Python 3.9 compat)
-        self._queue = asyncio.Queue()
 
         # Load adapters
         self._load_adapters()
@@ -112,8 +120,8 @@ class ChannelManager:
                 logger.error("Failed to start %s adapter: %s",
                              adapter.channel_name, e)
 
-        # Start the task processor
-        self._processor_task = asyncio.create_task(self._task_processor())
+        # Start the session scheduler
+        self._processor_task = asyncio.create_task(self._scheduler.run())
         # Start the health monitor
         self._health_task = asyncio.create_task(self._health_monitor())
         # Start session cleanup timer
@@ -138,6 +146,9 @@ class ChannelManager:
                     await task
                 except asyncio.CancelledError:
                     pass
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
         for adapter in self.adapters:
             try:
                 await adapter.stop()
@@ -167,6 +178,7 @@ class ChannelManager:
                 fresh_config = yaml.safe_load(f) or {}
             self.channels_config = fresh_config.get("channels", {})
             self.config["channels"] = self.channels_config
+            self._apply_scheduler_config()
         except Exception as e:
             logger.error("Failed to reload channels config from %s: %s",
                          config_path, e)
@@ -191,9 +203,9 @@ class ChannelManager:
                 logger.error("Failed to restart %s adapter: %s",
                              adapter.channel_name, e)
 
-        # Ensure processor task is running
+        # Ensure the session scheduler is running
         if not self._processor_task or self._processor_task.done():
-            self._processor_task = asyncio.create_task(self._task_processor())
+            self._processor_task = asyncio.create_task(self._scheduler.run())
         # Ensure health monitor is running
         if not self._health_task or self._health_task.done():
             self._health_task = asyncio.create_task(self._health_monitor())
@@ -201,6 +213,12 @@ class ChannelManager:
         logger.info("Channel manager reloaded: %d adapter(s) running",
                      len(self.adapters))
 
+    def _apply_scheduler_config(self):
+        cfg = {**SCHEDULER_DEFAULTS,
+               **(self.channels_config.get("scheduler") or {})}
+        self._scheduler.max_concurrent = max(1, int(cfg["max_concurrent"]))
+        self._max_pending_tasks = int(cfg["max_pending_tasks"])
+
     def get_status(self) -> list[dict]:
         """Return status of all adapters (for /v1/channels endpoint)."""
         # Canonical list of known channels
@@ -234,11 +252,12 @@ class ChannelManager:
             elif not cfg.get("enabled", False):
                 status["reason"] = "disabled"
 
+            status["scheduler"] = self._scheduler.stats(name)
             statuses.append(status)
 
         # Include any extra channels from config not in the known list
         for name in self.channels_config:
-            if name not in known_channels:
+            if name not in known_channels and name != "scheduler":
                 cfg = self.channels_config[name]
                 adapter = self._get_adapter(name)
                 statuses.append({
@@ -285,10 +304,34 @@ class ChannelManager:
         except Exception as e:
             logger.warning("Failed to save active session: %s", e)
 
+    # Root task id → session that submitted it.  Sessions run concurrently,
+    # so tools resolve the chat through their own task, not the last message.
+    _task_sessions_path = ".channel_sessions.json"
+    TASK_SESSION_TTL = 86400  # seconds
+
+    def _save_task_session(self, task_id: str, msg: ChannelMessage):
+        try:
+            sessions = self._read_json(self._task_sessions_path) or {}
+            cutoff = time.time() - self.TASK_SESSION_TTL
+            sessions = {k: v for k, v in sessions.items()
+                        if v.get("ts", 0) >= cutoff}
+            sessions[task_id] = {
+                "session_id": msg.session_id,
+                "channel": msg.channel,
+                "chat_id": msg.chat_id,
+                "user_id": msg.user_id,
+                "user_name": msg.user_name,
+                "ts": time.time(),
+            }
+            tmp = f"{self._task_sessions_path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(sessions, f)
+            os.replace(tmp, self._task_sessions_path)
+        except Exception as e:
+            logger.warning("Failed to save task session: %s", e)
+
     @staticmethod
-    def get_active_session() -> Optional[dict]:
-        """Read the active channel session info (used by tool handlers)."""
-        path = ChannelManager._active_session_path
+    def _read_json(path: str):
         if not os.path.exists(path):
             return None
         try:
@@ -297,6 +340,38 @@ class ChannelManager:
         except Exception:
             return None
 
+    @staticmethod
+    def get_active_session(task_id: str = "") -> Optional[dict]:
+        """Channel session info for tool handlers.
+
+        Resolves the session that submitted ``task_id``'s root task
+        (default: the task the current tool call runs for); falls back to
+        the most recent channel message when the task is unknown.
+        """
+        if not task_id:
+            try:
+                from core.tools import current_task_id
+                task_id = current_task_id.get()
+            except ImportError:
+                task_id = ""
+        if task_id:
+            sessions = ChannelManager._read_json(
+                ChannelManager._task_sessions_path) or {}
+            if task_id not in sessions and sessions:
+                try:
+                    from core.task_board import TaskBoard
+                    data = TaskBoard()._read()
+                except Exception:
+                    data = {}
+                seen = set()
+                while (task_id not in sessions and task_id in data
+                       and task_id not in seen):
+                    seen.add(task_id)
+                    task_id = data[task_id].get("parent_id") or ""
+            if task_id in sessions:
+                return sessions[task_id]
+        return ChannelManager._read_json(ChannelManager._active_session_path)
+
     async def send_file(self, session_id: str, file_path: str,
                         caption: str = "", reply_to: str = "") -> str:
         """Send a file to a channel chat. Returns sent message ID.
@@ -400,6 +475,8 @@ class ChannelManager:
     def _load_adapters(self):
         """Load enabled channel adapters. Skip gracefully if SDK not installed."""
         for channel_name, channel_cfg in self.channels_config.items():
+            if channel_name == "scheduler":
+                continue
             if not channel_cfg.get("enabled", False):
                 continue
 
@@ -541,53 +618,52 @@ class ChannelManager:
                 logger.error("Abort detection error: %s", e)
             return
 
-        await self._queue.put(msg)
+        # Track session (per-user in groups for isolation)
+        session = self._sessions.get_or_create(
+            msg.channel, msg.chat_id, msg.user_id, msg.user_name,
+            is_group=msg.is_group)
 
-    async def _task_processor(self):
-        """
-        Sequential task processor — consumes from queue, one at a time.
-        For each message:
-          1. Send typing indicator
-          2. Submit task via Orchestrator
-          3. Poll TaskBoard until complete or timeout
-          4. Send result back to channel
-        """
-        while self._running:
-            try:
-                msg = await asyncio.wait_for(
-                    self._queue.get(), timeout=5.0)
-            except asyncio.TimeoutError:
-                continue
-            except asyncio.CancelledError:
-                break
-
-            # Find the adapter for this channel
-            adapter = self._get_adapter(msg.channel)
-            if not adapter:
-                logger.error("No adapter found for channel: %s", msg.channel)
-                continue
+        busy = self._scheduler.saturated
+        ahead = self._scheduler.submit(
+            msg.channel, session.session_id, (msg, session))
+        adapter = self._get_adapter(msg.channel)
+        if adapter and ahead:
+            await adapter.send_message(
+                msg.chat_id, f"⏳ Task queued ({ahead} ahead)...")
+        elif adapter and busy:
+            await adapter.send_message(
+                msg.chat_id, "⏳ All agents are busy — your task is queued...")
 
-            # Track session (per-user in groups for isolation)
-            session = self._sessions.get_or_create(
-                msg.channel, msg.chat_id, msg.user_id, msg.user_name,
-                is_group=msg.is_group)
+    async def _handle_message(self, item):
+        """Scheduler handler: process one message of one session.
 
-            # Show queue position if there are waiting messages
-            queue_size = self._queue.qsize()
-            if queue_size > 0:
+        The scheduler guarantees at most one message per session is in
+        flight, so per-session history and replies stay in order while
+        other sessions proceed concurrently.
+        """
+        msg, session = item
+        adapter = self._get_adapter(msg.channel)
+        if not adapter:
+            logger.error("No adapter found for channel: %s", msg.channel)
+            return
+        try:
+            await self._process_message(msg, adapter, session)
+        except Exception as e:
+            try:
                 await adapter.send_message(
-                    msg.chat_id,
-                    f"⏳ Task queued ({queue_size} ahead)...")
+                    msg.chat_id, f"❌ Processing failed: {e}")
+            except Exception:
+                pass
+            raise
 
-            try:
-                await self._process_message(msg, adapter, session)
-            except Exception as e:
-                logger.exception("Error processing channel message: %s", e)
-                try:
-                    await adapter.send_message(
-                        msg.chat_id, f"❌ Processing failed: {e}")
-                except Exception:
-                    pass
+    def _pool_saturated(self) -> bool:
+        """Backpressure: too many tasks already waiting on the board."""
+        if self._max_pending_tasks <= 0:
+            return False
+        from core.task_board import TaskBoard
+        data = TaskBoard()._read()
+        pending = sum(1 for t in data.values() if t.get("status") == "pending")
+        return pending >= self._max_pending_tasks
 
     async def _process_message(self, msg: ChannelMessage,
                                 adapter: ChannelAdapter,
@@ -618,7 +694,7 @@ class ChannelManager:
         **Error handling:**
         - Task submission failure → send "❌ 任务提交失败".
         - Timeout → send "⏰ 任务超时" message.
-        - Unhandled exception → caught by the caller ``_on_message()``
+        - Unhandled exception → caught by the caller ``_handle_message()``
           which sends a generic error reply.
 
         Args:
@@ -677,8 +753,18 @@ class ChannelManager:
             return
 
         self._sessions.update_task(sid, task_id)
+        self._save_task_session(task_id, msg)
+        self._active_roots.add(task_id)
         await adapter.send_typing(msg.chat_id)
 
+        try:
+            await self._deliver_result(task_id, sid, msg, adapter)
+        finally:
+            self._active_roots.discard(task_id)
+
+    async def _deliver_result(self, task_id: str, sid: str,
+                              msg: ChannelMessage, adapter: ChannelAdapter):
+        """Wait for ``task_id`` and send its files and text to the chat."""
         # Poll for completion
         result = await self._wait_for_result(
             task_id, msg, adapter)
@@ -768,7 +854,7 @@ class ChannelManager:
             # Archive completed/failed tasks from previous messages
             # NOTE: We no longer destroy .context_bus.json or .mailboxes
             # to preserve cross-round context for session continuity.
-            self._archive_completed_tasks(board)
+            self._archive_completed_tasks(board, set(self._active_roots))
 
             # Submit task — persistent agents will claim it from the board
             task = board.create(full_description, required_role="planner")
@@ -863,18 +949,35 @@ class ChannelManager:
             runtime.prune_dead()
 
     @staticmethod
-    def _archive_completed_tasks(board):
-        """Archive completed/failed tasks without clearing the entire board.
+    def _archive_completed_tasks(board, keep: set[str] | frozenset = frozenset()):
+        """Archive finished task trees without clearing the entire board.
 
         Unlike the previous board.clear(force=True), this preserves any
         pending or in-progress tasks so persistent agents can keep working.
+        With sessions processed concurrently, a tree is archived only once
+        every task in it is finished and its root is not in ``keep`` (roots
+        whose results are still being awaited or delivered) — finished
+        subtasks of a running tree stay on the board for close-out.
         """
+        terminal = ("completed", "failed", "cancelled")
         try:
             from core.task_history import save_round
             data = board._read()
-            done = {k: v for k, v in data.items()
-                    if v.get("status") in
-                    ("completed", "failed", "cancelled")}
+
+            def root_of(tid: str) -> str:
+                seen = set()
+                while data.get(tid, {}).get("parent_id") in data and tid not in seen:
+                    seen.add(tid)
+                    tid = data[tid]["parent_id"]
+                return tid
+
+            trees: dict[str, list[str]] = {}
+            for tid in data:
+                trees.setdefault(root_of(tid), []).append(tid)
+            done = {tid: data[tid]
+                    for root, ids in trees.items() if root not in keep
+                    and all(data[t].get("status") in terminal for t in ids)
+                    for tid in ids}
             if done:
                 save_round(done)
                 with board.lock:
@@ -888,87 +991,65 @@ class ChannelManager:
     async def _wait_for_result(self, task_id: str,
                                 msg: ChannelMessage,
                                 adapter: ChannelAdapter) -> Optional[str]:
-        """Poll TaskBoard until the task completes or times out.
+        """Wait until the task tree settles, then return the root result.
 
         Handles the full Leo→Jerry→Alic→Leo lifecycle:
-        - While any task is in an active state, keep waiting.
+        - Subscribes to the tree via ``TaskWatcher`` — status transitions
+          are pushed from the board, so nothing is re-read while agents
+          work (the typing indicator is refreshed every few seconds).
         - When all tasks are done, return the root task result.
         - Guard against returning raw planner output (TASK: lines)
           before closeout has synthesized the final answer.
         """
         import re as _re
         from core.task_board import TaskBoard
+        from core.task_watch import TaskWatcher
+
+        if self._watcher is None:
+            self._watcher = TaskWatcher()
+        deadline = time.time() + TASK_TIMEOUT
+
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return None  # timeout
+            if await self._watcher.wait_settled(
+                    task_id, timeout=min(TYPING_INTERVAL, remaining)):
+                break
+            await adapter.send_typing(msg.chat_id)
 
-        start = time.time()
-        last_typing = 0.0
-
-        while time.time() - start < TASK_TIMEOUT:
-            await asyncio.sleep(POLL_INTERVAL)
-
-            board = TaskBoard()
-            data = board._read()
-
-            # Check if all tasks in THIS tree are done
-            if not data:
-                continue
-
-            # Build task tree: root + all descendant subtasks (BFS via parent_id)
-            # Same logic as TaskBoard.collect_results() — scopes to this task only
-            tree_ids = {task_id}
-            changed = True
-            while changed:
-                changed = False
-                for tid, t in data.items():
-                    if tid not in tree_ids and t.get("parent_id") in tree_ids:
-                        tree_ids.add(tid)
-                        changed = True
-
-            active_states = {"pending", "claimed", "review", "critique",
-                             "blocked", "paused", "synthesizing"}
-            has_active = any(
-                data[tid].get("status") in active_states
-                for tid in tree_ids
-                if tid in data)
-
-            if not has_active:
-                # All done — prefer root task result (Leo's synthesis)
-                root = data.get(task_id)
-                if root and root.get("result"):
-                    result_text = root["result"]
-                    # Guard: if result still contains TASK: lines, closeout
-                    # hasn't overwritten the planner decomposition yet.
-                    # Wait a bit longer for the synthesis to complete.
-                    if _re.search(r'^TASK:', result_text, _re.MULTILINE):
-                        await asyncio.sleep(3)
-                        data = board._read()
-                        root = data.get(task_id)
-                        if root and root.get("result"):
-                            result_text = root["result"]
-                        # If still has TASK: lines after extra wait,
-                        # fall through to collect executor results instead
-                        if _re.search(r'^TASK:', result_text, _re.MULTILINE):
-                            collected = board.collect_results(task_id)
-                            if collected:
-                                return self._clean_result(collected)
-                            # Last resort: clean the raw planner output
-                    return self._clean_result(result_text)
-                # Maybe closeout hasn't written yet, wait briefly
-                await asyncio.sleep(2)
+        board = TaskBoard()
+        data = board._read()
+        # All done — prefer root task result (Leo's synthesis)
+        root = data.get(task_id)
+        if root and root.get("result"):
+            result_text = root["result"]
+            # Guard: if result still contains TASK: lines, closeout
+            # hasn't overwritten the planner decomposition yet.
+            # Wait a bit longer for the synthesis to complete.
+            if _re.search(r'^TASK:', result_text, _re.MULTILINE):
+                await asyncio.sleep(3)
                 data = board._read()
                 root = data.get(task_id)
                 if root and root.get("result"):
-                    return self._clean_result(root["result"])
-                # Fallback to collected executor results
-                result = board.collect_results(task_id)
-                return self._clean_result(result) if result else "(No result produced)"
-
-            # Refresh typing indicator every 4s (Telegram typing lasts 5s)
-            now = time.time()
-            if now - last_typing >= 4:
-                await adapter.send_typing(msg.chat_id)
-                last_typing = now
-
-        return None  # timeout
+                    result_text = root["result"]
+                # If still has TASK: lines after extra wait,
+                # fall through to collect executor results instead
+                if _re.search(r'^TASK:', result_text, _re.MULTILINE):
+                    collected = board.collect_results(task_id)
+                    if collected:
+                        return self._clean_result(collected)
+                    # Last resort: clean the raw planner output
+            return self._clean_result(result_text)
+        # Maybe closeout hasn't written yet, wait briefly
+        await asyncio.sleep(2)
+        data = board._read()
+        root = data.get(task_id)
+        if root and root.get("result"):
+            return self._clean_result(root["result"])
+        # Fallback to collected executor results
+        result = board.collect_results(task_id)
+        return self._clean_result(result) if result else "(No result produced)"
 
     @staticmethod
     def _clean_result(text: str) -> str:
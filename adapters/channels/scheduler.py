@@ -0,0 +1,235 @@
+"""
+adapters/channels/scheduler.py
+Per-session concurrent scheduler for channel messages.
+
+Messages from different sessions are processed concurrently, up to a
+global ``max_concurrent`` limit; messages from the same session run
+strictly one at a time, in arrival order (a follow-up never overtakes
+the message it follows).  Ready sessions are picked round-robin across
+channels, then round-robin across sessions within a channel, so one busy
+group chat cannot starve the other channels.
+
+When the agent pool is saturated (``pressure()`` returns True) dispatch
+pauses and re-checks every ``pressure_interval`` seconds; queued messages
+wait in their session queues instead of piling more tasks onto the board.
+
+Per-channel metrics — queue wait, processing time, in-flight and
+completion counters — are exposed via ``stats()``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Awaitable, Callable, Optional
+
+from core.runtime.wakeup import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+
+class StageHistogram(LatencyHistogram):
+    """Histogram tuned for message-level latencies (seconds to minutes)."""
+
+    BUCKETS_MS = (100, 500, 1000, 5000, 15000, 30000, 60000,
+                  120000, 300000, 600000)
+
+
+class ChannelStats:
+    """Queue/processing counters for one channel."""
+
+    def __init__(self):
+        self.queued = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.wait_ms = StageHistogram()
+        self.process_ms = StageHistogram()
+
+    def snapshot(self) -> dict:
+        return {
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "queue_wait_ms": self.wait_ms.snapshot(),
+            "processing_ms": self.process_ms.snapshot(),
+        }
+
+
+class SessionScheduler:
+    """Dispatch queued items with per-session ordering and a global limit.
+
+    Usage:
+        sched = SessionScheduler(handler, max_concurrent=4)
+        task = asyncio.create_task(sched.run())
+        ahead = sched.submit("telegram", "telegram:42", item)
+    """
+
+    def __init__(self, handler: Callable[[object], Awaitable[None]],
+                 max_concurrent: int = 4,
+                 pressure: Optional[Callable[[], bool]] = None,
+                 pressure_interval: float = 1.0):
+        self.handler = handler
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.pressure = pressure
+        self.pressure_interval = pressure_interval
+        # session_id → deque[(item, enqueued_at)]
+        self._queues: dict[str, deque] = {}
+        self._session_channel: dict[str, str] = {}
+        # channel → ready sessions (queued work, nothing in flight)
+        self._ready: dict[str, OrderedDict] = {}
+        self._channels: deque[str] = deque()
+        self._busy: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self._stats: dict[str, ChannelStats] = {}
+        self._saturated = False
+        self.deferrals = 0
+        # Created in run() so it binds to the dispatcher's loop
+        self._wake: Optional[asyncio.Event] = None
+
+    # ── Public ──
+
+    def submit(self, channel: str, session_id: str, item) -> int:
+        """Queue ``item``; returns how many items of the same session are
+        ahead of it (queued or in flight)."""
+        queue = self._queues.setdefault(session_id, deque())
+        ahead = len(queue) + (session_id in self._busy)
+        queue.append((item, time.monotonic()))
+        self._session_channel[session_id] = channel
+        self._channel_stats(channel).queued += 1
+        if session_id not in self._busy:
+            self._mark_ready(channel, session_id)
+        self._notify()
+        return ahead
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._busy)
+
+    @property
+    def saturated(self) -> bool:
+        """True when new work would have to wait for a slot or the pool."""
+        return self._saturated or len(self._busy) >= self.max_concurrent
+
+    def pending(self, session_id: str) -> int:
+        return len(self._queues.get(session_id, ()))
+
+    def stats(self, channel: Optional[str] = None) -> dict:
+        if channel is not None:
+            return self._channel_stats(channel).snapshot()
+        return {name: s.snapshot() for name, s in self._stats.items()}
+
+    async def run(self) -> None:
+        """Dispatcher loop; runs until cancelled (cancels in-flight work)."""
+        self._wake = asyncio.Event()
+        self._wake.set()
+        try:
+            while True:
+                await self._wake.wait()
+                self._wake.clear()
+                await self._dispatch()
+        finally:
+            for task in list(self._tasks):
+                task.cancel()
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    # ── Internal ──
+
+    def _channel_stats(self, channel: str) -> ChannelStats:
+        stats = self._stats.get(channel)
+        if stats is None:
+            stats = self._stats[channel] = ChannelStats()
+        return stats
+
+    def _notify(self) -> None:
+        if self._wake is not None:
+            self._wake.set()
+
+    def _mark_ready(self, channel: str, session_id: str) -> None:
+        ready = self._ready.get(channel)
+        if ready is None:
+            ready = self._ready[channel] = OrderedDict()
+        if not ready:
+            self._channels.append(channel)
+        ready[session_id] = None
+
+    def _next_session(self) -> Optional[tuple[str, str]]:
+        """Round-robin: next channel with ready sessions, then its oldest
+        ready session (which goes to the back once it has run)."""
+        while self._channels:
+            channel = self._channels.popleft()
+            ready = self._ready.get(channel)
+            if not ready:
+                continue
+            session_id, _ = ready.popitem(last=False)
+            if ready:
+                self._channels.append(channel)
+            return channel, session_id
+        return None
+
+    async def _check_pressure(self) -> bool:
+        if self.pressure is None:
+            return False
+        loop = asyncio.get_running_loop()
+        try:
+            saturated = bool(await loop.run_in_executor(None, self.pressure))
+        except Exception as e:
+            logger.debug("[scheduler] pressure check failed: %s", e)
+            saturated = False
+        if saturated and not self._saturated:
+            logger.info("[scheduler] agent pool saturated — holding %d "
+                        "queued message(s)",
+                        sum(len(q) for q in self._queues.values()))
+        self._saturated = saturated
+        return saturated
+
+    async def _dispatch(self) -> None:
+        while len(self._busy) < self.max_concurrent and self._channels:
+            if await self._check_pressure():
+                self.deferrals += 1
+                asyncio.get_running_loop().call_later(
+                    self.pressure_interval, self._notify)
+                return
+            picked = self._next_session()
+            if picked is None:
+                return
+            channel, session_id = picked
+            item, enqueued_at = self._queues[session_id].popleft()
+            stats = self._channel_stats(channel)
+            stats.queued -= 1
+            stats.in_flight += 1
+            stats.wait_ms.observe((time.monotonic() - enqueued_at) * 1000)
+            self._busy.add(session_id)
+            task = asyncio.create_task(self._run_one(channel, session_id, item))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_one(self, channel: str, session_id: str, item) -> None:
+        stats = self._channel_stats(channel)
+        t0 = time.monotonic()
+        ok = False
+        try:
+            await self.handler(item)
+            ok = True
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception("[scheduler] %s handler failed: %s", session_id, e)
+        finally:
+            stats.process_ms.observe((time.monotonic() - t0) * 1000)
+            stats.in_flight -= 1
+            if ok:
+                stats.completed += 1
+            else:
+                stats.failed += 1
+            self._busy.discard(session_id)
+            if self._queues.get(session_id):
+                self._mark_ready(self._session_channel[session_id], session_id)
+            else:
+                self._queues.pop(session_id, None)
+                self._session_channel.pop(session_id, None)
+            self._notify()
@@ -0,0 +1,67 @@
+"""
+adapters/llm/cache_hints.py
+Provider prompt-prefix caching helpers shared by the LLM adapters.
+
+Agents using the ``cache`` prompt layout mark the system message with
+``CACHE_PREFIX_KEY`` = number of leading characters that are identical
+across tasks (role, soul, skills, tools, docs).  Before sending:
+
+  - adapters with ``cache_control=True`` (Anthropic-style APIs) split that
+    message into two text blocks and tag the stable one with
+    ``cache_control: {"type": "ephemeral"}``;
+  - every other adapter just drops the key — automatic prefix caching
+    (OpenAI, DeepSeek, MiniMax) benefits from the stable prefix as is.
+
+``parse_usage`` normalizes provider usage objects, including cached
+prompt-token counts reported under the various provider spellings.
+"""
+
+from __future__ import annotations
+
+CACHE_PREFIX_KEY = "cache_prefix_chars"
+
+_EPHEMERAL = {"type": "ephemeral"}
+
+
+def apply_cache_hints(messages: list[dict], cache_control: bool = False) -> list[dict]:
+    """Return ``messages`` ready to send (input list is not modified)."""
+    if not any(CACHE_PREFIX_KEY in m for m in messages):
+        return messages
+    out = []
+    for m in messages:
+        n = m.get(CACHE_PREFIX_KEY)
+        if n is None:
+            out.append(m)
+            continue
+        m = {k: v for k, v in m.items() if k != CACHE_PREFIX_KEY}
+        content = m.get("content")
+        if cache_control and isinstance(content, str) and 0 < n <= len(content):
+            blocks = [{"type": "text", "text": content[:n],
+                       "cache_control": dict(_EPHEMERAL)}]
+            if n < len(content):
+                blocks.append({"type": "text", "text": content[n:]})
+            m["content"] = blocks
+        out.append(m)
+    return out
+
+
+def parse_usage(usage: dict | None) -> dict:
+    """Token counts from an OpenAI-compatible ``usage`` object.
+
+    ``cached_tokens`` are prompt tokens served from the provider's prefix
+    cache (``prompt_tokens_details.cached_tokens``,
+    ``cache_read_input_tokens`` or ``prompt_cache_hit_tokens``);
+    ``cache_write_tokens`` are tokens written to it.
+    """
+    usage = usage or {}
+    details = usage.get("prompt_tokens_details") or {}
+    cached = (details.get("cached_tokens")
+              or usage.get("cache_read_input_tokens")
+              or usage.get("prompt_cache_hit_tokens") or 0)
+    return {
+        "prompt_tokens":      usage.get("prompt_tokens", 0),
+        "completion_tokens":  usage.get("completion_tokens", 0),
+        "total_tokens":       usage.get("total_tokens", 0),
+        "cached_tokens":      int(cached),
+        "cache_write_tokens": int(usage.get("cache_creation_input_tokens") or 0),
+    }
@@ -9,14 +9,19 @@ import json
 import logging
 import os
 
+from adapters.llm import transport
+from adapters.llm.cache_hints import apply_cache_hints, parse_usage
+
 logger = logging.getLogger(__name__)
 
 
 class FLockAdapter:
 
-    def __init__(self, api_key: str | None = None, base_url: str | None = None):
+    def __init__(self, api_key: str | None = None, base_url: str | None = None,
+                 cache_control: bool = False):
         self.api_key  = api_key  or os.getenv("FLOCK_API_KEY", "")
         self.base_url = base_url or os.getenv("FLOCK_BASE_URL", "https://api.flock.io/v1")
+        self.cache_control = cache_control  # explicit cache_control blocks
         if not self.api_key:
             logger.warning("FLOCK_API_KEY not set — LLM calls will fail")
 
@@ -25,7 +30,7 @@ class FLockAdapter:
         import httpx
 
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
+            async with transport.lease(self.base_url, timeout=120.0) as client:
                 resp = await client.post(
                     f"{self.base_url}/chat/completions",
                     headers={
@@ -34,7 +39,7 @@ class FLockAdapter:
                     },
                     json={
                         "model": model,
-                        "messages": messages,
+                        "messages": apply_cache_hints(messages, self.cache_control),
                     },
                 )
                 resp.raise_for_status()
@@ -64,7 +69,7 @@ class FLockAdapter:
         """
         import httpx
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
+        async with transport.lease(self.base_url, timeout=120.0) as client:
             async with client.stream(
                 "POST",
                 f"{self.base_url}/chat/completions",
@@ -74,7 +79,7 @@ class FLockAdapter:
                 },
                 json={
                     "model": model,
-                    "messages": messages,
+                    "messages": apply_cache_hints(messages, self.cache_control),
                     "stream": True,
                 },
             ) as resp:
@@ -105,7 +110,7 @@ class FLockAdapter:
         import httpx
 
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
+            async with transport.lease(self.base_url, timeout=120.0) as client:
                 resp = await client.post(
                     f"{self.base_url}/chat/completions",
                     headers={
@@ -114,7 +119,7 @@ class FLockAdapter:
                     },
                     json={
                         "model": model,
-                        "messages": messages,
+                        "messages": apply_cache_hints(messages, self.cache_control),
                     },
                 )
                 resp.raise_for_status()
@@ -123,12 +128,7 @@ class FLockAdapter:
                 if not choices:
                     raise ValueError(f"Empty choices in API response")
                 content = choices[0]["message"]["content"]
-                usage = data.get("usage", {})
-                return content, {
-                    "prompt_tokens":     usage.get("prompt_tokens", 0),
-                    "completion_tokens": usage.get("completion_tokens", 0),
-                    "total_tokens":      usage.get("total_tokens", 0),
-                }
+                return content, parse_usage(data.get("usage"))
         except httpx.HTTPStatusError as e:
             code = e.response.status_code
             raise RuntimeError(f"FLock API error ({code})") from e
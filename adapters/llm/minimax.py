@@ -24,6 +24,9 @@ import logging
 import os
 import re
 
+from adapters.llm import transport
+from adapters.llm.cache_hints import apply_cache_hints, parse_usage
+
 logger = logging.getLogger(__name__)
 
 # Default base URL for Minimax OpenAI-compatible API
@@ -236,9 +239,11 @@ def _tool_calls_to_text(tool_calls: list[dict]) -> str:
     return "\n".join(blocks)
 
 
-def _build_payload(model: str, messages: list[dict], **kwargs) -> dict:
-    """Build API payload, injecting tools if provided."""
-    payload: dict = {"model": model, "messages": messages}
+def _build_payload(model: str, messages: list[dict],
+                   cache_control: bool = False, **kwargs) -> dict:
+    """Build API payload, injecting tools and prompt-cache hints."""
+    payload: dict = {"model": model,
+                     "messages": apply_cache_hints(messages, cache_control)}
     tools = kwargs.get("tools")
     if tools:
         payload["tools"] = [
@@ -254,9 +259,11 @@ def _build_payload(model: str, messages: list[dict], **kwargs) -> dict:
 
 class MinimaxAdapter:
 
-    def __init__(self, api_key: str | None = None, base_url: str | None = None):
+    def __init__(self, api_key: str | None = None, base_url: str | None = None,
+                 cache_control: bool = False):
         self.api_key  = api_key  or os.getenv("MINIMAX_API_KEY", "")
         self.base_url = base_url or os.getenv("MINIMAX_BASE_URL", MINIMAX_BASE_URL)
+        self.cache_control = cache_control  # explicit cache_control blocks
         self._last_stream_usage: dict | None = None  # real token counts from streaming
         if not self.api_key:
             logger.warning("MINIMAX_API_KEY not set — LLM calls will fail")
@@ -266,8 +273,8 @@ class MinimaxAdapter:
         import httpx
 
         try:
-            payload = _build_payload(model, messages, **kwargs)
-            async with httpx.AsyncClient(timeout=120.0) as client:
+            payload = _build_payload(model, messages, self.cache_control, **kwargs)
+            async with transport.lease(self.base_url, timeout=120.0) as client:
                 resp = await client.post(
                     f"{self.base_url}/chat/completions",
                     headers={
@@ -337,14 +344,14 @@ class MinimaxAdapter:
         import httpx
 
         try:
-            payload = _build_payload(model, messages, **kwargs)
+            payload = _build_payload(model, messages, self.cache_control, **kwargs)
             payload["stream"] = True
             # Request real token usage in the final SSE chunk
             payload["stream_options"] = {"include_usage": True}
             self._last_stream_usage = None
             accumulated_tool_calls: list[dict] = []
 
-            async with httpx.AsyncClient(timeout=120.0) as client:
+            async with transport.lease(self.base_url, timeout=120.0) as client:
                 async with client.stream(
                     "POST",
                     f"{self.base_url}/chat/completions",
@@ -369,11 +376,7 @@ class MinimaxAdapter:
                                 # (enabled by stream_options.include_usage)
                                 usage = chunk.get("usage")
                                 if usage:
-                                    self._last_stream_usage = {
-                                        "prompt_tokens": usage.get("prompt_tokens", 0),
-                                        "completion_tokens": usage.get("completion_tokens", 0),
-                                        "total_tokens": usage.get("total_tokens", 0),
-                                    }
+                                    self._last_stream_usage = parse_usage(usage)
                                 choices = chunk.get("choices")
                                 if not choices:
                                     continue  # skip usage-only or empty chunks
@@ -420,15 +423,16 @@ class MinimaxAdapter:
         """
         Chat that also returns token usage info.
         Returns (content, usage_dict) where usage_dict has:
-          prompt_tokens, completion_tokens, total_tokens
-        Minimax also returns cache_creation_input_tokens and
-        cache_read_input_tokens when prompt caching is active.
+          prompt_tokens, completion_tokens, total_tokens, plus
+          cached_tokens / cache_write_tokens (from Minimax's
+          cache_read_input_tokens / cache_creation_input_tokens when
+          prompt caching is active).
         """
         import httpx
 
         try:
-            payload = _build_payload(model, messages, **kwargs)
-            async with httpx.AsyncClient(timeout=120.0) as client:
+            payload = _build_payload(model, messages, self.cache_control, **kwargs)
+            async with transport.lease(self.base_url, timeout=120.0) as client:
                 resp = await client.post(
                     f"{self.base_url}/chat/completions",
                     headers={
@@ -460,12 +464,7 @@ class MinimaxAdapter:
                         raise RuntimeError(
                             "Minimax returned empty content "
                             "(content filter or API issue)")
-                usage = data.get("usage", {})
-                return content, {
-                    "prompt_tokens":     usage.get("prompt_tokens", 0),
-                    "completion_tokens": usage.get("completion_tokens", 0),
-                    "total_tokens":      usage.get("total_tokens", 0),
-                }
+                return content, parse_usage(data.get("usage"))
         except httpx.HTTPStatusError as e:
             code = e.response.status_code
             body = ""
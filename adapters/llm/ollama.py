@@ -7,6 +7,9 @@ from __future__ import annotations
 import logging
 import os
 
+from adapters.llm import transport
+from adapters.llm.cache_hints import apply_cache_hints
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,14 +20,12 @@ class OllamaAdapter:
         self.base_url = base_url or os.getenv("OLLAMA_URL", "http://localhost:11434")
 
     async def chat(self, messages: list[dict], model: str) -> str:
-        import httpx
-
-        async with httpx.AsyncClient(timeout=300.0) as client:
+        async with transport.lease(self.base_url, timeout=300.0) as client:
             resp = await client.post(
                 f"{self.base_url}/api/chat",
                 json={
                     "model": model,
-                    "messages": messages,
+                    "messages": apply_cache_hints(messages),
                     "stream": False,
                 },
             )
@@ -34,15 +35,13 @@ class OllamaAdapter:
 
     async def chat_stream(self, messages: list[dict], model: str):
         """Yield content chunks from Ollama streaming response."""
-        import httpx
-
-        async with httpx.AsyncClient(timeout=300.0) as client:
+        async with transport.lease(self.base_url, timeout=300.0) as client:
             async with client.stream(
                 "POST",
                 f"{self.base_url}/api/chat",
                 json={
                     "model": model,
-                    "messages": messages,
+                    "messages": apply_cache_hints(messages),
                     "stream": True,
                 },
             ) as resp:
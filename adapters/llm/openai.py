@@ -9,14 +9,19 @@ import json
 import logging
 import os
 
+from adapters.llm import transport
+from adapters.llm.cache_hints import apply_cache_hints, parse_usage
+
 logger = logging.getLogger(__name__)
 
 
 class OpenAIAdapter:
 
-    def __init__(self, api_key: str | None = None, base_url: str | None = None):
+    def __init__(self, api_key: str | None = None, base_url: str | None = None,
+                 cache_control: bool = False):
         self.api_key  = api_key  or os.getenv("OPENAI_API_KEY", "")
         self.base_url = base_url or os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+        self.cache_control = cache_control  # explicit cache_control blocks
         if not self.api_key:
             logger.warning("OPENAI_API_KEY not set — LLM calls will fail")
 
@@ -24,7 +29,7 @@ class OpenAIAdapter:
         import httpx
 
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
+            async with transport.lease(self.base_url, timeout=120.0) as client:
                 resp = await client.post(
                     f"{self.base_url}/chat/completions",
                     headers={
@@ -33,7 +38,7 @@ class OpenAIAdapter:
                     },
                     json={
                         "model": model,
-                        "messages": messages,
+                        "messages": apply_cache_hints(messages, self.cache_control),
                     },
                 )
                 resp.raise_for_status()
@@ -61,7 +66,7 @@ class OpenAIAdapter:
         import httpx
 
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
+            async with transport.lease(self.base_url, timeout=120.0) as client:
                 async with client.stream(
                     "POST",
                     f"{self.base_url}/chat/completions",
@@ -71,7 +76,7 @@ class OpenAIAdapter:
                     },
                     json={
                         "model": model,
-                        "messages": messages,
+                        "messages": apply_cache_hints(messages, self.cache_control),
                         "stream": True,
                     },
                 ) as resp:
@@ -102,7 +107,7 @@ class OpenAIAdapter:
         import httpx
 
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
+            async with transport.lease(self.base_url, timeout=120.0) as client:
                 resp = await client.post(
                     f"{self.base_url}/chat/completions",
                     headers={
@@ -111,7 +116,7 @@ class OpenAIAdapter:
                     },
                     json={
                         "model": model,
-                        "messages": messages,
+                        "messages": apply_cache_hints(messages, self.cache_control),
                     },
                 )
                 resp.raise_for_status()
@@ -120,12 +125,7 @@ class OpenAIAdapter:
                 if not choices:
                     raise ValueError("Empty choices in API response")
                 content = choices[0]["message"]["content"]
-                usage = data.get("usage", {})
-                return content, {
-                    "prompt_tokens":     usage.get("prompt_tokens", 0),
-                    "completion_tokens": usage.get("completion_tokens", 0),
-                    "total_tokens":      usage.get("total_tokens", 0),
-                }
+                return content, parse_usage(data.get("usage"))
         except httpx.HTTPStatusError as e:
             code = e.response.status_code
             raise RuntimeError(f"OpenAI API error ({code})") from e
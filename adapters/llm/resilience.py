@@ -24,6 +24,8 @@ import time
 from dataclasses import dataclass, field
 from typing import Optional
 
+from core.token_counter import count_messages, count_tokens, token_counter
+
 logger = logging.getLogger(__name__)
 
 # ── Error classification ─────────────────────────────────────────────────────
@@ -212,6 +214,8 @@ class UsageRecord:
     prompt_tokens:   int   = 0
     completion_tokens: int = 0
     total_tokens:    int   = 0
+    cached_tokens:   int   = 0     # prompt tokens served from provider cache
+    estimated:       bool  = False # counts from core.token_counter, not the API
     latency_ms:      float = 0.0
     timestamp:       float = field(default_factory=time.time)
     success:         bool  = True
@@ -273,6 +277,35 @@ class ResilientLLM:
             )
         return self._circuits[model]
 
+    @staticmethod
+    def _usage_record(model: str, messages: list[dict], usage: dict,
+                      output: str, **kw) -> UsageRecord:
+        """UsageRecord from provider-reported usage, or token-counter
+        estimates when the adapter reported none.  Reported prompt counts
+        are fed back to ``token_counter.observe`` for accuracy stats."""
+        est_prompt = count_messages(messages, model)
+        if usage.get("total_tokens", 0) > 0:
+            token_counter.observe(model, est_prompt,
+                                  usage.get("prompt_tokens", 0))
+            return UsageRecord(
+                model=model,
+                prompt_tokens=usage.get("prompt_tokens", 0),
+                completion_tokens=usage.get("completion_tokens", 0),
+                total_tokens=usage.get("total_tokens", 0),
+                cached_tokens=usage.get("cached_tokens", 0),
+                success=True, **kw)
+        est_prompt = max(1, est_prompt)
+        if not isinstance(output, str):
+            output = str(output or "")
+        est_completion = max(1, count_tokens(output, model))
+        return UsageRecord(
+            model=model,
+            prompt_tokens=est_prompt,
+            completion_tokens=est_completion,
+            total_tokens=est_prompt + est_completion,
+            estimated=True,
+            success=True, **kw)
+
     async def chat(self, messages: list[dict], model: str, **kwargs) -> str:
         """
         Two-stage resilient chat:
@@ -318,14 +351,10 @@ class ResilientLLM:
                     if self._rotator:
                         self._rotator.mark_used()
 
-                    # Track usage (with real token counts from API)
-                    record = UsageRecord(
-                        model=current_model,
-                        prompt_tokens=usage_info.get("prompt_tokens", 0),
-                        completion_tokens=usage_info.get("completion_tokens", 0),
-                        total_tokens=usage_info.get("total_tokens", 0),
+                    # Track usage (real token counts from API when reported)
+                    record = self._usage_record(
+                        current_model, messages, usage_info, result,
                         latency_ms=latency,
-                        success=True,
                         retries=total_retries,
                         failover_used=is_failover,
                     )
@@ -422,18 +451,18 @@ class ResilientLLM:
             while retries <= self.max_retries:
                 try:
                     start_ts = time.time()
-                    output_chars = 0
+                    output: list[str] = []
 
                     if hasattr(self.adapter, 'chat_stream'):
                         async for chunk in self.adapter.chat_stream(
                             messages, current_model, **kwargs
                         ):
-                            output_chars += len(chunk)
+                            output.append(chunk)
                             yield chunk
                     else:
                         # Fallback: non-streaming, yield whole result
                         result = await self.adapter.chat(messages, current_model, **kwargs)
-                        output_chars = len(result)
+                        output.append(result)
                         yield result
 
                     latency = (time.time() - start_ts) * 1000
@@ -441,33 +470,13 @@ class ResilientLLM:
 
                     # Prefer real usage from adapter (via stream_options)
                     real_usage = getattr(self.adapter, '_last_stream_usage', None)
-                    if real_usage and real_usage.get("total_tokens", 0) > 0:
-                        record = UsageRecord(
-                            model=current_model,
-                            prompt_tokens=real_usage.get("prompt_tokens", 0),
-                            completion_tokens=real_usage.get("completion_tokens", 0),
-                            total_tokens=real_usage.get("total_tokens", 0),
-                            latency_ms=latency,
-                            success=True,
-                            retries=total_retries,
-                            failover_used=is_failover,
-                        )
-                    else:
-                        # Fallback: estimate from char counts (~4 chars/token)
-                        prompt_chars = sum(
-                            len(m.get("content", "")) for m in messages)
-                        est_prompt = max(1, prompt_chars // 4)
-                        est_completion = max(1, output_chars // 4)
-                        record = UsageRecord(
-                            model=current_model,
-                            prompt_tokens=est_prompt,
-                            completion_tokens=est_completion,
-                            total_tokens=est_prompt + est_completion,
-                            latency_ms=latency,
-                            success=True,
-                            retries=total_retries,
-                            failover_used=is_failover,
-                        )
+                    record = self._usage_record(
+                        current_model, messages, real_usage or {},
+                        "".join(output),
+                        latency_ms=latency,
+                        retries=total_retries,
+                        failover_used=is_failover,
+                    )
                     self.usage_log.append(record)
                     return
 
@@ -0,0 +1,220 @@
+"""
+adapters/llm/transport.py
+Shared keep-alive HTTP transport for the LLM adapters.
+
+Every adapter call used to open its own ``httpx.AsyncClient`` and pay a
+fresh TCP + TLS handshake per LLM round (including each tool-loop
+follow-up).  Adapters now lease a pooled client instead:
+
+    async with transport.lease(self.base_url, timeout=120.0) as client:
+        resp = await client.post(url, json=payload)
+
+One ``AsyncClient`` is kept per (event loop, origin) — httpx connections
+are bound to the loop that opened them — with configurable connection
+limits and keep-alive, and HTTP/2 for https origins when ``h2`` is
+installed.  Leasing never closes the client; ``aclose()`` shuts down the
+current loop's clients (called when an agent process / in-process
+runtime finishes).
+
+Configure from ``agents.yaml``::
+
+    llm:
+      http:
+        max_connections: 32
+        max_keepalive: 16
+        keepalive_expiry: 90     # seconds an idle connection is kept
+        http2: true              # https origins only; needs `h2`
+
+Per-origin counters — requests, new connections, TLS handshakes, reused
+connections, plus connect and time-to-first-byte histograms — come from
+httpcore trace events and are exposed via ``stats()`` (published in the
+agent heartbeat and the provider router status).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+from urllib.parse import urlsplit
+
+from core.runtime.wakeup import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "max_connections": 32,
+    "max_keepalive": 16,
+    "keepalive_expiry": 90.0,
+    "http2": True,
+}
+
+_config = dict(DEFAULTS)
+_lock = threading.Lock()
+# loop → {origin: AsyncClient}; entries for closed loops are purged lazily
+_clients: dict[asyncio.AbstractEventLoop, dict[str, object]] = {}
+_stats: dict[str, "OriginStats"] = {}
+
+
+def configure(**settings) -> None:
+    """Override pool settings; applies to clients created afterwards."""
+    with _lock:
+        for key, value in settings.items():
+            if key not in DEFAULTS:
+                logger.warning("[transport] unknown llm.http setting: %s", key)
+                continue
+            _config[key] = type(DEFAULTS[key])(value)
+
+
+def origin_of(base_url: str) -> str:
+    parts = urlsplit(base_url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+# ── Stats ───────────────────────────────────────────────────────────────────
+
+class OriginStats:
+    """Connection counters for one origin (all loops in this process)."""
+
+    def __init__(self, http2: bool):
+        self.http2 = http2
+        self.requests = 0
+        self.connections = 0
+        self.tls_handshakes = 0
+        self.reused = 0
+        self.connect_ms = LatencyHistogram()
+        self.ttfb_ms = LatencyHistogram()
+
+    def tracer(self):
+        """httpcore ``trace`` extension recording one request's events."""
+        t0 = time.perf_counter()
+        state = {"connect_t0": None, "opened": False}
+
+        async def trace(event: str, info: dict) -> None:
+            now = time.perf_counter()
+            if event == "connection.connect_tcp.started":
+                state["connect_t0"] = now
+            elif event == "connection.connect_tcp.complete":
+                state["opened"] = True
+                with _lock:
+                    self.connections += 1
+            elif event == "connection.start_tls.complete":
+                with _lock:
+                    self.tls_handshakes += 1
+            elif event.endswith("send_request_headers.started"):
+                if state["connect_t0"] is not None:
+                    with _lock:
+                        self.connect_ms.observe((now - state["connect_t0"]) * 1000)
+            elif event.endswith("receive_response_headers.complete"):
+                with _lock:
+                    self.requests += 1
+                    if not state["opened"]:
+                        self.reused += 1
+                    self.ttfb_ms.observe((now - t0) * 1000)
+
+        return trace
+
+    def snapshot(self) -> dict:
+        return {
+            "http2": self.http2,
+            "requests": self.requests,
+            "connections": self.connections,
+            "tls_handshakes": self.tls_handshakes,
+            "reused": self.reused,
+            "reuse_ratio": round(self.reused / self.requests, 3)
+                           if self.requests else 0.0,
+            "connect_ms": self.connect_ms.snapshot(),
+            "ttfb_ms": self.ttfb_ms.snapshot(),
+        }
+
+
+def stats() -> dict:
+    """Per-origin connection reuse / handshake / TTFB stats."""
+    with _lock:
+        return {origin: s.snapshot() for origin, s in _stats.items()}
+
+
+# ── Pool ────────────────────────────────────────────────────────────────────
+
+def _new_client(origin: str):
+    import httpx
+
+    http2 = (bool(_config["http2"]) and origin.startswith("https://")
+             and _h2_available())
+    limits = httpx.Limits(
+        max_connections=_config["max_connections"],
+        max_keepalive_connections=_config["max_keepalive"],
+        keepalive_expiry=_config["keepalive_expiry"],
+    )
+    if origin not in _stats:
+        _stats[origin] = OriginStats(http2)
+    return httpx.AsyncClient(limits=limits, http2=http2, timeout=120.0)
+
+
+def get_client(base_url: str):
+    """Pooled ``httpx.AsyncClient`` for ``base_url``'s origin on this loop."""
+    loop = asyncio.get_running_loop()
+    origin = origin_of(base_url)
+    with _lock:
+        for stale in [lp for lp in _clients if lp.is_closed()]:
+            del _clients[stale]     # sockets die with their loop
+        per_loop = _clients.setdefault(loop, {})
+        client = per_loop.get(origin)
+        if client is None or client.is_closed:
+            client = per_loop[origin] = _new_client(origin)
+        return client
+
+
+class PooledClient:
+    """A lease on a shared client: per-request timeout + stats tracing."""
+
+    def __init__(self, client, timeout: float, stats: OriginStats):
+        self._client = client
+        self._timeout = timeout
+        self._stats = stats
+
+    def _kwargs(self, kwargs: dict) -> dict:
+        kwargs.setdefault("timeout", self._timeout)
+        extensions = dict(kwargs.pop("extensions", None) or {})
+        extensions.setdefault("trace", self._stats.tracer())
+        kwargs["extensions"] = extensions
+        return kwargs
+
+    async def get(self, url: str, **kwargs):
+        return await self._client.get(url, **self._kwargs(kwargs))
+
+    async def post(self, url: str, **kwargs):
+        return await self._client.post(url, **self._kwargs(kwargs))
+
+    def stream(self, method: str, url: str, **kwargs):
+        return self._client.stream(method, url, **self._kwargs(kwargs))
+
+
+@asynccontextmanager
+async def lease(base_url: str, timeout: float = 120.0) -> AsyncIterator[PooledClient]:
+    """Borrow the pooled client for ``base_url`` (never closed on exit)."""
+    client = get_client(base_url)
+    yield PooledClient(client, timeout, _stats[origin_of(base_url)])
+
+
+async def aclose(loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+    """Close the pooled clients owned by ``loop`` (default: running loop)."""
+    loop = loop or asyncio.get_running_loop()
+    with _lock:
+        clients = list(_clients.pop(loop, {}).values())
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.debug("[transport] close failed: %s", e)
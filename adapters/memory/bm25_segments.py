@@ -0,0 +1,342 @@
+"""
+adapters/memory/bm25_segments.py
+On-disk segment storage for ``BM25Index`` (see ``adapters/memory/hybrid.py``).
+
+Layout of an index directory (``memory/.../bm25/<collection>/``):
+
+    manifest.json          live segments + current tail log (atomic replace)
+    tail-<n>.jsonl         append-only log of docs added since the last seal
+    seg-<n>.post           uint32 postings — per term: rows, then tfs
+    seg-<n>.terms(.off)    sorted term lexicon → (offset, count, max_tf)
+    seg-<n>.lens           uint32 token count per row
+    seg-<n>.docs / .doff   one JSON line per row ``[doc_id, document, metadata]``
+    seg-<n>.ids(.off)      sorted doc_id lexicon → row
+
+Segments are immutable and memory-mapped on first use, so opening an
+index reads only the manifest and replays the (bounded) tail log.  Term
+and id lookups binary-search the mapped lexicons in place; nothing is
+parsed up front.
+
+Both ``Segment`` and ``MemTail`` expose the same "part" interface —
+``base``, ``n``, ``lens``, ``postings(term)``, ``row_of(doc_id)``,
+``record(row)`` plus the ``terms()`` / ``ids()`` / ``doc_lines()``
+streams consumed by ``write_segment`` — so the index can score, seal and
+merge them uniformly.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import mmap
+import os
+from array import array
+from itertools import groupby
+from operator import itemgetter
+from typing import Iterable, Iterator, Optional
+
+SEAL_DOCS = 256       # tail size that triggers a seal into a level-0 segment
+MERGE_FACTOR = 4      # adjacent same-level segments merged into the next level
+MANIFEST = "manifest.json"
+SEGMENT_FILES = (".post", ".lens", ".docs", ".doff",
+                 ".terms", ".terms.off", ".ids", ".ids.off")
+
+
+def key_bytes(key: str) -> bytes:
+    """Lexicon sort key — JSON-escaped, so it never contains tab/newline."""
+    return json.dumps(key, ensure_ascii=False).encode("utf-8")
+
+
+def level_for(n: int) -> int:
+    """Tier a segment of ``n`` docs belongs to (level 0 ≈ one seal)."""
+    return max(0, int(math.log(max(n, 1) / SEAL_DOCS, MERGE_FACTOR)))
+
+
+def _mmap(path: str):
+    with open(path, "rb") as f:
+        if not os.fstat(f.fileno()).st_size:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+# ── Lexicon ─────────────────────────────────────────────────────────────────
+
+class Lexicon:
+    """Sorted ``key → ints`` table, binary-searched in the mapped file.
+
+    ``<path>`` holds ``key\\tv1\\tv2…\\n`` lines in key order; ``<path>.off``
+    holds uint64 line offsets (n + 1 entries).
+    """
+
+    def __init__(self, path: str):
+        self._data = _mmap(path)
+        self._off = memoryview(_mmap(path + ".off")).cast("Q")
+
+    def __len__(self) -> int:
+        return max(len(self._off) - 1, 0)
+
+    def _line(self, i: int) -> bytes:
+        return self._data[self._off[i]:self._off[i + 1] - 1]
+
+    def get(self, key: str) -> Optional[list[int]]:
+        k = key_bytes(key)
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            line = self._line(mid)
+            if line[:line.index(b"\t")] < k:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self):
+            kb, _, rest = self._line(lo).partition(b"\t")
+            if kb == k:
+                return [int(v) for v in rest.split(b"\t")]
+        return None
+
+    def items(self) -> Iterator[tuple[bytes, list[int]]]:
+        for i in range(len(self)):
+            kb, _, rest = self._line(i).partition(b"\t")
+            yield kb, [int(v) for v in rest.split(b"\t")]
+
+    @staticmethod
+    def write(path: str, items: Iterable[tuple[bytes, tuple]]) -> None:
+        """Write ``(key_bytes, ints)`` pairs, already sorted by key."""
+        offsets = array("Q", [0])
+        with open(path, "wb") as f:
+            for kb, vals in items:
+                line = b"\t".join([kb, *(str(v).encode() for v in vals)]) + b"\n"
+                f.write(line)
+                offsets.append(offsets[-1] + len(line))
+        with open(path + ".off", "wb") as f:
+            offsets.tofile(f)
+
+
+# ── Parts ───────────────────────────────────────────────────────────────────
+
+class Segment:
+    """Immutable, memory-mapped rows ``base .. base + n`` of an index."""
+
+    def __init__(self, directory: str, meta: dict, base: int):
+        self.meta = meta
+        self.name = meta["name"]
+        self.n = meta["n"]
+        self.level = meta.get("level", 0)
+        self.base = base
+        self._prefix = os.path.join(directory, self.name)
+        self._maps: dict = {}
+
+    def _map(self, ext: str, fmt: str = ""):
+        m = self._maps.get(ext)
+        if m is None:
+            if ext in (".terms", ".ids"):
+                m = Lexicon(self._prefix + ext)
+            else:
+                m = _mmap(self._prefix + ext)
+                if fmt:
+                    m = memoryview(m).cast(fmt)
+            self._maps[ext] = m
+        return m
+
+    @property
+    def lens(self):
+        return self._map(".lens", "I")
+
+    def postings(self, term: str):
+        """``(rows, tfs, max_tf)`` views into the mapped postings, or None."""
+        hit = self._map(".terms").get(term)
+        if hit is None:
+            return None
+        off, count, max_tf = hit
+        post = self._map(".post", "I")
+        return post[off:off + count], post[off + count:off + 2 * count], max_tf
+
+    def row_of(self, doc_id: str) -> Optional[int]:
+        hit = self._map(".ids").get(doc_id)
+        return hit[0] if hit else None
+
+    def record(self, row: int) -> list:
+        doff = self._map(".doff", "Q")
+        return json.loads(self._map(".docs")[doff[row]:doff[row + 1]])
+
+    # ── merge streams ──
+    def terms(self):
+        post = self._map(".post", "I")
+        for kb, (off, count, _max_tf) in self._map(".terms").items():
+            yield kb, post[off:off + count], post[off + count:off + 2 * count]
+
+    def ids(self):
+        for kb, (row,) in self._map(".ids").items():
+            yield json.loads(kb), row
+
+    def doc_lines(self):
+        data, doff = self._map(".docs"), self._map(".doff", "Q")
+        for i in range(self.n):
+            yield data[doff[i]:doff[i + 1]]
+
+    def remove_files(self) -> None:
+        """Delete this segment's files (open maps stay valid on POSIX)."""
+        for ext in SEGMENT_FILES:
+            try:
+                os.remove(self._prefix + ext)
+            except OSError:
+                pass
+
+
+class MemTail:
+    """Mutable in-memory rows added since the last seal."""
+
+    level = 0
+
+    def __init__(self, base: int = 0):
+        self.base = base
+        self.records: list[list] = []           # [doc_id, document, metadata]
+        self.lens = array("I")
+        self._postings: dict[str, tuple[array, array]] = {}
+        self._max_tf: dict[str, int] = {}
+        self._rows: dict[str, int] = {}
+
+    @property
+    def n(self) -> int:
+        return len(self.records)
+
+    def add(self, doc_id: str, document: str, metadata: dict,
+            tf: dict[str, int], length: int) -> None:
+        row = len(self.records)
+        self.records.append([doc_id, document, metadata])
+        self.lens.append(length)
+        self._rows[doc_id] = row
+        postings, max_tf = self._postings, self._max_tf
+        for term, count in tf.items():
+            post = postings.get(term)
+            if post is None:
+                post = postings[term] = (array("I"), array("I"))
+            post[0].append(row)
+            post[1].append(count)
+            if count > max_tf.get(term, 0):
+                max_tf[term] = count
+
+    def postings(self, term: str):
+        post = self._postings.get(term)
+        return (post[0], post[1], self._max_tf[term]) if post else None
+
+    def row_of(self, doc_id: str) -> Optional[int]:
+        return self._rows.get(doc_id)
+
+    def record(self, row: int) -> list:
+        return self.records[row]
+
+    # ── merge streams ──
+    def terms(self):
+        for kb, term in sorted((key_bytes(t), t) for t in self._postings):
+            yield (kb, *self._postings[term])
+
+    def ids(self):
+        return self._rows.items()
+
+    def doc_lines(self):
+        for rec in self.records:
+            yield (json.dumps(rec, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+# ── Writing ─────────────────────────────────────────────────────────────────
+
+def write_segment(directory: str, name: str, parts: list, level: int) -> dict:
+    """Write ``parts`` (in row order) as one segment; returns its manifest entry.
+
+    Term streams are k-way merged, so the cost is O(total postings) and
+    memory stays bounded by the largest single postings list.
+    """
+    prefix = os.path.join(directory, name)
+    lens = array("I")
+    doff = array("Q", [0])
+    ids: dict[str, int] = {}
+    bases = []
+    with open(prefix + ".docs", "wb") as f:
+        for part in parts:
+            base = len(lens)
+            bases.append(base)
+            for line in part.doc_lines():
+                f.write(line)
+                doff.append(doff[-1] + len(line))
+            for doc_id, row in part.ids():
+                ids[doc_id] = base + row          # later rows win
+            lens.extend(part.lens)
+    with open(prefix + ".doff", "wb") as f:
+        doff.tofile(f)
+    with open(prefix + ".lens", "wb") as f:
+        lens.tofile(f)
+    Lexicon.write(prefix + ".ids",
+                  sorted((key_bytes(d), (r,)) for d, r in ids.items()))
+
+    def _tagged(i, part):
+        for kb, rows, tfs in part.terms():
+            yield kb, i, rows, tfs
+
+    streams = [_tagged(i, part) for i, part in enumerate(parts)]
+    lexicon = []
+    pos = 0
+    with open(prefix + ".post", "wb") as f:
+        merged = heapq.merge(*streams, key=itemgetter(0, 1))
+        for kb, group in groupby(merged, key=itemgetter(0)):
+            rows, tfs = array("I"), array("I")
+            for _, i, part_rows, part_tfs in group:
+                base = bases[i]
+                if base:
+                    rows.extend(r + base for r in part_rows)
+                else:
+                    rows.extend(part_rows)
+                tfs.extend(part_tfs)
+            rows.tofile(f)
+            tfs.tofile(f)
+            lexicon.append((kb, (pos, len(rows), max(tfs))))
+            pos += 2 * len(rows)
+    Lexicon.write(prefix + ".terms", lexicon)
+    # Durable before any manifest can reference the segment
+    for ext in SEGMENT_FILES:
+        _fsync_path(prefix + ext)
+
+    return {"name": name, "n": len(lens), "level": level,
+            "total_len": sum(lens), "min_len": min(lens, default=0)}
+
+
+def read_manifest(directory: str) -> dict:
+    try:
+        with open(os.path.join(directory, MANIFEST)) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"segments": [], "next": 1, "tail": "tail-000000.jsonl"}
+
+
+def _fsync_path(path: str) -> None:
+    """fsync a file (or, on POSIX, a directory's entries) by path."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return      # directories cannot be opened on Windows
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_manifest(directory: str, manifest: dict) -> None:
+    """Atomically replace the manifest.
+
+    Segment files are fsync'd by ``write_segment``; the directory is
+    synced first so their entries are durable before the manifest that
+    points at them, and again so the replace itself survives a crash
+    (the caller removes the old tail log next).
+    """
+    path = os.path.join(directory, MANIFEST)
+    tmp = path + ".tmp"
+    _fsync_path(directory)
+    with open(tmp, "w") as f:
+        json.dump(manifest, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    _fsync_path(directory)
@@ -1,7 +1,8 @@
 """
 adapters/memory/chroma.py
 ChromaDB vector store adapter with pluggable embedding provider.
-Falls back to MockMemory if chromadb is not installed.
+Falls back to the built-in vector store (``adapters/memory/vector_store.py``)
+if chromadb is not installed or fails to import.
 """
 
 from __future__ import annotations
@@ -28,7 +29,7 @@ def ChromaAdapter(persist_dir: str = "memory/chroma",
                   embedding_fn=None):
     """
     Factory function: returns ChromaDB adapter if available,
-    otherwise falls back to MockMemory with a warning.
+    otherwise falls back to the built-in ``VectorMemory`` with a warning.
 
     Args:
         persist_dir: ChromaDB persistence directory.
@@ -42,16 +43,16 @@ def ChromaAdapter(persist_dir: str = "memory/chroma",
         if _CHROMA_ERROR and _CHROMA_ERROR != "not_installed":
             logger.warning(
                 "chromadb installed but failed to load: %s — "
-                "falling back to MockMemory. Try Python <=3.13.",
+                "falling back to the built-in vector store. Try Python <=3.13.",
                 _CHROMA_ERROR,
             )
         else:
             logger.warning(
-                "chromadb not installed — falling back to MockMemory. "
-                "Install with: pip install chromadb"
+                "chromadb not installed — falling back to the built-in "
+                "vector store. Install with: pip install chromadb"
             )
-        from adapters.memory.mock import MockMemory
-        return MockMemory()
+        from adapters.memory.vector_store import VectorMemory
+        return VectorMemory(persist_dir, embedding_fn=embedding_fn)
 
 
 class _ChromaAdapterImpl:
@@ -78,6 +79,15 @@ class _ChromaAdapterImpl:
             ids=[str(doc_id)],
         )
 
+    def add_many(self, collection: str, documents: list[str],
+                 metadatas: list[dict]):
+        """Batched add — one embedding call for the whole batch."""
+        self._get_collection(collection).add(
+            documents=documents,
+            metadatas=metadatas,
+            ids=[str(m.get("id", hash(d))) for d, m in zip(documents, metadatas)],
+        )
+
     def query(self, collection: str, query: str,
               n_results: int = 3) -> dict:
         coll = self._get_collection(collection)
@@ -5,6 +5,7 @@ Supports multiple embedding backends:
   - chromadb_default: ChromaDB's built-in (all-MiniLM-L6-v2, ~384 dims)
   - openai: OpenAI text-embedding-3-small/large (1536/3072 dims)
   - local: sentence-transformers on CPU (no API key needed)
+  - hashing: feature-hashed word / CJK n-grams (no deps; lexical only)
 
 Usage:
     from adapters.memory.embedding import get_embedding_provider
@@ -14,6 +15,13 @@ Usage:
 
 ChromaDB integration:
     provider.as_chromadb_function()  → chromadb.EmbeddingFunction compatible
+
+Caching:
+    Providers built by ``get_embedding_provider`` are wrapped in
+    ``CachedEmbeddingProvider`` (persistent, content-addressed, shared by
+    all agent processes — see ``adapters/memory/embedding_cache.py``).
+    Disable with ``memory.embedding.cache: false``; cap the size with
+    ``memory.embedding.cache_max_mb``.
 """
 
 from __future__ import annotations
@@ -238,6 +246,89 @@ class LocalEmbeddingProvider(EmbeddingProvider):
         return [e.tolist() for e in embeddings]
 
 
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """Dependency-free feature-hashing embeddings (words, word bigrams,
+    CJK character uni/bigrams), L2-normalised.
+
+    Lexical similarity only — the built-in vector store's default when no
+    real provider is configured.
+    """
+
+    def __init__(self, dim: int = 256):
+        self._dim = dim
+
+    @property
+    def name(self) -> str:
+        return f"hashing:{self._dim}"
+
+    @property
+    def dimensions(self) -> int:
+        return self._dim
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed_one(t) for t in texts]
+
+    def _embed_one(self, text: str) -> List[float]:
+        import hashlib
+        import math
+        import re
+        vec = [0.0] * self._dim
+        words = re.findall(r"[a-z0-9_]+", text.lower())
+        cjk = re.findall(r"[\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af]", text)
+        features = (words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+                    + cjk + [a + b for a, b in zip(cjk, cjk[1:])])
+        for feat in features:
+            h = int.from_bytes(hashlib.blake2b(
+                feat.encode("utf-8"), digest_size=8).digest(), "little")
+            vec[h % self._dim] += 1.0 if (h >> 63) else -1.0
+        norm = math.sqrt(sum(x * x for x in vec)) or 1.0
+        return [x / norm for x in vec]
+
+
+class CachedEmbeddingProvider(EmbeddingProvider):
+    """Serve repeated texts from the on-disk embedding cache.
+
+    Only texts missing from the cache (deduplicated) reach the wrapped
+    provider.  Cache failures are logged and fall through to it.
+    """
+
+    def __init__(self, inner: EmbeddingProvider, max_mb: float | None = None,
+                 directory: str | None = None):
+        from adapters.memory import embedding_cache as ec
+        self.inner = inner
+        self.cache = ec.open_cache(
+            inner.name, inner.dimensions,
+            directory=directory or ec.CACHE_DIR,
+            max_mb=max_mb if max_mb is not None else ec.DEFAULT_MAX_MB)
+
+    @property
+    def name(self) -> str:
+        return self.inner.name
+
+    @property
+    def dimensions(self) -> int:
+        return self.inner.dimensions
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        try:
+            cached = self.cache.get_many(texts)
+        except Exception as e:
+            logger.debug("[embedding] cache read failed: %s", e)
+            return self.inner.embed(texts)
+        missing = list(dict.fromkeys(t for t in texts if t not in cached))
+        if missing:
+            fresh = dict(zip(missing, self.inner.embed(missing)))
+            try:
+                self.cache.put_many(fresh)
+            except Exception as e:
+                logger.debug("[embedding] cache write failed: %s", e)
+            cached.update(fresh)
+        return [cached[t] for t in texts]
+
+    def stats(self) -> dict:
+        return self.cache.stats()
+
+
 # ── Factory ──────────────────────────────────────────────────────────────────
 
 
@@ -247,10 +338,12 @@ def get_embedding_provider(config: Optional[dict] = None) -> EmbeddingProvider:
     Config format (in agents.yaml):
         memory:
           embedding:
-            provider: openai          # openai | flock | local | chromadb_default
+            provider: openai          # openai | flock | local | hashing | chromadb_default
             model: text-embedding-3-small
             api_key_env: OPENAI_API_KEY
             base_url_env: OPENAI_BASE_URL
+            cache: true               # persistent embedding cache (default)
+            cache_max_mb: 256
 
     Falls back to chromadb_default if no config or provider unavailable.
     """
@@ -272,13 +365,16 @@ def get_embedding_provider(config: Optional[dict] = None) -> EmbeddingProvider:
 
     try:
         if provider_name == "openai":
-            return OpenAIEmbeddingProvider(
-                model=model, api_key=api_key, base_url=base_url)
+            return _with_cache(OpenAIEmbeddingProvider(
+                model=model, api_key=api_key, base_url=base_url), emb_config)
         elif provider_name == "flock":
-            return FlockEmbeddingProvider(
-                model=model, api_key=api_key, base_url=base_url)
+            return _with_cache(FlockEmbeddingProvider(
+                model=model, api_key=api_key, base_url=base_url), emb_config)
         elif provider_name == "local":
-            return LocalEmbeddingProvider(model_name=model)
+            return _with_cache(LocalEmbeddingProvider(model_name=model),
+                               emb_config)
+        elif provider_name == "hashing":
+            return HashingEmbeddingProvider(dim=emb_config.get("dim", 256))
         elif provider_name == "chromadb_default":
             return ChromaDBDefaultProvider()
         else:
@@ -289,3 +385,14 @@ def get_embedding_provider(config: Optional[dict] = None) -> EmbeddingProvider:
         logger.warning("Failed to create embedding provider '%s': %s. "
                        "Falling back to chromadb_default.", provider_name, e)
         return ChromaDBDefaultProvider()
+
+
+def _with_cache(provider: EmbeddingProvider, emb_config: dict) -> EmbeddingProvider:
+    if not emb_config.get("cache", True):
+        return provider
+    try:
+        return CachedEmbeddingProvider(
+            provider, max_mb=emb_config.get("cache_max_mb"))
+    except Exception as e:
+        logger.warning("Embedding cache unavailable (%s); embedding uncached", e)
+        return provider
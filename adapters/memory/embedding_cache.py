@@ -0,0 +1,334 @@
+"""
+adapters/memory/embedding_cache.py
+Persistent, content-addressed embedding cache shared across processes.
+
+Layout (``memory/.embedding_cache/<provider>-<dim>d/``, one directory per
+provider + model, so every vector in it has the same dimension):
+
+    index.db      sqlite (WAL): key → slot, last use; hit/miss counters
+    vectors.f32   fixed-size slots, memory-mapped:
+                  uint64 tag | float32 × dim
+
+Keys are ``sha256(provider \\0 text)``; the tag is the first 8 bytes of
+the key.  Writers allocate slots inside a ``BEGIN IMMEDIATE`` transaction
+(one writer at a time across processes) and write ``tag=0 → vector →
+tag``; readers map the file without locking and accept a slot only when
+the tag matches before and after copying the vector, so a slot that is
+being evicted or rewritten concurrently reads as a miss, never as a
+wrong vector.
+
+The cache holds at most ``max_mb`` of vectors; when full, the least
+recently used entries give up their slots.  ``CachedEmbeddingProvider``
+wraps any ``EmbeddingProvider`` (``get_embedding_provider`` does this by
+default), so ``as_chromadb_function()`` — used by both ``ChromaAdapter``
+and ``HybridMemory`` — serves repeated queries and re-added documents
+from disk.  ``cache_stats()`` reports hit rate and saved API cost for
+``cleo memory status``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import mmap
+import os
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.join("memory", ".embedding_cache")
+INDEX_DB = "index.db"
+VECTORS = "vectors.f32"
+DEFAULT_MAX_MB = 256
+GROW_SLOTS = 1024          # file grows by this many slots at a time
+_TAG_BYTES = 8
+_QUERY_CHUNK = 500         # keys per SELECT … IN (…)
+
+# USD per 1M input tokens (by model-name substring); local models are free
+EMBEDDING_PRICES = {
+    "text-embedding-3-small": 0.02,
+    "text-embedding-3-large": 0.13,
+    "text-embedding-ada-002": 0.10,
+}
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS entries ("
+    " key BLOB PRIMARY KEY, slot INTEGER NOT NULL, used REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS entries_used ON entries (used)",
+    "CREATE TABLE IF NOT EXISTS counters ("
+    " name TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+)
+_COUNTERS = ("hits", "misses", "evictions", "saved_tokens", "next_slot")
+
+
+def cache_dir_for(provider_name: str, dim: int,
+                  directory: str = CACHE_DIR) -> str:
+    safe = re.sub(r"[^A-Za-z0-9._-]+", "_", provider_name)
+    return os.path.join(directory, f"{safe}-{dim}d")
+
+
+def price_per_token(provider_name: str) -> float:
+    for model, usd in EMBEDDING_PRICES.items():
+        if model in provider_name:
+            return usd / 1_000_000
+    return 0.0
+
+
+def _key(provider_name: str, text: str) -> bytes:
+    return hashlib.sha256(
+        f"{provider_name}\0{text}".encode("utf-8", "surrogatepass")).digest()
+
+
+def _tag(key: bytes) -> bytes:
+    tag = bytearray(key[:_TAG_BYTES])
+    tag[0] |= 1               # never all-zero (zero marks a slot in flux)
+    return bytes(tag)
+
+
+class EmbeddingCache:
+    """Slot file + sqlite index for one provider/model."""
+
+    def __init__(self, provider_name: str, dim: int,
+                 directory: str = CACHE_DIR, max_mb: float = DEFAULT_MAX_MB):
+        self.provider_name = provider_name
+        self.dim = dim
+        self.dir = cache_dir_for(provider_name, dim, directory)
+        self.slot_size = _TAG_BYTES + 4 * dim
+        self.capacity = max(1, int(max_mb * 1024 * 1024) // self.slot_size)
+        self._mu = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = 0
+        self._fd = -1
+        self._mm: Optional[mmap.mmap] = None
+
+    # ── Public ──
+
+    def get_many(self, texts: list[str]) -> dict[str, list[float]]:
+        """Cached vectors for ``texts`` (misses are simply absent)."""
+        keys = {_key(self.provider_name, t): t for t in set(texts)}
+        found: dict[str, list[float]] = {}
+        with self._mu:
+            conn = self._connect()
+            rows = []
+            klist = list(keys)
+            for i in range(0, len(klist), _QUERY_CHUNK):
+                chunk = klist[i:i + _QUERY_CHUNK]
+                rows += conn.execute(
+                    "SELECT key, slot FROM entries WHERE key IN (%s)"
+                    % ",".join("?" * len(chunk)), chunk).fetchall()
+            hit_keys = []
+            for key, slot in rows:
+                vec = self._read_slot(slot, _tag(key))
+                if vec is not None:
+                    found[keys[key]] = vec
+                    hit_keys.append(key)
+            saved = 0
+            if found:
+                from core.token_counter import count_tokens
+                saved = sum(count_tokens(t) for t in found)
+            self._txn(lambda c: self._touch(c, hit_keys, len(keys) - len(found),
+                                            saved))
+        return found
+
+    def put_many(self, items: dict[str, list[float]]) -> None:
+        """Store vectors (wrong-sized or all-zero vectors are skipped —
+        zeros are the providers' error placeholder)."""
+        items = {t: v for t, v in items.items()
+                 if len(v) == self.dim and any(v)}
+        if not items:
+            return
+        with self._mu:
+            self._txn(lambda c: self._insert(c, items))
+
+    def stats(self) -> dict:
+        with self._mu:
+            return _read_stats(self._connect(), self.provider_name)
+
+    def close(self) -> None:
+        with self._mu:
+            if self._mm is not None:
+                self._mm.close()
+                self._mm = None
+            if self._fd >= 0:
+                os.close(self._fd)
+                self._fd = -1
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+    # ── Index ──
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None and self._pid == os.getpid():
+            return self._conn
+        os.makedirs(self.dir, exist_ok=True)
+        conn = sqlite3.connect(os.path.join(self.dir, INDEX_DB), timeout=30.0,
+                               isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for stmt in _SCHEMA:
+            conn.execute(stmt)
+        conn.executemany(
+            "INSERT OR IGNORE INTO counters (name, value) VALUES (?, 0)",
+            [(n,) for n in _COUNTERS])
+        self._conn = conn
+        self._pid = os.getpid()
+        self._fd = os.open(os.path.join(self.dir, VECTORS),
+                           os.O_RDWR | os.O_CREAT, 0o644)
+        self._mm = None
+        return conn
+
+    def _txn(self, fn) -> None:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            fn(conn)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @staticmethod
+    def _bump(conn, name: str, n: int) -> None:
+        if n:
+            conn.execute("UPDATE counters SET value = value + ? WHERE name = ?",
+                          (n, name))
+
+    def _touch(self, conn, hit_keys: list[bytes], misses: int,
+               saved_tokens: int) -> None:
+        now = time.time()
+        conn.executemany("UPDATE entries SET used = ? WHERE key = ?",
+                         [(now, k) for k in hit_keys])
+        self._bump(conn, "hits", len(hit_keys))
+        self._bump(conn, "misses", misses)
+        self._bump(conn, "saved_tokens", saved_tokens)
+
+    def _insert(self, conn, items: dict[str, list[float]]) -> None:
+        now = time.time()
+        keyed = {_key(self.provider_name, t): v for t, v in items.items()}
+        next_slot = conn.execute(
+            "SELECT value FROM counters WHERE name = 'next_slot'").fetchone()[0]
+        for key, vec in keyed.items():
+            row = conn.execute("SELECT slot FROM entries WHERE key = ?",
+                               (key,)).fetchone()
+            if row is not None:
+                slot = row[0]
+            elif next_slot < self.capacity:
+                slot, next_slot = next_slot, next_slot + 1
+            else:
+                slot = self._evict_one(conn, keyed)
+                if slot is None:
+                    break
+            self._write_slot(slot, _tag(key), vec)
+            conn.execute(
+                "INSERT INTO entries (key, slot, used) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET used = excluded.used",
+                (key, slot, now))
+        conn.execute("UPDATE counters SET value = ? WHERE name = 'next_slot'",
+                     (next_slot,))
+
+    def _evict_one(self, conn, protected: dict) -> Optional[int]:
+        for key, slot in conn.execute(
+                "SELECT key, slot FROM entries ORDER BY used LIMIT ?",
+                (len(protected) + 1,)).fetchall():
+            if key not in protected:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._bump(conn, "evictions", 1)
+                return slot
+        return None
+
+    # ── Slot file ──
+
+    def _map(self, end: int) -> Optional[mmap.mmap]:
+        """Mapping covering byte ``end`` (remapped after growth)."""
+        if self._mm is not None and len(self._mm) >= end:
+            return self._mm
+        size = os.fstat(self._fd).st_size
+        if size < end:
+            return None
+        if self._mm is not None:
+            self._mm.close()
+        self._mm = mmap.mmap(self._fd, size)
+        return self._mm
+
+    def _read_slot(self, slot: int, tag: bytes) -> Optional[list[float]]:
+        off = slot * self.slot_size
+        mm = self._map(off + self.slot_size)
+        if mm is None or mm[off:off + _TAG_BYTES] != tag:
+            return None
+        vec = array("f")
+        vec.frombytes(mm[off + _TAG_BYTES:off + self.slot_size])
+        if mm[off:off + _TAG_BYTES] != tag:      # rewritten while copying
+            return None
+        return vec.tolist()
+
+    def _write_slot(self, slot: int, tag: bytes, vec: list[float]) -> None:
+        off = slot * self.slot_size
+        end = off + self.slot_size
+        if os.fstat(self._fd).st_size < end:
+            grow_to = min(slot + GROW_SLOTS, self.capacity) * self.slot_size
+            os.ftruncate(self._fd, max(grow_to, end))
+        mm = self._map(end)
+        mm[off:off + _TAG_BYTES] = b"\0" * _TAG_BYTES
+        mm[off + _TAG_BYTES:end] = array("f", vec).tobytes()
+        mm[off:off + _TAG_BYTES] = tag
+
+
+def _read_stats(conn, provider_name: str) -> dict:
+    c = dict(conn.execute("SELECT name, value FROM counters"))
+    hits, misses = c.get("hits", 0), c.get("misses", 0)
+    total = hits + misses
+    saved = c.get("saved_tokens", 0)
+    return {
+        "entries": conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0],
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / total, 3) if total else 0.0,
+        "evictions": c.get("evictions", 0),
+        "saved_tokens": saved,
+        "saved_usd": round(saved * price_per_token(provider_name), 8),
+    }
+
+
+def cache_stats(directory: str = CACHE_DIR) -> dict[str, dict]:
+    """Stats for every provider cache under ``directory`` (read-only)."""
+    out: dict[str, dict] = {}
+    if not os.path.isdir(directory):
+        return out
+    for name in sorted(os.listdir(directory)):
+        db = os.path.join(directory, name, INDEX_DB)
+        if not os.path.exists(db):
+            continue
+        try:
+            conn = sqlite3.connect(f"file:{db}?mode=ro", uri=True, timeout=5.0)
+            try:
+                out[name] = _read_stats(conn, name)
+                out[name]["size_kb"] = os.path.getsize(
+                    os.path.join(directory, name, VECTORS)) // 1024
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError) as e:
+            logger.debug("[embedding_cache] stats for %s failed: %s", name, e)
+    return out
+
+
+# Shared by every CachedEmbeddingProvider in the process
+_caches: dict[tuple[str, str], EmbeddingCache] = {}
+_caches_mu = threading.Lock()
+
+
+def open_cache(provider_name: str, dim: int, directory: str = CACHE_DIR,
+               max_mb: float = DEFAULT_MAX_MB) -> EmbeddingCache:
+    key = (os.path.abspath(cache_dir_for(provider_name, dim, directory)),
+           provider_name)
+    with _caches_mu:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = EmbeddingCache(provider_name, dim,
+                                                  directory, max_mb)
+        return cache
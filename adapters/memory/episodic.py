@@ -8,6 +8,7 @@ Layer 2 (L2) — Full Detail:   Complete task input/output (stored but loaded on
 
 Storage layout:
   memory/agents/{agent_id}/
+    episodic.db                 # SQLite index (see episodic_index.py)
     episodes/
       {date}/
         {task_id}.json          # Full L2 episode
@@ -23,6 +24,9 @@ OpenViking concepts adapted:
   - 6-category extraction: profile, preferences, entities, events (user-owned);
     cases, patterns (agent-owned)
   - Session commit as crystallization point
+
+The JSON files are canonical; every write also updates ``episodic.db``
+and every query is answered from it (no directory scans).
 """
 
 from __future__ import annotations
@@ -31,13 +35,28 @@ import hashlib
 import json
 import logging
 import os
-import re
+import threading
 import time
 from datetime import datetime, timezone
 from typing import Optional
 
+from adapters.memory.episodic_index import DB_NAME, EpisodicIndex
+
 logger = logging.getLogger(__name__)
 
+_indexes: dict[str, EpisodicIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def _open_index(base: str) -> EpisodicIndex:
+    """Process-wide index per agent directory (reopened if the db vanished)."""
+    key = os.path.abspath(base)
+    with _indexes_lock:
+        idx = _indexes.get(key)
+        if idx is None or not os.path.exists(os.path.join(key, DB_NAME)):
+            idx = _indexes[key] = EpisodicIndex(key)
+        return idx
+
 
 def _today() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%d")
@@ -135,6 +154,16 @@ class EpisodicMemory:
         for d in [self.episodes_dir, self.daily_dir,
                   self.cases_dir, self.patterns_dir]:
             os.makedirs(d, exist_ok=True)
+        self.index = _open_index(self.base)
+
+    def reindex(self) -> dict:
+        """Rebuild ``episodic.db`` from the JSON files (after external edits)."""
+        return self.index.migrate(rebuild=True)
+
+    @staticmethod
+    def _write_json(path: str, data: dict) -> None:
+        with open(path, "w") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
 
     # ── Episode CRUD ──────────────────────────────────────────────────────
 
@@ -145,32 +174,41 @@ class EpisodicMemory:
         day_dir = os.path.join(self.episodes_dir, date)
         os.makedirs(day_dir, exist_ok=True)
         path = os.path.join(day_dir, f"{task_id}.json")
-        with open(path, "w") as f:
-            json.dump(episode, f, ensure_ascii=False, indent=2)
+        self._write_json(path, episode)
+        self.index.put_episode(episode, date)
         logger.debug("[%s] saved episode %s", self.agent_id, task_id)
         return path
 
+    def update_episode(self, task_id: str, fields: dict,
+                       date: Optional[str] = None) -> Optional[dict]:
+        """Merge ``fields`` into a stored episode (file + index).
+
+        Returns the updated episode, or None if it does not exist.
+        """
+        date = date or self.index.episode_date(task_id)
+        if not date:
+            return None
+        path = os.path.join(self.episodes_dir, date, f"{task_id}.json")
+        try:
+            with open(path) as f:
+                ep = json.load(f)
+            ep.update(fields)
+            self._write_json(path, ep)
+        except (json.JSONDecodeError, OSError) as e:
+            logger.debug("[%s] update_episode failed for %s: %s",
+                         self.agent_id, task_id, e)
+            return None
+        self.index.put_episode(ep, date)
+        return ep
+
     def update_episode_score(self, task_id: str, score: int,
                              date: Optional[str] = None) -> bool:
         """Retroactively set/overwrite the score field of an episode."""
-        dates_to_check = [date] if date else sorted(
-            self._list_dates(), reverse=True)
-        for d in dates_to_check:
-            path = os.path.join(self.episodes_dir, d, f"{task_id}.json")
-            if os.path.exists(path):
-                try:
-                    with open(path) as f:
-                        ep = json.load(f)
-                    ep["score"] = score
-                    with open(path, "w") as f:
-                        json.dump(ep, f, ensure_ascii=False, indent=2)
-                    logger.debug("[%s] backfilled score=%s for %s",
-                                 self.agent_id, score, task_id)
-                    return True
-                except (json.JSONDecodeError, OSError) as e:
-                    logger.debug("[%s] update_episode_score failed: %s",
-                                 self.agent_id, e)
-        return False
+        if self.update_episode(task_id, {"score": score}, date=date) is None:
+            return False
+        logger.debug("[%s] backfilled score=%s for %s",
+                     self.agent_id, score, task_id)
+        return True
 
     def load_episode(self, task_id: str, date: Optional[str] = None,
                      level: int = 1) -> Optional[dict]:
@@ -180,18 +218,20 @@ class EpisodicMemory:
         level=1: overview (+ description, result_preview, outcome)
         level=2: full detail (+ result_full, context)
         """
-        # Search in date dir or scan all dates
-        dates_to_check = [date] if date else self._list_dates()
-        for d in dates_to_check:
-            path = os.path.join(self.episodes_dir, d, f"{task_id}.json")
-            if os.path.exists(path):
-                try:
-                    with open(path) as f:
-                        ep = json.load(f)
-                    return self._trim_to_level(ep, level)
-                except (json.JSONDecodeError, OSError):
-                    continue
-        return None
+        if level < 2:
+            ep = self.index.episode(task_id)
+            if ep is None or (date and ep["date"] != date):
+                return None
+            return self._trim_to_level(ep, level)
+        date = date or self.index.episode_date(task_id)
+        if not date:
+            return None
+        try:
+            with open(os.path.join(self.episodes_dir, date,
+                                   f"{task_id}.json")) as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return None
 
     def _trim_to_level(self, episode: dict, level: int) -> dict:
         """Return episode trimmed to the requested level."""
@@ -209,30 +249,15 @@ class EpisodicMemory:
 
     def list_episodes(self, limit: int = 50, level: int = 0) -> list[dict]:
         """List recent episodes at specified level, newest first."""
-        episodes = []
-        for date_str in sorted(self._list_dates(), reverse=True):
-            day_dir = os.path.join(self.episodes_dir, date_str)
-            for fname in sorted(os.listdir(day_dir), reverse=True):
-                if not fname.endswith(".json") or fname.startswith("."):
-                    continue
-                path = os.path.join(day_dir, fname)
-                try:
-                    with open(path) as f:
-                        ep = json.load(f)
-                    episodes.append(self._trim_to_level(ep, level))
-                except (json.JSONDecodeError, OSError):
-                    continue
-                if len(episodes) >= limit:
-                    return episodes
-        return episodes
+        episodes = self.index.recent_episodes(limit)
+        if level >= 2:
+            return [self.load_episode(ep["task_id"], ep["date"], level=2) or ep
+                    for ep in episodes]
+        return [self._trim_to_level(ep, level) for ep in episodes]
 
     def _list_dates(self) -> list[str]:
-        """List all date directories in episodes/."""
-        if not os.path.isdir(self.episodes_dir):
-            return []
-        return [d for d in os.listdir(self.episodes_dir)
-                if os.path.isdir(os.path.join(self.episodes_dir, d))
-                and re.match(r"\d{4}-\d{2}-\d{2}", d)]
+        """List all dates that have indexed episodes."""
+        return self.index.dates()
 
     # ── Daily Learning Log ────────────────────────────────────────────────
 
@@ -265,33 +290,8 @@ class EpisodicMemory:
         optionally filtered by keyword overlap with task description.
         Used to inject "previous failure context" into agent prompts.
         """
-        failures: list[dict] = []
-        for date_str in sorted(self._list_dates(), reverse=True):
-            day_dir = os.path.join(self.episodes_dir, date_str)
-            for fname in sorted(os.listdir(day_dir), reverse=True):
-                if not fname.endswith(".json") or fname.startswith("."):
-                    continue
-                try:
-                    with open(os.path.join(day_dir, fname)) as f:
-                        ep = json.load(f)
-                except (json.JSONDecodeError, OSError):
-                    continue
-
-                outcome = ep.get("outcome", "")
-                if outcome not in ("failure", "needs_improvement"):
-                    continue
-
-                # Optional keyword filter
-                if keywords:
-                    desc = (ep.get("description", "") + " " +
-                            ep.get("title", "")).lower()
-                    if not any(kw.lower() in desc for kw in keywords):
-                        continue
-
-                failures.append(self._trim_to_level(ep, 1))
-                if len(failures) >= limit:
-                    return failures
-        return failures
+        return [self._trim_to_level(ep, 1)
+                for ep in self.index.failures(keywords, limit)]
 
     def generate_daily_summary(self, date: Optional[str] = None) -> str:
         """
@@ -299,21 +299,7 @@ class EpisodicMemory:
         Returns markdown text suitable for the daily log.
         """
         date = date or _today()
-        day_dir = os.path.join(self.episodes_dir, date)
-        if not os.path.isdir(day_dir):
-            return ""
-
-        episodes = []
-        for fname in sorted(os.listdir(day_dir)):
-            if not fname.endswith(".json") or fname.startswith("."):
-                continue
-            try:
-                with open(os.path.join(day_dir, fname)) as f:
-                    ep = json.load(f)
-                episodes.append(ep)
-            except (json.JSONDecodeError, OSError):
-                continue
-
+        episodes = self.index.episodes_on(date)
         if not episodes:
             return ""
 
@@ -353,48 +339,34 @@ class EpisodicMemory:
             "created_at": time.time(),
             "use_count": 0,
         }
-        path = os.path.join(self.cases_dir, f"{key}.json")
-        with open(path, "w") as f:
-            json.dump(case, f, ensure_ascii=False, indent=2)
+        self._write_json(os.path.join(self.cases_dir, f"{key}.json"), case)
+        self.index.put_case(case)
         logger.debug("[%s] saved case %s", self.agent_id, key)
         return key
 
+    def update_case(self, case_id: str, fields: dict) -> Optional[dict]:
+        """Merge ``fields`` into a stored case (file + index)."""
+        path = os.path.join(self.cases_dir, f"{case_id}.json")
+        try:
+            with open(path) as f:
+                case = json.load(f)
+            case.update(fields)
+            self._write_json(path, case)
+        except (json.JSONDecodeError, OSError) as e:
+            logger.debug("[%s] update_case failed for %s: %s",
+                         self.agent_id, case_id, e)
+            return None
+        self.index.put_case(case)
+        return case
+
     def search_cases(self, query: str, limit: int = 5) -> list[dict]:
-        """Simple keyword search over cases."""
-        results = []
-        query_lower = query.lower()
-        for fname in os.listdir(self.cases_dir):
-            if not fname.endswith(".json") or fname.startswith("."):
-                continue
-            try:
-                with open(os.path.join(self.cases_dir, fname)) as f:
-                    case = json.load(f)
-                # Score by keyword overlap
-                text = (case.get("problem", "") + " " +
-                        case.get("solution", "") + " " +
-                        " ".join(case.get("tags", []))).lower()
-                score = sum(1 for word in query_lower.split() if word in text)
-                if score > 0:
-                    case["_match_score"] = score
-                    results.append(case)
-            except (json.JSONDecodeError, OSError):
-                continue
-        results.sort(key=lambda x: x.get("_match_score", 0), reverse=True)
-        return results[:limit]
+        """Keyword search over cases, ranked by query-word overlap."""
+        words = query.lower().split()
+        return self.index.search_cases(words, limit) if words else []
 
     def list_cases(self, limit: int = 20) -> list[dict]:
         """List all cases, newest first."""
-        cases = []
-        for fname in os.listdir(self.cases_dir):
-            if not fname.endswith(".json") or fname.startswith("."):
-                continue
-            try:
-                with open(os.path.join(self.cases_dir, fname)) as f:
-                    cases.append(json.load(f))
-            except (json.JSONDecodeError, OSError):
-                continue
-        cases.sort(key=lambda x: x.get("created_at", 0), reverse=True)
-        return cases[:limit]
+        return self.index.cases_by("recent", limit)
 
     # ── Patterns (recurring observations) ─────────────────────────────────
 
@@ -408,13 +380,7 @@ class EpisodicMemory:
         path = os.path.join(self.patterns_dir, f"{key}.json")
 
         # Merge with existing if same pattern
-        existing = None
-        if os.path.exists(path):
-            try:
-                with open(path) as f:
-                    existing = json.load(f)
-            except (json.JSONDecodeError, OSError):
-                pass
+        existing = self.index.pattern(key)
 
         if existing:
             existing["evidence"].extend(evidence)
@@ -434,23 +400,13 @@ class EpisodicMemory:
                 "updated_at": time.time(),
             }
 
-        with open(path, "w") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        self._write_json(path, data)
+        self.index.put_pattern(data)
         return key
 
     def list_patterns(self, limit: int = 10) -> list[dict]:
         """List patterns sorted by occurrence frequency."""
-        patterns = []
-        for fname in os.listdir(self.patterns_dir):
-            if not fname.endswith(".json") or fname.startswith("."):
-                continue
-            try:
-                with open(os.path.join(self.patterns_dir, fname)) as f:
-                    patterns.append(json.load(f))
-            except (json.JSONDecodeError, OSError):
-                continue
-        patterns.sort(key=lambda x: x.get("occurrences", 0), reverse=True)
-        return patterns[:limit]
+        return self.index.patterns_by_frequency(limit)
 
     # ── Progressive Recall (L0→L1→L2 budget-aware) ────────────────────────
 
@@ -559,14 +515,8 @@ class EpisodicMemory:
         now_ts = time.time()
         cutoff = now_ts - (max_age_days * 86400)
 
-        all_dates = sorted(self._list_dates())
-        total_episodes = 0
-
-        # Count total episodes
-        for d in all_dates:
-            day_dir = os.path.join(self.episodes_dir, d)
-            total_episodes += len([f for f in os.listdir(day_dir)
-                                   if f.endswith(".json")])
+        all_dates = self._list_dates()
+        total_episodes = self.index.counts()["episodes"]
 
         # Archive old dates (beyond TTL)
         for d in all_dates:
@@ -587,11 +537,13 @@ class EpisodicMemory:
                         f"[ARCHIVED] {summary[:500]}", date=d)
 
                 # Delete individual episode files
-                for fname in os.listdir(day_dir):
+                for fname in (os.listdir(day_dir)
+                              if os.path.isdir(day_dir) else []):
                     if fname.endswith(".json"):
                         os.remove(os.path.join(day_dir, fname))
                         archived += 1
                         total_episodes -= 1
+                self.index.delete_date(d)
 
                 # Remove empty directory
                 try:
@@ -629,44 +581,27 @@ class EpisodicMemory:
 
     def stats(self) -> dict:
         """Return memory statistics."""
-        episode_count = 0
-        for d in self._list_dates():
-            day_dir = os.path.join(self.episodes_dir, d)
-            episode_count += len([f for f in os.listdir(day_dir)
-                                  if f.endswith(".json") and not f.startswith(".")])
-
-        case_count = len([f for f in os.listdir(self.cases_dir)
-                          if f.endswith(".json") and not f.startswith(".")])
-        pattern_count = len([f for f in os.listdir(self.patterns_dir)
-                             if f.endswith(".json") and not f.startswith(".")])
+        counts = self.index.counts()
         daily_count = len([f for f in os.listdir(self.daily_dir)
                            if f.endswith(".md") and not f.startswith(".")])
 
         return {
             "agent_id": self.agent_id,
-            "episodes": episode_count,
-            "cases": case_count,
-            "patterns": pattern_count,
+            "episodes": counts["episodes"],
+            "cases": counts["cases"],
+            "patterns": counts["patterns"],
             "daily_logs": daily_count,
-            "dates": sorted(self._list_dates()),
+            "dates": self._list_dates(),
         }
 
     # ── MEMORY.md Generation (P0/P1/P2 tiers) ─────────────────────────────
 
     def increment_use_count(self, case_id: str):
         """Increment use_count for a case (tracks how often it's recalled)."""
-        path = os.path.join(self.cases_dir, f"{case_id}.json")
-        if not os.path.exists(path):
-            return
-        try:
-            with open(path) as f:
-                case = json.load(f)
-            case["use_count"] = case.get("use_count", 0) + 1
-            with open(path, "w") as f:
-                json.dump(case, f, ensure_ascii=False, indent=2)
-        except (json.JSONDecodeError, OSError) as e:
-            logger.debug("[%s] increment_use_count failed for %s: %s",
-                         self.agent_id, case_id, e)
+        case = self.index.case(case_id)
+        if case is not None:
+            self.update_case(case_id,
+                             {"use_count": case.get("use_count", 0) + 1})
 
     def generate_memory_md(self, max_lines: int = 200) -> str:
         """Generate MEMORY.md with P0/P1/P2 priority tiers.
@@ -682,24 +617,13 @@ class EpisodicMemory:
 
         # P0: Top cases by use_count (permanent core knowledge)
         lines.append("## P0 — Core Knowledge (Permanent)")
-        cases = []
-        if os.path.isdir(self.cases_dir):
-            for fname in os.listdir(self.cases_dir):
-                if not fname.endswith(".json") or fname.startswith("."):
-                    continue
-                try:
-                    with open(os.path.join(self.cases_dir, fname)) as f:
-                        case = json.load(f)
-                    cases.append(case)
-                except (json.JSONDecodeError, OSError):
-                    continue
+        cases = self.index.cases_by("used")
 
         # Sort by use_count descending, take top entries
         # V0.03+: Filter out cases whose problem is conversation history
         # metadata (injected by channel managers), not actual task content
         _HISTORY_MARKERS = ("对话历史", "Conversation History",
                             "[source:telegram]", "[source:dashboard]")
-        cases.sort(key=lambda c: c.get("use_count", 0), reverse=True)
         p0_cases = [c for c in cases
                     if c.get("use_count", 0) >= 1
                     and not any(m in c.get("problem", "")
@@ -719,21 +643,8 @@ class EpisodicMemory:
         lines.append("## P1 — Active Patterns (90-day TTL)")
         now = time.time()
         ttl_90d = 90 * 86400
-        patterns = []
-        if os.path.isdir(self.patterns_dir):
-            for fname in os.listdir(self.patterns_dir):
-                if not fname.endswith(".json") or fname.startswith("."):
-                    continue
-                try:
-                    with open(os.path.join(self.patterns_dir, fname)) as f:
-                        pat = json.load(f)
-                    created = pat.get("created_at", 0)
-                    if (now - created) <= ttl_90d:
-                        patterns.append(pat)
-                except (json.JSONDecodeError, OSError):
-                    continue
-
-        patterns.sort(key=lambda p: p.get("occurrences", 1), reverse=True)
+        patterns = self.index.patterns_by_frequency(
+            created_after=now - ttl_90d)
         for p in patterns[:10]:
             occ = p.get("occurrences", 1)
             lines.append(f"- [{occ}x] {p.get('pattern', '')[:200]}")
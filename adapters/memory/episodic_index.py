@@ -0,0 +1,434 @@
+"""
+adapters/memory/episodic_index.py
+SQLite index for ``EpisodicMemory`` (``memory/agents/{agent_id}/episodic.db``).
+
+The JSON files under ``episodes/``, ``cases/`` and ``patterns/`` stay the
+canonical store (exports, the FTS indexer and the consolidator read
+them); this index mirrors them so every query is answered without
+opening files:
+
+  episodes   L0/L1 columns (title, tags, score, outcome, preview, …),
+             indexed by recency and by outcome — ``list_episodes``,
+             ``query_error_patterns``, ``load_episode`` levels 0/1
+  cases      full JSON + created_at / use_count columns
+  patterns   full JSON + occurrences / created_at columns
+
+Keyword lookups use FTS5 with the ``trigram`` tokenizer, which matches
+arbitrary substrings (≥ 3 characters) — the same semantics as the
+previous ``kw in text`` scans, served from an index.  SQLite builds
+without it (< 3.34, or no FTS5) fall back to ``instr`` scans over the
+tables; results are identical, only slower on large histories.
+
+The first open of an agent's index imports the existing directory
+layout (``migrate``); ``EpisodicMemory.reindex()`` rebuilds it after
+out-of-band file edits.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+DB_NAME = "episodic.db"
+SCHEMA_VERSION = 1
+MIN_FTS_CHARS = 3          # trigram tokenizer cannot match shorter strings
+RECENT_WINDOW = 256        # newest failures filtered before falling back to FTS
+FAILURE_OUTCOMES = ("failure", "needs_improvement")
+
+EPISODE_COLUMNS = ("task_id", "agent_id", "title", "tags", "score", "ts",
+                   "date", "outcome", "error_type", "model", "description",
+                   "result_preview")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS episodes (
+    task_id        TEXT PRIMARY KEY,
+    agent_id       TEXT,
+    title          TEXT NOT NULL DEFAULT '',
+    tags           TEXT NOT NULL DEFAULT '[]',
+    score,
+    ts             REAL NOT NULL DEFAULT 0,
+    date           TEXT NOT NULL,
+    outcome        TEXT,
+    error_type     TEXT,
+    model          TEXT,
+    description    TEXT NOT NULL DEFAULT '',
+    result_preview TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS episodes_recent  ON episodes(date DESC, ts DESC);
+CREATE INDEX IF NOT EXISTS episodes_outcome ON episodes(outcome, date DESC, ts DESC);
+
+CREATE TABLE IF NOT EXISTS cases (
+    id          TEXT PRIMARY KEY,
+    created_at  REAL NOT NULL DEFAULT 0,
+    use_count   INTEGER NOT NULL DEFAULT 0,
+    search_text TEXT NOT NULL DEFAULT '',
+    data        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cases_recent ON cases(created_at DESC);
+CREATE INDEX IF NOT EXISTS cases_used   ON cases(use_count DESC);
+
+CREATE TABLE IF NOT EXISTS patterns (
+    id          TEXT PRIMARY KEY,
+    occurrences INTEGER NOT NULL DEFAULT 1,
+    created_at  REAL NOT NULL DEFAULT 0,
+    data        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS patterns_freq ON patterns(occurrences DESC);
+"""
+
+# Substring indexes over episodes / cases; only created when the SQLite
+# build ships the trigram tokenizer (``trigram_supported``)
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS episodes_fts USING fts5(
+    title, description, content='episodes', tokenize='trigram');
+CREATE TRIGGER IF NOT EXISTS episodes_ai AFTER INSERT ON episodes BEGIN
+    INSERT INTO episodes_fts(rowid, title, description)
+    VALUES (new.rowid, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS episodes_ad AFTER DELETE ON episodes BEGIN
+    INSERT INTO episodes_fts(episodes_fts, rowid, title, description)
+    VALUES ('delete', old.rowid, old.title, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS episodes_au AFTER UPDATE ON episodes BEGIN
+    INSERT INTO episodes_fts(episodes_fts, rowid, title, description)
+    VALUES ('delete', old.rowid, old.title, old.description);
+    INSERT INTO episodes_fts(rowid, title, description)
+    VALUES (new.rowid, new.title, new.description);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS cases_fts USING fts5(
+    search_text, content='cases', tokenize='trigram');
+CREATE TRIGGER IF NOT EXISTS cases_ai AFTER INSERT ON cases BEGIN
+    INSERT INTO cases_fts(rowid, search_text) VALUES (new.rowid, new.search_text);
+END;
+CREATE TRIGGER IF NOT EXISTS cases_ad AFTER DELETE ON cases BEGIN
+    INSERT INTO cases_fts(cases_fts, rowid, search_text)
+    VALUES ('delete', old.rowid, old.search_text);
+END;
+CREATE TRIGGER IF NOT EXISTS cases_au AFTER UPDATE ON cases BEGIN
+    INSERT INTO cases_fts(cases_fts, rowid, search_text)
+    VALUES ('delete', old.rowid, old.search_text);
+    INSERT INTO cases_fts(rowid, search_text) VALUES (new.rowid, new.search_text);
+END;
+"""
+
+_FTS_TRIGGERS = ("episodes_ai", "episodes_ad", "episodes_au",
+                 "cases_ai", "cases_ad", "cases_au")
+
+_trigram: Optional[bool] = None
+
+
+def trigram_supported() -> bool:
+    """Whether this SQLite build has FTS5 with the ``trigram`` tokenizer
+    (SQLite ≥ 3.34).  Probed once per process on an in-memory database."""
+    global _trigram
+    if _trigram is None:
+        conn = sqlite3.connect(":memory:")
+        try:
+            conn.execute("CREATE VIRTUAL TABLE probe USING fts5("
+                         "x, tokenize='trigram')")
+            _trigram = True
+        except sqlite3.OperationalError:
+            _trigram = False
+            logger.info("[episodic] SQLite %s lacks the FTS5 trigram "
+                        "tokenizer — keyword lookups use table scans",
+                        sqlite3.sqlite_version)
+        finally:
+            conn.close()
+    return _trigram
+
+
+def case_search_text(case: dict) -> str:
+    """Lower-cased text ``search_cases`` matches against."""
+    return (case.get("problem", "") + " " + case.get("solution", "") + " " +
+            " ".join(case.get("tags", []))).lower()
+
+
+def fts_any(terms: Iterable[str]) -> str:
+    """FTS5 query matching any of ``terms`` as a literal substring."""
+    return " OR ".join('"' + t.replace('"', '""') + '"' for t in terms)
+
+
+def _read_json_dir(path: str) -> Iterable[dict]:
+    if not os.path.isdir(path):
+        return
+    for fname in os.listdir(path):
+        if not fname.endswith(".json") or fname.startswith("."):
+            continue
+        try:
+            with open(os.path.join(path, fname)) as f:
+                yield json.load(f)
+        except (json.JSONDecodeError, OSError):
+            continue
+
+
+class EpisodicIndex:
+    """One agent's episodic index; thread-safe, WAL for cross-process reads."""
+
+    def __init__(self, base: str):
+        self.base = base
+        self.path = os.path.join(base, DB_NAME)
+        self._mu = threading.RLock()
+        self.conn = sqlite3.connect(self.path, timeout=30.0,
+                                    isolation_level=None,
+                                    check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self._mu:
+            self.conn.executescript(_SCHEMA)
+            self.fts = self._setup_fts()
+            if self.conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                self.migrate()
+
+    def _setup_fts(self) -> bool:
+        """Create (or, without trigram support, detach) the FTS indexes.
+
+        Sync triggers are dropped when the tokenizer is missing, so writes
+        keep working on a database created by a newer SQLite; the indexes
+        are rebuilt from the tables once the triggers come back.
+        """
+        if not trigram_supported():
+            for name in _FTS_TRIGGERS:
+                self.conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+            return False
+        had = {r[0] for r in self.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+        self.conn.executescript(_FTS_SCHEMA)
+        if not had.issuperset(_FTS_TRIGGERS):
+            for table in ("episodes_fts", "cases_fts"):
+                self.conn.execute(
+                    f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+        return True
+
+    # ── Migration ─────────────────────────────────────────────────────────
+
+    def migrate(self, rebuild: bool = False) -> dict:
+        """Import the JSON directory layout; ``rebuild`` clears the index first.
+
+        Runs in one IMMEDIATE transaction and re-checks the schema version
+        inside it, so concurrent first opens migrate exactly once.
+        """
+        counts = {"episodes": 0, "cases": 0, "patterns": 0}
+        with self._mu:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+                if version >= SCHEMA_VERSION and not rebuild:
+                    self.conn.execute("COMMIT")
+                    return counts
+                for table in ("episodes", "cases", "patterns"):
+                    self.conn.execute(f"DELETE FROM {table}")
+                ep_dir = os.path.join(self.base, "episodes")
+                dates = os.listdir(ep_dir) if os.path.isdir(ep_dir) else []
+                for date in dates:
+                    if not re.match(r"\d{4}-\d{2}-\d{2}", date):
+                        continue
+                    for ep in _read_json_dir(os.path.join(ep_dir, date)):
+                        if ep.get("task_id"):
+                            self._put_episode(ep, date)
+                            counts["episodes"] += 1
+                for case in _read_json_dir(os.path.join(self.base, "cases")):
+                    if case.get("id"):
+                        self._put_case(case)
+                        counts["cases"] += 1
+                for pat in _read_json_dir(os.path.join(self.base, "patterns")):
+                    if pat.get("id"):
+                        self._put_pattern(pat)
+                        counts["patterns"] += 1
+                self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        if any(counts.values()):
+            logger.info("[episodic] indexed %s: %d episodes, %d cases, %d patterns",
+                        self.base, counts["episodes"], counts["cases"],
+                        counts["patterns"])
+        return counts
+
+    # ── Writes ────────────────────────────────────────────────────────────
+
+    def _put_episode(self, ep: dict, date: str) -> None:
+        row = {c: ep.get(c) for c in EPISODE_COLUMNS}
+        row.update(date=date, tags=json.dumps(ep.get("tags") or [],
+                                              ensure_ascii=False),
+                   title=ep.get("title") or "", ts=ep.get("ts") or 0,
+                   description=ep.get("description") or "",
+                   result_preview=ep.get("result_preview") or "")
+        cols = ", ".join(EPISODE_COLUMNS)
+        marks = ", ".join(f":{c}" for c in EPISODE_COLUMNS)
+        updates = ", ".join(f"{c}=excluded.{c}" for c in EPISODE_COLUMNS[1:])
+        self.conn.execute(
+            f"INSERT INTO episodes ({cols}) VALUES ({marks}) "
+            f"ON CONFLICT(task_id) DO UPDATE SET {updates}", row)
+
+    def _put_case(self, case: dict) -> None:
+        self.conn.execute(
+            "INSERT INTO cases (id, created_at, use_count, search_text, data) "
+            "VALUES (?, ?, ?, ?, ?) ON CONFLICT(id) DO UPDATE SET "
+            "created_at=excluded.created_at, use_count=excluded.use_count, "
+            "search_text=excluded.search_text, data=excluded.data",
+            (case["id"], case.get("created_at") or 0, case.get("use_count") or 0,
+             case_search_text(case), json.dumps(case, ensure_ascii=False)))
+
+    def _put_pattern(self, pat: dict) -> None:
+        self.conn.execute(
+            "INSERT INTO patterns (id, occurrences, created_at, data) "
+            "VALUES (?, ?, ?, ?) ON CONFLICT(id) DO UPDATE SET "
+            "occurrences=excluded.occurrences, created_at=excluded.created_at, "
+            "data=excluded.data",
+            (pat["id"], pat.get("occurrences") or 1, pat.get("created_at") or 0,
+             json.dumps(pat, ensure_ascii=False)))
+
+    def put_episode(self, ep: dict, date: str) -> None:
+        with self._mu:
+            self._put_episode(ep, date)
+
+    def put_case(self, case: dict) -> None:
+        with self._mu:
+            self._put_case(case)
+
+    def put_pattern(self, pat: dict) -> None:
+        with self._mu:
+            self._put_pattern(pat)
+
+    def delete_date(self, date: str) -> None:
+        with self._mu:
+            self.conn.execute("DELETE FROM episodes WHERE date = ?", (date,))
+
+    # ── Episode queries ───────────────────────────────────────────────────
+
+    def _query(self, sql: str, params: tuple = ()) -> list[sqlite3.Row]:
+        with self._mu:
+            return self.conn.execute(sql, params).fetchall()
+
+    def episode_date(self, task_id: str) -> Optional[str]:
+        rows = self._query("SELECT date FROM episodes WHERE task_id = ?",
+                           (task_id,))
+        return rows[0]["date"] if rows else None
+
+    def episode(self, task_id: str) -> Optional[dict]:
+        rows = self._query("SELECT * FROM episodes WHERE task_id = ?", (task_id,))
+        return self.row_to_episode(rows[0]) if rows else None
+
+    def recent_episodes(self, limit: int) -> list[dict]:
+        return [self.row_to_episode(r) for r in self._query(
+            "SELECT * FROM episodes ORDER BY date DESC, ts DESC LIMIT ?",
+            (limit,))]
+
+    def episodes_on(self, date: str) -> list[dict]:
+        return [self.row_to_episode(r) for r in self._query(
+            "SELECT * FROM episodes WHERE date = ? ORDER BY task_id", (date,))]
+
+    def failures(self, keywords: list[str] | None, limit: int) -> list[dict]:
+        """Recent failure/needs_improvement episodes containing any keyword.
+
+        Per outcome, the newest ``RECENT_WINDOW`` rows are filtered first
+        (common keywords finish there); if that yields fewer than
+        ``limit`` hits, the exact query runs via FTS when available (rare
+        keywords have short postings).  Each per-outcome list is exact, so the merge is.
+        """
+        kws = [k.lower() for k in keywords or [] if k]
+        rows: list[sqlite3.Row] = []
+        for outcome in FAILURE_OUTCOMES:
+            if not kws:
+                rows += self._query(
+                    "SELECT * FROM episodes WHERE outcome = ? "
+                    "ORDER BY date DESC, ts DESC LIMIT ?", (outcome, limit))
+                continue
+            contains = " OR ".join(
+                ["instr(lower(description || ' ' || title), ?) > 0"] * len(kws))
+            hits = self._query(
+                "SELECT * FROM (SELECT * FROM episodes WHERE outcome = ? "
+                "ORDER BY date DESC, ts DESC LIMIT ?) "
+                f"WHERE {contains} LIMIT ?",
+                (outcome, RECENT_WINDOW, *kws, limit))
+            if len(hits) < limit:
+                if self.fts and all(len(k) >= MIN_FTS_CHARS for k in kws):
+                    match, params = ("rowid IN (SELECT rowid FROM episodes_fts "
+                                     "WHERE episodes_fts MATCH ?)", (fts_any(kws),))
+                else:
+                    match, params = f"({contains})", tuple(kws)
+                hits = self._query(
+                    f"SELECT * FROM episodes WHERE outcome = ? AND {match} "
+                    "ORDER BY date DESC, ts DESC LIMIT ?",
+                    (outcome, *params, limit))
+            rows += hits
+        rows.sort(key=lambda r: (r["date"], r["ts"]), reverse=True)
+        return [self.row_to_episode(r) for r in rows[:limit]]
+
+    def dates(self) -> list[str]:
+        return [r[0] for r in self._query(
+            "SELECT DISTINCT date FROM episodes ORDER BY date")]
+
+    def counts(self) -> dict:
+        with self._mu:
+            return {t: self.conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]
+                    for t in ("episodes", "cases", "patterns")}
+
+    @staticmethod
+    def row_to_episode(row: sqlite3.Row) -> dict:
+        ep = {c: row[c] for c in EPISODE_COLUMNS}
+        ep["tags"] = json.loads(ep["tags"] or "[]")
+        return ep
+
+    # ── Cases / patterns ──────────────────────────────────────────────────
+
+    def case(self, case_id: str) -> Optional[dict]:
+        rows = self._query("SELECT data FROM cases WHERE id = ?", (case_id,))
+        return json.loads(rows[0]["data"]) if rows else None
+
+    def search_cases(self, words: list[str], limit: int) -> list[dict]:
+        """Cases ranked by how many of ``words`` they contain (``_match_score``).
+
+        FTS narrows the candidates when every word is long enough for a
+        trigram; scoring and ordering run in SQL so only ``limit`` rows
+        are decoded.
+        """
+        score = " + ".join(["(instr(search_text, ?) > 0)"] * len(words))
+        sql = f"SELECT data, {score} AS score FROM cases"
+        params: list = list(words)
+        if self.fts and all(len(w) >= MIN_FTS_CHARS for w in words):
+            sql += (" WHERE rowid IN (SELECT rowid FROM cases_fts "
+                    "WHERE cases_fts MATCH ?)")
+            params.append(fts_any(words))
+        sql = (f"SELECT data, score FROM ({sql}) WHERE score > 0 "
+               "ORDER BY score DESC LIMIT ?")
+        params.append(limit)
+        results = []
+        for row in self._query(sql, tuple(params)):
+            case = json.loads(row["data"])
+            case["_match_score"] = row["score"]
+            results.append(case)
+        return results
+
+    def cases_by(self, order: str, limit: int | None = None) -> list[dict]:
+        column = {"recent": "created_at", "used": "use_count"}[order]
+        sql = f"SELECT data FROM cases ORDER BY {column} DESC"
+        rows = (self._query(sql + " LIMIT ?", (limit,)) if limit is not None
+                else self._query(sql))
+        return [json.loads(r["data"]) for r in rows]
+
+    def pattern(self, pattern_id: str) -> Optional[dict]:
+        rows = self._query("SELECT data FROM patterns WHERE id = ?", (pattern_id,))
+        return json.loads(rows[0]["data"]) if rows else None
+
+    def patterns_by_frequency(self, limit: int | None = None,
+                              created_after: float = 0) -> list[dict]:
+        sql = ("SELECT data FROM patterns WHERE created_at >= ? "
+               "ORDER BY occurrences DESC")
+        rows = (self._query(sql + " LIMIT ?", (created_after, limit))
+                if limit is not None else self._query(sql, (created_after,)))
+        return [json.loads(r["data"]) for r in rows]
+
+    def close(self) -> None:
+        with self._mu:
+            self.conn.close()
@@ -9,13 +9,26 @@ BM25 implementation is self-contained (no external dependency).
 """
 
 from __future__ import annotations
+import hashlib
+import heapq
+import json
 import logging
 import math
 import os
 import re
-from collections import defaultdict
+import threading
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from collections.abc import Sequence
+from operator import itemgetter
 from typing import Optional
 
+from adapters.memory.bm25_segments import (
+    MERGE_FACTOR, SEAL_DOCS, MemTail, Segment, level_for, read_manifest,
+    write_manifest, write_segment,
+)
+from core.protocols import FileLock  # shared fallback
+
 logger = logging.getLogger(__name__)
 
 
@@ -44,117 +57,321 @@ def _tokenize(text: str) -> list[str]:
     return [t for t in tokens if t not in _CHINESE_STOP_WORDS]
 
 
+class _Column(Sequence):
+    """Read-only row-indexed view over every part of a ``BM25Index``."""
+
+    def __init__(self, index: "BM25Index", field: int | None):
+        self._index = index
+        self._field = field          # record slot, or None for doc length
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(len(self)))]
+        if row < 0:
+            row += len(self)
+        part = self._index._part(row)
+        if self._field is None:
+            return part.lens[row - part.base]
+        return part.record(row - part.base)[self._field]
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+
 class BM25Index:
     """
     Self-contained BM25 index — no external dependencies.
     Supports incremental document addition and disk persistence.
+
+    Inverted layout: each term maps to a postings list of (row, tf) pairs
+    held in two parallel uint32 columns (rows ascending), so a query only
+    touches the documents that contain one of its terms.  IDF is derived at
+    query time from the postings length (document frequency) — ``add`` is
+    O(|doc|) regardless of vocabulary size.
+
+    Rows live in immutable memory-mapped segments plus an in-memory tail
+    (``adapters/memory/bm25_segments.py``).  An index opened on a
+    directory appends each add to the tail log and seals the tail into a
+    segment every SEAL_DOCS docs; in-memory indexes (``BM25Index()``)
+    only ever have the tail.
     """
 
     def __init__(self, k1: float = 1.5, b: float = 0.75):
         self.k1 = k1
         self.b  = b
-        self.docs: list[str]               = []       # original documents
-        self.doc_ids: list[str]             = []       # document IDs
-        self.doc_metadata: list[dict]       = []       # metadata per doc
-        self.doc_lens: list[int]            = []       # token count per doc
-        self.doc_freqs: list[dict[str,int]] = []       # term frequencies per doc
-        self.idf: dict[str, float]          = {}       # inverse doc frequency
-        self.avg_dl: float                  = 0.0
-        self._df: dict[str, int]            = defaultdict(int)  # doc frequency
+        self._segments: list[Segment] = []
+        self._tail = MemTail()
+        self._total_len: int = 0
+        self._min_len: int   = 0          # shortest doc
+        self._dir: str | None = None
+        self._manifest: dict = {}
+        self._log = None                  # tail log (append mode)
+
+        # Row-indexed views (lazy for segment rows)
+        self.docs         = _Column(self, 1)
+        self.doc_ids      = _Column(self, 0)
+        self.doc_metadata = _Column(self, 2)
+        self.doc_lens     = _Column(self, None)
+
+    def __len__(self) -> int:
+        return self._tail.base + self._tail.n
+
+    @property
+    def _parts(self) -> list:
+        return [*self._segments, self._tail]
+
+    def _part(self, row: int):
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        if row >= self._tail.base:
+            return self._tail
+        i = bisect_right([s.base for s in self._segments], row) - 1
+        return self._segments[i]
+
+    @property
+    def avg_dl(self) -> float:
+        n = len(self)
+        return self._total_len / n if n else 0.0
+
+    def df(self, term: str) -> int:
+        """Number of documents containing ``term``."""
+        return sum(len(p[0]) for part in self._parts
+                   if (p := part.postings(term)) is not None)
+
+    def row_of(self, doc_id: str) -> int | None:
+        """Row of the most recent document added under ``doc_id``."""
+        for part in reversed(self._parts):
+            row = part.row_of(doc_id)
+            if row is not None:
+                return part.base + row
+        return None
 
     def add(self, doc_id: str, document: str, metadata: dict | None = None):
         """Add a document to the BM25 index."""
+        metadata = metadata or {}
+        if self._log is not None:
+            self._log.write(json.dumps([doc_id, document, metadata],
+                                       ensure_ascii=False) + "\n")
+            self._log.flush()
+        self._add_tail(doc_id, document, metadata)
+        if self._dir and self._tail.n >= SEAL_DOCS:
+            self._seal()
+
+    def add_many(self, items: list[tuple[str, str, dict]]) -> None:
+        """Add ``(doc_id, document, metadata)`` items with one log write."""
+        if self._log is not None and items:
+            self._log.write("".join(
+                json.dumps([d, doc, m or {}], ensure_ascii=False) + "\n"
+                for d, doc, m in items))
+            self._log.flush()
+        for doc_id, document, metadata in items:
+            self._add_tail(doc_id, document, metadata or {})
+            if self._dir and self._tail.n >= SEAL_DOCS:
+                self._seal()
+
+    def _add_tail(self, doc_id: str, document: str, metadata: dict) -> None:
         tokens = _tokenize(document)
-        tf = defaultdict(int)
-        for t in tokens:
-            tf[t] += 1
-
-        self.docs.append(document)
-        self.doc_ids.append(doc_id)
-        self.doc_metadata.append(metadata or {})
-        self.doc_lens.append(len(tokens))
-        self.doc_freqs.append(dict(tf))
-
-        # Update document frequency
-        for term in set(tokens):
-            self._df[term] += 1
-
-        # Recompute IDF and avg_dl
-        n = len(self.docs)
-        self.avg_dl = sum(self.doc_lens) / n if n else 0
-        self.idf = {}
-        for term, df in self._df.items():
-            self.idf[term] = math.log(1 + (n - df + 0.5) / (df + 0.5))
+        self._min_len = min(self._min_len, len(tokens)) if len(self) else len(tokens)
+        self._total_len += len(tokens)
+        self._tail.add(doc_id, document, metadata, Counter(tokens), len(tokens))
 
     def search(self, query: str, n_results: int = 5) -> list[tuple[int, float]]:
         """
         Search the index. Returns list of (doc_index, score) sorted by score desc.
+
+        Term-at-a-time with MaxScore pruning: terms are visited in order of
+        their score upper bound (rarest first).  Once the top ``n_results``
+        threshold exceeds what the remaining terms could add, those terms
+        are no longer scanned — their postings are only probed (binary
+        search) for docs already in contention.  Common terms therefore
+        cost O(candidates · log df), not O(df).
         """
         query_tokens = _tokenize(query)
-        if not query_tokens or not self.docs:
+        n = len(self)
+        if not query_tokens or not n or n_results <= 0:
             return []
 
-        scores = []
-        for i, (doc_tf, dl) in enumerate(zip(self.doc_freqs, self.doc_lens)):
-            score = 0.0
-            for term in query_tokens:
-                if term not in doc_tf:
+        k1, b = self.k1, self.b
+        # Length normalisation  k1·(1 − b + b·dl/avgdl)  =  c0 + c1·dl
+        c0 = k1 * (1 - b)
+        c1 = k1 * b / max(self.avg_dl, 1)
+
+        # (upper bound, weight, [(part, rows, tfs)]).  A term contributes
+        # w·tf/(tf + c0 + c1·dl), which grows with tf and shrinks with dl,
+        # so the term's highest tf over the shortest doc bounds it.
+        # Repeated query terms count once per occurrence.
+        parts = self._parts
+        terms = []
+        for term, count in Counter(query_tokens).items():
+            hits, df, mt = [], 0, 0
+            for part in parts:
+                post = part.postings(term)
+                if post is not None:
+                    hits.append((part, post[0], post[1]))
+                    df += len(post[0])
+                    mt = max(mt, post[2])
+            if not hits:
+                continue
+            w = math.log(1 + (n - df + 0.5) / (df + 0.5)) * (k1 + 1) * count
+            terms.append((w * mt / (mt + c0 + c1 * self._min_len), w, hits))
+        terms.sort(key=itemgetter(0), reverse=True)
+
+        scores: dict[int, float] = {}
+        get = scores.get
+        remaining = sum(t[0] for t in terms)
+        for ub, w, hits in terms:
+            remaining -= ub
+            theta = (heapq.nlargest(n_results, scores.values())[-1]
+                     if len(scores) >= n_results else 0.0)
+            if ub + remaining > theta:
+                # Docs matching only this and later terms can still make it
+                for part, rows, tfs in hits:
+                    base, lens = part.base, part.lens
+                    for r, tf in zip(rows, tfs):
+                        row = base + r
+                        scores[row] = get(row, 0.0) + w * tf / (tf + c0 + c1 * lens[r])
+                continue
+            bases = [part.base for part, _, _ in hits]
+            for row, score in list(scores.items()):
+                if score + ub + remaining <= theta:
+                    continue
+                j = bisect_right(bases, row) - 1
+                if j < 0:
                     continue
-                tf = doc_tf[term]
-                idf = self.idf.get(term, 0)
-                numerator   = tf * (self.k1 + 1)
-                denominator = tf + self.k1 * (
-                    1 - self.b + self.b * dl / max(self.avg_dl, 1)
-                )
-                score += idf * numerator / denominator
-            if score > 0:
-                scores.append((i, score))
-
-        scores.sort(key=lambda x: x[1], reverse=True)
-        return scores[:n_results]
+                part, rows, tfs = hits[j]
+                r = row - part.base
+                i = bisect_left(rows, r)
+                if i < len(rows) and rows[i] == r:
+                    tf = tfs[i]
+                    scores[row] = score + w * tf / (tf + c0 + c1 * part.lens[r])
+
+        return heapq.nlargest(n_results, scores.items(), key=itemgetter(1))
 
     # ── Persistence ───────────────────────────────────────────────────────
 
+    @classmethod
+    def open(cls, directory: str, k1: float = 1.5, b: float = 0.75) -> "BM25Index":
+        """Open (or create) a segment directory; adds persist as they happen.
+
+        Reads only the manifest and replays the tail log (< SEAL_DOCS
+        docs) — segment files are mapped on first use.
+        """
+        os.makedirs(directory, exist_ok=True)
+        manifest = read_manifest(directory)
+        idx = cls(k1=manifest.get("k1", k1), b=manifest.get("b", b))
+        idx._dir, idx._manifest = directory, manifest
+        base = 0
+        for meta in manifest["segments"]:
+            seg = Segment(directory, meta, base)
+            idx._segments.append(seg)
+            idx._min_len = min(idx._min_len, meta["min_len"]) if base else meta["min_len"]
+            idx._total_len += meta["total_len"]
+            base += seg.n
+        idx._tail = MemTail(base)
+
+        log_path = os.path.join(directory, manifest["tail"])
+        try:
+            with open(log_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = b""
+        good = data.rfind(b"\n") + 1
+        if good < len(data):
+            # Torn final append (crash mid-write) — drop it
+            with open(log_path, "r+b") as f:
+                f.truncate(good)
+        for line in data[:good].splitlines():
+            try:
+                doc_id, document, metadata = json.loads(line)
+            except (ValueError, TypeError):
+                continue
+            idx._add_tail(doc_id, document, metadata)
+        idx._log = open(log_path, "a", encoding="utf-8")
+        logger.debug("BM25 index opened at %s (%d segments, %d docs)",
+                     directory, len(idx._segments), len(idx))
+        return idx
+
+    def _seal(self):
+        """Turn the tail into a level-0 segment, then merge full tiers."""
+        with FileLock(os.path.join(self._dir, ".lock")):
+            manifest = dict(self._manifest)
+            seq = manifest["next"]
+
+            def _write(parts, level):
+                nonlocal seq
+                meta = write_segment(self._dir, f"seg-{seq:06d}", parts, level)
+                seq += 1
+                return Segment(self._dir, meta, parts[0].base)
+
+            segments = [*self._segments, _write([self._tail], 0)]
+            obsolete: list[Segment] = []
+            while len(segments) >= MERGE_FACTOR:
+                run = segments[-MERGE_FACTOR:]
+                if any(s.level != run[0].level for s in run):
+                    break
+                segments[-MERGE_FACTOR:] = [_write(run, run[0].level + 1)]
+                obsolete.extend(run)
+
+            old_log = os.path.join(self._dir, manifest["tail"])
+            manifest.update(segments=[s.meta for s in segments], next=seq + 1,
+                            tail=f"tail-{seq:06d}.jsonl", k1=self.k1, b=self.b)
+            write_manifest(self._dir, manifest)
+
+            self._log.close()
+            os.remove(old_log)
+            for seg in obsolete:
+                seg.remove_files()
+        self._manifest = manifest
+        self._segments = segments
+        self._tail = MemTail(len(self))
+        self._log = open(os.path.join(self._dir, manifest["tail"]), "a",
+                         encoding="utf-8")
+        logger.debug("BM25 index sealed at %s (%d segments, %d docs)",
+                     self._dir, len(segments), len(self))
+
     def save(self, path: str):
-        """Save index to disk as JSON for persistence across restarts."""
-        import json
-        data = {
-            "k1": self.k1, "b": self.b,
-            "docs": self.docs,
-            "doc_ids": self.doc_ids,
-            "doc_metadata": self.doc_metadata,
-            "doc_lens": self.doc_lens,
-            "doc_freqs": self.doc_freqs,
-            "idf": self.idf,
-            "avg_dl": self.avg_dl,
-            "df": dict(self._df),
-        }
-        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
-        with open(path, "w") as f:
-            json.dump(data, f, ensure_ascii=False)
-        logger.debug("BM25 index saved to %s (%d docs)", path, len(self.docs))
+        """Write the whole index to ``path`` as one compacted segment directory.
+
+        An index opened on ``path`` is already persisted; this only flushes.
+        """
+        if self._dir and os.path.abspath(path) == os.path.abspath(self._dir):
+            self._log.flush()
+            return
+        os.makedirs(path, exist_ok=True)
+        meta = write_segment(path, "seg-000001", self._parts, level_for(len(self)))
+        write_manifest(path, {"segments": [meta], "next": 3,
+                              "tail": "tail-000002.jsonl",
+                              "k1": self.k1, "b": self.b})
+        logger.debug("BM25 index saved to %s (%d docs)", path, len(self))
 
     @classmethod
     def load(cls, path: str) -> "BM25Index":
-        """Load index from disk. Returns empty index if file missing."""
-        import json
+        """Open a saved index directory, or import a legacy JSON index file.
+
+        Returns an empty in-memory index if ``path`` is missing.
+        """
+        if os.path.isdir(path):
+            return cls.open(path)
         try:
             with open(path) as f:
                 data = json.load(f)
             idx = cls(k1=data.get("k1", 1.5), b=data.get("b", 0.75))
-            idx.docs = data.get("docs", [])
-            idx.doc_ids = data.get("doc_ids", [])
-            idx.doc_metadata = data.get("doc_metadata", [])
-            idx.doc_lens = data.get("doc_lens", [])
-            idx.doc_freqs = data.get("doc_freqs", [])
-            idx.idf = data.get("idf", {})
-            idx.avg_dl = data.get("avg_dl", 0.0)
-            idx._df = defaultdict(int, data.get("df", {}))
-            logger.debug("BM25 index loaded from %s (%d docs)", path, len(idx.docs))
+            docs, metas = data.get("docs", []), data.get("doc_metadata", [])
+            for i, doc_id in enumerate(data.get("doc_ids", [])):
+                idx._add_tail(doc_id, docs[i], metas[i] if i < len(metas) else {})
+            logger.debug("BM25 index loaded from %s (%d docs)", path, len(idx))
             return idx
-        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, IndexError):
             return cls()
 
+    def close(self) -> None:
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
 
 # ── Reciprocal Rank Fusion ───────────────────────────────────────────────────
 
@@ -199,9 +416,16 @@ def reciprocal_rank_fusion(
 
 # ── Hybrid Memory Adapter ───────────────────────────────────────────────────
 
+def _content_id(document: str) -> str:
+    """Stable id for a document added without one — ``hash()`` is salted
+    per process, so replays and other processes would mint duplicates."""
+    return hashlib.sha1(document.encode()).hexdigest()
+
+
 class HybridMemory:
     """
-    Combines ChromaDB vector search with BM25 keyword search.
+    Combines ChromaDB vector search (or the built-in ``VectorStore`` when
+    chromadb is unavailable) with BM25 keyword search.
     Uses Reciprocal Rank Fusion to merge results.
 
     API-compatible with ChromaAdapter (same add/query interface).
@@ -222,36 +446,48 @@ class HybridMemory:
         self.alpha = alpha
         self._embedding_fn = embedding_fn
 
-        # Vector search backend
+        # Vector search backend (built-in vector store if chromadb is missing)
         try:
             import chromadb
             os.makedirs(persist_dir, exist_ok=True)
             self._chroma = chromadb.PersistentClient(path=persist_dir)
-            self._has_chroma = True
         except (ImportError, Exception):
-            logger.warning("chromadb not available — hybrid mode uses BM25 only")
-            self._chroma = None
-            self._has_chroma = False
-
-        # BM25 keyword search (per-collection) — with persistence
+            from adapters.memory.vector_store import VectorStore
+            logger.warning("chromadb not available — hybrid mode uses the "
+                           "built-in vector store")
+            self._chroma = VectorStore(persist_dir)
+        self._has_chroma = True
+
+        # BM25 keyword search (per-collection) — segment directories under
+        # bm25/<collection>/, persisted on every add
         self._bm25_dir = os.path.join(persist_dir, "bm25")
         os.makedirs(self._bm25_dir, exist_ok=True)
         self._bm25_indices: dict[str, BM25Index] = {}
-        self._bm25_dirty: set[str] = set()
+        # Recall-pool threads and the MemoryWriter thread open indexes
+        # concurrently — one BM25Index per segment directory
+        self._bm25_open_lock = threading.Lock()
 
     def _get_bm25(self, collection: str) -> BM25Index:
-        """Get or load BM25 index for a collection."""
-        if collection not in self._bm25_indices:
-            path = os.path.join(self._bm25_dir, f"{collection}.json")
-            self._bm25_indices[collection] = BM25Index.load(path)
-        return self._bm25_indices[collection]
-
-    def _save_bm25(self, collection: str):
-        """Persist a dirty BM25 index to disk."""
-        if collection in self._bm25_indices:
-            path = os.path.join(self._bm25_dir, f"{collection}.json")
-            self._bm25_indices[collection].save(path)
-            self._bm25_dirty.discard(collection)
+        """Get or open the BM25 index for a collection.
+
+        A legacy ``bm25/<collection>.json`` is imported once and archived
+        as ``.json.migrated``.
+        """
+        index = self._bm25_indices.get(collection)
+        if index is not None:
+            return index
+        with self._bm25_open_lock:
+            index = self._bm25_indices.get(collection)
+            if index is None:
+                path = os.path.join(self._bm25_dir, collection)
+                legacy = path + ".json"
+                if not os.path.isdir(path) and os.path.exists(legacy):
+                    BM25Index.load(legacy).save(path)
+                    os.replace(legacy, legacy + ".migrated")
+                    logger.info("BM25 index %s migrated to segment storage",
+                                collection)
+                index = self._bm25_indices[collection] = BM25Index.open(path)
+        return index
 
     def _get_chroma_collection(self, collection: str):
         """Get or create a ChromaDB collection with the configured embedding."""
@@ -262,7 +498,7 @@ class HybridMemory:
 
     def add(self, collection: str, document: str, metadata: dict):
         """Add a document to both vector and BM25 indices."""
-        doc_id = str(metadata.get("id", hash(document)))
+        doc_id = str(metadata["id"]) if "id" in metadata else _content_id(document)
 
         # Vector index
         if self._has_chroma:
@@ -273,14 +509,19 @@ class HybridMemory:
                 ids=[doc_id],
             )
 
-        # BM25 index (with persistence)
-        bm25 = self._get_bm25(collection)
-        bm25.add(doc_id, document, metadata)
-        self._bm25_dirty.add(collection)
+        # BM25 index (appended to the collection's tail log)
+        self._get_bm25(collection).add(doc_id, document, metadata)
 
-        # Auto-persist every 10 adds
-        if len(bm25.docs) % 10 == 0:
-            self._save_bm25(collection)
+    def add_many(self, collection: str, documents: list[str],
+                 metadatas: list[dict]):
+        """Batched add — one embedding call and one BM25 log write."""
+        ids = [str(m["id"]) if "id" in m else _content_id(d)
+               for d, m in zip(documents, metadatas)]
+        if self._has_chroma:
+            self._get_chroma_collection(collection).add(
+                documents=documents, metadatas=metadatas, ids=ids)
+        self._get_bm25(collection).add_many(
+            list(zip(ids, documents, metadatas)))
 
     def query(self, collection: str, query: str,
               n_results: int = 3) -> dict:
@@ -316,13 +557,14 @@ class HybridMemory:
                 doc_id = bm25_idx.doc_ids[doc_idx]
                 bm25_results.append((doc_id, score))
 
-        # 3. Build density map from metadata (V0.02 DensityTag)
+        # 3. Build density map from metadata (V0.02 DensityTag) — only the
+        #    candidates being fused need a lookup
         density_map: dict[str, str] = {}
         if bm25_idx:
-            for i, did in enumerate(bm25_idx.doc_ids):
-                meta = bm25_idx.doc_metadata[i] if i < len(bm25_idx.doc_metadata) else {}
-                if "density" in meta:
-                    density_map[did] = meta["density"]
+            for did, _score in (*vector_results, *bm25_results):
+                row = bm25_idx.row_of(did)
+                if row is not None and "density" in bm25_idx.doc_metadata[row]:
+                    density_map[did] = bm25_idx.doc_metadata[row]["density"]
 
         # 4. Fuse results with RRF (+ density weighting)
         if vector_results and bm25_results:
@@ -339,20 +581,13 @@ class HybridMemory:
         # 4. Collect documents for top-N results
         fused = fused[:n_results]
 
-        # Build lookup from BM25 index
-        doc_lookup = {}
-        meta_lookup = {}
-        if bm25_idx:
-            for i, did in enumerate(bm25_idx.doc_ids):
-                doc_lookup[did] = bm25_idx.docs[i]
-                meta_lookup[did] = bm25_idx.doc_metadata[i]
-
         documents = []
         metadatas = []
         for doc_id, _score in fused:
-            if doc_id in doc_lookup:
-                documents.append(doc_lookup[doc_id])
-                metadatas.append(meta_lookup[doc_id])
+            row = bm25_idx.row_of(doc_id) if bm25_idx else None
+            if row is not None:
+                documents.append(bm25_idx.docs[row])
+                metadatas.append(bm25_idx.doc_metadata[row])
             else:
                 # Try to fetch from ChromaDB
                 if self._has_chroma:
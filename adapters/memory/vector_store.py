@@ -0,0 +1,369 @@
+"""
+adapters/memory/vector_store.py
+Built-in vector store — the fallback when ``chromadb`` is unavailable.
+
+Exposes the slice of the ChromaDB client API the memory adapters use:
+
+    store = VectorStore("memory/chroma")
+    coll = store.get_or_create_collection("notes", embedding_function=fn)
+    coll.add(ids=[...], documents=[...], metadatas=[...])   # batched
+    coll.query(query_texts=["..."], n_results=5)             # Chroma shape
+    coll.get(ids=[...]); coll.count()
+
+Layout per collection (``<persist_dir>/vectors/<collection>/``):
+
+    meta.json      {"dim": d}
+    vectors.f32    L2-normalised float32 rows, append-only, memory-mapped
+    docs.jsonl     one ``[id, document, metadata]`` line per row
+
+Appends hold ``core.protocols.FileLock`` on ``.lock``; readers pick up rows
+appended by other processes on their next call (file size check).
+Re-adding an id appends a new row and masks the old one.
+
+Search is exact cosine top-k: one vectorised ``matrix @ query`` with NumPy
+when installed, a pure-Python dot-product scan otherwise.  With NumPy,
+collections of ``ivf_threshold`` rows or more also get an IVF index
+(spherical k-means coarse quantiser, persisted as ``ivf.npz``): queries
+score only the rows in the ``nprobe`` nearest lists plus rows added since
+the index was built, and the index is rebuilt once the collection grows
+by half.  Distances are ``1 - cosine``.
+
+Without an embedding function, ``HashingEmbeddingProvider`` (word and CJK
+n-gram feature hashing) is used — lexical similarity only, so configure a
+real provider under ``memory.embedding`` for semantic recall.
+``VectorMemory`` wraps a store in the ``add`` / ``query`` memory-adapter
+interface (``memory.backend: vector``).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import json
+import logging
+import math
+import mmap
+import os
+import threading
+from array import array
+from operator import mul
+from typing import Optional
+
+from core.protocols import FileLock
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+VECTORS_DIR = "vectors"
+IVF_THRESHOLD = 50_000     # rows before an IVF index is built (NumPy only)
+IVF_MIN_LISTS = 16         # smallest coarse quantiser; also the lowest threshold
+IVF_NPROBE = 8             # lists scored per query
+IVF_REBUILD_GROWTH = 1.5   # rebuild once rows exceed built rows × this
+_KMEANS_ITERS = 10
+
+
+def _normalise(vec) -> list[float]:
+    norm = math.sqrt(sum(x * x for x in vec)) or 1.0
+    return [x / norm for x in vec]
+
+
+# ── Collection ───────────────────────────────────────────────────────────────
+
+class VectorCollection:
+    """One collection: append-only vectors + documents, exact / IVF search."""
+
+    def __init__(self, directory: str, name: str, embedding_function=None,
+                 ivf_threshold: int = IVF_THRESHOLD, nprobe: int = IVF_NPROBE):
+        self.name = name
+        self.dir = directory
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        if embedding_function is None:
+            from adapters.memory.embedding import HashingEmbeddingProvider
+            embedding_function = HashingEmbeddingProvider().as_chromadb_function()
+        self._embed = embedding_function
+        self._mu = threading.RLock()
+        os.makedirs(directory, exist_ok=True)
+        self._vec_path = os.path.join(directory, "vectors.f32")
+        self._docs_path = os.path.join(directory, "docs.jsonl")
+        self._meta_path = os.path.join(directory, "meta.json")
+        self._lock_path = os.path.join(directory, ".lock")
+        self.dim = 0
+        self._ids: list[str] = []
+        self._docs: list[str] = []
+        self._metas: list[dict] = []
+        self._row_of: dict[str, int] = {}
+        self._dead: set[int] = set()
+        self._docs_offset = 0
+        self._vec_size: tuple[int, int] = (-1, -1)   # (vectors, docs) bytes seen
+        self._rows = 0
+        self._mm: Optional[mmap.mmap] = None
+        self._mat = None            # np.ndarray view or array('f')
+        self._ivf: Optional[dict] = None
+        self._refresh()
+
+    # ── Chroma-compatible API ──
+
+    def count(self) -> int:
+        with self._mu:
+            self._refresh()
+            return self._rows - len(self._dead)
+
+    def add(self, ids: list[str], documents: Optional[list[str]] = None,
+            metadatas: Optional[list[dict]] = None, embeddings=None) -> None:
+        """Append a batch (one embedding call, one write per file)."""
+        if not ids:
+            return
+        documents = documents or [""] * len(ids)
+        metadatas = metadatas or [{} for _ in ids]
+        if embeddings is None:
+            embeddings = self._embed(list(documents))
+        vecs = [_normalise(v) for v in embeddings]
+        dim = len(vecs[0])
+        if any(len(v) != dim for v in vecs):
+            raise ValueError("embeddings in one batch have different sizes")
+        with self._mu, FileLock(self._lock_path):
+            self._refresh()
+            if not self.dim:
+                self.dim = dim
+                tmp = self._meta_path + ".tmp"
+                with open(tmp, "w") as f:
+                    json.dump({"dim": dim}, f)
+                os.replace(tmp, self._meta_path)
+            elif dim != self.dim:
+                raise ValueError(
+                    f"collection {self.name!r} holds {self.dim}-d vectors, "
+                    f"got {dim}-d (embedding provider changed?)")
+            buf = array("f")
+            for v in vecs:
+                buf.extend(v)
+            with open(self._vec_path, "ab") as f:
+                f.write(buf.tobytes())
+            with open(self._docs_path, "a", encoding="utf-8") as f:
+                f.write("".join(
+                    json.dumps([str(i), d, m or {}], ensure_ascii=False) + "\n"
+                    for i, d, m in zip(ids, documents, metadatas)))
+            self._refresh()
+
+    def query(self, query_texts: Optional[list[str]] = None,
+              n_results: int = 10, query_embeddings=None) -> dict:
+        if query_embeddings is None:
+            query_embeddings = self._embed(list(query_texts or []))
+        out = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        with self._mu:
+            self._refresh()
+            for q in query_embeddings:
+                hits = self._search(_normalise(q), n_results) if self._rows else []
+                out["ids"].append([self._ids[r] for r, _ in hits])
+                out["documents"].append([self._docs[r] for r, _ in hits])
+                out["metadatas"].append([self._metas[r] for r, _ in hits])
+                out["distances"].append([1.0 - s for _, s in hits])
+        return out
+
+    def get(self, ids: Optional[list[str]] = None) -> dict:
+        with self._mu:
+            self._refresh()
+            rows = ([self._row_of[i] for i in ids
+                     if self._row_of.get(i, self._rows) < self._rows]
+                    if ids is not None else
+                    [r for r in range(self._rows) if r not in self._dead])
+            return {"ids": [self._ids[r] for r in rows],
+                    "documents": [self._docs[r] for r in rows],
+                    "metadatas": [self._metas[r] for r in rows]}
+
+    # ── Storage ──
+
+    def _refresh(self) -> None:
+        """Pick up rows appended since the last call (any process)."""
+        try:
+            size = os.path.getsize(self._vec_path)
+            docs_size = os.path.getsize(self._docs_path)
+        except OSError:
+            return
+        if (size, docs_size) == self._vec_size:
+            return
+        if not self.dim:
+            with open(self._meta_path) as f:
+                self.dim = json.load(f)["dim"]
+        with open(self._docs_path, "rb") as f:
+            f.seek(self._docs_offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1          # complete lines only
+        for line in data[:end].splitlines():
+            doc_id, doc, meta = json.loads(line)
+            old = self._row_of.get(doc_id)
+            if old is not None:
+                self._dead.add(old)
+            self._row_of[doc_id] = len(self._ids)
+            self._ids.append(doc_id)
+            self._docs.append(doc)
+            self._metas.append(meta)
+        self._docs_offset += end
+        self._vec_size = (size, docs_size)
+        self._rows = min(len(self._ids), size // (4 * self.dim))
+        self._map()
+
+    def _map(self) -> None:
+        nbytes = self._rows * self.dim * 4
+        if not nbytes:
+            return
+        if HAS_NUMPY:
+            # The previous mapping stays alive while arrays still view it
+            with open(self._vec_path, "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mat = np.frombuffer(self._mm, dtype=np.float32,
+                                      count=self._rows * self.dim
+                                      ).reshape(self._rows, self.dim)
+        else:
+            mat = self._mat if isinstance(self._mat, array) else array("f")
+            with open(self._vec_path, "rb") as f:
+                f.seek(len(mat) * 4)
+                mat.frombytes(f.read(nbytes - len(mat) * 4))
+            self._mat = mat
+
+    # ── Search ──
+
+    def _search(self, q: list[float], k: int) -> list[tuple[int, float]]:
+        live = self._rows - len(self._dead)
+        k = min(k, live)
+        if k <= 0:
+            return []
+        if not HAS_NUMPY:
+            d, mat = self.dim, self._mat
+            scored = ((sum(map(mul, mat[r * d:(r + 1) * d], q)), r)
+                      for r in range(self._rows) if r not in self._dead)
+            return [(r, s) for s, r in heapq.nlargest(k, scored)]
+
+        qv = np.asarray(q, dtype=np.float32)
+        ivf = self._ivf_index() if self._rows >= self.ivf_threshold else None
+        if ivf is None:
+            rows = None
+            scores = self._mat @ qv
+        else:
+            probes = np.argsort(ivf["centroids"] @ qv)[-self.nprobe:]
+            parts = [ivf["lists"][p] for p in probes]
+            parts.append(np.arange(ivf["rows"], self._rows))
+            rows = np.concatenate(parts)
+            scores = self._mat[rows] @ qv
+        if self._dead:
+            dead = np.fromiter(self._dead, dtype=np.int64)
+            mask = np.isin(rows if rows is not None
+                           else np.arange(self._rows), dead)
+            scores = np.where(mask, -np.inf, scores)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(rows[i] if rows is not None else i), float(scores[i]))
+                for i in top if np.isfinite(scores[i])]
+
+    # ── IVF (NumPy only) ──
+
+    def _ivf_index(self) -> Optional[dict]:
+        ivf = self._ivf
+        if ivf is None:
+            ivf = self._ivf = self._load_ivf()
+        if ivf is None or self._rows > ivf["rows"] * IVF_REBUILD_GROWTH:
+            ivf = self._ivf = self._build_ivf()
+        return ivf
+
+    def _load_ivf(self) -> Optional[dict]:
+        path = os.path.join(self.dir, "ivf.npz")
+        try:
+            z = np.load(path)
+        except (OSError, ValueError):
+            return None
+        rows = int(z["rows"])
+        if rows > self._rows or z["centroids"].shape[1] != self.dim:
+            return None
+        return self._ivf_from(z["centroids"], z["assign"], rows)
+
+    def _build_ivf(self) -> dict:
+        n = self._rows
+        nlist = min(int(min(max(IVF_MIN_LISTS, math.sqrt(n)), 4096)), n)
+        rng = np.random.default_rng(0)
+        sample = self._mat[rng.choice(n, size=min(n, nlist * 64), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(_KMEANS_ITERS):             # spherical k-means
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = sample[assign == c]
+                if len(members):
+                    v = members.sum(axis=0)
+                    centroids[c] = v / (np.linalg.norm(v) or 1.0)
+        assign = np.concatenate([
+            np.argmax(self._mat[i:i + 65536] @ centroids.T, axis=1)
+            for i in range(0, n, 65536)])
+        tmp = os.path.join(self.dir, "ivf.tmp.npz")
+        np.savez(tmp, centroids=centroids, assign=assign, rows=n)
+        os.replace(tmp, os.path.join(self.dir, "ivf.npz"))
+        logger.info("[vector_store] %s: IVF index built (%d rows, %d lists)",
+                    self.name, n, nlist)
+        return self._ivf_from(centroids, assign, n)
+
+    @staticmethod
+    def _ivf_from(centroids, assign, rows: int) -> dict:
+        order = np.argsort(assign, kind="stable")
+        bounds = np.searchsorted(assign[order], np.arange(len(centroids) + 1))
+        lists = [order[bounds[c]:bounds[c + 1]] for c in range(len(centroids))]
+        return {"centroids": centroids, "lists": lists, "rows": rows}
+
+
+# ── Client ───────────────────────────────────────────────────────────────────
+
+class VectorStore:
+    """ChromaDB ``PersistentClient`` stand-in over ``VectorCollection``."""
+
+    def __init__(self, path: str, ivf_threshold: int = IVF_THRESHOLD,
+                 nprobe: int = IVF_NPROBE):
+        if ivf_threshold < IVF_MIN_LISTS:
+            raise ValueError(
+                f"ivf_threshold must be at least {IVF_MIN_LISTS}, "
+                f"got {ivf_threshold}")
+        self.path = path
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self._collections: dict[str, VectorCollection] = {}
+
+    def get_or_create_collection(self, name: str, embedding_function=None,
+                                 **_ignored) -> VectorCollection:
+        coll = self._collections.get(name)
+        if coll is None:
+            coll = self._collections[name] = VectorCollection(
+                os.path.join(self.path, VECTORS_DIR, name), name,
+                embedding_function, self.ivf_threshold, self.nprobe)
+        return coll
+
+
+class VectorMemory:
+    """Memory adapter (``add`` / ``query``) backed by ``VectorStore``."""
+
+    def __init__(self, persist_dir: str = "memory/chroma", embedding_fn=None,
+                 ivf_threshold: int = IVF_THRESHOLD, nprobe: int = IVF_NPROBE):
+        self.client = VectorStore(persist_dir, ivf_threshold, nprobe)
+        self._embedding_fn = embedding_fn
+
+    def _get_collection(self, name: str) -> VectorCollection:
+        return self.client.get_or_create_collection(
+            name, embedding_function=self._embedding_fn)
+
+    def add(self, collection: str, document: str, metadata: dict):
+        self.add_many(collection, [document], [metadata])
+
+    def add_many(self, collection: str, documents: list[str],
+                 metadatas: list[dict]):
+        """Batched add — one embedding call for the whole batch."""
+        ids = [str(m["id"]) if "id" in m else hashlib.sha1(d.encode()).hexdigest()
+               for d, m in zip(documents, metadatas)]
+        self._get_collection(collection).add(
+            ids=ids, documents=documents, metadatas=metadatas)
+
+    def query(self, collection: str, query: str,
+              n_results: int = 3) -> dict:
+        return self._get_collection(collection).query(
+            query_texts=[query], n_results=n_results)
@@ -112,11 +112,8 @@ def _show_status_rich(console, agent_filter: str = "",
                       search_filter: str = ""):
     """Show task board with rich formatting and optional filtering."""
     from core.i18n import t as _t
-    if not os.path.exists(".task_board.json"):
-        console.print(f"  [{_theme.muted}]{_t('cmd.no_tasks')}[/{_theme.muted}]\n")
-        return
-
-    data = json.load(open(".task_board.json"))
+    from core.task_board import read_board
+    data = read_board()
     if not data:
         console.print(f"  [{_theme.muted}]{_t('cmd.no_tasks')}[/{_theme.muted}]\n")
         return
@@ -591,9 +588,8 @@ def interactive_main():
         try:
             board = TaskBoard()
             board.clear()
-            for fp in [".context_bus.json"]:
-                if os.path.exists(fp):
-                    os.remove(fp)
+            from core.context_bus import ContextBus
+            ContextBus().clear()
             import glob
             for fp in glob.glob(".mailboxes/*.jsonl"):
                 os.remove(fp)
@@ -780,20 +776,14 @@ def _handle_pause(cmd, console):
             if tid.startswith(_pause_tid):
                 _match = tid
                 break
-        if _match and _pd[_match].get("status") in ("pending", "claimed"):
-            _pd[_match]["status"] = "paused"
-            _pb._write(_pd)
+        if _match and _pb.pause(_match):
             console.print(f"  [{_theme.warning}]⏸[/{_theme.warning}] Paused: {_pd[_match]['description'][:40]}\n")
         else:
             console.print(f"  [{_theme.muted}]Task not found or not pauseable.[/{_theme.muted}]\n")
     else:
-        _count = 0
-        for tid, t in _pd.items():
-            if t.get("status") in ("pending", "claimed"):
-                t["status"] = "paused"
-                _count += 1
+        _count = sum(_pb.pause(tid) for tid, t in _pd.items()
+                     if t.get("status") in ("pending", "claimed"))
         if _count:
-            _pb._write(_pd)
             console.print(f"  [{_theme.warning}]⏸[/{_theme.warning}] Paused {_count} task(s)\n")
         else:
             console.print(f"  [{_theme.muted}]No active tasks to pause.[/{_theme.muted}]\n")
@@ -811,20 +801,14 @@ def _handle_resume(cmd, console):
             if tid.startswith(_resume_tid):
                 _match = tid
                 break
-        if _match and _rd[_match].get("status") == "paused":
-            _rd[_match]["status"] = "pending"
-            _rb._write(_rd)
+        if _match and _rb.resume(_match):
             console.print(f"  [{_theme.success}]▶[/{_theme.success}] Resumed: {_rd[_match]['description'][:40]}\n")
         else:
             console.print(f"  [{_theme.muted}]Task not found or not paused.[/{_theme.muted}]\n")
     else:
-        _count = 0
-        for tid, t in _rd.items():
-            if t.get("status") == "paused":
-                t["status"] = "pending"
-                _count += 1
+        _count = sum(_rb.resume(tid) for tid, t in _rd.items()
+                     if t.get("status") == "paused")
         if _count:
-            _rb._write(_rd)
             console.print(f"  [{_theme.success}]▶[/{_theme.success}] Resumed {_count} task(s)\n")
         else:
             console.print(f"  [{_theme.muted}]No paused tasks.[/{_theme.muted}]\n")
@@ -927,8 +911,8 @@ def _handle_clear(console):
             else:
                 cleared_parts.append(_t("clear.tasks"))
         if "context" in selected:
-            if os.path.exists(".context_bus.json"):
-                os.remove(".context_bus.json")
+            from core.context_bus import ContextBus
+            ContextBus().clear()
             cleared_parts.append(_t("clear.context"))
         if "mailboxes" in selected:
             for fp in _glob.glob(".mailboxes/*.jsonl"):
@@ -945,9 +929,8 @@ def _handle_clear(console):
     except ImportError:
         board = TaskBoard()
         result = board.clear(force=True)
-        for fp in [".context_bus.json"]:
-            if os.path.exists(fp):
-                os.remove(fp)
+        from core.context_bus import ContextBus
+        ContextBus().clear()
         import glob as _glob
         for fp in _glob.glob(".mailboxes/*.jsonl"):
             os.remove(fp)
@@ -1109,13 +1092,11 @@ def _handle_templates(console) -> str | None:
 
 
 def _handle_export(console):
-    if os.path.exists(".task_board.json"):
-        data = json.load(open(".task_board.json"))
-        if data:
-            first_tid = next(iter(data))
-            from cli.export_cmd import cmd_export
-            cmd_export(first_tid, fmt="md", console=console)
-        else:
-            console.print(f"  [{_theme.muted}]No tasks to export.[/{_theme.muted}]\n")
+    from core.task_board import read_board
+    data = read_board()
+    if data:
+        first_tid = next(iter(data))
+        from cli.export_cmd import cmd_export
+        cmd_export(first_tid, fmt="md", console=console)
     else:
         console.print(f"  [{_theme.muted}]No tasks to export.[/{_theme.muted}]\n")
@@ -78,9 +78,9 @@ def cmd_doctor_export(console=None):
         gw_status = "✗"
     lines.append(f"Gateway: {gw_status} :{gw_port}")
 
-    if os.path.exists(".task_board.json"):
-        with open(".task_board.json") as f:
-            data = json.load(f)
+    from core.task_board import read_board
+    data = read_board()
+    if data:
         total = len(data)
         active = sum(1 for t in data.values() if t.get("status") in ("pending", "claimed", "review"))
         done = sum(1 for t in data.values() if t.get("status") == "completed")
@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 import json
-import os
 
 from core.theme import theme as _theme
 
@@ -16,15 +15,15 @@ def cmd_export(task_id: str, fmt: str = "md", console=None):
         except ImportError:
             console = None
 
-    if not os.path.exists(".task_board.json"):
+    from core.task_board import read_board
+    data = read_board()
+    if not data:
         if console:
             console.print(f"  [{_theme.muted}]No task board found.[/{_theme.muted}]")
         else:
             print("  No task board found.")
         return
 
-    data = json.load(open(".task_board.json"))
-
     match_id = None
     for tid in data:
         if tid == task_id or tid.startswith(task_id):
@@ -170,6 +170,21 @@ def _memory_status(console, agent: str = None):
     except Exception:
         pass
 
+    try:
+        from adapters.memory.embedding_cache import cache_stats
+        for name, st in cache_stats().items():
+            line = (f"{st['entries']} vectors ({st['size_kb']} KB), "
+                    f"hit rate {st['hit_rate']:.0%} "
+                    f"({st['hits']}/{st['hits'] + st['misses']}), "
+                    f"saved {st['saved_tokens']} tokens ≈ ${st['saved_usd']:.4f}")
+            if console:
+                console.print(f"\n[{_theme.heading}]Embedding Cache[/{_theme.heading}] {name}")
+                console.print(f"  {line}")
+            else:
+                print(f"\nEmbedding cache {name}: {line}")
+    except Exception:
+        pass
+
 
 def _memory_search(console, query: str, agent: str = None):
     """Search memory using QMD FTS5."""
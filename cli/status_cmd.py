@@ -9,7 +9,8 @@ from core.theme import theme as _theme
 
 
 def cmd_status(json_output: bool = False):
-    data = json.load(open(".task_board.json")) if os.path.exists(".task_board.json") else {}
+    from core.task_board import read_board
+    data = read_board()
     if json_output:
         print(json.dumps(data, indent=2, default=str))
         return
@@ -10,6 +10,7 @@ Memory architecture (OpenViking-inspired):
 """
 
 from __future__ import annotations
+import asyncio
 import json
 import logging
 import os
@@ -19,12 +20,14 @@ from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Optional
 
 from core.protocols import _strip_think, FileLock  # noqa: E402 — shared utilities
+from core.recall import RecallPipeline
 
 if TYPE_CHECKING:
     from core.context_bus import ContextBus
     from core.task_board import Task
     from adapters.memory.episodic import EpisodicMemory
     from adapters.memory.knowledge_base import KnowledgeBase
+    from core.memory_writer import MemoryWriter
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +61,12 @@ class AgentConfig:
     max_system_prompt_tokens: int = 16000  # ~64K chars; 0 = no limit
     # Tool configuration (OpenClaw-inspired)
     tools_config:           dict = field(default_factory=dict)  # {profile, allow, deny}
+    # System prompt layout: "classic" | "cache" (stable prefix first, see
+    # _budget_system_prompt) for provider-side prompt caching
+    prompt_layout:          str  = "classic"
+    # Long-term recall fan-out
+    recall_timeout_ms:      int   = 800    # per-source deadline; late sources skipped
+    recall_cache_ttl:       float = 30.0   # seconds a (source, query) result is reused
 
 
 class BaseAgent:
@@ -82,11 +91,17 @@ class BaseAgent:
         self.chain        = chain
         self.episodic     = episodic
         self.kb           = kb
+        self._recall = RecallPipeline(timeout=cfg.recall_timeout_ms / 1000,
+                                      ttl=cfg.recall_cache_ttl)
+        self.writer: Optional["MemoryWriter"] = None   # write-behind queue
         self._short_term: list[dict] = []  # conversation window
         self._cognition: str = ""          # cached cognition profile
         self._soul: str = ""               # cached soul.md (OpenClaw pattern)
         self._tools_md: str = ""           # cached TOOLS.md (per-agent tool spec)
         self._user_md: str = ""            # cached USER.md (user identity)
+        # Stable-prefix tracking for the "cache" prompt layout
+        self._prefix_digest: str = ""
+        self._prefix_stats = {"reused": 0, "changed": 0, "chars": 0}
         os.makedirs(MAILBOX_DIR, exist_ok=True)
         # Session transcript persistence
         self._transcript_dir = os.path.join("memory", "transcripts")
@@ -248,6 +263,9 @@ class BaseAgent:
         7. Tool execution loop (parse tool calls → execute → feed back)
         8. Store episode + publish to context bus
         """
+        from core.tools import current_task_id
+        current_task_id.set(task.task_id)
+
         # 0. Clear short-term memory when starting a new root task to prevent
         #    context bleeding between unrelated user requests.
         #    Subtasks (with parent_id) keep the parent's context for continuity.
@@ -272,7 +290,8 @@ class BaseAgent:
         # 4. Long-term memory recall (NEW — activates dormant memory)
         memory_section = ""
         if self.cfg.long_term:
-            memory_section = self._recall_long_term(task.description)
+            memory_section = await asyncio.to_thread(
+                self._recall_long_term, task.description)
 
         # 5. System prompt with all layers
         docs_section = f"\n\n## Reference Documents\n{docs_text}" if docs_text else ""
@@ -291,27 +310,8 @@ class BaseAgent:
         tools_cfg = self.cfg.tools_config
         if tools_cfg:
             try:
-                from core.tools import (build_tools_prompt, build_tools_schemas,
-                                        build_scoped_tools_prompt,
-                                        build_scoped_tools_schemas)
-                if tool_hints:
-                    # V0.02 ToolScope: load only base + category tools
-                    tools_prompt = build_scoped_tools_prompt(
-                        tool_hints, {"tools": tools_cfg})
-                    if tools_prompt:
-                        tools_section = f"\n\n{tools_prompt}"
-                    tools_schemas = build_scoped_tools_schemas(
-                        tool_hints, {"tools": tools_cfg})
-                else:
-                    # V0.01 fallback: load full profile
-                    tools_prompt = build_tools_prompt({"tools": tools_cfg})
-                    if tools_prompt:
-                        tools_section = f"\n\n{tools_prompt}"
-                    # Native function calling for executor agents (coding/full),
-                    # OR for planners that have explicitly allowed tools
-                    tools_profile = tools_cfg.get("profile", "minimal")
-                    if tools_profile in ("coding", "full") or tools_cfg.get("allow"):
-                        tools_schemas = build_tools_schemas({"tools": tools_cfg})
+                tools_section, tools_schemas = self._tools_sections(
+                    tools_cfg, tool_hints)
             except Exception as e:
                 logger.warning("[%s] tools prompt build failed: %s",
                                self.cfg.agent_id, e)
@@ -343,23 +343,7 @@ class BaseAgent:
                          self.cfg.agent_id, e)
 
         # Workspace awareness
-        workspace_section = ""
-        ws_path = "workspace"
-        if os.path.isdir(ws_path):
-            try:
-                ws_files = os.listdir(ws_path)
-                # Filter out hidden files like .gitkeep
-                ws_files = [f for f in ws_files if not f.startswith('.')]
-                ws_files = ws_files[:20]  # limit to 20 files
-                if ws_files:
-                    workspace_section = (
-                        f"\n\n## Shared Workspace (workspace/)\n"
-                        f"Files: {', '.join(ws_files)}\n"
-                        f"Use read_file/write_file with workspace/ prefix "
-                        f"to collaborate with other agents.\n"
-                    )
-            except Exception as e:
-                logger.debug("Workspace listing failed: %s", e)
+        workspace_section = self._workspace_section("workspace")
 
         # V0.02: IntentAnchor — inject original user intent for subtasks
         intent_section = ""
@@ -382,9 +366,10 @@ class BaseAgent:
                 logger.debug("[%s] intent anchor lookup failed: %s",
                              self.cfg.agent_id, e)
 
-        system_prompt = self._budget_system_prompt(
+        system_prompt, prefix_chars = self._budget_system_prompt(
             role_section=self.cfg.role,
-            soul_section=soul_section + intent_section,
+            soul_section=soul_section,
+            intent_section=intent_section,
             tools_md_section=tools_md_section,
             user_section=user_section,
             skills_text=skills_text,
@@ -399,6 +384,10 @@ class BaseAgent:
         messages = [
             {"role": "system", "content": system_prompt},
         ]
+        if prefix_chars:
+            from adapters.llm.cache_hints import CACHE_PREFIX_KEY
+            messages[0][CACHE_PREFIX_KEY] = prefix_chars
+            self._note_prefix(system_prompt[:prefix_chars])
 
         # Add short-term memory (last N turns)
         for turn in self._short_term[-(self.cfg.short_term_turns * 2):]:
@@ -416,7 +405,8 @@ class BaseAgent:
         if self.cfg.compaction_enabled:
             try:
                 from core.compaction import compact_history, needs_compaction
-                if needs_compaction(messages, self.cfg.max_context_tokens):
+                if needs_compaction(messages, self.cfg.max_context_tokens,
+                                    self.cfg.model):
                     messages = await compact_history(
                         messages, self.llm, self.cfg.model,
                         max_context_tokens=self.cfg.max_context_tokens,
@@ -515,12 +505,13 @@ class BaseAgent:
         # Mini tool loop (max 3 rounds)
         if tools_cfg:
             try:
-                from core.tools import parse_tool_calls, execute_tool_calls
+                from core.tools import parse_tool_calls, aexecute_tool_calls
                 for _ in range(3):
                     calls = parse_tool_calls(result)
                     if not calls:
                         break
-                    tool_results = execute_tool_calls(calls, {"tools": tools_cfg})
+                    tool_results = await aexecute_tool_calls(
+                        calls, {"tools": tools_cfg})
                     feedback = []
                     for tr in tool_results:
                         status = "✓" if tr["result"].get("ok") else "✗"
@@ -545,7 +536,8 @@ class BaseAgent:
     async def _call_llm_streaming(self, messages: list[dict], task: "Task",
                                     tools_schemas: list[dict] | None = None) -> str:
         """
-        Call LLM with streaming if available, writing partial results to task board.
+        Call LLM with streaming if available, writing chunks and the partial
+        result through a buffered ``StreamWriter``.
         Falls back to non-streaming chat() if chat_stream() is not available.
 
         When tools_schemas is provided, passes them to the adapter for
@@ -558,33 +550,18 @@ class BaseAgent:
         # Try streaming first
         if hasattr(self.llm, "chat_stream"):
             try:
-                from core.task_board import TaskBoard
-                board = TaskBoard()
-                chunks: list[str] = []
-                seq = 0
-                update_interval = 0
-                async for chunk in self.llm.chat_stream(
-                    messages, self.cfg.model, **llm_kwargs
-                ):
-                    chunks.append(chunk)
-                    seq += 1
-                    # Append chunk to per-task stream file (lockless, fast)
-                    try:
-                        TaskBoard.append_stream_chunk(
-                            task.task_id, chunk, seq)
-                    except Exception:
-                        pass  # non-critical: SSE just won't get this chunk
-                    update_interval += 1
-                    # Still update TaskBoard partial_result periodically
-                    # for backward compat (WS gateway, HTTP polling)
-                    if update_interval >= 20:
-                        board.update_partial(
-                            task.task_id, "".join(chunks))
-                        update_interval = 0
-                result = "".join(chunks)
-                # Final partial update (will be cleared when task completes)
-                if chunks:
-                    board.update_partial(task.task_id, result)
+                from core.task_stream import StreamWriter
+                # Buffered: one open handle, ~50 ms / 4 KB batches, and the
+                # dashboard preview goes to a side file (board untouched)
+                with StreamWriter(task.task_id) as writer:
+                    async for chunk in self.llm.chat_stream(
+                        messages, self.cfg.model, **llm_kwargs
+                    ):
+                        try:
+                            writer.write(chunk)
+                        except OSError:
+                            pass  # non-critical: SSE just won't get this chunk
+                result = writer.text()
                 # Detect empty streaming result (content filter / API issue)
                 if not result.strip():
                     logger.warning(
@@ -618,7 +595,7 @@ class BaseAgent:
         - Max rounds reached (prevent infinite loops)
         """
         try:
-            from core.tools import parse_tool_calls, execute_tool_calls
+            from core.tools import parse_tool_calls, aexecute_tool_calls
         except ImportError:
             return initial_result
 
@@ -669,8 +646,21 @@ class BaseAgent:
                         self.cfg.agent_id, round_num + 1, len(filtered_calls),
                         [c["tool"] for c in filtered_calls])
 
-            # Execute all tool calls
-            tool_results = execute_tool_calls(filtered_calls, tools_agent_cfg)
+            # Execute all tool calls (independent ones concurrently, off-loop)
+            t0 = time.perf_counter()
+            tool_results = await aexecute_tool_calls(filtered_calls,
+                                                     tools_agent_cfg)
+            self.log_transcript(
+                "tool_round", task.task_id,
+                ", ".join(tr["tool"] for tr in tool_results),
+                metadata={
+                    "round": round_num + 1,
+                    "wall_ms": round((time.perf_counter() - t0) * 1000, 1),
+                    "tools": [{"tool": tr["tool"],
+                               "ok": bool(tr["result"].get("ok")),
+                               "elapsed_ms": tr.get("elapsed_ms", 0.0)}
+                              for tr in tool_results],
+                })
 
             # Track consecutive failures for circuit breaker
             for tr in tool_results:
@@ -720,10 +710,78 @@ class BaseAgent:
 
         return result
 
+    # ── Cached prompt sections (see core.prompt_cache) ────────────────────
+
+    def _tools_sections(self, tools_cfg: dict,
+                        tool_hints: list[str] | None
+                        ) -> tuple[str, list[dict] | None]:
+        """Tools prompt + native schemas, rebuilt only when the tools config,
+        hints or env-gated availability change."""
+        from core.prompt_cache import prompt_cache
+        from core.tools import available_tools_key
+
+        def build() -> tuple[str, list[dict] | None]:
+            from core.tools import (build_tools_prompt, build_tools_schemas,
+                                    build_scoped_tools_prompt,
+                                    build_scoped_tools_schemas)
+            if tool_hints:
+                # V0.02 ToolScope: load only base + category tools
+                prompt = build_scoped_tools_prompt(
+                    tool_hints, {"tools": tools_cfg})
+                return (f"\n\n{prompt}" if prompt else "",
+                        build_scoped_tools_schemas(
+                            tool_hints, {"tools": tools_cfg}))
+            # V0.01 fallback: load full profile
+            prompt = build_tools_prompt({"tools": tools_cfg})
+            schemas = None
+            # Native function calling for executor agents (coding/full),
+            # OR for planners that have explicitly allowed tools
+            tools_profile = tools_cfg.get("profile", "minimal")
+            if tools_profile in ("coding", "full") or tools_cfg.get("allow"):
+                schemas = build_tools_schemas({"tools": tools_cfg})
+            return (f"\n\n{prompt}" if prompt else "", schemas)
+
+        key = (json.dumps(tools_cfg, sort_keys=True, default=str),
+               tuple(tool_hints or ()), available_tools_key())
+        return prompt_cache.section("tools", key, build)
+
     @staticmethod
-    def _estimate_tokens(text: str) -> int:
-        """Rough token count — ~4 chars per token for English/mixed-lang text."""
-        return len(text) // 4 if text else 0
+    def _workspace_section(ws_path: str) -> str:
+        """Shared-workspace file list, re-listed only when the directory changes."""
+        from core.prompt_cache import prompt_cache
+
+        def build() -> str:
+            prompt_cache.track(ws_path)
+            if not os.path.isdir(ws_path):
+                return ""
+            try:
+                ws_files = os.listdir(ws_path)
+            except Exception as e:
+                logger.debug("Workspace listing failed: %s", e)
+                return ""
+            # Filter out hidden files like .gitkeep
+            ws_files = [f for f in ws_files if not f.startswith('.')]
+            ws_files = ws_files[:20]  # limit to 20 files
+            if not ws_files:
+                return ""
+            return (
+                f"\n\n## Shared Workspace (workspace/)\n"
+                f"Files: {', '.join(ws_files)}\n"
+                f"Use read_file/write_file with workspace/ prefix "
+                f"to collaborate with other agents.\n"
+            )
+
+        return prompt_cache.section("workspace", os.path.abspath(ws_path), build)
+
+    def _estimate_tokens(self, text: str) -> int:
+        """Token count for this agent's model family (memoized per text)."""
+        from core.token_counter import count_tokens
+        return count_tokens(text, self.cfg.model)
+
+    def _chars_for(self, text: str, max_tokens: float) -> int:
+        """Characters of ``text`` that fit in ``max_tokens`` (at its own
+        chars-per-token ratio)."""
+        return int(len(text) * max_tokens / max(self._estimate_tokens(text), 1))
 
     def _budget_system_prompt(
         self,
@@ -739,7 +797,8 @@ class BaseAgent:
         history_section: str,
         workspace_section: str,
         context_snap: str,
-    ) -> str:
+        intent_section: str = "",
+    ) -> tuple[str, int]:
         """Assemble system prompt and trim to fit within token budget.
 
         Priority (highest → lowest):
@@ -749,123 +808,161 @@ class BaseAgent:
           P3: docs_section, memory_block, history_section
           P4: workspace_section, context_snap (trimmed last)
 
+        Layout (``cfg.prompt_layout``):
+          classic — sections interleaved as above, intent after the soul.
+          cache   — stable sections (identity … docs) first, trimmed only
+                    against each other so the prefix is byte-identical
+                    across tasks; intent, memory, history, workspace and
+                    shared context follow in a trailing block.
+
         If max_system_prompt_tokens <= 0, no budget is applied.
+        Returns ``(prompt, stable_prefix_chars)``; the prefix length is 0
+        for the classic layout.
         """
+        cache_layout = self.cfg.prompt_layout == "cache"
+        if not cache_layout:
+            soul_section = soul_section + intent_section
+            intent_section = ""
+
         budget = self.cfg.max_system_prompt_tokens
-        if budget <= 0:
-            # No budget — assemble as-is
-            return (
-                f"You are {self.cfg.agent_id}.\n\n"
-                f"## Role\n{role_section}"
-                f"{soul_section}"
+        header = f"You are {self.cfg.agent_id}.\n\n## Role\n{role_section}{soul_section}"
+        if budget > 0:
+            # ── Build in priority order, track running total ──
+            # P0 — identity (never trimmed)
+            used = self._estimate_tokens(header + intent_section)
+
+            # P1 — tools + user
+            p1_parts = [tools_md_section, user_section, tools_section]
+            for part in p1_parts:
+                used += self._estimate_tokens(part)
+
+            # Remaining budget for P2–P4
+            remaining = max(budget - used, 200)  # always keep at least 200 tokens
+
+            # P2 — skills (biggest contributor, trim if needed)
+            skills_tokens = self._estimate_tokens(skills_text)
+            if skills_tokens > remaining * 0.6:
+                # Trim skills to 60% of remaining budget
+                max_chars = self._chars_for(skills_text, remaining * 0.6)
+                if len(skills_text) > max_chars:
+                    skills_text = skills_text[:max_chars] + "\n\n[... skills truncated for context budget ...]\n"
+                    logger.warning(
+                        "[%s] system prompt budget: skills trimmed from %d to %d tokens",
+                        self.cfg.agent_id, skills_tokens, int(remaining * 0.6))
+
+            # Recalculate remaining after skills
+            used += self._estimate_tokens(skills_text)
+            remaining = max(budget - used, 100)
+
+            # P3 — docs, memory, history (trim proportionally if over budget)
+            p3_sections = [
+                ("docs", docs_section),
+                ("memory", memory_block),
+                ("history", history_section),
+            ]
+            if cache_layout:
+                # Docs are part of the stable prefix: cap them at half the
+                # remaining budget so their cut never depends on per-task
+                # memory/history sizes
+                max_docs_chars = self._chars_for(docs_section, remaining * 0.5)
+                if len(docs_section) > max_docs_chars:
+                    docs_section = docs_section[:max_docs_chars] + "\n[... docs truncated ...]\n"
+                    logger.warning(
+                        "[%s] system prompt budget: docs trimmed to %d chars",
+                        self.cfg.agent_id, max_docs_chars)
+                used += self._estimate_tokens(docs_section)
+                remaining = max(budget - used, 100)
+                p3_sections = p3_sections[1:]
+            p3_total = sum(self._estimate_tokens(s) for _, s in p3_sections)
+            if p3_total > remaining * 0.8:
+                # Trim each proportionally to fit 80% of remaining
+                keep = remaining * 0.8 / max(p3_total, 1)
+                trimmed_p3 = {}
+                for label, section in p3_sections:
+                    if not section:
+                        trimmed_p3[label] = ""
+                        continue
+                    share = max(int(len(section) * keep), 100)
+                    if len(section) > share:
+                        section = section[:share] + f"\n[... {label} truncated ...]\n"
+                        logger.warning(
+                            "[%s] system prompt budget: %s trimmed to %d chars",
+                            self.cfg.agent_id, label, share)
+                    trimmed_p3[label] = section
+                docs_section = trimmed_p3.get("docs", docs_section)
+                memory_block = trimmed_p3["memory"]
+                history_section = trimmed_p3["history"]
+
+            # P4 — workspace, context (lowest priority, hard cap)
+            used += sum(self._estimate_tokens(s) for s in (
+                [memory_block, history_section] if cache_layout
+                else [docs_section, memory_block, history_section]))
+            remaining = max(budget - used, 50)
+            p4_budget_chars = self._chars_for(
+                workspace_section + context_snap, remaining)
+
+            if len(workspace_section) + len(context_snap) > p4_budget_chars:
+                # Trim context first (it's the least critical)
+                ctx_limit = max(p4_budget_chars - len(workspace_section), 200)
+                if len(context_snap) > ctx_limit:
+                    context_snap = context_snap[:ctx_limit] + "\n[... context truncated ...]\n"
+                    logger.warning("[%s] system prompt budget: context_snap trimmed to %d chars",
+                                   self.cfg.agent_id, ctx_limit)
+                if len(workspace_section) > p4_budget_chars // 2:
+                    workspace_section = workspace_section[:p4_budget_chars // 2] + "\n[... truncated ...]\n"
+
+        if cache_layout:
+            stable = (
+                f"{header}"
                 f"{tools_md_section}"
                 f"{user_section}\n\n"
                 f"## Skills\n{skills_text}"
                 f"{tools_section}"
                 f"{docs_section}"
+            )
+            prompt = (
+                f"{stable}"
+                f"{intent_section}"
                 f"{memory_block}"
                 f"{history_section}"
                 f"{workspace_section}\n\n"
                 f"## Shared Context\n{context_snap}\n"
             )
-
-        # ── Build in priority order, track running total ──
-        # P0 — identity (never trimmed)
-        header = f"You are {self.cfg.agent_id}.\n\n## Role\n{role_section}{soul_section}"
-        used = self._estimate_tokens(header)
-
-        # P1 — tools + user
-        p1_parts = [tools_md_section, user_section, tools_section]
-        for part in p1_parts:
-            used += self._estimate_tokens(part)
-
-        # Remaining budget for P2–P4
-        remaining = max(budget - used, 200)  # always keep at least 200 tokens
-
-        # P2 — skills (biggest contributor, trim if needed)
-        skills_tokens = self._estimate_tokens(skills_text)
-        if skills_tokens > remaining * 0.6:
-            # Trim skills to 60% of remaining budget
-            max_chars = int(remaining * 0.6 * 4)
-            if len(skills_text) > max_chars:
-                skills_text = skills_text[:max_chars] + "\n\n[... skills truncated for context budget ...]\n"
-                logger.warning(
-                    "[%s] system prompt budget: skills trimmed from %d to %d tokens",
-                    self.cfg.agent_id, skills_tokens, max_chars // 4)
-
-        # Recalculate remaining after skills
-        used += self._estimate_tokens(skills_text)
-        remaining = max(budget - used, 100)
-
-        # P3 — docs, memory, history (trim proportionally if over budget)
-        p3_sections = [
-            ("docs", docs_section),
-            ("memory", memory_block),
-            ("history", history_section),
-        ]
-        p3_total = sum(self._estimate_tokens(s) for _, s in p3_sections)
-        if p3_total > remaining * 0.8:
-            # Trim each proportionally to fit 80% of remaining
-            max_p3_chars = int(remaining * 0.8 * 4)
-            trimmed_p3 = []
-            for label, section in p3_sections:
-                if not section:
-                    trimmed_p3.append(("", label))
-                    continue
-                share = max(len(section) * max_p3_chars // max(p3_total * 4, 1), 100)
-                if len(section) > share:
-                    section = section[:share] + f"\n[... {label} truncated ...]\n"
-                    logger.warning(
-                        "[%s] system prompt budget: %s trimmed to %d chars",
-                        self.cfg.agent_id, label, share)
-                trimmed_p3.append((section, label))
-            docs_section = trimmed_p3[0][0]
-            memory_block = trimmed_p3[1][0]
-            history_section = trimmed_p3[2][0]
-
-        # P4 — workspace, context (lowest priority, hard cap)
-        used += sum(self._estimate_tokens(s) for s in [docs_section, memory_block, history_section])
-        remaining = max(budget - used, 50)
-        p4_budget_chars = remaining * 4
-
-        if len(workspace_section) + len(context_snap) > p4_budget_chars:
-            # Trim context first (it's the least critical)
-            ctx_limit = max(p4_budget_chars - len(workspace_section), 200)
-            if len(context_snap) > ctx_limit:
-                context_snap = context_snap[:ctx_limit] + "\n[... context truncated ...]\n"
-                logger.warning("[%s] system prompt budget: context_snap trimmed to %d chars",
-                               self.cfg.agent_id, ctx_limit)
-            if len(workspace_section) > p4_budget_chars // 2:
-                workspace_section = workspace_section[:p4_budget_chars // 2] + "\n[... truncated ...]\n"
-
-        prompt = (
-            f"{header}"
-            f"{tools_md_section}"
-            f"{user_section}\n\n"
-            f"## Skills\n{skills_text}"
-            f"{tools_section}"
-            f"{docs_section}"
-            f"{memory_block}"
-            f"{history_section}"
-            f"{workspace_section}\n\n"
-            f"## Shared Context\n{context_snap}\n"
-        )
+            prefix_chars = len(stable)
+        else:
+            prompt = (
+                f"{header}"
+                f"{tools_md_section}"
+                f"{user_section}\n\n"
+                f"## Skills\n{skills_text}"
+                f"{tools_section}"
+                f"{docs_section}"
+                f"{memory_block}"
+                f"{history_section}"
+                f"{workspace_section}\n\n"
+                f"## Shared Context\n{context_snap}\n"
+            )
+            prefix_chars = 0
 
         final_tokens = self._estimate_tokens(prompt)
-        if final_tokens > budget:
+        if budget > 0 and final_tokens > budget:
             logger.warning(
                 "[%s] system prompt (%d est. tokens) still exceeds budget (%d) after trimming",
                 self.cfg.agent_id, final_tokens, budget)
 
-        return prompt
+        return prompt, prefix_chars
 
     def _recall_long_term(self, query: str) -> str:
         """Recall from all long-term memory layers for system prompt injection.
 
-        Assembles contextual memory from five independent sources, each
+        Assembles contextual memory from six independent sources, each
         failure-tolerant (a failing source is skipped, never fatal).
-        Results are concatenated and injected into the system prompt
-        before the LLM call in ``BaseAgent.run()``.
+        Sources run concurrently on the recall pool (``core/recall.py``);
+        any source that misses ``cfg.recall_timeout_ms`` is skipped for
+        this prompt, and results are cached for ``cfg.recall_cache_ttl``
+        seconds per query.  Sections are concatenated in priority order
+        and injected into the system prompt before the LLM call in
+        ``BaseAgent.run()``.
 
         **Source priority (highest → lowest):**
 
@@ -876,14 +973,17 @@ class BaseAgent:
         2. **Episodic Memory** — recent task episodes, failure cases,
            and behavioural patterns from ``EpisodicMemory.recall()``.
            Budget-controlled via ``cfg.episodic_recall_budget`` tokens.
-        3. **Knowledge Base** — shared cross-agent notes and insights
+        3. **Past Failures** — up to 3 failure / needs_improvement
+           episodes matching the query keywords, from
+           ``EpisodicMemory.query_error_patterns()``.
+        4. **Knowledge Base** — shared cross-agent notes and insights
            from ``KnowledgeBase.recall()``.  Budget-controlled via
            ``cfg.kb_recall_budget`` tokens.
-        4. **Vector / BM25 Hybrid** — semantic search via ChromaDB +
+        5. **Vector / BM25 Hybrid** — semantic search via ChromaDB +
            BM25 reranking from ``HybridMemory.query()``.  Returns
            ``cfg.recall_top_k`` results (default 5), each truncated
            to 300 chars.
-        5. **FTS5 Search (QMD)** — full-text SQLite search as an
+        6. **FTS5 Search (QMD)** — full-text SQLite search as an
            optional augmentation.  Returns up to 3 results with
            title + 200-char snippets.
 
@@ -900,101 +1000,97 @@ class BaseAgent:
             ``## Vector Memory Recall``, etc.) ready for system prompt
             injection.  Empty string if all sources return nothing.
         """
-        parts = []
-
-        # Hot Memory: MEMORY.md (P0/P1/P2 crystallized knowledge)
-        memory_md_path = os.path.join(
-            "memory", "agents", self.cfg.agent_id, "MEMORY.md")
-        if os.path.exists(memory_md_path):
-            try:
-                with open(memory_md_path) as f:
-                    md_content = f.read().strip()[:1500]
-                if md_content:
-                    parts.append(f"## Persistent Memory\n{md_content}")
-            except OSError:
-                pass
-
-        # Episodic memory recall (per-agent)
-        if self.episodic:
-            try:
-                ep_recall = self.episodic.recall(
-                    query,
-                    token_budget=self.cfg.episodic_recall_budget,
-                )
-                if ep_recall:
-                    parts.append(ep_recall)
-            except Exception as e:
-                logger.debug("[%s] episodic recall failed: %s",
-                             self.cfg.agent_id, e)
-
-        # Error pattern recall: inject failure history for similar tasks
+        sources = [("memory_md", self._recall_memory_md)]
         if self.episodic:
-            try:
-                keywords = [w for w in query.split()[:10] if len(w) > 2]
-                error_episodes = self.episodic.query_error_patterns(
-                    keywords=keywords, limit=3)
-                if error_episodes:
-                    err_lines = ["## Past Failures (similar tasks)"]
-                    for ep in error_episodes:
-                        err_type = ep.get("error_type", "unknown")
-                        err_lines.append(
-                            f"- **{ep.get('title', '?')}** [{ep.get('outcome','?')}]"
-                            f" error_type={err_type}\n"
-                            f"  Preview: {(ep.get('result_preview', '') or '')[:200]}")
-                    parts.append("\n".join(err_lines))
-            except Exception as e:
-                logger.debug("[%s] error pattern recall failed: %s",
-                             self.cfg.agent_id, e)
-
-        # Knowledge base recall (shared)
+            sources.append(("episodic", self._recall_episodic))
+            sources.append(("error_patterns", self._recall_error_patterns))
         if self.kb:
-            try:
-                kb_recall = self.kb.recall(
-                    query, self.cfg.agent_id,
-                    token_budget=self.cfg.kb_recall_budget,
-                )
-                if kb_recall:
-                    parts.append(kb_recall)
-            except Exception as e:
-                logger.debug("[%s] KB recall failed: %s",
-                             self.cfg.agent_id, e)
-
-        # Vector/BM25 recall (existing hybrid memory)
+            sources.append(("kb", self._recall_kb))
         if self.memory and self.cfg.recall_top_k > 0:
-            try:
-                collection = f"agent_{self.cfg.agent_id}"
-                result = self.memory.query(
-                    collection, query,
-                    n_results=self.cfg.recall_top_k,
-                )
-                docs = result.get("documents", [[]])[0]
-                if docs:
-                    section = "## Vector Memory Recall\n"
-                    for doc in docs:
-                        if doc:
-                            section += f"- {doc[:300]}\n"
-                    parts.append(section)
-            except Exception as e:
-                logger.debug("[%s] vector recall failed: %s",
-                             self.cfg.agent_id, e)
-
-        # FTS5 search augmentation (QMD engine)
+            sources.append(("vector", self._recall_vector))
+        sources.append(("fts", self._recall_fts))
+        return "\n".join(self._recall.run(query, sources))
+
+    def _note_prefix(self, prefix: str) -> None:
+        """Count whether this task's stable prompt prefix matched the last one."""
+        import hashlib
+        digest = hashlib.sha1(prefix.encode("utf-8", "surrogatepass")).hexdigest()
+        self._prefix_stats["reused" if digest == self._prefix_digest
+                           else "changed"] += 1
+        self._prefix_stats["chars"] = len(prefix)
+        self._prefix_digest = digest
+
+    def prompt_stats(self) -> dict:
+        """Stable-prefix reuse counters (for heartbeat metrics)."""
+        return {"layout": self.cfg.prompt_layout, **self._prefix_stats}
+
+    def recall_stats(self) -> dict:
+        """Per-source recall latency / deadline misses (for heartbeat metrics)."""
+        return self._recall.stats()
+
+    # ── Recall sources (run concurrently by RecallPipeline) ──
+
+    def _recall_memory_md(self, query: str) -> str:
+        """Hot Memory: MEMORY.md (P0/P1/P2 crystallized knowledge)."""
+        memory_md_path = os.path.join(
+            "memory", "agents", self.cfg.agent_id, "MEMORY.md")
         try:
-            from core.search import QMD
-            qmd = QMD()
-            fts_results = qmd.search(query, collection="memory", limit=3)
-            qmd.close()
-            if fts_results:
-                fts_section = "## FTS5 Search Results\n"
-                for r in fts_results:
-                    title = r.get("title", "")
-                    snippet = r.get("snippet", "")[:200]
-                    fts_section += f"- {title}: {snippet}\n"
-                parts.append(fts_section)
-        except Exception:
-            pass  # FTS5 is optional enhancement
-
-        return "\n".join(parts)
+            with open(memory_md_path) as f:
+                md_content = f.read().strip()[:1500]
+        except OSError:
+            return ""
+        return f"## Persistent Memory\n{md_content}" if md_content else ""
+
+    def _recall_episodic(self, query: str) -> str:
+        """Episodic memory recall (per-agent)."""
+        return self.episodic.recall(
+            query, token_budget=self.cfg.episodic_recall_budget)
+
+    def _recall_error_patterns(self, query: str) -> str:
+        """Failure history for similar tasks."""
+        keywords = [w for w in query.split()[:10] if len(w) > 2]
+        error_episodes = self.episodic.query_error_patterns(
+            keywords=keywords, limit=3)
+        if not error_episodes:
+            return ""
+        err_lines = ["## Past Failures (similar tasks)"]
+        for ep in error_episodes:
+            err_type = ep.get("error_type", "unknown")
+            err_lines.append(
+                f"- **{ep.get('title', '?')}** [{ep.get('outcome','?')}]"
+                f" error_type={err_type}\n"
+                f"  Preview: {(ep.get('result_preview', '') or '')[:200]}")
+        return "\n".join(err_lines)
+
+    def _recall_kb(self, query: str) -> str:
+        """Knowledge base recall (shared)."""
+        return self.kb.recall(query, self.cfg.agent_id,
+                              token_budget=self.cfg.kb_recall_budget)
+
+    def _recall_vector(self, query: str) -> str:
+        """Vector/BM25 recall (hybrid memory)."""
+        result = self.memory.query(
+            f"agent_{self.cfg.agent_id}", query,
+            n_results=self.cfg.recall_top_k,
+        )
+        docs = [d for d in result.get("documents", [[]])[0] if d]
+        if not docs:
+            return ""
+        return "## Vector Memory Recall\n" + "".join(
+            f"- {doc[:300]}\n" for doc in docs)
+
+    def _recall_fts(self, query: str) -> str:
+        """FTS5 search augmentation (QMD engine, per-thread connection)."""
+        from core.search import QMD
+        fts_results = QMD.shared().search(query, collection="memory", limit=3)
+        if not fts_results:
+            return ""
+        fts_section = "## FTS5 Search Results\n"
+        for r in fts_results:
+            title = r.get("title", "")
+            snippet = r.get("snippet", "")[:200]
+            fts_section += f"- {title}: {snippet}\n"
+        return fts_section
 
     def _store_to_memory(self, task: "Task", result: str,
                          outcome: str = "success",
@@ -1003,53 +1099,84 @@ class BaseAgent:
         Store completed task to long-term memory layers.
         Non-blocking, failure-tolerant.
 
+        With a ``MemoryWriter`` attached (``self.writer``) the record is
+        journaled and persisted in the background by ``_persist_episodes``.
+
         Args:
             outcome: "success", "failure", or "partial"
             error_type: Error category for pattern learning
         """
-        # Store to episodic memory
-        if self.episodic:
+        record = {"task_id": task.task_id, "description": task.description,
+                  "result": result, "outcome": outcome,
+                  "error_type": error_type}
+        if self.writer is not None:
             try:
-                from adapters.memory.episodic import make_episode
-                # Derive baseline score from outcome when no explicit score
-                _score = {"success": 8, "partial": 5}.get(outcome, 2)
-                episode = make_episode(
-                    agent_id=self.cfg.agent_id,
-                    task_id=task.task_id,
-                    task_description=task.description,
-                    result=result,
-                    score=_score,
-                    outcome=outcome,
-                    error_type=error_type,
-                    model=getattr(self.cfg, "model", None),
-                )
-                self.episodic.save_episode(episode)
-                # Append to daily log
-                status_icon = "✓" if outcome == "success" else "✗"
-                self.episodic.append_daily_log(
-                    f"{status_icon} **Task:** {task.description[:100]}\n"
-                    f"**Outcome:** {outcome}"
-                    + (f" (error: {error_type})" if error_type else "") +
-                    f"\n**Result:** {result[:200]}..."
-                )
+                self.writer.submit("episode", **record)
+                return
             except Exception as e:
-                logger.debug("[%s] episodic store failed: %s",
+                logger.debug("[%s] memory write-behind unavailable: %s",
                              self.cfg.agent_id, e)
+        self._persist_episodes([record])
 
-        # Store to vector memory (existing hybrid)
+    def _persist_episodes(self, records: list[dict]) -> None:
+        """Write episode records (episodic + daily log + one batched vector add)."""
+        # Store to episodic memory
+        if self.episodic:
+            from adapters.memory.episodic import make_episode
+            for r in records:
+                try:
+                    outcome, error_type = r["outcome"], r.get("error_type")
+                    # Derive baseline score from outcome when no explicit score
+                    _score = {"success": 8, "partial": 5}.get(outcome, 2)
+                    episode = make_episode(
+                        agent_id=self.cfg.agent_id,
+                        task_id=r["task_id"],
+                        task_description=r["description"],
+                        result=r["result"],
+                        score=_score,
+                        outcome=outcome,
+                        error_type=error_type,
+                        model=getattr(self.cfg, "model", None),
+                    )
+                    self.episodic.save_episode(episode)
+                    # Append to daily log
+                    status_icon = "✓" if outcome == "success" else "✗"
+                    self.episodic.append_daily_log(
+                        f"{status_icon} **Task:** {r['description'][:100]}\n"
+                        f"**Outcome:** {outcome}"
+                        + (f" (error: {error_type})" if error_type else "") +
+                        f"\n**Result:** {r['result'][:200]}..."
+                    )
+                except Exception as e:
+                    logger.debug("[%s] episodic store failed: %s",
+                                 self.cfg.agent_id, e)
+
+        # Store to vector memory (existing hybrid) — one embedding call;
+        # ids are task ids, so keep only the latest record per task
         if self.memory:
             try:
                 collection = f"agent_{self.cfg.agent_id}"
-                self.memory.add(
-                    collection,
-                    f"Task: {task.description}\nResult: {result[:1000]}",
-                    {"task_id": task.task_id, "agent_id": self.cfg.agent_id,
-                     "ts": time.time(), "id": task.task_id},
-                )
+                records = list({r["task_id"]: r for r in records}.values())
+                docs = [f"Task: {r['description']}\nResult: {r['result'][:1000]}"
+                        for r in records]
+                metas = [{"task_id": r["task_id"],
+                          "agent_id": self.cfg.agent_id,
+                          "ts": r.get("ts", time.time()), "id": r["task_id"]}
+                         for r in records]
+                if hasattr(self.memory, "add_many"):
+                    self.memory.add_many(collection, docs, metas)
+                else:
+                    for doc, meta in zip(docs, metas):
+                        self.memory.add(collection, doc, meta)
             except Exception as e:
                 logger.debug("[%s] vector store failed: %s",
                              self.cfg.agent_id, e)
 
+        # New memories — cached recall results are stale.  Invalidate after
+        # the writes: a recall that ran while they were in flight may have
+        # cached pre-write results.
+        self._recall.invalidate()
+
     # ── Mailbox ───────────────────────────────────────────────────────────────
 
     def read_mail(self) -> list[dict]:
@@ -9,7 +9,8 @@ Strategy:
   3. Keep recent N turns verbatim for context continuity
   4. Insert summary as a system message prefix
 
-Token estimation: ~4 chars per token (conservative for CJK-heavy text: ~2 chars/token)
+Token estimation: ``core.token_counter`` (per model family, memoized per
+message content).
 """
 
 from __future__ import annotations
@@ -17,20 +18,21 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-# Average chars per token — conservative estimate
+# Average chars per token — only used to phrase the summary length target
 # English ~4 chars/token, Chinese ~1.5 chars/token, mix ~3
 CHARS_PER_TOKEN = 3
 
 
-def estimate_tokens(messages: list[dict]) -> int:
-    """Rough token count estimation for a message list."""
-    total_chars = sum(len(m.get("content", "")) for m in messages)
-    return total_chars // CHARS_PER_TOKEN
+def estimate_tokens(messages: list[dict], model: str | None = None) -> int:
+    """Token count for a message list (``model`` selects the tokenizer family)."""
+    from core.token_counter import count_messages
+    return count_messages(messages, model)
 
 
-def needs_compaction(messages: list[dict], max_tokens: int = 8000) -> bool:
+def needs_compaction(messages: list[dict], max_tokens: int = 8000,
+                     model: str | None = None) -> bool:
     """Check if the conversation history needs compaction."""
-    return estimate_tokens(messages) > max_tokens
+    return estimate_tokens(messages, model) > max_tokens
 
 
 async def compact_history(
@@ -60,7 +62,7 @@ async def compact_history(
     Returns:
         Compacted message list, or original if no compaction needed
     """
-    if not needs_compaction(messages, max_context_tokens):
+    if not needs_compaction(messages, max_context_tokens, model):
         return messages
 
     # Split messages
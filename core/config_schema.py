@@ -37,10 +37,13 @@ CONFIG_PATH = "config/agents.yaml"
 REQUIRED_AGENT_FIELDS = {"id", "role", "model"}
 OPTIONAL_AGENT_FIELDS = {
     "skills", "fallback_models", "llm", "tools",
-    "max_context_tokens", "compaction",
+    "max_context_tokens", "compaction", "prompt_layout",
 }
 VALID_PROVIDERS = {"flock", "openai", "minimax", "ollama"}
-VALID_MEMORY_BACKENDS = {"mock", "chroma", "hybrid"}
+VALID_MEMORY_BACKENDS = {"mock", "chroma", "hybrid", "vector"}
+VALID_TASK_BOARD_ENGINES = {"json", "sqlite"}
+VALID_CONTEXT_BUS_ENGINES = {"json", "sqlite"}
+VALID_PROMPT_LAYOUTS = {"classic", "cache"}
 VALID_STATUSES = {"pending", "claimed", "review", "completed", "failed",
                   "cancelled", "paused"}
 
@@ -114,6 +117,12 @@ def validate_config(path: str = CONFIG_PATH) -> list[str]:
                 f"Unknown provider '{provider}'. "
                 f"Valid: {', '.join(sorted(VALID_PROVIDERS))}"
             )
+        layout = llm.get("prompt_layout", "")
+        if layout and layout not in VALID_PROMPT_LAYOUTS:
+            errors.append(
+                f"Unknown llm prompt_layout '{layout}'. "
+                f"Valid: {', '.join(sorted(VALID_PROMPT_LAYOUTS))}"
+            )
 
     # Check memory section
     memory = cfg.get("memory", {})
@@ -124,6 +133,32 @@ def validate_config(path: str = CONFIG_PATH) -> list[str]:
                 f"Unknown memory backend '{backend}'. "
                 f"Valid: {', '.join(sorted(VALID_MEMORY_BACKENDS))}"
             )
+        cache_mb = memory.get("embedding", {}).get("cache_max_mb")
+        if cache_mb is not None and (
+                not isinstance(cache_mb, (int, float)) or cache_mb <= 0):
+            errors.append("memory.embedding.cache_max_mb must be a positive number")
+        if not isinstance(memory.get("write_behind", True), bool):
+            errors.append("memory.write_behind must be true or false")
+
+    # Check task board section
+    task_board = cfg.get("task_board", {})
+    if task_board:
+        engine = task_board.get("engine", "")
+        if engine and engine not in VALID_TASK_BOARD_ENGINES:
+            errors.append(
+                f"Unknown task_board engine '{engine}'. "
+                f"Valid: {', '.join(sorted(VALID_TASK_BOARD_ENGINES))}"
+            )
+
+    # Check context bus section
+    context_bus = cfg.get("context_bus", {})
+    if context_bus:
+        engine = context_bus.get("engine", "")
+        if engine and engine not in VALID_CONTEXT_BUS_ENGINES:
+            errors.append(
+                f"Unknown context_bus engine '{engine}'. "
+                f"Valid: {', '.join(sorted(VALID_CONTEXT_BUS_ENGINES))}"
+            )
 
     # Check resilience section
     resilience = cfg.get("resilience", {})
@@ -1,6 +1,6 @@
 """
 core/context_bus.py
-Shared file-backed KV store with layered context and TTL support.
+Shared KV store with layered context and TTL support.
 Every agent reads it at the start of each task.
 The snapshot is injected into the agent's system prompt.
 Key format: "{agent_id}:{key}"
@@ -10,21 +10,50 @@ Context Layers:
   L1 SESSION — TTL 3600s (1 hour)
   L2 SHORT   — TTL 86400s (1 day), default
   L3 LONG    — permanent, no TTL
+
+Storage engines (same surface, picked like the TaskBoard's):
+  json    — ``.context_bus.json``, FileLock + atomic full rewrite (default).
+  sqlite  — WAL-mode ``.context_bus.db``, one row per key, single-row
+            UPSERT per publish, indexed ``expires_at`` / ``layer`` deletes.
+
+Reads are served from a per-process cache shared by every ``ContextBus``
+on the same path.  The cache is validated by a version stamp — the file's
+(mtime_ns, size, inode) for json, ``PRAGMA data_version`` for sqlite — so
+an unchanged bus costs one stat / one pragma, never a parse.  Expiry is
+tracked in a min-heap of (expires_at, key): lookups pop only entries
+whose deadline passed instead of scanning everything, and unwrapped
+snapshots are memoized until the next change.
+
+Migration: ``migrate_json_to_sqlite()`` copies a JSON bus into a fresh
+database and archives the JSON file; afterwards every ``ContextBus()``
+auto-detects ``.context_bus.db``.
 """
 
 from __future__ import annotations
+
+import heapq
 import json
 import logging
 import os
+import sqlite3
+import threading
 import time
+from typing import Optional
 
 from core.protocols import FileLock  # shared fallback
 
 logger = logging.getLogger(__name__)
 
 BUS_FILE = ".context_bus.json"
+BUS_DB   = ".context_bus.db"
 BUS_LOCK = ".context_bus.lock"
 
+ENGINE_JSON   = "json"
+ENGINE_SQLITE = "sqlite"
+ENGINES = (ENGINE_JSON, ENGINE_SQLITE)
+
+ENGINE_ENV = "CLEO_CONTEXT_BUS_ENGINE"
+
 # ── Context Layers ────────────────────────────────────────────────────────────
 LAYER_TASK    = 0   # cleared when task completes
 LAYER_SESSION = 1   # TTL = 3600s
@@ -39,20 +68,431 @@ _DEFAULT_TTL = {
 }
 
 
+def _expires_at(entry) -> Optional[float]:
+    """Absolute expiry time of a raw entry (None = never expires)."""
+    if not isinstance(entry, dict) or entry.get("ttl") is None:
+        return None
+    return entry.get("ts", 0) + entry["ttl"]
+
+
+def _layer_of(entry) -> Optional[int]:
+    """Layer of a raw entry; None for legacy plain-string values."""
+    if not isinstance(entry, dict):
+        return None
+    return entry.get("layer", LAYER_SHORT)
+
+
+# ── Engine selection ──────────────────────────────────────────────────────────
+
+def resolve_engine(path: str | None = None, engine: str | None = None) -> str:
+    """Pick the storage engine for a bus.
+
+    Priority: explicit argument → ``CLEO_CONTEXT_BUS_ENGINE`` env →
+    ``.db`` path suffix → existing ``.context_bus.db`` → json.
+    """
+    choice = (engine or os.environ.get(ENGINE_ENV, "")).strip().lower()
+    if choice:
+        if choice not in ENGINES:
+            logger.warning("Unknown context bus engine '%s' — using json", choice)
+            return ENGINE_JSON
+        return choice
+    if path and path.endswith(".db"):
+        return ENGINE_SQLITE
+    if os.path.exists(_db_path_for(path or BUS_FILE)):
+        return ENGINE_SQLITE
+    return ENGINE_JSON
+
+
+def _db_path_for(path: str) -> str:
+    if path.endswith(".db"):
+        return path
+    if os.path.basename(path) == BUS_FILE:
+        return os.path.join(os.path.dirname(path), BUS_DB)
+    return os.path.splitext(path)[0] + ".db"
+
+
+def _json_path_for(path: str) -> str:
+    if not path.endswith(".db"):
+        return path
+    if os.path.basename(path) == BUS_DB:
+        return os.path.join(os.path.dirname(path), BUS_FILE)
+    return os.path.splitext(path)[0] + ".json"
+
+
+def _lock_path_for(path: str) -> str:
+    if os.path.basename(path) == BUS_FILE:
+        return os.path.join(os.path.dirname(path), BUS_LOCK)
+    return path + ".lock"
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Storage engines
+# ══════════════════════════════════════════════════════════════════════════════
+
+class _BusStore:
+    """Version-validated read cache + TTL heap shared by both engines.
+
+    Subclasses provide ``_stamp()`` (cheap change detector), ``_load()``
+    (full read) and the write operations, which must keep ``_data``
+    coherent via ``_apply`` / ``_drop`` or invalidate it.
+    """
+
+    engine = ""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._mu = threading.RLock()
+        self._data: Optional[dict] = None     # key → raw entry (live only)
+        self._stamp_seen = None
+        self._heap: list[tuple[float, str]] = []
+        self._deadline: dict[str, float] = {}
+        # Expired in memory but still stored — purged on the next write
+        self._stale: set[str] = set()
+        self._views: dict[Optional[int], dict] = {}
+        self.reloads = 0
+
+    # ── Reads ──
+
+    def entries(self) -> dict:
+        """Live (non-expired) raw entries. Callers must not mutate."""
+        with self._mu:
+            return self._current()
+
+    def view(self, max_layer: Optional[int]) -> dict:
+        """Unwrapped ``{key: value}`` up to ``max_layer`` (None = all)."""
+        with self._mu:
+            data = self._current()
+            cached = self._views.get(max_layer)
+            if cached is None:
+                cached = {}
+                for k, v in data.items():
+                    if not isinstance(v, dict):
+                        cached[k] = v     # plain strings: always visible
+                    elif max_layer is None or \
+                            v.get("layer", LAYER_SHORT) <= max_layer:
+                        cached[k] = v.get("v", "")
+                self._views[max_layer] = cached
+            return dict(cached)
+
+    def has_stale(self) -> bool:
+        with self._mu:
+            self._current()
+            return bool(self._stale)
+
+    def _current(self) -> dict:
+        stamp = self._stamp()
+        if self._data is None or stamp != self._stamp_seen:
+            self._reset(self._load(), stamp)
+        self._expire(time.time())
+        return self._data
+
+    # ── Cache maintenance ──
+
+    def _reset(self, data: dict, stamp) -> None:
+        self._data = data
+        self._stamp_seen = stamp
+        self._deadline = {}
+        self._stale = set()
+        for k, v in data.items():
+            exp = _expires_at(v)
+            if exp is not None:
+                self._deadline[k] = exp
+        self._heap = [(exp, k) for k, exp in self._deadline.items()]
+        heapq.heapify(self._heap)
+        self._views.clear()
+        self.reloads += 1
+
+    def _expire(self, now: float) -> None:
+        heap = self._heap
+        while heap and heap[0][0] < now:
+            exp, key = heapq.heappop(heap)
+            if self._deadline.get(key) != exp:
+                continue          # superseded by a later publish
+            del self._deadline[key]
+            self._data.pop(key, None)
+            self._stale.add(key)
+            self._views.clear()
+
+    def _apply(self, key: str, entry) -> None:
+        self._data[key] = entry
+        self._stale.discard(key)
+        exp = _expires_at(entry)
+        if exp is None:
+            self._deadline.pop(key, None)
+        else:
+            self._deadline[key] = exp
+            heapq.heappush(self._heap, (exp, key))
+        self._views.clear()
+
+    def _drop(self, keys) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+            self._deadline.pop(key, None)
+        self._views.clear()
+
+    def close(self) -> None:
+        pass
+
+
+class JsonBusStore(_BusStore):
+    """Original single-file engine: FileLock + full rewrite per change."""
+
+    engine = ENGINE_JSON
+
+    def __init__(self, path: str = BUS_FILE):
+        super().__init__(path)
+        self.lock = FileLock(_lock_path_for(path))
+        if not os.path.exists(path):
+            with self.lock:
+                if not os.path.exists(path):
+                    self._dump({})
+
+    def _stamp(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _dump(self, data: dict) -> None:
+        """Atomic rewrite; re-stamps the cache so our own write isn't re-read."""
+        d = os.path.dirname(self.path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
+        if self._data is data:
+            self._stamp_seen = self._stamp()
+            self._stale.clear()    # expired keys were left out of the dump
+
+    def put(self, key: str, entry: dict) -> None:
+        with self._mu, self.lock:
+            self._current()
+            self._apply(key, entry)
+            self._dump(self._data)
+
+    def remove(self, pred) -> int:
+        """Delete live entries matching ``pred(entry)``; returns the count."""
+        with self._mu, self.lock:
+            data = self._current()
+            keys = [k for k, v in data.items() if pred(v)]
+            if keys or self._stale:
+                self._drop(keys)
+                self._dump(data)
+            return len(keys)
+
+    def remove_expired(self) -> int:
+        with self._mu, self.lock:
+            self._current()
+            removed = len(self._stale)
+            if removed:
+                self._dump(self._data)
+            return removed
+
+    def clear(self) -> None:
+        with self._mu, self.lock:
+            self._dump({})
+            self._data = None
+
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS context (
+        key        TEXT PRIMARY KEY,
+        data       TEXT NOT NULL,
+        layer      INTEGER,
+        expires_at REAL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_context_expires ON context(expires_at) "
+    "WHERE expires_at IS NOT NULL",
+    "CREATE INDEX IF NOT EXISTS idx_context_layer ON context(layer)",
+)
+
+
+class SqliteBusStore(_BusStore):
+    """WAL-mode SQLite engine: one row per key, per-key UPSERT."""
+
+    engine = ENGINE_SQLITE
+
+    def __init__(self, path: str = BUS_DB):
+        super().__init__(path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = 0
+        with self._mu:
+            self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None and self._pid == os.getpid():
+            return self._conn
+        d = os.path.dirname(self.path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30.0,
+                               isolation_level=None,
+                               check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for stmt in _SCHEMA:
+            conn.execute(stmt)
+        self._conn = conn
+        self._pid = os.getpid()
+        self._data = None
+        return conn
+
+    def _stamp(self):
+        return self._connect().execute("PRAGMA data_version").fetchone()[0]
+
+    def _load(self) -> dict:
+        rows = self._connect().execute("SELECT key, data FROM context")
+        return {k: json.loads(d) for k, d in rows}
+
+    def _write(self, sql: str, params=()) -> int:
+        """Run one statement in its own write transaction (stale keys are
+        purged in the same transaction)."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Our own commits don't bump data_version on this connection,
+            # so the cache stays valid only if nobody else committed
+            if conn.execute("PRAGMA data_version").fetchone()[0] != \
+                    self._stamp_seen:
+                self._data = None
+                self._stale.clear()   # may have been re-published since
+            n = conn.execute(sql, params).rowcount
+            if self._stale:
+                conn.executemany("DELETE FROM context WHERE key = ?",
+                                 [(k,) for k in self._stale])
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        self._stale.clear()
+        return n
+
+    def put(self, key: str, entry: dict) -> None:
+        with self._mu:
+            self._write(
+                "INSERT INTO context (key, data, layer, expires_at) "
+                "VALUES (?, ?, ?, ?) ON CONFLICT(key) DO UPDATE SET "
+                "data = excluded.data, layer = excluded.layer, "
+                "expires_at = excluded.expires_at",
+                (key, json.dumps(entry, ensure_ascii=False),
+                 _layer_of(entry), _expires_at(entry)))
+            if self._data is not None:
+                self._apply(key, entry)
+
+    def remove_layer(self, layer: int) -> int:
+        with self._mu:
+            n = self._write("DELETE FROM context WHERE layer = ?", (layer,))
+            if self._data is not None:
+                self._drop([k for k, v in self._data.items()
+                            if _layer_of(v) == layer])
+            return n
+
+    def remove_expired(self) -> int:
+        with self._mu:
+            return self._write(
+                "DELETE FROM context WHERE expires_at < ?", (time.time(),))
+
+    def clear(self) -> None:
+        with self._mu:
+            self._write("DELETE FROM context")
+            self._data = None
+
+    def close(self) -> None:
+        with self._mu:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+            self._data = None
+
+
+# ── Factory + migration ───────────────────────────────────────────────────────
+
+_stores: dict[tuple[str, str], _BusStore] = {}
+_stores_mu = threading.Lock()
+
+
+def open_store(path: str = BUS_FILE, engine: str | None = None) -> _BusStore:
+    """Shared store for ``path`` (one cache per process and path).
+
+    Explicitly requesting sqlite while only a JSON bus exists performs the
+    one-shot migration first.
+    """
+    chosen = resolve_engine(path, engine)
+    target = _db_path_for(path) if chosen == ENGINE_SQLITE else _json_path_for(path)
+    key = (os.path.abspath(target), chosen)
+    with _stores_mu:
+        store = _stores.get(key)
+        if store is not None and os.path.exists(target):
+            return store
+        if chosen == ENGINE_SQLITE:
+            json_path = _json_path_for(path)
+            if not os.path.exists(target) and os.path.exists(json_path):
+                migrate_json_to_sqlite(json_path, target)
+            store = SqliteBusStore(target)
+        else:
+            store = JsonBusStore(target)
+        _stores[key] = store
+        return store
+
+
+def migrate_json_to_sqlite(json_path: str = BUS_FILE,
+                           db_path: str | None = None,
+                           archive: bool = True) -> int:
+    """Copy every entry from a JSON bus into a SQLite bus.
+
+    Runs under the bus FileLock; with ``archive=True`` the JSON file is
+    renamed to ``<name>.migrated`` so auto-detection switches every process
+    to SQLite.  Returns the number of migrated entries.
+    """
+    db_path = db_path or _db_path_for(json_path)
+    with FileLock(_lock_path_for(json_path)):
+        try:
+            with open(json_path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Cannot migrate corrupt context bus {json_path}: {e}")
+        store = SqliteBusStore(db_path)
+        try:
+            for key, entry in data.items():
+                store.put(key, entry)
+        finally:
+            store.close()
+        if archive and os.path.exists(json_path):
+            os.replace(json_path, json_path + ".migrated")
+    logger.info("Migrated %d context entries from %s to %s",
+                len(data), json_path, db_path)
+    return len(data)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  ContextBus
+# ══════════════════════════════════════════════════════════════════════════════
+
 class ContextBus:
     """
-    File-locked KV store shared by all agent processes.
+    KV store shared by all agent processes.
     Keys are namespaced: "{agent_id}:{key}".
 
     Each entry can have a layer (0-3) and optional TTL.
     Backward compatible: plain string values are treated as LAYER_SHORT.
     """
 
-    def __init__(self, path: str = BUS_FILE):
-        self.path = path
-        self.lock = FileLock(BUS_LOCK)
-        if not os.path.exists(self.path):
-            self._write({})
+    def __init__(self, path: str = BUS_FILE, engine: str | None = None):
+        self._store = open_store(path, engine)
+        self.path = self._store.path
+        self.engine = self._store.engine
 
     def publish(self, agent_id: str, key: str, value: str,
                 layer: int = LAYER_SHORT, ttl: int | None = None,
@@ -69,7 +509,6 @@ class ContextBus:
                         Keys: kind ("external_user"|"inter_agent"|"system"),
                               source_agent, source_channel, source_task_id.
         """
-        ns_key = f"{agent_id}:{key}"
         if ttl is None:
             ttl = _DEFAULT_TTL.get(layer)
         entry = {
@@ -80,17 +519,12 @@ class ContextBus:
         }
         if provenance:
             entry["provenance"] = provenance
-        with self.lock:
-            data = self._read()
-            data[ns_key] = entry
-            self._write(data)
+        self._store.put(f"{agent_id}:{key}", entry)
 
     def get(self, agent_id: str, key: str) -> str:
         """Read a value by agent_id and key. Returns '' if not found or expired."""
-        raw = self._read().get(f"{agent_id}:{key}", "")
+        raw = self._store.entries().get(f"{agent_id}:{key}", "")
         if isinstance(raw, dict):
-            if self._is_expired(raw):
-                return ""
             return raw.get("v", "")
         return raw  # backward compat: plain string
 
@@ -98,16 +532,7 @@ class ContextBus:
         """Return the full KV store as a dict (backward compatible).
         Unwraps layered entries to plain values. Filters expired entries.
         """
-        raw = self._read()
-        result = {}
-        for k, v in raw.items():
-            if isinstance(v, dict):
-                if self._is_expired(v):
-                    continue
-                result[k] = v.get("v", "")
-            else:
-                result[k] = v  # backward compat
-        return result
+        return self._store.view(None)
 
     def snapshot_for_agent(self, agent_id: str,
                            max_layer: int = LAYER_SHORT) -> dict:
@@ -123,66 +548,26 @@ class ContextBus:
         Returns:
             {key: value} dict with unwrapped values.
         """
-        raw = self._read()
-        result = {}
-        for k, v in raw.items():
-            if isinstance(v, dict):
-                if self._is_expired(v):
-                    continue
-                entry_layer = v.get("layer", LAYER_SHORT)
-                if entry_layer > max_layer:
-                    continue
-                result[k] = v.get("v", "")
-            else:
-                result[k] = v  # backward compat: plain strings always included
-        return result
+        return self._store.view(max_layer)
 
     def clear_task_layer(self):
         """Clear all LAYER_TASK (L0) entries. Called when a task completes."""
-        with self.lock:
-            data = self._read()
-            keys_to_remove = []
-            for k, v in data.items():
-                if isinstance(v, dict) and v.get("layer", LAYER_SHORT) == LAYER_TASK:
-                    keys_to_remove.append(k)
-            if keys_to_remove:
-                for k in keys_to_remove:
-                    del data[k]
-                self._write(data)
-                logger.debug("Cleared %d task-layer entries", len(keys_to_remove))
+        if self._store.engine == ENGINE_SQLITE:
+            removed = self._store.remove_layer(LAYER_TASK)
+        else:
+            removed = self._store.remove(lambda v: _layer_of(v) == LAYER_TASK)
+        if removed:
+            logger.debug("Cleared %d task-layer entries", removed)
 
     def cleanup_expired(self) -> int:
-        """Remove all expired entries. Returns count of removed entries."""
-        removed = 0
-        with self.lock:
-            data = self._read()
-            keys_to_remove = []
-            for k, v in data.items():
-                if isinstance(v, dict) and self._is_expired(v):
-                    keys_to_remove.append(k)
-            if keys_to_remove:
-                for k in keys_to_remove:
-                    del data[k]
-                self._write(data)
-                removed = len(keys_to_remove)
-        return removed
-
-    @staticmethod
-    def _is_expired(entry: dict) -> bool:
-        """Check if a layered entry has expired based on its TTL."""
-        ttl = entry.get("ttl")
-        if ttl is None:
-            return False
-        ts = entry.get("ts", 0)
-        return (time.time() - ts) > ttl
+        """Remove all expired entries. Returns count of removed entries.
 
-    def _read(self) -> dict:
-        try:
-            with open(self.path, "r") as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
+        Free when the TTL heap shows nothing has expired (no lock, no write).
+        """
+        if not self._store.has_stale():
+            return 0
+        return self._store.remove_expired()
 
-    def _write(self, data: dict):
-        with open(self.path, "w") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+    def clear(self) -> None:
+        """Drop every entry (all layers)."""
+        self._store.clear()
@@ -275,7 +275,10 @@ def check_memory_backend() -> tuple[bool, str, str]:
             import chromadb  # noqa: F401
             return True, "Memory", "ChromaDB [ok]"
         except ImportError:
-            return False, "Memory", "ChromaDB not installed -- pip3 install chromadb"
+            return True, "Memory", (
+                "ChromaDB not installed -- using built-in vector store "
+                "(pip3 install chromadb to switch)"
+            )
         except Exception as e:
             return False, "Memory", (
                 f"ChromaDB installed but broken ({e.__class__.__name__}: {e}) "
@@ -287,13 +290,23 @@ def check_memory_backend() -> tuple[bool, str, str]:
             import chromadb  # noqa: F401
             return True, "Memory", "Hybrid (Vector + BM25) [ok]"
         except ImportError:
-            return True, "Memory", "Hybrid (BM25 only -- install chromadb for vector search)"
+            return True, "Memory", "Hybrid (built-in vector store + BM25) [ok]"
         except Exception as e:
             return True, "Memory", (
                 f"Hybrid (BM25 only -- chromadb broken: {e.__class__.__name__}; "
                 f"try Python <=3.13)"
             )
 
+    if backend == "vector":
+        try:
+            import numpy  # noqa: F401
+            return True, "Memory", "Built-in vector store (numpy) [ok]"
+        except ImportError:
+            return True, "Memory", (
+                "Built-in vector store (pure Python -- pip3 install numpy "
+                "for faster search)"
+            )
+
     return True, "Memory", f"{backend}"
 
 
@@ -505,7 +518,7 @@ def check_disk_space() -> tuple[bool, str, str]:
             total += size
 
     # Also count state files
-    for sf in [".task_board.json", ".context_bus.json"]:
+    for sf in [".task_board.json", ".context_bus.json", ".context_bus.db"]:
         if os.path.exists(sf):
             total += os.path.getsize(sf)
 
@@ -753,8 +766,8 @@ def run_doctor_deep(rich_console=None) -> list[tuple[bool, str, str]]:
     deep_results = []
 
     # Deep 1: Disk usage of Cleo data files
-    data_files = [".task_board.json", ".context_bus.json", "memory/usage.json",
-                  "memory/reputation_cache.json"]
+    data_files = [".task_board.json", ".context_bus.json", ".context_bus.db",
+                  "memory/usage.json", "memory/reputation_cache.json"]
     total_size = 0
     for fp in data_files:
         if os.path.exists(fp):
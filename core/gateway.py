@@ -60,6 +60,12 @@ Endpoints:
 
 Default port: 19789  (configurable via CLEO_GATEWAY_PORT or config)
 Auth: Bearer token  (auto-injected into dashboard, configurable via CLEO_GATEWAY_TOKEN)
+
+Concurrency: request/response routes run on a bounded worker pool
+(CLEO_GATEWAY_WORKERS, default 32).  Long-lived streams (/v1/events,
+/v1/stream/:id, /a2a/stream) detach from the pool onto their own
+lightweight threads (CLEO_GATEWAY_MAX_STREAMS, default 512), so open
+dashboards never starve /health, /v1/status or task submission.
 """
 
 from __future__ import annotations
@@ -71,13 +77,16 @@ import re
 import secrets
 import time
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from http.server import HTTPServer, BaseHTTPRequestHandler
-from threading import Thread
-from typing import Any
+from threading import BoundedSemaphore, Lock, Thread
+from typing import Any, Callable
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_PORT = 19789
+DEFAULT_WORKERS = 32        # request/response worker pool
+DEFAULT_MAX_STREAMS = 512   # concurrent SSE streams (own threads)
 _start_time: float = 0.0
 _token: str = ""
 _config: dict = {}
@@ -86,10 +95,6 @@ _SAFE_NAME = re.compile(r'^[a-zA-Z0-9_-]+$')
 _channel_manager = None  # ChannelManager instance (set by start_gateway)
 _a2a_server = None       # A2AServer instance (set by start_gateway)
 
-# SSE task-board mtime cache (avoids json.load every 1.5s when idle)
-_sse_tb_cache: dict = {}
-_sse_tb_mtime: float = 0.0
-
 
 # ── Sensitive field redaction ──────────────────────────────────────────────────
 
@@ -153,9 +158,55 @@ def redact_config(cfg: dict | list | Any) -> dict | list | Any:
 class _Handler(BaseHTTPRequestHandler):
     """Minimal JSON API handler."""
 
+    _detached = False
+
     def log_message(self, fmt, *args):
         logger.debug(fmt, *args)
 
+    def handle(self):
+        # Stop reading requests once a stream took over the socket (its
+        # "Connection: keep-alive" header would otherwise re-enter the loop)
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection and not self._detached:
+            self.handle_one_request()
+
+    def finish(self):
+        # A detached stream thread still owns rfile/wfile
+        if not self._detached:
+            super().finish()
+
+    # ── Long-lived streams ──
+    def _detach_stream(self, loop_fn: Callable[..., None], *args) -> None:
+        """Run a streaming response on its own thread.
+
+        The pool worker returns immediately; the stream thread writes
+        headers + events and closes the connection when ``loop_fn`` ends.
+        Falls back to running inline on servers without stream support.
+        """
+        server = self.server
+        if not isinstance(server, _GatewayServer):
+            loop_fn(*args)
+            return
+        if not server.acquire_stream(self.request):
+            self._json_response(503, {"error": "Too many open streams"})
+            return
+        self._detached = True
+
+        def _run():
+            try:
+                loop_fn(*args)
+            except Exception as e:
+                logger.debug("stream %s ended with error: %s", self.path, e)
+            finally:
+                try:
+                    super(_Handler, self).finish()
+                except OSError:
+                    pass
+                server.release_stream(self.request)
+
+        Thread(target=_run, daemon=True, name="gw-stream").start()
+
     # ── Auth ──
     def _check_auth(self) -> bool:
         if not _token:
@@ -359,10 +410,10 @@ class _Handler(BaseHTTPRequestHandler):
             self._handle_heartbeat()
         # ── SSE event stream ──
         elif path == "/v1/events":
-            self._handle_sse()
+            self._detach_stream(self._handle_sse)
         elif path.startswith("/v1/stream/"):
             task_id = path[len("/v1/stream/"):]
-            self._handle_task_stream(task_id)
+            self._detach_stream(self._handle_task_stream, task_id)
         # ── Budget & Alerts ──
         elif path == "/v1/budget":
             self._handle_get_budget()
@@ -625,12 +676,8 @@ class _Handler(BaseHTTPRequestHandler):
         })
 
     def _handle_status(self):
-        if not os.path.exists(".task_board.json"):
-            self._json_response(200, {"tasks": {}})
-            return
-        with open(".task_board.json") as f:
-            data = json.load(f)
-        self._json_response(200, {"tasks": data})
+        from core.task_board import read_board
+        self._json_response(200, {"tasks": read_board()})
 
     def _handle_scores(self):
         path = "memory/reputation_cache.json"
@@ -698,17 +745,15 @@ class _Handler(BaseHTTPRequestHandler):
             # Current task (from task board)
             current_task = None
             try:
-                if os.path.exists(".task_board.json"):
-                    with open(".task_board.json") as tb:
-                        tasks = json.load(tb)
-                    for tid, t in tasks.items():
-                        if t.get("agent_id") == a["id"] and t.get("status") in ("claimed", "critique"):
-                            current_task = {
-                                "id": tid[:8],
-                                "description": t.get("description", "")[:80],
-                                "status": t.get("status", ""),
-                            }
-                            break
+                from core.task_board import read_board
+                for tid, t in read_board().items():
+                    if t.get("agent_id") == a["id"] and t.get("status") in ("claimed", "critique"):
+                        current_task = {
+                            "id": tid[:8],
+                            "description": t.get("description", "")[:80],
+                            "status": t.get("status", ""),
+                        }
+                        break
             except Exception:
                 pass
 
@@ -766,11 +811,11 @@ class _Handler(BaseHTTPRequestHandler):
         self._json_response(200, {"agents": agents, "global_key_env": global_key_env, "global_url_env": global_url_env})
 
     def _handle_get_task(self, task_id: str):
-        if not os.path.exists(".task_board.json"):
+        from core.task_board import read_board
+        data = read_board()
+        if not data:
             self._json_response(404, {"error": "No tasks"})
             return
-        with open(".task_board.json") as f:
-            data = json.load(f)
         task = data.get(task_id)
         if not task:
             self._json_response(404, {"error": f"Task {task_id} not found"})
@@ -846,9 +891,10 @@ class _Handler(BaseHTTPRequestHandler):
         # Salvage in-progress streaming results before clear
         if session_id and old_data:
             try:
+                from core.task_stream import task_partial
                 store = self._get_dashboard_sessions()
                 for _tid, t in old_data.items():
-                    salvage = t.get("result") or t.get("partial_result", "")
+                    salvage = t.get("result") or task_partial(t)
                     if (salvage.strip()
                             and t.get("status") in (
                                 "claimed", "review", "critique", "synthesizing")):
@@ -1204,6 +1250,7 @@ class _Handler(BaseHTTPRequestHandler):
             from core.usage_tracker import UsageTracker
             tracker = UsageTracker()
             summary = tracker.get_summary()
+            summary["by_hour"] = tracker.get_hourly(24)
             self._json_response(200, summary)
         except Exception as e:
             logger.warning("Usage stats error: %s", e)
@@ -1218,11 +1265,8 @@ class _Handler(BaseHTTPRequestHandler):
         try:
             from core.usage_tracker import UsageTracker
             tracker = UsageTracker()
-            data = tracker._read()
-            calls = data.get("calls", [])
-            # Return last 50 calls with full detail
-            recent = calls[-50:]
-            self._json_response(200, {"calls": recent})
+            # Last 50 calls with full detail, kept in the rollups
+            self._json_response(200, {"calls": tracker.recent_calls(50)})
         except Exception as e:
             logger.warning("Recent usage error: %s", e)
             self._json_response(200, {"calls": []})
@@ -3081,7 +3125,10 @@ class _Handler(BaseHTTPRequestHandler):
             self._json_response(200, result)
             return
 
-        # Start SSE stream
+        self._detach_stream(self._a2a_stream_loop, a2a_id, result)
+
+    def _a2a_stream_loop(self, a2a_id: str, result: dict):
+        """Push A2A task events for ``a2a_id`` until the task finishes."""
         self.send_response(200)
         self.send_header("Content-Type", "text/event-stream")
         self.send_header("Cache-Control", "no-cache")
@@ -3184,7 +3231,11 @@ class _Handler(BaseHTTPRequestHandler):
     def _handle_sse(self):
         """Server-Sent Events stream for real-time dashboard updates.
 
-        Pushes task board state, heartbeats, and alerts every 1.5s.
+        Frames come pre-encoded from the shared ``SnapshotBroadcaster``
+        (one snapshot build per tick for all clients):
+          event: state — full snapshot (on connect and periodic resync)
+          event: delta — changed tasks / removed ids / agents / budget
+        Every payload carries ``seq``; apply deltas in order.
         Dashboard connects via: new EventSource('/v1/events')
         """
         self.send_response(200)
@@ -3194,117 +3245,23 @@ class _Handler(BaseHTTPRequestHandler):
         self.send_header("Access-Control-Allow-Origin", "*")
         self.end_headers()
 
-        import time as _time
-
-        last_state_hash = ""
+        from core.state_broadcast import get_broadcaster
+        broadcaster = get_broadcaster()
+        broadcaster.subscribe()
+        seq = 0
         try:
             while True:
-                # Build current state snapshot
-                snapshot = self._sse_snapshot()
-                state_str = json.dumps(snapshot, ensure_ascii=False,
-                                       default=str)
-                # Only send if state changed (or every 5th cycle as heartbeat)
-                state_hash = str(hash(state_str))
-                if state_hash != last_state_hash:
-                    self.wfile.write(f"event: state\ndata: {state_str}\n\n"
-                                    .encode("utf-8"))
-                    self.wfile.flush()
-                    last_state_hash = state_hash
+                seq, frames = broadcaster.wait_frames(seq, timeout=15.0)
+                if frames:
+                    self.wfile.write(b"".join(data for _, data in frames))
                 else:
                     # Send keepalive comment
                     self.wfile.write(b": keepalive\n\n")
-                    self.wfile.flush()
-
-                _time.sleep(1.5)
+                self.wfile.flush()
         except (BrokenPipeError, ConnectionResetError, OSError):
             pass  # Client disconnected
-
-    def _sse_snapshot(self) -> dict:
-        """Build a compact state snapshot for SSE push."""
-        snapshot: dict = {"ts": time.time()}
-
-        # Task board (mtime-guarded to avoid redundant json.load)
-        try:
-            global _sse_tb_cache, _sse_tb_mtime
-            tb_path = ".task_board.json"
-            try:
-                mtime = os.path.getmtime(tb_path)
-            except OSError:
-                mtime = 0
-            if mtime != _sse_tb_mtime:
-                if mtime > 0:
-                    with open(tb_path) as f:
-                        _sse_tb_cache = json.load(f)
-                else:
-                    _sse_tb_cache = {}
-                _sse_tb_mtime = mtime
-            if _sse_tb_cache:
-                tasks = _sse_tb_cache
-                # Compact: only send essential fields
-                compact_tasks = {}
-                for tid, t in tasks.items():
-                    compact_tasks[tid] = {
-                        "s": t.get("status", "?"),
-                        "a": t.get("agent_id", ""),
-                        "d": (t.get("description", ""))[:60],
-                        "ca": t.get("claimed_at"),
-                        "co": t.get("completed_at"),
-                        "rc": t.get("retry_count", 0),
-                    }
-                    # Include review/critique data
-                    critique = t.get("critique")
-                    if critique:
-                        compact_tasks[tid]["cr"] = {
-                            "v": "LGTM" if critique.get("passed") else "NEEDS_WORK",
-                            "s": critique.get("score", 0),
-                        }
-                    else:
-                        scores = t.get("review_scores", [])
-                        if scores:
-                            avg = sum(r["score"] for r in scores) / len(scores)
-                            compact_tasks[tid]["rs"] = int(avg)
-                    # Streaming: partial result (last 200 chars)
-                    pr = t.get("partial_result", "")
-                    if pr:
-                        compact_tasks[tid]["pr"] = pr[-200:]
-                    # Task cost from usage tracker
-                    cost = t.get("cost_usd")
-                    if cost is not None:
-                        compact_tasks[tid]["cost"] = round(cost, 4)
-                    # Parent ID for subtask tree
-                    pid = t.get("parent_id")
-                    if pid:
-                        compact_tasks[tid]["pid"] = pid
-                snapshot["tasks"] = compact_tasks
-        except Exception:
-            snapshot["tasks"] = {}
-
-        # Agent heartbeats
-        try:
-            from core.heartbeat import read_all_heartbeats
-            agents = read_all_heartbeats()
-            snapshot["agents"] = [
-                {"id": a.get("agent_id", ""), "on": a.get("online", False),
-                 "st": a.get("status", "offline"), "tid": a.get("task_id")}
-                for a in agents
-            ]
-        except Exception:
-            snapshot["agents"] = []
-
-        # Budget status (compact)
-        try:
-            from core.usage_tracker import UsageTracker
-            budget = UsageTracker.get_budget()
-            if budget.get("enabled"):
-                snapshot["budget"] = {
-                    "pct": budget.get("percent_used", 0),
-                    "cost": round(budget.get("current_cost_usd", 0), 4),
-                    "limit": budget.get("max_cost_usd", 0),
-                }
-        except Exception:
-            pass
-
-        return snapshot
+        finally:
+            broadcaster.unsubscribe()
 
     # ── Per-task SSE stream (token-level) ─────────────────────────────────
 
@@ -3312,16 +3269,16 @@ class _Handler(BaseHTTPRequestHandler):
         """SSE stream for a specific task — pushes token-level chunks.
 
         Agent writes chunks to .task_streams/{task_id}.stream via lockless
-        append.  This handler polls the file every 150 ms and pushes new
-        chunks as ``event: chunk`` SSE messages.
+        append.  ``StreamTail`` follows the file from its last byte offset
+        (inotify where available) and stops at the end marker written when
+        the task reaches a terminal state.
 
         Events:
           chunk  — ``{"c": "text", "seq": N}``
           done   — task reached terminal state
           timeout — 30 s with no new data
         """
-        from core.task_board import TaskBoard
-        import time as _time
+        from core.task_stream import StreamTail
 
         self.send_response(200)
         self.send_header("Content-Type", "text/event-stream")
@@ -3330,56 +3287,37 @@ class _Handler(BaseHTTPRequestHandler):
         self.send_header("Access-Control-Allow-Origin", "*")
         self.end_headers()
 
-        last_seq = -1
-        idle_cycles = 0
-        max_idle = 200          # 200 × 0.15 s = 30 s max silence
-
+        tail = StreamTail(task_id)
         try:
-            while True:
-                chunks = TaskBoard.read_stream_chunks(
-                    task_id, after_seq=last_seq)
-
-                if chunks:
-                    idle_cycles = 0
-                    for c in chunks:
-                        event_data = json.dumps(
-                            {"c": c["c"], "seq": c["seq"]},
-                            ensure_ascii=False)
-                        self.wfile.write(
-                            f"event: chunk\ndata: {event_data}\n\n"
-                            .encode("utf-8"))
-                        last_seq = max(last_seq, c["seq"])
-                    self.wfile.flush()
+            for c in tail.follow(idle_timeout=30.0,
+                                 is_terminal=self._task_is_terminal,
+                                 keepalive=3.0):
+                if c is None:
+                    self.wfile.write(b": keepalive\n\n")
                 else:
-                    idle_cycles += 1
-                    # Check if task reached terminal state
-                    if self._task_is_terminal(task_id):
-                        self.wfile.write(b"event: done\ndata: {}\n\n")
-                        self.wfile.flush()
-                        break
-                    if idle_cycles > max_idle:
-                        self.wfile.write(
-                            b"event: timeout\ndata: {}\n\n")
-                        self.wfile.flush()
-                        break
-                    # Keepalive every ~3 s (20 cycles)
-                    if idle_cycles % 20 == 0:
-                        self.wfile.write(b": keepalive\n\n")
-                        self.wfile.flush()
-
-                _time.sleep(0.15)
+                    event_data = json.dumps(
+                        {"c": c["c"], "seq": c["seq"]}, ensure_ascii=False)
+                    self.wfile.write(
+                        f"event: chunk\ndata: {event_data}\n\n"
+                        .encode("utf-8"))
+                self.wfile.flush()
+            if tail.ended == "timeout":
+                self.wfile.write(b"event: timeout\ndata: {}\n\n")
+            else:
+                self.wfile.write(b"event: done\ndata: {}\n\n")
+            self.wfile.flush()
         except (BrokenPipeError, ConnectionResetError, OSError):
             pass  # Client disconnected
+        finally:
+            tail.close()
 
     def _task_is_terminal(self, task_id: str) -> bool:
         """Check if a task reached a terminal state."""
         try:
-            if os.path.exists(".task_board.json"):
-                with open(".task_board.json") as f:
-                    data = json.load(f)
-                t = data.get(task_id, {})
-                return t.get("status") in (
-                    "completed", "failed", "cancelled")
+            from core.task_board import read_board
+            t = read_board().get(task_id, {})
+            return t.get("status") in (
+                "completed", "failed", "cancelled")
         except Exception:
             pass
         return False
@@ -3517,20 +3455,15 @@ class _Handler(BaseHTTPRequestHandler):
         if not body:
             self._json_response(400, {"error": "Empty body"})
             return
-        case_path = os.path.join("memory", "agents", agent_id,
-                                 "cases", f"{case_hash}.json")
         try:
-            if not os.path.exists(case_path):
+            from adapters.memory.episodic import EpisodicMemory
+            # Merge updates (allow updating solution, tags, notes)
+            fields = {k: body[k] for k in ("solution", "tags", "notes", "context")
+                      if k in body}
+            case_data = EpisodicMemory(agent_id).update_case(case_hash, fields)
+            if case_data is None:
                 self._json_response(404, {"error": f"Case {case_hash} not found"})
                 return
-            with open(case_path, "r", encoding="utf-8") as f:
-                case_data = json.load(f)
-            # Merge updates (allow updating solution, tags, notes)
-            for key in ("solution", "tags", "notes", "context"):
-                if key in body:
-                    case_data[key] = body[key]
-            with open(case_path, "w", encoding="utf-8") as f:
-                json.dump(case_data, f, ensure_ascii=False, indent=2)
             self._json_response(200, {"ok": True, "case": case_data})
         except Exception as e:
             self._json_response(500, {"error": str(e)})
@@ -3543,23 +3476,13 @@ class _Handler(BaseHTTPRequestHandler):
         if not body:
             self._json_response(400, {"error": "Empty body"})
             return
-        # Episodes are stored by date: memory/agents/{id}/episodes/{date}/{task_id}.json
-        import glob as _glob
-        pattern = os.path.join("memory", "agents", agent_id,
-                               "episodes", "*", f"{task_id}.json")
-        matches = _glob.glob(pattern)
-        if not matches:
-            self._json_response(404, {"error": f"Episode {task_id} not found"})
-            return
-        ep_path = matches[0]
         try:
-            with open(ep_path, "r", encoding="utf-8") as f:
-                ep_data = json.load(f)
-            for key in ("notes", "tags", "outcome"):
-                if key in body:
-                    ep_data[key] = body[key]
-            with open(ep_path, "w", encoding="utf-8") as f:
-                json.dump(ep_data, f, ensure_ascii=False, indent=2)
+            from adapters.memory.episodic import EpisodicMemory
+            fields = {k: body[k] for k in ("notes", "tags", "outcome") if k in body}
+            ep_data = EpisodicMemory(agent_id).update_episode(task_id, fields)
+            if ep_data is None:
+                self._json_response(404, {"error": f"Episode {task_id} not found"})
+                return
             self._json_response(200, {"ok": True, "episode": ep_data})
         except Exception as e:
             self._json_response(500, {"error": str(e)})
@@ -3956,6 +3879,75 @@ def _start_file_delivery_consumer():
     logger.info("File delivery consumer started (polling %s every 5s)", _FILE_DELIVERY_DIR)
 
 
+# ══════════════════════════════════════════════════════════════════════════════
+#  SERVER
+# ══════════════════════════════════════════════════════════════════════════════
+
+class _GatewayServer(HTTPServer):
+    """HTTPServer with a bounded worker pool and detachable streams.
+
+    Each accepted connection is handled on a pool worker.  Handlers that
+    stream (SSE) call ``_Handler._detach_stream``: the socket is then owned
+    by a dedicated thread and is not closed when the worker returns.
+    """
+
+    daemon_threads = True
+    request_queue_size = 256   # listen backlog — bursts of SSE reconnects
+
+    def __init__(self, server_address, handler_class,
+                 workers: int = DEFAULT_WORKERS,
+                 max_streams: int = DEFAULT_MAX_STREAMS):
+        super().__init__(server_address, handler_class)
+        self.workers = workers
+        self.max_streams = max_streams
+        self._pool = ThreadPoolExecutor(max_workers=workers,
+                                        thread_name_prefix="gw-worker")
+        self._stream_slots = BoundedSemaphore(max_streams)
+        self._streams: set = set()
+        self._streams_lock = Lock()
+
+    # ── socketserver hooks ──
+    def process_request(self, request, client_address):
+        try:
+            self._pool.submit(self._process, request, client_address)
+        except RuntimeError:    # pool shut down
+            self.shutdown_request(request)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            with self._streams_lock:
+                detached = request in self._streams
+            if not detached:
+                self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # ── stream bookkeeping ──
+    def acquire_stream(self, request) -> bool:
+        if not self._stream_slots.acquire(blocking=False):
+            return False
+        with self._streams_lock:
+            self._streams.add(request)
+        return True
+
+    def release_stream(self, request) -> None:
+        with self._streams_lock:
+            self._streams.discard(request)
+        self._stream_slots.release()
+        self.shutdown_request(request)
+
+    @property
+    def open_streams(self) -> int:
+        with self._streams_lock:
+            return len(self._streams)
+
+
 def start_gateway(port: int = 0, token: str = "",
                    daemon: bool = True) -> HTTPServer | None:
     """
@@ -3987,8 +3979,12 @@ def start_gateway(port: int = 0, token: str = "",
     except OSError:
         pass
 
+    workers = int(os.environ.get("CLEO_GATEWAY_WORKERS", DEFAULT_WORKERS))
+    max_streams = int(os.environ.get("CLEO_GATEWAY_MAX_STREAMS",
+                                     DEFAULT_MAX_STREAMS))
     try:
-        server = HTTPServer(("127.0.0.1", port), _Handler)
+        server = _GatewayServer(("127.0.0.1", port), _Handler,
+                                workers=workers, max_streams=max_streams)
     except OSError as e:
         logger.error("Cannot start gateway on port %d: %s", port, e)
         return None
@@ -4083,6 +4079,7 @@ def start_gateway(port: int = 0, token: str = "",
             pass
         finally:
             server.shutdown()
+            server.server_close()
 
     return server
 
@@ -10,7 +10,8 @@ Each agent writes a JSON heartbeat file every N seconds:
     "task_id": "abc123" | null,
     "last_beat": 1718000000.0,
     "started_at": 1718000000.0,
-    "beats": 42
+    "beats": 42,
+    "metrics": {"dispatch_latency": {...}}   # optional, see Heartbeat.metrics
   }
 
 The gateway reads all heartbeat files to determine agent online/offline status.
@@ -40,6 +41,9 @@ class Heartbeat:
         self.beats = 0
         self.status = "idle"
         self.task_id: str | None = None
+        # Free-form per-agent metrics published with every beat
+        # (e.g. task dispatch latency histogram from the wakeup bus)
+        self.metrics: dict = {}
         self._path = os.path.join(HEARTBEAT_DIR, f"{agent_id}.json")
         os.makedirs(HEARTBEAT_DIR, exist_ok=True)
 
@@ -65,6 +69,8 @@ class Heartbeat:
             "started_at": self.started_at,
             "beats": self.beats,
         }
+        if self.metrics:
+            data["metrics"] = self.metrics
         try:
             # Atomic write: write to temp then rename
             tmp = self._path + ".tmp"
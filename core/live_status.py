@@ -10,6 +10,7 @@ import time
 from typing import Optional
 
 from core.i18n import t
+from core.task_stream import task_partial
 
 from rich.console import Console, Group
 from rich.live import Live
@@ -121,7 +122,7 @@ class LiveStatus:
                 claimed_at  = t.get("claimed_at")
                 row.elapsed = (now - claimed_at) if claimed_at else None
                 # Show streaming partial result preview
-                partial = t.get("partial_result", "")
+                partial = task_partial(t)
                 if partial:
                     row.partial_preview = _clean_preview(partial, 50)
 
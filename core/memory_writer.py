@@ -0,0 +1,225 @@
+"""
+core/memory_writer.py
+Write-behind queue for post-task memory persistence.
+
+After a task, ``BaseAgent._store_to_memory`` (episode, daily log, vector
+add) and ``_extract_and_store_memories`` (cases, patterns, insight, KB
+note, FTS5, MEMORY.md, DocUpdater) used to run inline, so the agent could
+not claim its next task until every file write and embedding call had
+finished.  With a writer attached they ``submit()`` a record instead:
+
+    writer = MemoryWriter(agent_id, {"episode": fn, "extract": fn})
+    writer.start()                 # replays the journal left by a crash
+    writer.submit("episode", task_id=..., result=...)
+    writer.close()                 # flush-on-shutdown
+
+``submit`` appends the record to ``memory/.writeback/<agent>.journal``
+(one fsync'd JSON line) and returns; a daemon thread drains the queue in
+batches (up to ``batch_max`` records, waiting ``linger`` seconds for
+more) and hands each handler all records of its kind at once, so
+embeddings, BM25 appends and index rebuilds are grouped per batch.  The
+last applied seq is recorded in ``<agent>.ack``; once the queue is empty
+both files are truncated.  Records applied but not yet acked when the
+process dies are replayed on the next start (at-least-once — handlers
+key writes by task id).
+
+``stats()`` is published as ``heartbeat.metrics["memory_writer"]``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+WRITEBACK_DIR = os.path.join("memory", ".writeback")
+BATCH_MAX = 32           # records per batch
+LINGER = 0.2             # seconds to wait for more records before a batch
+CLOSE_TIMEOUT = 30.0     # seconds close() waits for the queue to drain
+
+Handler = Callable[[list[dict]], None]
+
+
+class MemoryWriter:
+    """Per-agent durable queue drained by one background thread."""
+
+    def __init__(self, agent_id: str, handlers: dict[str, Handler],
+                 directory: str = WRITEBACK_DIR, batch_max: int = BATCH_MAX,
+                 linger: float = LINGER):
+        self.agent_id = agent_id
+        self.handlers = dict(handlers)
+        self.batch_max = batch_max
+        self.linger = linger
+        os.makedirs(directory, exist_ok=True)
+        self._journal_path = os.path.join(directory, f"{agent_id}.journal")
+        self._ack_path = os.path.join(directory, f"{agent_id}.ack")
+        self._cond = threading.Condition()
+        self._queue: list[dict] = []
+        self._inflight = 0
+        self._seq = 0
+        self._journal = None
+        self._thread: Optional[threading.Thread] = None
+        self._closing = False
+        self._stats = {"submitted": 0, "applied": 0, "batches": 0,
+                       "failed": 0, "replayed": 0, "max_batch": 0}
+
+    # ── Public ──
+
+    def start(self) -> None:
+        """Replay unacknowledged journal records and start the worker."""
+        with self._cond:
+            if self._thread is not None:
+                return
+            pending = self._load_journal()
+            self._journal = open(self._journal_path, "a", encoding="utf-8")
+            self._queue.extend(pending)
+            self._stats["replayed"] = len(pending)
+            self._thread = threading.Thread(
+                target=self._run, daemon=True,
+                name=f"memory-writer-{self.agent_id}")
+            self._thread.start()
+        if pending:
+            logger.info("[%s] replaying %d memory write(s) from journal",
+                        self.agent_id, len(pending))
+
+    def submit(self, kind: str, **payload) -> None:
+        """Journal a record and queue it; returns without applying it."""
+        with self._cond:
+            if self._journal is None or self._closing:
+                raise RuntimeError("memory writer is not running")
+            self._seq += 1
+            record = {"seq": self._seq, "kind": kind, "ts": time.time(),
+                      **payload}
+            self._journal.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            self._queue.append(record)
+            self._stats["submitted"] += 1
+            self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every submitted record is applied (False on timeout)."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._queue and not self._inflight, timeout)
+
+    def close(self, timeout: float = CLOSE_TIMEOUT) -> bool:
+        """Drain the queue and stop the worker.  Records still pending at
+        ``timeout`` stay in the journal for the next start."""
+        with self._cond:
+            if self._thread is None:
+                return True
+            self._closing = True
+            self._cond.notify_all()
+        thread = self._thread
+        thread.join(timeout)
+        drained = not thread.is_alive()
+        if not drained:
+            logger.warning("[%s] memory writer still busy after %.0fs — "
+                           "%d record(s) left in the journal",
+                           self.agent_id, timeout, len(self._queue))
+        with self._cond:
+            if drained:
+                self._journal.close()
+                self._journal = None
+                self._thread = None
+        return drained
+
+    @property
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._queue) + self._inflight
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {**self._stats, "pending": len(self._queue) + self._inflight}
+
+    # ── Worker ──
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._closing)
+                if not self._queue:
+                    return                    # closing and drained
+                if not self._closing and len(self._queue) < self.batch_max:
+                    self._cond.wait_for(
+                        lambda: len(self._queue) >= self.batch_max
+                        or self._closing, self.linger)
+                batch = self._queue[:self.batch_max]
+                del self._queue[:self.batch_max]
+                self._inflight = len(batch)
+            self._apply(batch)
+            with self._cond:
+                self._inflight = 0
+                self._stats["batches"] += 1
+                self._stats["applied"] += len(batch)
+                self._stats["max_batch"] = max(self._stats["max_batch"],
+                                               len(batch))
+                self._checkpoint(batch[-1]["seq"])
+                self._cond.notify_all()
+
+    def _apply(self, batch: list[dict]) -> None:
+        by_kind: dict[str, list[dict]] = {}
+        for record in batch:
+            by_kind.setdefault(record["kind"], []).append(record)
+        for kind, records in by_kind.items():
+            handler = self.handlers.get(kind)
+            if handler is None:
+                logger.warning("[%s] no memory handler for %r — dropping %d "
+                               "record(s)", self.agent_id, kind, len(records))
+                continue
+            try:
+                handler(records)
+            except Exception as e:
+                # Handlers are failure-tolerant per record; a raise here
+                # would only repeat on replay, so the batch is not retried.
+                with self._cond:
+                    self._stats["failed"] += len(records)
+                logger.warning("[%s] memory write (%s × %d) failed: %s",
+                               self.agent_id, kind, len(records), e)
+
+    # ── Journal ──
+
+    def _checkpoint(self, seq: int) -> None:
+        """Record ``seq`` as applied; truncate everything once idle."""
+        try:
+            if not self._queue:
+                os.ftruncate(self._journal.fileno(), 0)
+                if os.path.exists(self._ack_path):
+                    os.remove(self._ack_path)
+                return
+            tmp = self._ack_path + ".tmp"
+            with open(tmp, "w") as f:
+                f.write(str(seq))
+            os.replace(tmp, self._ack_path)
+        except OSError as e:
+            logger.debug("[%s] memory journal checkpoint failed: %s",
+                         self.agent_id, e)
+
+    def _load_journal(self) -> list[dict]:
+        try:
+            with open(self._ack_path) as f:
+                acked = int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            acked = 0
+        pending = []
+        try:
+            with open(self._journal_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue              # torn last line
+                    self._seq = max(self._seq, record.get("seq", 0))
+                    if record.get("seq", 0) > acked:
+                        pending.append(record)
+        except OSError:
+            pass
+        self._seq = max(self._seq, acked)
+        return pending
@@ -1276,6 +1276,7 @@ def _section_memory(cfg: dict):
 
     choices = [
         questionary.Choice("Mock (in-memory, no persistence)", value="mock"),
+        questionary.Choice("Built-in vector store (no dependencies)", value="vector"),
         questionary.Choice(
             "ChromaDB (vector store)" + _ctag,
             value="chroma",
@@ -1316,13 +1317,13 @@ def _section_memory(cfg: dict):
                     if result.stderr:
                         console.print(f"  [{C_DIM}]{result.stderr.strip()[:200]}[/{C_DIM}]")
                     if backend == "hybrid":
-                        console.print(f"  [{C_DIM}]Hybrid will use BM25 only (no vector search).[/{C_DIM}]")
+                        console.print(f"  [{C_DIM}]Hybrid will use the built-in vector store.[/{C_DIM}]")
                     else:
-                        backend = "mock"
+                        backend = "vector"
             except subprocess.TimeoutExpired:
                 console.print(f"  [{C_WARN}]Install timed out.[/{C_WARN}]")
                 if backend != "hybrid":
-                    backend = "mock"
+                    backend = "vector"
 
     cfg.setdefault("memory", {})["backend"] = backend
     console.print(f"  [{C_OK}]+[/{C_OK}] Memory ->{backend}")
@@ -2794,6 +2795,7 @@ def _ask_memory() -> str | None:
         "Memory backend:",
         choices=[
             questionary.Choice("Mock (in-memory, no persistence)", value="mock"),
+            questionary.Choice("Built-in vector store (no dependencies)", value="vector"),
             questionary.Choice(f"ChromaDB (vector store){chroma_tag}", value="chroma"),
             questionary.Choice(f"Hybrid (Vector + BM25 keyword search){chroma_tag}", value="hybrid"),
         ],
@@ -2821,16 +2823,16 @@ def _ask_memory() -> str | None:
             else:
                 console.print(f"  [{C_WARN}]Install failed.[/{C_WARN}]")
                 if choice == "hybrid":
-                    console.print(f"  [{C_DIM}]Hybrid will use BM25 only (no vector search).[/{C_DIM}]")
-                    return choice  # hybrid still works with BM25 only
-                console.print(f"  [{C_DIM}]Falling back to mock.[/{C_DIM}]")
-                return "mock"
+                    console.print(f"  [{C_DIM}]Hybrid will use the built-in vector store.[/{C_DIM}]")
+                    return choice
+                console.print(f"  [{C_DIM}]Falling back to the built-in vector store.[/{C_DIM}]")
+                return "vector"
         else:
             if choice == "hybrid":
-                console.print(f"  [{C_DIM}]Hybrid will use BM25 only.[/{C_DIM}]")
+                console.print(f"  [{C_DIM}]Hybrid will use the built-in vector store.[/{C_DIM}]")
                 return choice
-            console.print(f"  [{C_DIM}]Using mock memory instead.[/{C_DIM}]")
-            return "mock"
+            console.print(f"  [{C_DIM}]Using the built-in vector store instead.[/{C_DIM}]")
+            return "vector"
 
     return choice
 
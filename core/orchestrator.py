@@ -19,6 +19,7 @@ import re
 import signal
 import sys
 import time
+from types import SimpleNamespace
 from typing import Any
 
 import yaml
@@ -80,12 +81,16 @@ logger = logging.getLogger(__name__)
 # ── Per-process entry point ─────────────────────────────────────────────────
 
 def _agent_process(agent_cfg_dict: dict, agent_def: dict, config: dict,
-                    wakeup=None):
+                    wakeup=None, started_at: float | None = None,
+                    start_mode: str = "process"):
     """
     Runs in a child process.
     Imports adapters here to avoid pickling issues.
     Child output is redirected to .logs/ to keep the terminal clean.
     Registers signal handlers for graceful shutdown.
+
+    ``started_at`` is when the runtime requested the start (``start_mode``:
+    process | zygote); ``_agent_loop`` reports ready / first-claim times.
     """
     import asyncio, logging, os, sys
 
@@ -138,17 +143,43 @@ def _agent_process(agent_cfg_dict: dict, agent_def: dict, config: dict,
                         episodic=episodic, kb=kb)
     tracker = UsageTracker()
 
+    # Post-task memory writes are journaled and applied behind the agent
+    # loop, so the next claim does not wait on them (memory.write_behind)
+    writer = None
+    if config.get("memory", {}).get("write_behind", True):
+        from core.memory_writer import MemoryWriter
+        writer = MemoryWriter(agent_id, {
+            "episode": agent._persist_episodes,
+            "extract": lambda records: _persist_extractions(agent, records),
+        })
+        writer.start()
+        agent.writer = writer
+
     bus   = ContextBus()
     board = TaskBoard()
 
     from core.heartbeat import Heartbeat
     hb = Heartbeat(agent_id)
 
+    startup = ({"mode": start_mode, "started_at": started_at}
+               if started_at else None)
+
+    async def _run():
+        from adapters.llm import transport
+        try:
+            await _agent_loop(agent, bus, board, config, tracker, hb,
+                              wakeup=wakeup, startup=startup)
+        finally:
+            await transport.aclose()
+
     try:
-        asyncio.run(_agent_loop(agent, bus, board, config, tracker, hb,
-                                wakeup=wakeup))
+        asyncio.run(_run())
     finally:
+        if writer is not None:
+            writer.close()  # flush pending memory writes before exit
         hb.stop()  # clean up heartbeat file on exit
+        if wakeup is not None and hasattr(wakeup, "close"):
+            wakeup.close(agent_id)  # unlink task signal socket
 
 
 # ── Helper: resolve agent model from config ──────────────────────────────────
@@ -580,15 +611,9 @@ def _create_subtasks_from_specs(board: TaskBoard, specs: list,
             blocked_by=[],
             required_role=role,
             parent_id=parent_task_id,
+            complexity=complexity,
+            spec=spec.to_json(),
         )
-        # Set complexity and spec on the task
-        with board.lock:
-            data = board._read()
-            t = data.get(new_task.task_id)
-            if t:
-                t["complexity"] = complexity
-                t["spec"] = spec.to_json()
-                board._write(data)
         subtask_ids.append(new_task.task_id)
         logger.info("Created subtask %s [role=%s, complexity=%s, tools=%s]: %s",
                      new_task.task_id, role or "any", complexity,
@@ -676,9 +701,7 @@ def _infer_role(description: str) -> str:
 
 def _has_active_tasks(board: TaskBoard) -> bool:
     """Return True if any tasks are still pending, claimed, in review/critique, or paused."""
-    data = board._read()
-    active_states = {"pending", "claimed", "review", "critique", "blocked", "paused"}
-    return any(t.get("status") in active_states for t in data.values())
+    return board.active_count() > 0
 
 
 def _has_pending_closeouts() -> bool:
@@ -701,7 +724,7 @@ def _has_pending_closeouts() -> bool:
 
 async def _agent_loop(agent, bus: ContextBus, board: TaskBoard,
                        config: dict, tracker=None, heartbeat=None,
-                       wakeup=None):
+                       wakeup=None, startup: dict | None = None):
     """Core event loop for every agent process (Leo, Jerry, Alic).
 
     Runs as the main coroutine inside each ``multiprocessing.Process``
@@ -747,10 +770,26 @@ async def _agent_loop(agent, bus: ContextBus, board: TaskBoard,
         config:    Merged ``agents.yaml`` config dict.
         tracker:   Optional ``UsageTracker`` for per-call cost accounting.
         heartbeat: Optional ``Heartbeat`` writer for gateway status display.
+        wakeup:    Optional wakeup bus.  In socket mode the agent binds its
+                   task signal socket before the first claim, so TaskBoard
+                   notifications for claimable tasks end the idle wait.
+        startup:   Optional ``{"mode", "started_at"}`` from the runtime;
+                   ready and first-claim latency are added to it and
+                   published as ``heartbeat.metrics["startup"]``.
     """
     from reputation.scheduler import ReputationScheduler
     sched = ReputationScheduler(board)
 
+    # Bind before the first claim: a task made ready between an empty
+    # claim and the idle wait is then queued on the socket, not lost.
+    if wakeup is not None and hasattr(wakeup, "listen"):
+        wakeup.listen(agent.cfg.agent_id)
+
+    if startup:
+        startup["ready_ms"] = round((time.time() - startup["started_at"]) * 1000)
+        if heartbeat:
+            heartbeat.metrics["startup"] = startup
+
     idle_count = 0
     max_idle   = config.get("max_idle_cycles", 30)
     _last_recovery_check = 0.0
@@ -893,14 +932,6 @@ async def _agent_loop(agent, bus: ContextBus, board: TaskBoard,
                                   agent_role=agent.cfg.role)
 
         if task is None:
-            # Check lightweight task signals before full board scan
-            signals = board.consume_task_signals()
-            if signals:
-                # New tasks created — immediately retry claim instead of sleeping
-                logger.debug("[%s] task signal detected (%d new), retrying claim",
-                             agent.cfg.agent_id, len(signals))
-                continue
-
             # If there are still tasks in-progress (claimed/review/pending),
             # keep waiting — other agents might produce subtasks for us
             active = _has_active_tasks(board)
@@ -917,16 +948,27 @@ async def _agent_loop(agent, bus: ContextBus, board: TaskBoard,
                 return
             # Progressive backoff: idle longer → check less often (1s → 5s max)
             # WakeupBus: block on event instead of blind sleep — instant wakeup
-            # when another agent creates subtasks.
+            # when a claimable task appears.  In socket mode the timeout is
+            # only a safety net for missed datagrams / stale recovery.
             backoff = min(1.0 + idle_count * 0.5, 5.0)
             if wakeup:
                 await wakeup.async_wait(agent.cfg.agent_id, timeout=backoff)
+                if heartbeat and hasattr(wakeup, "latency_stats"):
+                    stats = wakeup.latency_stats(agent.cfg.agent_id)
+                    if stats:
+                        heartbeat.metrics["dispatch_latency"] = stats
             else:
                 await asyncio.sleep(backoff)
             continue
 
         idle_count = 0
         logger.info("[%s] claimed task %s", agent.cfg.agent_id, task.task_id)
+        if startup and "first_claim_ms" not in startup:
+            startup["first_claim_ms"] = round(
+                (time.time() - startup["started_at"]) * 1000)
+            logger.info("[%s] first claim %dms after %s start (ready in %dms)",
+                        agent.cfg.agent_id, startup["first_claim_ms"],
+                        startup["mode"], startup["ready_ms"])
         agent.log_transcript("task_claimed", task.task_id,
                              task.description[:200])
 
@@ -954,6 +996,19 @@ async def _agent_loop(agent, bus: ContextBus, board: TaskBoard,
 
             result = await agent.run(task, bus, tool_hints=_tool_hints)
 
+            if heartbeat and hasattr(agent, "recall_stats"):
+                heartbeat.metrics["recall"] = agent.recall_stats()
+                heartbeat.metrics["prompt_prefix"] = agent.prompt_stats()
+                if getattr(agent, "writer", None) is not None:
+                    heartbeat.metrics["memory_writer"] = agent.writer.stats()
+            if heartbeat:
+                from adapters.llm import transport
+                from core.prompt_cache import prompt_cache
+                from core.token_counter import token_counter
+                heartbeat.metrics["http"] = transport.stats()
+                heartbeat.metrics["prompt_cache"] = prompt_cache.stats()
+                heartbeat.metrics["token_counter"] = token_counter.stats()
+
             if heartbeat:
                 heartbeat.beat("working", task.task_id,
                                progress="processing result...")
@@ -971,6 +1026,7 @@ async def _agent_loop(agent, bus: ContextBus, board: TaskBoard,
                         success=last_usage.success,
                         retries=last_usage.retries,
                         failover=last_usage.failover_used,
+                        cached_tokens=getattr(last_usage, "cached_tokens", 0),
                     )
                     # Write cost to task board for dashboard display
                     board.set_cost(task.task_id, call_cost)
@@ -1065,7 +1121,8 @@ async def _agent_loop(agent, bus: ContextBus, board: TaskBoard,
                     logger.info("[%s] planner created %d subtasks for task %s, waiting for close-out",
                                 agent.cfg.agent_id, len(subtask_ids), task.task_id)
                     # Wake executors instantly so they can claim subtasks
-                    if wakeup:
+                    # (socket bus: TaskBoard already signalled the claimers)
+                    if wakeup and not getattr(wakeup, "routes_task_events", False):
                         wakeup.wake_all()
                 else:
                     # No TASK: lines found — fallback delegation
@@ -1094,14 +1151,9 @@ async def _agent_loop(agent, bus: ContextBus, board: TaskBoard,
                             blocked_by=[],
                             required_role="implement",
                             parent_id=task.task_id,
+                            # normal complexity — goes through Alic review
+                            complexity="normal",
                         )
-                        # Set complexity to normal (goes through Alic review)
-                        with board.lock:
-                            data = board._read()
-                            t = data.get(fallback_task.task_id)
-                            if t:
-                                t["complexity"] = "normal"
-                                board._write(data)
                         _register_subtasks(
                             bus, task.task_id, [fallback_task.task_id])
                         board.submit_for_review(task.task_id, result)
@@ -1110,7 +1162,8 @@ async def _agent_loop(agent, bus: ContextBus, board: TaskBoard,
                             agent.cfg.agent_id, fallback_task.task_id,
                             task.task_id)
                         # Wake executors for fallback subtask
-                        if wakeup:
+                        if wakeup and not getattr(wakeup, "routes_task_events",
+                                                  False):
                             wakeup.wake_all()
                     else:
                         # Truly empty, trivially short, or already a
@@ -1283,23 +1336,22 @@ async def _check_planner_closeouts(agent, bus, board: TaskBoard, config: dict):
                              parent_id)
             continue
 
-        # V0.03: Double-check inside board lock to prevent race where two agents
+        # V0.03: Double-check inside a board transaction to prevent race where two agents
         # both detect "all subtasks complete" and both enter synthesis.
         # Mark parent as "synthesizing" atomically to claim exclusive synthesis.
-        with board.lock:
-            fresh_data = board._read()
-            fresh_parent = fresh_data.get(parent_id)
+        with board.transaction() as tx:
+            fresh_parent = tx.get(parent_id)
             if not fresh_parent or fresh_parent.get("status") in (
                     "completed", "synthesizing"):
                 completed_ids.add(parent_id)
                 continue  # Already handled by another agent
             fresh_all_done = all(
-                fresh_data.get(sid, {}).get("status") == "completed"
+                (tx.get(sid) or {}).get("status") == "completed"
                 for sid in subtask_ids)
             if not fresh_all_done:
                 continue  # Subtask status changed since initial check
             fresh_parent["status"] = "synthesizing"
-            board._write(fresh_data)
+            tx.put(fresh_parent)
 
         # All subtasks done — synthesize final answer with reviewer feedback
         logger.info("All %d subtasks completed for parent %s, synthesizing close-out",
@@ -1415,14 +1467,16 @@ async def _check_planner_closeouts(agent, bus, board: TaskBoard, config: dict):
             # execute them and feed results back (max 3 rounds).
             if planner_tools_cfg:
                 try:
-                    from core.tools import parse_tool_calls, execute_tool_calls
+                    from core.tools import (parse_tool_calls, aexecute_tool_calls,
+                                            current_task_id)
+                    current_task_id.set(parent_id)
                     for _round in range(3):
                         calls = parse_tool_calls(final_answer)
                         if not calls:
                             break
                         logger.info("closeout tool round %d: %s",
                                     _round + 1, [c["tool"] for c in calls])
-                        tool_results = execute_tool_calls(
+                        tool_results = await aexecute_tool_calls(
                             calls, {"tools": planner_tools_cfg})
                         feedback_parts = []
                         for tr in tool_results:
@@ -1450,21 +1504,19 @@ async def _check_planner_closeouts(agent, bus, board: TaskBoard, config: dict):
             final_answer = _strip_tool_blocks(final_answer)
 
             # Update parent task with synthesized result and complete
-            with board.lock:
-                data = board._read()
-                t = data.get(parent_id)
+            with board.transaction() as tx:
+                t = tx.get(parent_id)
                 if t:
                     t["result"] = final_answer
                     t["status"] = "completed"
                     t["completed_at"] = time.time()
-                    board._write(data)
+                    tx.put(t)
             logger.info("Planner close-out completed for task %s", parent_id)
         except Exception as e:
             logger.error("Planner close-out failed for %s: %s", parent_id, e)
             # Mark as failed so channel does NOT send raw subtask results
-            with board.lock:
-                data = board._read()
-                t = data.get(parent_id)
+            with board.transaction() as tx:
+                t = tx.get(parent_id)
                 if t:
                     t["result"] = (
                         f"⚠️ 合成失败，请重试。\n"
@@ -1472,7 +1524,7 @@ async def _check_planner_closeouts(agent, bus, board: TaskBoard, config: dict):
                     )
                     t["status"] = "failed"
                     t["completed_at"] = time.time()
-                    board._write(data)
+                    tx.put(t)
 
         completed_ids.add(parent_id)
 
@@ -1503,6 +1555,10 @@ def _build_llm_for_agent(agent_def: dict, config: dict) -> "ResilientLLM":
 
     Per-agent llm: block overrides global llm: config.
     """
+    # Pooled keep-alive transport shared by every adapter in this process
+    from adapters.llm import transport
+    transport.configure(**config.get("llm", {}).get("http", {}))
+
     # ── Mode 1: Provider Router (cross-provider failover) ──
     try:
         from core.provider_router import get_router
@@ -1539,23 +1595,32 @@ def _build_llm_for_agent(agent_def: dict, config: dict) -> "ResilientLLM":
     if not api_key and all_keys:
         api_key = all_keys[0]
 
+    # Explicit cache_control blocks on the stable prompt prefix (for
+    # Anthropic-style APIs); automatic prefix caches need no hint
+    cache_control = bool(agent_llm.get("cache_control",
+                                       global_llm.get("cache_control", False)))
+
     # Build base adapter
     if provider == "flock":
         from adapters.llm.flock import FLockAdapter
-        base = FLockAdapter(api_key=api_key, base_url=base_url)
+        base = FLockAdapter(api_key=api_key, base_url=base_url,
+                            cache_control=cache_control)
     elif provider == "openai":
         from adapters.llm.openai import OpenAIAdapter
-        base = OpenAIAdapter(api_key=api_key, base_url=base_url)
+        base = OpenAIAdapter(api_key=api_key, base_url=base_url,
+                             cache_control=cache_control)
     elif provider == "minimax":
         from adapters.llm.minimax import MinimaxAdapter
-        base = MinimaxAdapter(api_key=api_key, base_url=base_url)
+        base = MinimaxAdapter(api_key=api_key, base_url=base_url,
+                              cache_control=cache_control)
     elif provider == "ollama":
         from adapters.llm.ollama import OllamaAdapter
         base = OllamaAdapter(api_key=api_key, base_url=base_url)
     else:
         # Treat unknown providers as OpenAI-compatible (anthropic, deepseek, custom, etc.)
         from adapters.llm.openai import OpenAIAdapter
-        base = OpenAIAdapter(api_key=api_key, base_url=base_url)
+        base = OpenAIAdapter(api_key=api_key, base_url=base_url,
+                             cache_control=cache_control)
 
     # Wrap with resilience layer (retry + circuit breaker + model failover)
     from adapters.llm.resilience import ResilientLLM, CredentialRotator
@@ -1590,9 +1655,12 @@ def _build_memory(config: dict, agent_id: str = ""):
 
     Embedding provider is configured via config.memory.embedding:
         embedding:
-          provider: openai | flock | local | chromadb_default
+          provider: openai | flock | local | hashing | chromadb_default
           model: text-embedding-3-small
           api_key_env: OPENAI_API_KEY
+
+    ``backend: vector`` selects the built-in vector store (no chromadb);
+    ``memory.vector.ivf_threshold`` / ``nprobe`` tune its IVF index.
     """
     backend = config.get("memory", {}).get("backend", "chroma")
     if agent_id:
@@ -1618,6 +1686,12 @@ def _build_memory(config: dict, agent_id: str = ""):
     elif backend == "chroma":
         from adapters.memory.chroma import ChromaAdapter
         return ChromaAdapter(persist_dir=persist_dir, embedding_fn=embedding_fn)
+    elif backend == "vector":
+        from adapters.memory.vector_store import VectorMemory
+        vcfg = config.get("memory", {}).get("vector", {})
+        return VectorMemory(persist_dir=persist_dir, embedding_fn=embedding_fn,
+                            **{k: vcfg[k] for k in ("ivf_threshold", "nprobe")
+                               if k in vcfg})
     elif backend == "mock":
         from adapters.memory.mock import MockMemory
         return MockMemory()
@@ -1709,70 +1783,71 @@ def _auto_create_kb_note(kb, task, result: str, agent_id: str) -> None:
                      agent_id, e)
 
 
-def _extract_and_store_memories(agent, task, result: str) -> None:
-    """
-    Extract reusable knowledge from a completed task and store
-    in episodic memory + shared knowledge base.
-
-    Called after task completion, non-blocking.
-    """
-    try:
-        from adapters.memory.extractor import (
-            extract_cases, extract_patterns, extract_insight)
-
-        agent_id = agent.cfg.agent_id
-
+def _persist_extractions(agent, records: list[dict]) -> None:
+    """Batch of ``_extract_and_store_memories`` records: per-task extraction
+    (cases, patterns, insight, KB note), then one FTS5 connection, one
+    MEMORY.md refresh and one DocUpdater check for the whole batch."""
+    agent_id = agent.cfg.agent_id
+    qmd = None
+    for r in records:
+        task = SimpleNamespace(task_id=r["task_id"], description=r["description"])
+        result = r["result"]
         # V0.03+: Strip conversation history before memory extraction
         # to prevent dialogue metadata from polluting cases/patterns/KB
         clean_desc = _extract_current_task(task.description)
+        try:
+            from adapters.memory.extractor import (
+                extract_cases, extract_patterns, extract_insight)
+
+            # Extract and store cases
+            if agent.episodic:
+                cases = extract_cases(clean_desc, result, agent_id)
+                for case in cases:
+                    agent.episodic.save_case(
+                        problem=case["problem"],
+                        solution=case["solution"],
+                        tags=case.get("tags", []),
+                        source_task_id=task.task_id,
+                    )
 
-        # Extract and store cases
-        if agent.episodic:
-            cases = extract_cases(clean_desc, result, agent_id)
-            for case in cases:
-                agent.episodic.save_case(
-                    problem=case["problem"],
-                    solution=case["solution"],
-                    tags=case.get("tags", []),
-                    source_task_id=task.task_id,
-                )
-
-            patterns = extract_patterns(clean_desc, result, agent_id)
-            for pat in patterns:
-                agent.episodic.save_pattern(
-                    pattern=pat["pattern"],
-                    evidence=pat["evidence"],
-                    tags=pat.get("tags", []),
-                )
+                patterns = extract_patterns(clean_desc, result, agent_id)
+                for pat in patterns:
+                    agent.episodic.save_pattern(
+                        pattern=pat["pattern"],
+                        evidence=pat["evidence"],
+                        tags=pat.get("tags", []),
+                    )
 
-        # Extract and publish cross-agent insight
-        if agent.kb:
-            insight = extract_insight(clean_desc, result, agent_id)
-            if insight:
-                agent.kb.add_insight(agent_id, insight)
-                logger.debug("[%s] published insight to KB", agent_id)
+            # Extract and publish cross-agent insight
+            if agent.kb:
+                insight = extract_insight(clean_desc, result, agent_id)
+                if insight:
+                    agent.kb.add_insight(agent_id, insight)
+                    logger.debug("[%s] published insight to KB", agent_id)
 
-            # Auto-create KB note from significant task results
-            _auto_create_kb_note(agent.kb, task, result, agent_id)
+                # Auto-create KB note from significant task results
+                _auto_create_kb_note(agent.kb, task, result, agent_id)
 
-    except Exception as e:
-        logger.debug("[%s] memory extraction failed (non-critical): %s",
-                     agent.cfg.agent_id, e)
+        except Exception as e:
+            logger.debug("[%s] memory extraction failed (non-critical): %s",
+                         agent_id, e)
 
-    # FTS5 incremental indexing — index task result for future search
-    try:
-        from core.search import QMD
-        qmd = QMD()
-        qmd.index(
-            title=clean_desc[:120],
-            content=result[:2000],
-            collection="memory",
-            agent_id=agent_id,
-            source_type="episode",
-        )
+        # FTS5 incremental indexing — index task result for future search
+        try:
+            if qmd is None:
+                from core.search import QMD
+                qmd = QMD()
+            qmd.index(
+                title=clean_desc[:120],
+                content=result[:2000],
+                collection="memory",
+                agent_id=agent_id,
+                source_type="episode",
+            )
+        except Exception as _e:
+            logger.debug("FTS5 search indexing skipped: %s", _e)
+    if qmd is not None:
         qmd.close()
-    except Exception as _e:
-        logger.debug("FTS5 search indexing skipped: %s", _e)
 
     # Refresh MEMORY.md from episodic data
     if agent.episodic:
@@ -1784,11 +1859,39 @@ def _extract_and_store_memories(agent, task, result: str) -> None:
     # Auto-update docs (error pattern detection + lesson consolidation)
     try:
         from core.doc_updater import DocUpdater
-        updater = DocUpdater(agent.cfg.agent_id)
+        updater = DocUpdater(agent_id)
         updater.check_and_update()
     except Exception as _e:
         logger.debug("DocUpdater check failed: %s", _e)
 
+    # New cases / insights — cached recall results are stale
+    recall = getattr(agent, "_recall", None)
+    if recall is not None:
+        recall.invalidate()
+
+
+def _extract_and_store_memories(agent, task, result: str) -> None:
+    """
+    Extract reusable knowledge from a completed task and store
+    in episodic memory + shared knowledge base.
+
+    Called after task completion, non-blocking: with a write-behind
+    ``agent.writer`` the record is journaled and ``_persist_extractions``
+    runs in the writer thread; otherwise it runs inline.
+    """
+    record = {"task_id": task.task_id, "description": task.description,
+              "result": result}
+    writer = getattr(agent, "writer", None)
+    if writer is not None:
+        try:
+            writer.submit("extract", **record)
+            record = None
+        except Exception as e:
+            logger.debug("[%s] memory write-behind unavailable: %s",
+                         agent.cfg.agent_id, e)
+    if record is not None:
+        _persist_extractions(agent, [record])
+
     # ── Memo Protocol auto-upload hook (V0.03) ───────────────────────────
     try:
         from adapters.memo.config import MemoConfig
@@ -1834,8 +1937,12 @@ class Orchestrator:
     def __init__(self, config_path: str = "config/agents.yaml"):
         with open(config_path) as f:
             self.config = yaml.safe_load(f)
-        self.bus    = ContextBus()
-        self.board  = TaskBoard()
+        self.bus    = ContextBus(
+            engine=self.config.get("context_bus", {}).get("engine"))
+        # Storage engine: json (default) | sqlite — explicit sqlite migrates
+        # an existing .task_board.json once; later TaskBoard() calls auto-detect.
+        self.board  = TaskBoard(
+            engine=self.config.get("task_board", {}).get("engine"))
         self._shutting_down = False
 
         # ── AgentRuntime (Phase 1) ──
@@ -1843,11 +1950,15 @@ class Orchestrator:
         self.runtime = create_runtime(self.config)
 
         # WakeupBus: event-driven agent wakeup (zero-delay subtask dispatch)
-        # Use DualWakeupBus matching the runtime mode (process vs async)
+        # Use DualWakeupBus matching the runtime mode: asyncio events for
+        # in_process, per-agent task signal sockets for child processes
+        # (role-filtered by TaskBoard), mp.Event where AF_UNIX is missing.
+        from core.runtime.wakeup import DualWakeupBus, HAS_UNIX_SOCKETS
         runtime_mode = self.config.get("runtime", {}).get("mode", "process")
         if runtime_mode == "in_process":
-            from core.runtime.wakeup import DualWakeupBus
             self.wakeup = DualWakeupBus(mode="async")
+        elif HAS_UNIX_SOCKETS:
+            self.wakeup = DualWakeupBus(mode="socket")
         else:
             from core.wakeup import WakeupBus
             self.wakeup = WakeupBus()
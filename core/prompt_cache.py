@@ -0,0 +1,169 @@
+"""
+core/prompt_cache.py
+Stat-validated cache for system-prompt sections.
+
+    text = prompt_cache.section("skills", key, build)
+
+``build()`` runs only on a miss.  While it runs, every file or directory
+it reads is registered through ``track(path)``, which records a stat key
+(mtime_ns, size, inode — or None when the path is missing).  Later calls
+re-stat those paths and return the cached value when every key matches,
+so an unchanged section costs one ``stat`` per dependency and no opens or
+reads.  Editing, adding or removing a tracked file (or an entry of a
+tracked directory) changes a key and rebuilds the section on the next
+call, which keeps the hot-reload behaviour of ``SkillLoader`` intact
+(Evolution Engine patches are visible to the very next task).
+
+Each rebuild is hashed; ``digest()`` exposes the content hash, and
+``stats()`` reports per-section hits / misses / rebuilds whose content
+actually changed (published as ``heartbeat.metrics["prompt_cache"]``).
+Sections with no file dependencies (e.g. the tools prompt) are keyed on
+their inputs only and never rebuild.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+from typing import Callable, Hashable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+MAX_ENTRIES = 256      # (section, key) pairs kept before the oldest is evicted
+
+
+def stat_key(path: str) -> Optional[tuple[int, int, int]]:
+    """(mtime_ns, size, inode) of ``path``, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _digest(value) -> str:
+    if isinstance(value, str):
+        raw = value.encode("utf-8", "surrogatepass")
+    else:
+        raw = repr(value).encode("utf-8", "surrogatepass")
+    return hashlib.sha1(raw).hexdigest()
+
+
+class _Entry:
+    __slots__ = ("value", "deps", "digest")
+
+    def __init__(self, value, deps: dict, digest: str):
+        self.value = value
+        self.deps = deps
+        self.digest = digest
+
+
+class _SectionStats:
+    __slots__ = ("hits", "misses", "changed")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.changed = 0      # rebuilds whose content hash differed
+
+    def snapshot(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "changed": self.changed,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+class PromptCache:
+    """Per-process cache of prompt sections keyed by (section, key)."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: dict[tuple[str, Hashable], _Entry] = {}
+        self._stats: dict[str, _SectionStats] = {}
+        self._mu = threading.RLock()
+        self._local = threading.local()
+
+    # ── Public ──
+
+    def section(self, name: str, key: Hashable,
+                build: Callable[[], T]) -> T:
+        """Cached ``build()`` for ``(name, key)`` while its tracked paths
+        are unchanged."""
+        ck = (name, key)
+        with self._mu:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = _SectionStats()
+            entry = self._entries.get(ck)
+            if entry is not None and all(
+                    stat_key(p) == k for p, k in entry.deps.items()):
+                stats.hits += 1
+                # An enclosing section depends on everything this one read
+                frames = self._frames()
+                if frames:
+                    frames[-1].update(entry.deps)
+                return entry.value
+
+            stats.misses += 1
+            frames = self._frames()
+            frames.append({})
+            try:
+                value = build()
+            finally:
+                deps = frames.pop()
+            # An enclosing section depends on everything this one read
+            if frames:
+                frames[-1].update(deps)
+            digest = _digest(value)
+            if entry is None or entry.digest != digest:
+                stats.changed += 1
+            self._entries.pop(ck, None)
+            self._entries[ck] = _Entry(value, deps, digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            return value
+
+    def track(self, path: str) -> None:
+        """Register ``path`` as a dependency of the section being built.
+
+        Call before reading so a write racing the read is caught next time.
+        """
+        frames = self._frames()
+        if frames and path not in frames[-1]:
+            frames[-1][path] = stat_key(path)
+
+    def digest(self, name: str, key: Hashable) -> str:
+        """Content hash of the cached value ('' if not cached)."""
+        entry = self._entries.get((name, key))
+        return entry.digest if entry is not None else ""
+
+    def invalidate(self, name: str | None = None) -> None:
+        with self._mu:
+            if name is None:
+                self._entries.clear()
+            else:
+                for ck in [ck for ck in self._entries if ck[0] == name]:
+                    del self._entries[ck]
+
+    def stats(self) -> dict:
+        with self._mu:
+            return {name: s.snapshot() for name, s in self._stats.items()}
+
+    # ── Internal ──
+
+    def _frames(self) -> list[dict]:
+        frames = getattr(self._local, "frames", None)
+        if frames is None:
+            frames = self._local.frames = []
+        return frames
+
+
+# Shared by every SkillLoader / BaseAgent in the process
+prompt_cache = PromptCache()
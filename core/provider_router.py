@@ -53,6 +53,8 @@ import random
 from dataclasses import dataclass, field
 from typing import Optional, AsyncIterator
 
+from adapters.llm import transport
+
 logger = logging.getLogger(__name__)
 
 
@@ -420,7 +422,11 @@ class ProviderRouter:
             await self._probe_one(entry)
 
     async def _probe_one(self, entry: ProviderEntry):
-        """Send a minimal health check to a provider."""
+        """Send a minimal health check to a provider.
+
+        Goes through the adapter, so it uses (and keeps warm) the same
+        pooled connection as real traffic.
+        """
         model = entry.models[0] if entry.models else "gpt-4o-mini"
         messages = [{"role": "user", "content": "ping"}]
 
@@ -482,6 +488,7 @@ class ProviderRouter:
             "total_calls": total_calls,
             "total_tokens": total_tokens,
             "providers": providers,
+            "transport": transport.stats(),
         }
 
     def get_provider_health(self, name: str) -> dict | None:
@@ -0,0 +1,139 @@
+"""
+core/recall.py
+Concurrent long-term recall for ``BaseAgent._recall_long_term``.
+
+Each memory source (MEMORY.md, episodic, error patterns, knowledge base,
+hybrid vector/BM25, FTS5) is a ``(name, fn(query) -> str)`` pair.
+``RecallPipeline.run`` submits every source to a shared thread pool at
+once and waits up to one deadline; sources that miss it are skipped for
+this prompt (their result still lands in the cache when they finish, so
+the next identical recall is instant).  Sections are returned in source
+order regardless of completion order, so prompt layout and the
+per-source token budgets are unchanged.
+
+Results are cached per ``(source, query)`` for a short TTL — retries,
+critique rounds and subtasks often recall the same description within
+seconds.  The agent invalidates the cache when it writes new memories.
+
+Per-source latency histograms, deadline misses and cache hits are
+exposed via ``stats()`` (published as ``heartbeat.metrics["recall"]``).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Optional
+
+from core.runtime.wakeup import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+RECALL_TIMEOUT = 0.8      # seconds — shared deadline for all sources
+CACHE_TTL = 30.0          # seconds a (source, query) result is reused
+CACHE_MAX = 256           # entries per pipeline
+POOL_WORKERS = 16
+
+RecallSource = tuple[str, Callable[[str], str]]
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _executor() -> ThreadPoolExecutor:
+    """Process-wide recall pool (shared by in-process agents)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=POOL_WORKERS,
+                                       thread_name_prefix="recall")
+        return _pool
+
+
+class RecallPipeline:
+    """Fan-out over recall sources with a deadline and a TTL cache."""
+
+    def __init__(self, timeout: float = RECALL_TIMEOUT, ttl: float = CACHE_TTL):
+        self.timeout = timeout
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[tuple[str, str], tuple[float, str]] = OrderedDict()
+        self._generation = 0          # bumped by invalidate()
+        self._latency: dict[str, LatencyHistogram] = {}
+        self._misses: dict[str, int] = defaultdict(int)
+        self._errors: dict[str, int] = defaultdict(int)
+        self.cache_hits = 0
+
+    def run(self, query: str, sources: list[RecallSource]) -> list[str]:
+        """Non-empty sections in ``sources`` order; late/failed sources omitted."""
+        results: dict[str, str] = {}
+        pending = {}
+        now = time.monotonic()
+        with self._lock:
+            generation = self._generation
+            for name, _fn in sources:
+                hit = self._cache.get((name, query))
+                if hit and hit[0] > now:
+                    results[name] = hit[1]
+                    self.cache_hits += 1
+        for name, fn in sources:
+            if name not in results:
+                fut = _executor().submit(self._call, name, fn, query, generation)
+                pending[fut] = name
+
+        if pending:
+            done, late = wait(pending, timeout=self.timeout)
+            for fut in done:
+                name = pending[fut]
+                try:
+                    results[name] = fut.result()
+                except Exception as e:
+                    with self._lock:
+                        self._errors[name] += 1
+                    logger.debug("[recall] %s failed: %s", name, e)
+            for fut in late:
+                with self._lock:
+                    self._misses[pending[fut]] += 1
+            if late:
+                logger.info("[recall] skipped %s (missed %.0fms deadline)",
+                            ", ".join(sorted(pending[f] for f in late)),
+                            self.timeout * 1000)
+
+        return [results[name] for name, _ in sources if results.get(name)]
+
+    def _call(self, name: str, fn: Callable[[str], str], query: str,
+              generation: int) -> str:
+        t0 = time.perf_counter()
+        try:
+            value = fn(query) or ""
+        finally:
+            ms = (time.perf_counter() - t0) * 1000
+            with self._lock:
+                self._latency.setdefault(name, LatencyHistogram()).observe(ms)
+        with self._lock:
+            if generation == self._generation:     # not stale after a write
+                self._cache[(name, query)] = (time.monotonic() + self.ttl, value)
+                self._cache.move_to_end((name, query))
+                while len(self._cache) > CACHE_MAX:
+                    self._cache.popitem(last=False)
+        return value
+
+    def invalidate(self) -> None:
+        """Drop cached results (call after writing to any memory layer)."""
+        with self._lock:
+            self._cache.clear()
+            self._generation += 1
+
+    def stats(self) -> dict:
+        """Per-source latency histograms plus deadline misses and errors."""
+        with self._lock:
+            sources = {
+                name: {**hist.snapshot(), "missed": self._misses.get(name, 0),
+                       "errors": self._errors.get(name, 0)}
+                for name, hist in self._latency.items()
+            }
+            return {"sources": sources, "cache_hits": self.cache_hits,
+                    "timeout_ms": round(self.timeout * 1000)}
@@ -218,6 +218,8 @@ class InProcessRuntime:
         if self._tasks:
             await asyncio.gather(*self._tasks.values(),
                                  return_exceptions=True)
+        from adapters.llm import transport
+        await transport.aclose()
 
     async def wait_any_alive(self, poll_interval: float = 0.5):
         """Poll until no agents are alive (for ChannelManager)."""
@@ -3,8 +3,13 @@ core/runtime/lazy.py — LazyRuntime: on-demand agent startup.
 
 Wraps a delegate runtime (ProcessRuntime or InProcessRuntime) and adds:
   - **always_on**: agents that are started immediately and never stopped
-  - **idle_shutdown**: seconds before idle agents auto-shutdown
+  - **idle_shutdown**: seconds before idle agents auto-shutdown (exact
+    per-agent deadlines)
+  - **task events**: pending work for a stopped agent's role starts it as
+    soon as the TaskBoard commits it (no board polling while quiet)
   - **ensure_running()**: start an agent on demand if it's not running
+  - **delegate: zygote**: fork agents from a pre-warmed parent
+    (``core/runtime/zygote.py``) instead of cold ``mp.Process`` starts
 
 This gives the best of both worlds:
   - DIRECT_ANSWER requests: only Leo runs (~600MB saved)
@@ -27,12 +32,55 @@ Usage::
 from __future__ import annotations
 
 import logging
+import os
+import select
+import socket
 import threading
 import time
 from typing import Any, Optional
 
 logger = logging.getLogger(__name__)
 
+RESYNC_INTERVAL = 60.0   # safety board re-read (dropped task events)
+POLL_FALLBACK = 2.0      # board re-read interval without Unix sockets
+# Statuses whose transitions count as activity for the task's role
+_BUSY_STATUSES = frozenset({"claimed", "review", "critique"})
+
+
+class PendingByRole:
+    """Pending task ids per ``required_role``, kept from status events."""
+
+    def __init__(self):
+        self._role: dict[str, str] = {}            # pending task → role
+        self._pending: dict[str, set[str]] = {}    # role → pending tasks
+
+    def rebuild(self, data: dict) -> None:
+        self._role.clear()
+        self._pending.clear()
+        for tid, t in data.items():
+            self.apply(tid, t.get("status", "pending"),
+                       t.get("required_role") or "")
+
+    def apply(self, task_id: str, status: str, role: str) -> bool:
+        """Record a transition; True if ``task_id`` became pending."""
+        old = self._role.pop(task_id, None)
+        if old is not None:
+            tasks = self._pending[old]
+            tasks.discard(task_id)
+            if not tasks:
+                del self._pending[old]
+        if status == "pending" and role:
+            self._role[task_id] = role
+            self._pending.setdefault(role, set()).add(task_id)
+            return old is None
+        return False
+
+    def roles(self) -> list[str]:
+        return list(self._pending)
+
+    def counts(self) -> dict[str, int]:
+        return {role: len(tasks) for role, tasks in self._pending.items()}
+
 
 class LazyRuntime:
     """On-demand agent lifecycle with idle auto-shutdown.
@@ -53,6 +101,10 @@ class LazyRuntime:
         if delegate_mode == "in_process":
             from core.runtime.in_process import InProcessRuntime
             self._delegate = InProcessRuntime()
+        elif delegate_mode == "zygote":
+            from core.runtime.zygote import ZygoteRuntime
+            self._delegate = ZygoteRuntime(
+                preload=runtime_cfg.get("zygote", {}).get("preload", []))
         else:
             from core.runtime.process import ProcessRuntime
             self._delegate = ProcessRuntime()
@@ -63,9 +115,15 @@ class LazyRuntime:
         self._config: dict = config
         self._wakeup: Any = None
 
-        # Idle monitor thread
+        # Monitor thread: task events + idle deadlines
         self._monitor_thread: Optional[threading.Thread] = None
         self._stop_monitor = threading.Event()
+        self._wake_r: Optional[socket.socket] = None
+        self._wake_w: Optional[socket.socket] = None
+        self._pending = PendingByRole()
+        self._synced_at = 0.0
+        self.events = 0
+        self.resyncs = 0
 
     # ── AgentRuntime interface ───────────────────────────────────────────
 
@@ -91,6 +149,10 @@ class LazyRuntime:
         """Register all agents but only start always_on ones."""
         self._config = config
         self._wakeup = wakeup
+        # Zygote delegate: import the stack once, before any agent is needed
+        # and before the idle monitor thread exists (the zygote is forked)
+        if hasattr(self._delegate, "warm"):
+            self._delegate.warm(wakeup)
         for agent_def in config.get("agents", []):
             self.start(agent_def, config, wakeup)
         # Start the idle monitor
@@ -111,6 +173,7 @@ class LazyRuntime:
 
     def stop_all(self) -> None:
         self._stop_monitor.set()
+        self._wake_monitor()
         if self._monitor_thread and self._monitor_thread.is_alive():
             self._monitor_thread.join(timeout=3)
         self._delegate.stop_all()
@@ -139,6 +202,7 @@ class LazyRuntime:
         t0 = time.time()
         self._delegate.start(agent_def, cfg, wk)
         self._last_activity[agent_id] = time.time()
+        self._wake_monitor()        # new idle deadline
         elapsed = round(time.time() - t0, 2)
         logger.info("[runtime:lazy] '%s' started in %.2fs", agent_id, elapsed)
 
@@ -165,31 +229,114 @@ class LazyRuntime:
     # ── monitors ──────────────────────────────────────────────────────────
 
     def _start_idle_monitor(self):
-        """Background thread: idle shutdown + on-demand startup.
-
-        Two responsibilities:
-        1. Stop agents idle longer than ``idle_shutdown``.
-        2. Start non-running agents when new subtasks appear on the TaskBoard
-           (Leo creates subtasks → Jerry/Alic need to be alive to claim them).
+        """Background thread: on-demand startup + idle shutdown.
+
+        Event-driven: the thread binds a task-watch socket and sleeps in
+        ``select()`` until a committed status transition arrives, the
+        nearest idle deadline passes, or the safety re-sync is due.
+
+        1. Status events update per-role pending counters
+           (``PendingByRole``); a role with pending work starts its
+           non-running agents immediately.
+        2. Each running non-always_on agent has an exact idle deadline
+           (last activity + ``idle_shutdown``); the thread wakes at the
+           earliest one.
         """
-
-        def _monitor():
-            while not self._stop_monitor.is_set():
-                self._stop_monitor.wait(timeout=2)  # check every 2s
-                if self._stop_monitor.is_set():
-                    break
-                self._check_pending_subtasks()
-                # Idle check less frequently (every ~60s)
-                if self._idle_shutdown > 0:
-                    if int(time.time()) % 60 < 3:
-                        self._check_idle_agents()
-
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_w.setblocking(False)
         self._monitor_thread = threading.Thread(
-            target=_monitor, name="lazy-idle-monitor", daemon=True)
+            target=self._monitor, name="lazy-idle-monitor", daemon=True)
         self._monitor_thread.start()
 
+    def _monitor(self):
+        listener = self._bind_watch()
+        interval = RESYNC_INTERVAL if listener else POLL_FALLBACK
+        next_resync = 0.0
+        try:
+            while not self._stop_monitor.is_set():
+                if time.monotonic() >= next_resync:
+                    self._check_pending_subtasks()
+                    next_resync = time.monotonic() + interval
+                idle_at = self._next_idle_deadline()
+                timeout = next_resync - time.monotonic()
+                if idle_at is not None:
+                    timeout = min(timeout, idle_at - time.time())
+                fds = [self._wake_r] + ([listener] if listener else [])
+                try:
+                    readable, _, _ = select.select(fds, [], [],
+                                                   max(timeout, 0.0))
+                except (OSError, ValueError):
+                    break                       # sockets closed by stop_all
+                if self._wake_r in readable:
+                    try:
+                        self._wake_r.recv(4096)
+                    except OSError:
+                        pass
+                if listener is not None and listener in readable:
+                    if self._apply_events(listener.drain()):
+                        self._start_needed()
+                if idle_at is not None and time.time() >= idle_at:
+                    self._check_idle_agents()
+        finally:
+            if listener is not None:
+                listener.close()
+            self._wake_r.close()
+            self._wake_w.close()
+
+    def _wake_monitor(self):
+        """Interrupt the monitor's wait (deadlines changed / stopping)."""
+        if self._wake_w is not None:
+            try:
+                self._wake_w.send(b"x")
+            except OSError:
+                pass
+
+    def _bind_watch(self):
+        from core.runtime.wakeup import (HAS_UNIX_SOCKETS, TaskSignalListener,
+                                         watch_socket_path)
+        if not HAS_UNIX_SOCKETS:
+            return None
+        name = f"lazy-{os.getpid()}"
+        try:
+            return TaskSignalListener(name, watch_socket_path(name))
+        except OSError as e:
+            logger.warning("[runtime:lazy] task events unavailable, "
+                           "polling the board: %s", e)
+            return None
+
+    def _apply_events(self, signals: list[dict]) -> bool:
+        """Apply status events; True if any task became pending."""
+        from core.task_board import _ROLE_TO_AGENTS
+        added = False
+        now = time.time()
+        for sig in signals:
+            if sig.get("kind") != "status":
+                continue
+            # Committed before the last board read — already counted
+            if not isinstance(sig.get("ts"), (int, float)) or \
+                    sig["ts"] < self._synced_at:
+                continue
+            for tid, _parent, status, *role in sig.get("tasks", ()):
+                role = role[0] if role else ""
+                self.events += 1
+                added |= self._pending.apply(tid, status, role)
+                # Work moving through a role keeps its agents from idling
+                if status in _BUSY_STATUSES:
+                    for aid in _ROLE_TO_AGENTS.get(role, ()):
+                        if aid in self._last_activity:
+                            self._last_activity[aid] = now
+        return added
+
+    def _next_idle_deadline(self) -> Optional[float]:
+        if self._idle_shutdown <= 0:
+            return None
+        deadlines = [last + self._idle_shutdown
+                     for aid, last in list(self._last_activity.items())
+                     if aid not in self._always_on and self.is_alive(aid)]
+        return min(deadlines, default=None)
+
     def _check_idle_agents(self):
-        """Stop agents that have been idle longer than idle_shutdown."""
+        """Stop agents that have been idle for ``idle_shutdown`` seconds."""
         now = time.time()
         for agent_id in list(self._last_activity.keys()):
             if agent_id in self._always_on:
@@ -198,10 +345,10 @@ class LazyRuntime:
                 continue  # already stopped
 
             idle_secs = now - self._last_activity.get(agent_id, now)
-            if idle_secs > self._idle_shutdown:
+            if idle_secs >= self._idle_shutdown:
                 logger.info(
                     "[runtime:lazy] stopping idle agent '%s' "
-                    "(idle %.0fs > %ds threshold)",
+                    "(idle %.0fs >= %ds threshold)",
                     agent_id, idle_secs, self._idle_shutdown)
                 try:
                     self._delegate.stop(agent_id)
@@ -211,43 +358,43 @@ class LazyRuntime:
                         agent_id, e)
 
     def _check_pending_subtasks(self):
-        """Auto-start agents when pending subtasks need them.
+        """Re-count pending work from one board read, then start agents.
 
-        Reads the TaskBoard for PENDING tasks with ``required_role`` that
-        maps to a non-running agent, and starts that agent on demand.
+        Seeds the counters when the monitor starts and re-syncs them every
+        ``RESYNC_INTERVAL`` seconds (``POLL_FALLBACK`` without task events)
+        in case a datagram was dropped.
         """
         try:
-            from core.task_board import TaskBoard, _ROLE_TO_AGENTS
-            board = TaskBoard()
-            data = board._read()
-            if not data:
-                return
-
-            # Find pending tasks with specific role requirements
-            needed_agents: set[str] = set()
-            for tid, t in data.items():
-                if t.get("status") != "pending":
-                    continue
-                role = t.get("required_role", "")
-                if not role:
-                    continue
-                # Map role to agent IDs
-                candidate_ids = _ROLE_TO_AGENTS.get(role, set())
-                for cid in candidate_ids:
-                    # Only care about agents we manage
-                    if cid in self._agent_defs and not self.is_alive(cid):
-                        needed_agents.add(cid)
-
-            # Start needed agents
-            for agent_id in needed_agents:
-                logger.info(
-                    "[runtime:lazy] pending tasks need '%s' — starting",
-                    agent_id)
-                self.ensure_running(agent_id)
-
+            from core.task_board import TaskBoard
+            started = time.time()
+            data = TaskBoard()._read()
+            self._pending.rebuild(data or {})
+            self._synced_at = started
+            self.resyncs += 1
+            self._start_needed()
         except Exception as e:
             logger.debug("[runtime:lazy] subtask check failed: %s", e)
 
+    def _start_needed(self):
+        """Start non-running agents whose role has pending tasks."""
+        from core.task_board import _ROLE_TO_AGENTS
+        for role in self._pending.roles():
+            for agent_id in _ROLE_TO_AGENTS.get(role, ()):
+                # Only care about agents we manage
+                if agent_id in self._agent_defs and not self.is_alive(agent_id):
+                    logger.info(
+                        "[runtime:lazy] pending tasks need '%s' — starting",
+                        agent_id)
+                    try:
+                        self.ensure_running(agent_id)
+                    except Exception as e:
+                        logger.warning("[runtime:lazy] failed to start "
+                                       "'%s': %s", agent_id, e)
+
+    def monitor_stats(self) -> dict:
+        return {"pending_by_role": self._pending.counts(),
+                "events": self.events, "resyncs": self.resyncs}
+
     def touch(self, agent_id: str):
         """Update last-activity timestamp (called when agent does work)."""
         self._last_activity[agent_id] = time.time()
@@ -12,7 +12,6 @@ import json
 import logging
 import multiprocessing as mp
 import os
-import signal
 import time
 from typing import Any, Optional
 
@@ -52,8 +51,16 @@ def _build_agent_cfg_dict(agent_def: dict, config: dict) -> dict:
                                      .get("episodic_recall_budget", 1500),
         "kb_recall_budget":       agent_def.get("memory", {})
                                      .get("kb_recall_budget", 800),
+        "recall_timeout_ms":      agent_def.get("memory", {})
+                                     .get("recall_timeout_ms", 800),
+        "recall_cache_ttl":       agent_def.get("memory", {})
+                                     .get("recall_cache_ttl", 30.0),
         # Tool configuration (OpenClaw-inspired)
         "tools_config":         agent_def.get("tools", {}),
+        # System prompt layout: classic | cache (stable prefix first)
+        "prompt_layout":        agent_def.get("prompt_layout")
+                                    or config.get("llm", {})
+                                    .get("prompt_layout", "classic"),
     }
 
 
@@ -80,6 +87,7 @@ class ProcessRuntime:
         p = mp.Process(
             target=_agent_process,
             args=(cfg_dict, agent_def, config, wakeup),
+            kwargs={"started_at": time.time(), "start_mode": "process"},
             name=agent_id,
             daemon=False,
         )
@@ -118,10 +126,10 @@ class ProcessRuntime:
         while time.time() < deadline and p.is_alive():
             time.sleep(0.5)
 
-        # Force SIGTERM
+        # Force SIGTERM (through the handle — never a bare, maybe-reused pid)
         if p.is_alive():
             try:
-                os.kill(p.pid, signal.SIGTERM)
+                p.terminate()
             except OSError:
                 pass
 
@@ -145,7 +153,7 @@ class ProcessRuntime:
         for p in self._procs.values():
             if p.is_alive():
                 try:
-                    os.kill(p.pid, signal.SIGTERM)
+                    p.terminate()
                 except OSError:
                     pass
 
@@ -1,11 +1,23 @@
 """
 core/runtime/wakeup.py — Dual-mode WakeupBus.
 
-Supports two backends transparently:
+Supports three backends transparently:
   - **process mode** (default): uses ``multiprocessing.Event``
     for cross-process wakeup (same as original ``core/wakeup.py``).
   - **async mode**: uses ``asyncio.Event`` for in-process
     coroutine wakeup (InProcessRuntime).
+  - **socket mode**: one Unix-domain datagram socket per agent under
+    ``.task_signals/<agent_id>.sock``.  Any process — agent, gateway,
+    channel manager — that makes a task claimable (create, unblock,
+    resume, retry, stale recovery) sends a datagram to exactly the agents
+    whose role may claim it (see ``TaskBoard._emit_ready``), so idle
+    agents wake within milliseconds instead of on their backoff timer.
+    Each listener records dispatch latency in a ``LatencyHistogram``.
+
+Task-tree watchers (``core.task_watch``) bind sockets of their own under
+``.task_signals/watch/``; every TaskBoard commit that changes task
+statuses sends them one ``{"kind": "status"}`` datagram (see
+``TaskBoard._emit_status``).
 
 The agent loop code (``_agent_loop``) calls ``wakeup.async_wait()``
 and ``wakeup.wake_all()`` identically regardless of backend.
@@ -26,12 +38,212 @@ Usage::
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 import multiprocessing
+import os
+import socket
+import time
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+SIGNAL_DIR = ".task_signals"
+WATCH_DIR = os.path.join(SIGNAL_DIR, "watch")
+_SOCK_SUFFIX = ".sock"
+_MAX_DATAGRAM = 4096   # receive buffer per datagram
+
+# Unix-domain sockets are unavailable on Windows — socket mode degrades
+# to plain timeouts there (agents still poll the board on backoff).
+HAS_UNIX_SOCKETS = hasattr(socket, "AF_UNIX")
+
+
+# ── Dispatch latency histogram ───────────────────────────────────────────
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds)."""
+
+    BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)   # last = overflow
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        ms = max(ms, 0.0)
+        for i, bound in enumerate(self.BUCKETS_MS):
+            if ms <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += 1
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, q: float) -> float:
+        """Upper bucket bound containing the q-quantile (0 < q <= 1)."""
+        if not self.total:
+            return 0.0
+        rank = q * self.total
+        seen = 0
+        for i, n in enumerate(self.counts[:-1]):
+            seen += n
+            if seen >= rank:
+                return float(self.BUCKETS_MS[i])
+        return self.max_ms
+
+    def snapshot(self) -> dict:
+        buckets = {f"le_{b}ms": n for b, n in zip(self.BUCKETS_MS, self.counts)}
+        buckets["overflow"] = self.counts[-1]
+        return {
+            "count": self.total,
+            "avg_ms": round(self.sum_ms / self.total, 3) if self.total else 0.0,
+            "p50_ms": self.percentile(0.50),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max_ms, 3),
+            "buckets": buckets,
+        }
+
+
+# ── Task signal sockets ──────────────────────────────────────────────────
+
+def signal_socket_path(agent_id: str) -> str:
+    return os.path.join(SIGNAL_DIR, f"{agent_id}{_SOCK_SUFFIX}")
+
+
+def watch_socket_path(name: str) -> str:
+    return os.path.join(WATCH_DIR, f"{name}{_SOCK_SUFFIX}")
+
+
+def signal_listeners() -> list[str]:
+    """Agent IDs that currently have a bound signal socket."""
+    try:
+        return [f[:-len(_SOCK_SUFFIX)] for f in os.listdir(SIGNAL_DIR)
+                if f.endswith(_SOCK_SUFFIX)]
+    except OSError:
+        return []
+
+
+def watch_listeners() -> list[str]:
+    """Socket paths of the task-tree watchers currently bound."""
+    try:
+        return [os.path.join(WATCH_DIR, f) for f in os.listdir(WATCH_DIR)
+                if f.endswith(_SOCK_SUFFIX)]
+    except OSError:
+        return []
+
+
+_sender: Optional[socket.socket] = None
+_sender_pid = 0
+
+
+def send_signal(agent_id: str, payload: dict) -> bool:
+    """Send one datagram to an agent's signal socket (non-blocking).
+
+    Returns False if nobody is listening.  A full receive queue means the
+    agent already has wakeups pending, so the datagram is simply dropped.
+    """
+    return send_datagram(signal_socket_path(agent_id), payload)
+
+
+def send_datagram(path: str, payload: dict) -> bool:
+    """Send ``payload`` to the socket at ``path`` (see ``send_signal``)."""
+    global _sender, _sender_pid
+    if not HAS_UNIX_SOCKETS:
+        return False
+    if _sender is None or _sender_pid != os.getpid():
+        _sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        _sender.setblocking(False)
+        _sender_pid = os.getpid()
+    data = json.dumps(payload, ensure_ascii=False).encode()
+    try:
+        _sender.sendto(data, path)
+        return True
+    except BlockingIOError:
+        return True
+    except ConnectionRefusedError:
+        # Stale socket file left by a crashed agent
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    except OSError:
+        pass
+    return False
+
+
+class TaskSignalListener:
+    """Per-agent datagram socket the agent loop blocks on while idle.
+
+    ``path`` overrides the socket location (task-tree watchers).
+    """
+
+    def __init__(self, agent_id: str, path: str | None = None):
+        self.agent_id = agent_id
+        self.path = path or signal_socket_path(agent_id)
+        self.histogram = LatencyHistogram()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.bind(self.path)
+        self._sock.setblocking(False)
+
+    def drain(self) -> list[dict]:
+        """Read every queued datagram and record its dispatch latency."""
+        signals: list[dict] = []
+        while True:
+            try:
+                data = self._sock.recv(_MAX_DATAGRAM)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                break
+            now = time.time()
+            try:
+                sig = json.loads(data)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            ts = sig.get("ts")
+            if isinstance(ts, (int, float)):
+                self.histogram.observe((now - ts) * 1000)
+            signals.append(sig)
+        return signals
+
+    def fileno(self) -> int:
+        return self._sock.fileno()
+
+    async def wait(self, timeout: float) -> list[dict]:
+        """Wait up to ``timeout`` seconds for signals; returns them."""
+        signals = self.drain()
+        if signals:
+            return signals
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        fd = self._sock.fileno()
+        loop.add_reader(fd, lambda: fut.done() or fut.set_result(None))
+        try:
+            await asyncio.wait_for(fut, timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            loop.remove_reader(fd)
+        return self.drain()
+
+    def close(self) -> None:
+        try:
+            self._sock.close()
+        finally:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
 
 class DualWakeupBus:
     """Event bus that works in both mp.Process and asyncio.Task modes."""
@@ -42,16 +254,32 @@ class DualWakeupBus:
             mode: "process" for multiprocessing.Event,
                   "async" for asyncio.Event.
         """
-        if mode not in ("process", "async"):
+        if mode not in ("process", "async", "socket"):
             raise ValueError(f"Invalid wakeup mode: {mode}")
         self._mode = mode
         self._mp_events: dict[str, multiprocessing.Event] = {}
         self._async_events: dict[str, asyncio.Event] = {}
+        self._socket_agents: set[str] = set()
+        # Bound lazily in the waiting (child) process — never pickled
+        self._listeners: dict[str, TaskSignalListener] = {}
+        self._listeners_pid = 0
 
     @property
     def mode(self) -> str:
         return self._mode
 
+    @property
+    def routes_task_events(self) -> bool:
+        """True when TaskBoard notifications reach agents directly, so
+        producers need not ``wake_all()`` after creating tasks."""
+        return self._mode == "socket" and HAS_UNIX_SOCKETS
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_listeners"] = {}
+        state["_listeners_pid"] = 0
+        return state
+
     # ── registration ─────────────────────────────────────────────────────
 
     def register(self, agent_id: str):
@@ -63,6 +291,8 @@ class DualWakeupBus:
         """
         if self._mode == "process":
             self._mp_events[agent_id] = multiprocessing.Event()
+        elif self._mode == "socket":
+            self._socket_agents.add(agent_id)
         else:
             # Mark as registered; actual asyncio.Event created on first access
             self._async_events[agent_id] = None  # type: ignore
@@ -83,11 +313,53 @@ class DualWakeupBus:
             self._async_events[agent_id] = ev
         return ev
 
+    # ── internal: per-process socket listeners ──────────────────────────
+
+    def listen(self, agent_id: str) -> Optional[TaskSignalListener]:
+        """Bind (once per process) the signal socket for ``agent_id``.
+
+        Agent loops call this before their first claim so no notification
+        sent between "claim found nothing" and "start waiting" is lost.
+        No-op outside socket mode.
+        """
+        if not self.routes_task_events:
+            return None
+        if self._listeners_pid != os.getpid():
+            self._listeners = {}
+            self._listeners_pid = os.getpid()
+        listener = self._listeners.get(agent_id)
+        if listener is None:
+            try:
+                listener = TaskSignalListener(agent_id)
+            except OSError as e:
+                logger.warning("[wakeup] cannot bind signal socket for %s: %s",
+                               agent_id, e)
+                return None
+            self._listeners[agent_id] = listener
+        return listener
+
+    def close(self, agent_id: str | None = None) -> None:
+        """Close listeners bound in this process (all, or one agent's)."""
+        if self._listeners_pid != os.getpid():
+            return
+        for aid in [agent_id] if agent_id else list(self._listeners):
+            listener = self._listeners.pop(aid, None)
+            if listener:
+                listener.close()
+
+    def latency_stats(self, agent_id: str) -> dict:
+        """Dispatch-latency histogram for a listener bound in this process."""
+        listener = self._listeners.get(agent_id) \
+            if self._listeners_pid == os.getpid() else None
+        return listener.histogram.snapshot() if listener else {}
+
     # ── wake (called by producer: Leo creating subtasks) ─────────────────
 
     def wake(self, agent_id: str):
         """Wake a specific agent."""
-        if self._mode == "process":
+        if self._mode == "socket":
+            send_signal(agent_id, {"kind": "wake", "ts": time.time()})
+        elif self._mode == "process":
             ev = self._mp_events.get(agent_id)
             if ev:
                 ev.set()
@@ -98,7 +370,10 @@ class DualWakeupBus:
 
     def wake_all(self):
         """Wake every registered agent."""
-        if self._mode == "process":
+        if self._mode == "socket":
+            for agent_id in self._socket_agents | set(signal_listeners()):
+                send_signal(agent_id, {"kind": "wake", "ts": time.time()})
+        elif self._mode == "process":
             for ev in self._mp_events.values():
                 ev.set()
         else:
@@ -114,6 +389,12 @@ class DualWakeupBus:
 
         Returns True if woken by signal, False if timed out.
         """
+        if self._mode == "socket":
+            listener = self.listen(agent_id)
+            if listener is None:
+                await asyncio.sleep(timeout)
+                return False
+            return bool(await listener.wait(timeout))
         if self._mode == "process":
             # mp.Event.wait() blocks — run in thread pool
             ev = self._mp_events.get(agent_id)
@@ -144,4 +425,6 @@ class DualWakeupBus:
         """Get raw event for an agent (for passing to child process)."""
         if self._mode == "process":
             return self._mp_events.get(agent_id)
+        if self._mode == "socket":
+            return None
         return self._async_events.get(agent_id)
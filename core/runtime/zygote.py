@@ -0,0 +1,405 @@
+"""
+core/runtime/zygote.py — ZygoteRuntime: agents forked from a warm parent.
+
+With ``ProcessRuntime`` every on-demand start is a fresh ``mp.Process``
+that re-imports the stack (LLM adapters, chromadb, memory adapters,
+extractor, search) before it can claim the subtask that triggered it.
+
+ZygoteRuntime starts one *zygote* process that imports
+``PRELOAD_MODULES`` (plus ``runtime.zygote.preload``) and loads ``.env``
+once, then waits on a pipe.  Each agent start asks the zygote to
+``os.fork()``: the child shares the imported modules copy-on-write and
+goes straight to ``_agent_process``.  The zygote holds no agent state —
+no LLM clients, memory stores, sqlite connections or threads — so it is
+safe to fork, and an idle lazy runtime costs one import-only process
+instead of full agents.
+
+The zygote is the agents' parent, so it reaps them (``waitpid``) and
+reports each exit over the pipe; SIGTERM is also sent by the zygote, and
+only to a child it has not reaped yet.  The runtime never signals a bare
+pid that may already belong to an unrelated process.
+
+The zygote itself is forked once, in ``warm()`` — before the runtime's
+monitor threads exist, so it cannot inherit a lock held by another
+thread.  It is never re-forked from the (by then threaded) runtime.
+
+Enable with::
+
+    runtime:
+      mode: lazy
+      delegate: zygote
+      zygote:
+        preload: [my_tool_module]     # optional extra imports
+
+Every agent reports startup-to-first-claim as
+``heartbeat.metrics["startup"]`` (see ``_agent_loop``).  Without
+``os.fork`` (Windows), before ``warm()`` or once the zygote has died,
+agents start as plain ``mp.Process`` like ``ProcessRuntime``.
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import multiprocessing as mp
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+from typing import Any, Optional
+
+from core.runtime.process import ProcessRuntime, _build_agent_cfg_dict
+
+logger = logging.getLogger(__name__)
+
+PRELOAD_MODULES = (
+    "yaml",
+    "core.orchestrator",
+    "core.agent",
+    "core.skill_loader",
+    "core.usage_tracker",
+    "core.heartbeat",
+    "core.compaction",
+    "core.token_counter",
+    "core.memory_writer",
+    "core.provider_router",
+    "core.search",
+    "reputation.scheduler",
+    "adapters.llm.transport",
+    "adapters.llm.resilience",
+    "adapters.llm.openai",
+    "adapters.llm.minimax",
+    "adapters.llm.flock",
+    "adapters.llm.ollama",
+    "adapters.memory.embedding",
+    "adapters.memory.hybrid",
+    "adapters.memory.chroma",
+    "adapters.memory.vector_store",
+    "adapters.memory.episodic",
+    "adapters.memory.knowledge_base",
+    "adapters.memory.extractor",
+    "adapters.memory.consolidator",
+    "chromadb",
+)
+READY_TIMEOUT = 120.0    # seconds for the zygote's imports
+SPAWN_TIMEOUT = 10.0     # seconds for one fork reply
+REAP_INTERVAL = 0.2      # seconds between the zygote's waitpid sweeps
+
+
+# ── Zygote process ───────────────────────────────────────────────────────────
+
+def _preload(modules) -> dict:
+    t0 = time.perf_counter()
+    loaded = 0
+    for name in modules:
+        try:
+            importlib.import_module(name)
+            loaded += 1
+        except Exception as e:          # optional deps (chromadb, httpx …)
+            logger.debug("[zygote] preload %s skipped: %s", name, e)
+    try:
+        from core.env_loader import load_dotenv
+        load_dotenv()
+    except Exception as e:
+        logger.debug("[zygote] .env not loaded: %s", e)
+    return {"modules": loaded,
+            "preload_ms": round((time.perf_counter() - t0) * 1000, 1)}
+
+
+def _zygote_main(conn, wakeup, modules) -> None:
+    """Import once, then fork one agent per ``spawn`` request.
+
+    Requests: ``spawn`` (reply ``{"pid"}`` or ``{"error"}``), ``kill``
+    (no reply) and ``stop``.  Child exits are sent unprompted as
+    ``{"exit": pid, "code": exitcode}``.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)    # stopped by the runtime
+    conn.send({"ready": True, "pid": os.getpid(), **_preload(modules)})
+    children: set[int] = set()
+    try:
+        while True:
+            _reap(conn, children)
+            if not conn.poll(REAP_INTERVAL):
+                continue
+            req = conn.recv()
+            op = req.get("op")
+            if op == "stop":
+                return
+            if op == "kill":
+                # Reaping happens on this thread too, so a pid still in
+                # ``children`` is ours and cannot have been reused
+                if req["pid"] in children:
+                    os.kill(req["pid"], req.get("sig", signal.SIGTERM))
+                continue
+            try:
+                pid = _fork_agent(conn, wakeup, req)
+            except OSError as e:
+                conn.send({"error": str(e)})
+                continue
+            children.add(pid)
+            conn.send({"pid": pid})
+    except (EOFError, OSError):
+        return                                      # runtime went away
+
+
+def _reap(conn, children: set) -> None:
+    """Collect exited agents and report them to the runtime."""
+    while children:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            children.clear()
+            return
+        if pid == 0:
+            return
+        children.discard(pid)
+        conn.send({"exit": pid, "code": os.waitstatus_to_exitcode(status)})
+
+
+def _fork_agent(conn, wakeup, req: dict) -> int:
+    pid = os.fork()
+    if pid:
+        return pid
+    # ── child: becomes the agent process ──
+    code = 1
+    try:
+        conn.close()
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        import random
+        random.seed()                               # don't share the zygote's
+        from core.orchestrator import _agent_process
+        _agent_process(req["cfg"], req["agent_def"], req["config"], wakeup,
+                       started_at=req["ts"], start_mode="zygote")
+        code = 0
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else 0
+    except BaseException:
+        logger.exception("[zygote] agent '%s' crashed",
+                         req["agent_def"].get("id"))
+    finally:
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except Exception:
+                pass
+        os._exit(code)
+
+
+# ── Runtime ──────────────────────────────────────────────────────────────────
+
+class _ForkedAgent:
+    """``mp.Process``-like handle for an agent forked by the zygote.
+
+    Liveness comes from the zygote's exit report, and ``terminate()`` asks
+    the zygote to signal the child.  If the zygote dies first the handle
+    is *orphaned*: ``is_alive()`` falls back to a best-effort
+    ``kill(pid, 0)`` probe and ``terminate()`` does nothing.
+    """
+
+    def __init__(self, name: str, pid: int, runtime: "ZygoteRuntime"):
+        self.name = name
+        self.pid = pid
+        self.exitcode: Optional[int] = None
+        self._runtime = runtime
+        self._exited = threading.Event()
+        self._orphaned = False
+
+    def _set_exit(self, code: int) -> None:
+        self.exitcode = code
+        self._exited.set()
+
+    def is_alive(self) -> bool:
+        if self._exited.is_set():
+            return False
+        if not self._orphaned:
+            return True
+        try:
+            os.kill(self.pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        deadline = None if timeout is None else time.time() + timeout
+        while self.is_alive() and (deadline is None or time.time() < deadline):
+            self._exited.wait(0.05)
+
+    def terminate(self) -> None:
+        if not self._orphaned and not self._exited.is_set():
+            self._runtime._kill(self.pid, signal.SIGTERM)
+
+
+class ZygoteRuntime(ProcessRuntime):
+    """ProcessRuntime whose agents are forked from a pre-warmed zygote."""
+
+    def __init__(self, preload: tuple | list = (),
+                 spawn_timeout: float = SPAWN_TIMEOUT):
+        super().__init__()
+        self._modules = PRELOAD_MODULES + tuple(preload)
+        self._spawn_timeout = spawn_timeout
+        self._mu = threading.Lock()          # one spawn request at a time
+        self._send_mu = threading.Lock()     # spawn vs. kill on the pipe
+        self._zygote: Optional[mp.Process] = None
+        self._conn = None
+        self._replies: queue.Queue = queue.Queue()
+        self._pump: Optional[threading.Thread] = None
+        self.zygote_info: dict = {}
+        # pid → handle, fed by the pump thread; exits that arrive before
+        # start() has registered the handle wait in _early_exits
+        self._track_mu = threading.Lock()
+        self._forked: dict[int, _ForkedAgent] = {}
+        self._early_exits: dict[int, int] = {}
+        self._zygote_gone = True
+
+    # ── AgentRuntime interface ───────────────────────────────────────────
+
+    def warm(self, wakeup: Any = None) -> None:
+        """Start the zygote ahead of the first on-demand agent.
+
+        Call before the runtime starts any threads: this is the only
+        place the zygote is forked.
+        """
+        if hasattr(os, "fork"):
+            with self._mu:
+                if self._zygote is not None:
+                    return
+                try:
+                    self._start_zygote(wakeup)
+                except (OSError, EOFError, TimeoutError) as e:
+                    logger.warning("[runtime:zygote] warm-up failed: %s", e)
+                    self._stop_zygote()
+
+    def start(self, agent_def: dict, config: dict,
+              wakeup: Any = None) -> None:
+        if not hasattr(os, "fork"):
+            return super().start(agent_def, config, wakeup)
+        agent_id = agent_def["id"]
+        req = {"op": "spawn", "agent_def": agent_def, "config": config,
+               "cfg": _build_agent_cfg_dict(agent_def, config),
+               "ts": time.time()}
+        with self._mu:
+            try:
+                if self._zygote is None or not self._zygote.is_alive():
+                    # Not re-forked here: this process has threads by now
+                    raise EOFError("zygote not running")
+                self._send(req)
+                try:
+                    reply = self._replies.get(timeout=self._spawn_timeout)
+                except queue.Empty:
+                    raise TimeoutError("no reply from zygote") from None
+                if reply is None:
+                    raise EOFError("zygote exited")
+                if "error" in reply:
+                    raise OSError(reply["error"])
+            except (OSError, EOFError, TimeoutError) as e:
+                logger.warning("[runtime:zygote] fork of '%s' failed (%s) — "
+                               "starting a fresh process", agent_id, e)
+                self._stop_zygote()
+                return super().start(agent_def, config, wakeup)
+            handle = _ForkedAgent(agent_id, reply["pid"], self)
+            with self._track_mu:
+                if handle.pid in self._early_exits:
+                    handle._set_exit(self._early_exits.pop(handle.pid))
+                elif self._zygote_gone:
+                    handle._orphaned = True
+                else:
+                    self._forked[handle.pid] = handle
+        self._procs[agent_id] = handle
+        logger.info("[runtime:zygote] forked '%s' (pid=%d) in %.1fms",
+                    agent_id, reply["pid"], (time.time() - req["ts"]) * 1000)
+
+    def stop_all(self) -> None:
+        super().stop_all()
+        with self._mu:
+            self._stop_zygote()
+
+    # ── zygote lifecycle ─────────────────────────────────────────────────
+
+    def _start_zygote(self, wakeup: Any) -> None:
+        ctx = mp.get_context("fork")
+        parent, child = ctx.Pipe()
+        # Forked, not pickled: the wakeup bus (mp.Events / socket agents)
+        # is inherited by the zygote and from it by every agent
+        proc = ctx.Process(target=_zygote_main,
+                           args=(child, wakeup, self._modules),
+                           name="zygote", daemon=False)
+        proc.start()
+        child.close()
+        self._zygote, self._conn = proc, parent
+        if not parent.poll(READY_TIMEOUT):
+            raise TimeoutError("zygote did not finish preloading")
+        self.zygote_info = parent.recv()
+        logger.info("[runtime:zygote] zygote ready (pid=%d, %d modules in "
+                    "%.0fms)", proc.pid, self.zygote_info["modules"],
+                    self.zygote_info["preload_ms"])
+        self._replies = queue.Queue()
+        self._zygote_gone = False
+        self._pump = threading.Thread(target=self._pump_replies,
+                                      args=(parent, self._replies),
+                                      name="zygote-pump", daemon=True)
+        self._pump.start()
+
+    def _pump_replies(self, conn, replies: queue.Queue) -> None:
+        """Route exit reports to handles and spawn replies to ``start()``."""
+        while True:
+            try:
+                msg = conn.recv()
+            except (EOFError, OSError):
+                break
+            if "exit" not in msg:
+                replies.put(msg)
+                continue
+            with self._track_mu:
+                handle = self._forked.pop(msg["exit"], None)
+                if handle is not None:
+                    handle._set_exit(msg["code"])
+                else:
+                    self._early_exits[msg["exit"]] = msg["code"]
+        with self._track_mu:
+            # Agents the zygote never reported are now init's children
+            for handle in self._forked.values():
+                handle._orphaned = True
+            self._forked.clear()
+            self._early_exits.clear()
+            self._zygote_gone = True
+        replies.put(None)
+
+    def _send(self, msg: dict) -> None:
+        with self._send_mu:
+            if self._conn is None:
+                raise EOFError("zygote not running")
+            self._conn.send(msg)
+
+    def _kill(self, pid: int, sig: int) -> None:
+        """Ask the zygote to signal *pid* if it is still an unreaped child."""
+        try:
+            self._send({"op": "kill", "pid": pid, "sig": int(sig)})
+        except (OSError, EOFError, ValueError):
+            pass
+
+    def _stop_zygote(self) -> None:
+        if self._zygote is None:
+            return
+        try:
+            self._send({"op": "stop"})
+        except (OSError, EOFError, ValueError):
+            pass
+        with self._send_mu:
+            proc, conn, pump = self._zygote, self._conn, self._pump
+            self._zygote = self._conn = self._pump = None
+        proc.join(timeout=3)
+        if proc.is_alive():
+            proc.terminate()
+            proc.join(timeout=3)
+        if pump is not None:
+            pump.join(timeout=3)
+        conn.close()
+
+
+# Register as proper subclass of AgentRuntime
+from core.runtime.base import AgentRuntime
+AgentRuntime.register(ZygoteRuntime)
@@ -21,6 +21,7 @@ import json
 import logging
 import os
 import sqlite3
+import threading
 import time
 from pathlib import Path
 from typing import Optional
@@ -29,6 +30,8 @@ logger = logging.getLogger(__name__)
 
 DB_PATH = "search.db"
 
+_shared = threading.local()     # per-thread long-lived instances
+
 
 class QMD:
     """SQLite FTS5 search engine."""
@@ -39,6 +42,24 @@ class QMD:
         self.conn.row_factory = sqlite3.Row
         self._init_schema()
 
+    @classmethod
+    def shared(cls, db_path: str = DB_PATH) -> "QMD":
+        """Long-lived instance for the calling thread.
+
+        sqlite3 connections are bound to their creating thread, so hot
+        read paths (e.g. the recall pool) keep one connection per worker
+        thread instead of opening and closing one per query.  Do not
+        ``close()`` the returned instance.
+        """
+        instances = getattr(_shared, "instances", None)
+        if instances is None:
+            instances = _shared.instances = {}
+        key = os.path.abspath(db_path)
+        qmd = instances.get(key)
+        if qmd is None:
+            qmd = instances[key] = cls(db_path)
+        return qmd
+
     def _init_schema(self):
         """Create FTS5 virtual table + metadata table."""
         self.conn.executescript("""
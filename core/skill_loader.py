@@ -1,8 +1,9 @@
 """
 core/skill_loader.py
 Hot-reload markdown skill documents from skills/ directory.
-Reads from disk on every call — no caching.
-This allows Evolution Engine Path A to patch skills at runtime.
+Assembled sections are cached in ``core.prompt_cache`` and re-validated
+by stat on every call: any edit, new or deleted file rebuilds the section,
+so Evolution Engine Path A can still patch skills at runtime.
 
 Features:
   - YAML frontmatter parsing (Claude Code skill compatible)
@@ -20,6 +21,8 @@ import logging
 import os
 import re
 
+from core.prompt_cache import PromptCache, prompt_cache
+
 logger = logging.getLogger(__name__)
 
 SKILLS_DIR = "skills"
@@ -64,7 +67,8 @@ def _parse_frontmatter(content: str) -> tuple[dict, str]:
 class SkillLoader:
     """
     Loads markdown skill files and agent-specific overrides.
-    Hot-reload: reads from disk every call (no cache).
+    Hot-reload: every call re-stats the files a section was built from and
+    only re-reads them when something changed.
 
     Load order (all injected into system prompt):
       1. Shared skills (skills/{name}.md) — from agent's skill list
@@ -73,12 +77,27 @@ class SkillLoader:
       4. Agent overrides (skills/agent_overrides/{agent_id}.md)
     """
 
-    def __init__(self, skills_dir: str = SKILLS_DIR, docs_dir: str = DOCS_DIR):
+    def __init__(self, skills_dir: str = SKILLS_DIR, docs_dir: str = DOCS_DIR,
+                 cache: PromptCache | None = None):
         self.skills_dir = skills_dir
         self.docs_dir = docs_dir
+        self._cache = cache or prompt_cache
 
     def load(self, skill_names: list[str],
              agent_id: str | None = None) -> str:
+        """Load and concatenate skill documents (cached, see ``_load``)."""
+        key = (os.path.abspath(self.skills_dir), tuple(skill_names), agent_id)
+        return self._cache.section(
+            "skills", key, lambda: self._load(skill_names, agent_id))
+
+    def load_docs(self, agent_id: str) -> str:
+        """Load reference documents for an agent (cached, see ``_load_docs``)."""
+        key = (os.path.abspath(self.docs_dir), agent_id)
+        return self._cache.section(
+            "docs", key, lambda: self._load_docs(agent_id))
+
+    def _load(self, skill_names: list[str],
+              agent_id: str | None = None) -> str:
         """
         Load and concatenate skill documents.
 
@@ -111,8 +130,8 @@ class SkillLoader:
         if agent_id:
             agent_skills_dir = os.path.join(
                 self.skills_dir, "agents", agent_id)
-            if os.path.isdir(agent_skills_dir):
-                for fname in sorted(os.listdir(agent_skills_dir)):
+            if self._isdir(agent_skills_dir):
+                for fname in sorted(self._listdir(agent_skills_dir)):
                     if fname.endswith(".md") and not fname.startswith("."):
                         path = os.path.join(agent_skills_dir, fname)
                         content = self._read_file(path)
@@ -142,7 +161,7 @@ class SkillLoader:
 
         return "\n\n".join(parts) if parts else "(no skills loaded)"
 
-    def load_docs(self, agent_id: str) -> str:
+    def _load_docs(self, agent_id: str) -> str:
         """
         Load reference documents for an agent.
 
@@ -156,8 +175,8 @@ class SkillLoader:
 
         # ── Shared docs ──
         shared_dir = os.path.join(self.docs_dir, "_shared")
-        if os.path.isdir(shared_dir):
-            for fname in sorted(os.listdir(shared_dir)):
+        if self._isdir(shared_dir):
+            for fname in sorted(self._listdir(shared_dir)):
                 if fname.endswith((".md", ".txt")) and not fname.startswith("."):
                     path = os.path.join(shared_dir, fname)
                     content = self._read_file(path)
@@ -167,8 +186,8 @@ class SkillLoader:
 
         # ── Agent-specific docs ──
         agent_dir = os.path.join(self.docs_dir, agent_id)
-        if os.path.isdir(agent_dir):
-            for fname in sorted(os.listdir(agent_dir)):
+        if self._isdir(agent_dir):
+            for fname in sorted(self._listdir(agent_dir)):
                 if fname.endswith((".md", ".txt")) and not fname.startswith("."):
                     path = os.path.join(agent_dir, fname)
                     content = self._read_file(path)
@@ -289,7 +308,7 @@ class SkillLoader:
 
         # Case 2: directory pack — load SKILL.md + all sub-skills
         dir_path = os.path.join(self.skills_dir, name)
-        if os.path.isdir(dir_path):
+        if self._isdir(dir_path):
             pack_parts = []
             main_skill = os.path.join(dir_path, "SKILL.md")
             main_content = self._read_file(main_skill)
@@ -297,9 +316,9 @@ class SkillLoader:
                 pack_parts.append(main_content)
             # Load sub-skills from child directories
             try:
-                for child in sorted(os.listdir(dir_path)):
+                for child in sorted(self._listdir(dir_path)):
                     child_path = os.path.join(dir_path, child)
-                    if not os.path.isdir(child_path):
+                    if not self._isdir(child_path):
                         continue
                     if child.startswith("."):
                         continue
@@ -317,9 +336,17 @@ class SkillLoader:
 
         return ""
 
-    @staticmethod
-    def _read_file(path: str) -> str:
+    def _isdir(self, path: str) -> bool:
+        self._cache.track(path)
+        return os.path.isdir(path)
+
+    def _listdir(self, path: str) -> list[str]:
+        self._cache.track(path)
+        return os.listdir(path)
+
+    def _read_file(self, path: str) -> str:
         """Read a file, returning empty string if not found or unreadable."""
+        self._cache.track(path)
         try:
             with open(path, "r", encoding="utf-8", errors="ignore") as f:
                 return f.read().strip()
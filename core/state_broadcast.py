@@ -0,0 +1,291 @@
+"""
+core/state_broadcast.py
+Shared dashboard-state producer for the SSE (/v1/events) and WebSocket
+gateways.
+
+One background thread builds the compact state snapshot once per tick,
+diffs it against the previous one and encodes each frame exactly once —
+as SSE bytes and as a WebSocket text message.  Subscribers only read the
+pre-encoded frames, so per-tick CPU cost is O(tasks) once plus O(changes)
+per frame, independent of how many clients are attached.
+
+Frames:
+  state  — full snapshot ``{"ts", "seq", "tasks", "agents", "budget"?}``
+  delta  — ``{"ts", "seq", "tasks": {changed}, "removed": [ids],
+            "agents"?, "budget"?}`` (only keys that changed)
+
+A full ``state`` frame is re-sent every ``resync_every`` frames so a
+client that missed a delta converges.  New subscribers — and subscribers
+that fall behind the frame ring — start from the latest full snapshot.
+
+Usage:
+    from core.state_broadcast import get_broadcaster
+    b = get_broadcaster()
+    b.subscribe()
+    seq = 0
+    while True:
+        seq, frames = b.wait_frames(seq, timeout=15.0, fmt="sse")
+        for frame_seq, data in frames:
+            ...
+    b.unsubscribe()
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+from core.task_stream import task_partial
+
+logger = logging.getLogger(__name__)
+
+TICK_INTERVAL = 1.0     # seconds between snapshot builds
+RESYNC_EVERY = 30       # full frame after this many deltas
+RING_SIZE = 64          # frames kept for slow subscribers
+
+
+# ── Snapshot building ───────────────────────────────────────────────────────
+
+def _compact_task(t: dict) -> dict:
+    ct = {
+        "s": t.get("status", "?"),
+        "a": t.get("agent_id", ""),
+        "d": (t.get("description", ""))[:60],
+        "ca": t.get("claimed_at"),
+        "co": t.get("completed_at"),
+        "rc": t.get("retry_count", 0),
+    }
+    # Include review/critique data
+    critique = t.get("critique")
+    if critique:
+        ct["cr"] = {
+            "v": "LGTM" if critique.get("passed") else "NEEDS_WORK",
+            "s": critique.get("score", 0),
+        }
+    else:
+        scores = t.get("review_scores", [])
+        if scores:
+            avg = sum(r["score"] for r in scores) / len(scores)
+            ct["rs"] = int(avg)
+    # Streaming: partial result (last 200 chars)
+    pr = task_partial(t)
+    if pr:
+        ct["pr"] = pr[-200:]
+    cost = t.get("cost_usd")
+    if cost is not None:
+        ct["cost"] = round(cost, 4)
+    # Parent ID for subtask tree
+    pid = t.get("parent_id")
+    if pid:
+        ct["pid"] = pid
+    cs = t.get("critique_spec")
+    if cs:
+        ct["cs"] = cs
+    return ct
+
+
+def build_snapshot() -> dict:
+    """Compact state: tasks, agent heartbeats, budget."""
+    snapshot: dict = {"ts": time.time()}
+
+    # Task board (engine cache avoids redundant loads on unchanged board)
+    try:
+        from core.task_board import read_board
+        snapshot["tasks"] = {tid: _compact_task(t)
+                             for tid, t in read_board().items()}
+    except Exception:
+        snapshot["tasks"] = {}
+
+    # Agent heartbeats
+    try:
+        from core.heartbeat import read_all_heartbeats
+        snapshot["agents"] = [
+            {"id": a.get("agent_id", ""), "on": a.get("online", False),
+             "st": a.get("status", "offline"), "tid": a.get("task_id")}
+            for a in read_all_heartbeats()
+        ]
+    except Exception:
+        snapshot["agents"] = []
+
+    # Budget status (compact)
+    try:
+        from core.usage_tracker import UsageTracker
+        budget = UsageTracker.get_budget()
+        if budget.get("enabled"):
+            snapshot["budget"] = {
+                "pct": budget.get("percent_used", 0),
+                "cost": round(budget.get("current_cost_usd", 0), 4),
+                "limit": budget.get("max_cost_usd", 0),
+            }
+    except Exception:
+        pass
+
+    return snapshot
+
+
+def diff_snapshots(prev: dict, cur: dict) -> dict | None:
+    """Delta payload from ``prev`` to ``cur``, or None if nothing changed."""
+    delta: dict = {}
+    prev_tasks, cur_tasks = prev.get("tasks", {}), cur.get("tasks", {})
+    changed = {tid: ct for tid, ct in cur_tasks.items()
+               if prev_tasks.get(tid) != ct}
+    removed = [tid for tid in prev_tasks if tid not in cur_tasks]
+    if changed:
+        delta["tasks"] = changed
+    if removed:
+        delta["removed"] = removed
+    for key in ("agents", "budget"):
+        if prev.get(key) != cur.get(key):
+            delta[key] = cur.get(key)
+    if not delta:
+        return None
+    delta["ts"] = cur["ts"]
+    return delta
+
+
+# ── Frames ──────────────────────────────────────────────────────────────────
+
+class _Frame:
+    """One event, encoded once per transport."""
+
+    __slots__ = ("seq", "event", "sse", "ws")
+
+    def __init__(self, seq: int, event: str, data: dict):
+        payload = json.dumps({**data, "seq": seq}, ensure_ascii=False,
+                             default=str)
+        self.seq = seq
+        self.event = event
+        self.sse = f"event: {event}\ndata: {payload}\n\n".encode("utf-8")
+        self.ws = f'{{"event": "{event}", "data": {payload}}}'
+
+    def encoded(self, fmt: str):
+        return self.sse if fmt == "sse" else self.ws
+
+
+# ── Broadcaster ─────────────────────────────────────────────────────────────
+
+class SnapshotBroadcaster:
+    """Builds snapshots while anyone is subscribed; fans out shared frames."""
+
+    def __init__(self, interval: float = TICK_INTERVAL,
+                 resync_every: int = RESYNC_EVERY,
+                 builder=build_snapshot):
+        self.interval = interval
+        self.resync_every = resync_every
+        self._builder = builder
+        self._cond = threading.Condition()
+        self._ring: deque[_Frame] = deque(maxlen=RING_SIZE)
+        self._full: _Frame | None = None      # latest full snapshot frame
+        self._snapshot: dict | None = None
+        self._seq = 0
+        self._since_full = 0
+        self._subscribers = 0
+        self._thread: threading.Thread | None = None
+        self.builds = 0                       # snapshots built (for tests)
+
+    # ── Subscription ──
+    def subscribe(self) -> None:
+        with self._cond:
+            self._subscribers += 1
+            # (Re)starting after an idle period: the last snapshot is stale
+            stale = self._thread is None or not self._thread.is_alive()
+            if stale:
+                self._thread = threading.Thread(
+                    target=self._run, daemon=True, name="state-broadcast")
+                self._thread.start()
+        if stale:
+            self._publish()
+
+    def unsubscribe(self) -> None:
+        with self._cond:
+            self._subscribers = max(0, self._subscribers - 1)
+
+    @property
+    def subscribers(self) -> int:
+        return self._subscribers
+
+    def wait_frames(self, after_seq: int, timeout: float,
+                    fmt: str = "sse") -> tuple[int, list]:
+        """Encoded frames newer than ``after_seq`` (blocks up to ``timeout``).
+
+        ``after_seq=0`` or a seq older than the ring yields the latest full
+        snapshot.  Returns ``(new_seq, [(frame_seq, encoded), ...])``; the
+        list is empty on timeout.  ``fmt`` is ``"sse"`` (bytes) or ``"ws"``.
+        """
+        with self._cond:
+            if after_seq >= self._seq:
+                self._cond.wait_for(lambda: self._seq > after_seq, timeout)
+            return self._frames_since(after_seq, fmt)
+
+    def frames_since(self, after_seq: int, fmt: str = "sse") -> tuple[int, list]:
+        """Non-blocking ``wait_frames``."""
+        with self._cond:
+            return self._frames_since(after_seq, fmt)
+
+    def _frames_since(self, after_seq: int, fmt: str) -> tuple[int, list]:
+        if after_seq >= self._seq:
+            return after_seq, []
+        oldest = self._ring[0].seq if self._ring else self._seq + 1
+        if after_seq == 0 or after_seq < oldest - 1:
+            return self._seq, [(self._seq, self._full_frame().encoded(fmt))]
+        return self._seq, [(f.seq, f.encoded(fmt)) for f in self._ring
+                           if f.seq > after_seq]
+
+    def _full_frame(self) -> _Frame:
+        if self._full is None or self._full.seq != self._seq:
+            self._full = _Frame(self._seq, "state", self._snapshot or {})
+        return self._full
+
+    # ── Producer ──
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._cond:
+                if self._subscribers <= 0:
+                    self._thread = None
+                    return
+            try:
+                self._publish()
+            except Exception as e:
+                logger.warning("[state_broadcast] snapshot failed: %s", e)
+
+    def _publish(self) -> None:
+        """Build one snapshot (unlocked) and append a frame if it changed."""
+        snapshot = self._builder()
+        with self._cond:
+            self.builds += 1
+            self._apply(snapshot)
+
+    def _apply(self, snapshot: dict) -> None:
+        prev = self._snapshot
+        if prev is None or self._since_full >= self.resync_every:
+            self._snapshot = snapshot
+            self._seq += 1
+            self._since_full = 0
+            self._full = _Frame(self._seq, "state", snapshot)
+            self._ring.append(self._full)
+        else:
+            delta = diff_snapshots(prev, snapshot)
+            if delta is None:
+                return
+            self._snapshot = snapshot
+            self._seq += 1
+            self._since_full += 1
+            self._ring.append(_Frame(self._seq, "delta", delta))
+        self._cond.notify_all()
+
+
+_instance: SnapshotBroadcaster | None = None
+_instance_lock = threading.Lock()
+
+
+def get_broadcaster() -> SnapshotBroadcaster:
+    """Process-wide broadcaster shared by the HTTP and WebSocket gateways."""
+    global _instance
+    with _instance_lock:
+        if _instance is None:
+            _instance = SnapshotBroadcaster()
+        return _instance
@@ -13,6 +13,7 @@ from __future__ import annotations
 import json
 import logging
 import os
+import threading
 import time
 import uuid
 from dataclasses import dataclass, field
@@ -23,13 +24,15 @@ from typing import Optional
 CLAIMED_TIMEOUT = 180   # 3 min — agent crashed if no progress (was 10 min)
 REVIEW_TIMEOUT  = 300   # 5 min — reviewer crashed
 
-from core.protocols import FileLock  # shared fallback
+from core.task_stream import STREAM_DIR, partial_path, stream_path
+from core.task_store import (
+    BOARD_FILE, open_store, resolve_engine, _db_path_for, _json_path_for,
+)
 
 logger = logging.getLogger(__name__)
 
-BOARD_FILE = ".task_board.json"
-BOARD_LOCK = ".task_board.lock"
-TASK_SIGNAL_DIR = ".task_signals"
+# Non-terminal states — a board with any of these still has work in flight
+ACTIVE_STATES = ("pending", "claimed", "review", "critique", "blocked", "paused")
 
 # ── Role matching ────────────────────────────────────────────────────────────
 # Maps required_role keywords → which agent_id(s) can claim them.
@@ -201,20 +204,20 @@ class Task:
 class TaskBoard:
     """
     File-backed task store.
-    All mutating methods acquire a file lock — safe for concurrent agent processes.
+    All mutating methods run inside a storage-engine transaction — safe for
+    concurrent agent processes (FileLock for json, BEGIN IMMEDIATE for sqlite).
     Includes timeout recovery: stale CLAIMED/REVIEW tasks auto-return to PENDING.
+
+    engine: "json" | "sqlite" | None (auto — see core.task_store.resolve_engine)
     """
 
-    def __init__(self, path: str = BOARD_FILE):
-        self.path = path
-        self.lock = FileLock(BOARD_LOCK)
-        # mtime-guarded cache — avoids redundant json.load() on unchanged file
-        self._cache: dict | None = None
-        self._cache_mtime: float = 0.0
-        # Fix TOCTOU: init under lock
-        with self.lock:
-            if not os.path.exists(path):
-                self._write({})
+    def __init__(self, path: str = BOARD_FILE, engine: str | None = None):
+        self._store = open_store(path, engine)
+        self.engine = self._store.engine
+        self.path = self._store.path
+        self.lock = self._store.lock
+        self._store.on_ready = self._emit_ready
+        self._store.on_status = self._emit_status
 
     # ── Create ───────────────────────────────────────────────────────────────
 
@@ -222,7 +225,9 @@ class TaskBoard:
                blocked_by: list[str] | None = None,
                min_reputation: int = 0,
                required_role: str | None = None,
-               parent_id: str | None = None) -> Task:
+               parent_id: str | None = None,
+               complexity: str = "normal",
+               spec: str | None = None) -> Task:
         # Phase 8: full UUID instead of [:8] to prevent collisions
         task = Task(
             task_id=str(uuid.uuid4()),
@@ -231,51 +236,60 @@ class TaskBoard:
             min_reputation=min_reputation,
             required_role=required_role,
             parent_id=parent_id,
+            complexity=complexity,
+            spec=spec,
         )
-        with self.lock:
-            data = self._read()
-            data[task.task_id] = task.to_dict()
-            self._write(data)
-        # Emit lightweight signal so agents discover new tasks faster
-        self._emit_task_signal(task.task_id, required_role)
+        with self._store.transaction() as tx:
+            tx.put(task.to_dict())
         return task
 
-    # ── Task signal IPC ───────────────────────────────────────────────────
-    def _emit_task_signal(self, task_id: str, required_role: str | None = None):
-        """Write a small signal file so agents can detect new tasks via inotify/poll
-        instead of re-reading the entire board every tick."""
-        try:
-            os.makedirs(TASK_SIGNAL_DIR, exist_ok=True)
-            sig = {"task_id": task_id, "role": required_role, "ts": time.time()}
-            sig_path = os.path.join(TASK_SIGNAL_DIR, f"{task_id[:8]}.signal")
-            with open(sig_path, "w") as f:
-                json.dump(sig, f)
-        except OSError:
-            pass  # Non-critical — agents still poll the board
+    # ── Ready notifications ───────────────────────────────────────────────
+    def _emit_ready(self, ready: list[tuple[str, str, int]]) -> None:
+        """Signal listening agents that may claim newly ready tasks.
 
-    @staticmethod
-    def consume_task_signals() -> list[dict]:
-        """Read and delete all pending task signals. Returns list of signal dicts."""
-        signals: list[dict] = []
-        if not os.path.isdir(TASK_SIGNAL_DIR):
-            return signals
-        try:
-            for fname in os.listdir(TASK_SIGNAL_DIR):
-                if not fname.endswith(".signal"):
-                    continue
-                fpath = os.path.join(TASK_SIGNAL_DIR, fname)
-                try:
-                    with open(fpath, "r") as f:
-                        signals.append(json.load(f))
-                    os.remove(fpath)
-                except (json.JSONDecodeError, OSError):
-                    try:
-                        os.remove(fpath)
-                    except OSError:
-                        pass
-        except OSError:
-            pass
-        return signals
+        Called by the store after every commit that made tasks ready.
+        Only agents whose id passes the same role guards as ``claim_next``
+        are notified, so a review task never wakes the executor.
+        """
+        from core.runtime.wakeup import send_signal, signal_listeners
+        listeners = signal_listeners()
+        if not listeners:
+            return
+        now = time.time()
+        for agent_id in listeners:
+            task_ids = [tid for tid, role, _rep in ready
+                        if _agent_may_claim(agent_id, role or None)
+                        and (not role or _role_matches(role, agent_id, None))]
+            if task_ids:
+                # IDs are informational (the agent re-claims) — keep the
+                # datagram small
+                send_signal(agent_id, {"kind": "task",
+                                       "task_ids": task_ids[:32], "ts": now})
+
+    # Status transitions per datagram.  A 4-field row (two full UUIDs,
+    # status, role) encodes to ~115 bytes, so 20 rows are ~2.3 KB — well
+    # under the 4 KB receive buffer, with headroom for long role names
+    STATUS_BATCH = 20
+
+    def _emit_status(self, changes: list[tuple[str, str, str, str]]) -> None:
+        """Forward committed status transitions to task-tree watchers.
+
+        Watchers (``core.task_watch.TaskWatcher``) keep a parent → children
+        index from these events, so waiting for a task tree to settle costs
+        nothing while the board is quiet; ``LazyRuntime``'s monitor keeps
+        per-role pending counts from them.
+        """
+        from core.runtime.wakeup import send_datagram, watch_listeners
+        watchers = watch_listeners()
+        if not watchers:
+            return
+        now = time.time()
+        for i in range(0, len(changes), self.STATUS_BATCH):
+            payload = {"kind": "status", "ts": now,
+                       "tasks": [list(c) for c in
+                                 changes[i:i + self.STATUS_BATCH]]}
+            for path in watchers:
+                send_datagram(path, payload)
 
     # ── Self-claim (Agent Teams pattern) ────────────────────────────────────
 
@@ -284,60 +298,52 @@ class TaskBoard:
         """
         Atomically grab the next available unblocked task this agent qualifies for.
         Returns None if nothing is available.
-        File lock prevents two agents claiming the same task.
-        """
-        with self.lock:
-            data = self._read()
-            completed_ids = {tid for tid, t in data.items()
-                             if t["status"] == TaskStatus.COMPLETED.value}
-
-            for tid, t in data.items():
-                if t["status"] != TaskStatus.PENDING.value:
-                    continue
-                if t["min_reputation"] > agent_reputation:
-                    continue
-                # check all blockers are done
-                if any(b not in completed_ids for b in t.get("blocked_by", [])):
-                    continue
+        The engine transaction prevents two agents claiming the same task.
 
+        Reads the engine's ready queue: only role buckets this agent may
+        claim are probed, each yielding its earliest-created ready task —
+        O(roles · log n) instead of a scan over every task.
+        """
+        with self._store.transaction() as tx:
+            roles = []
+            for role in tx.ready_roles():
+                req_role = role or None
                 # Agent claim restrictions (prevents reviewer stealing executor tasks)
-                req_role = t.get("required_role")
                 if not _agent_may_claim(agent_id, req_role):
                     continue
-
                 # Phase 6: role-based routing
-                if req_role:
-                    if not _role_matches(req_role, agent_id, agent_role):
-                        continue
+                if req_role and not _role_matches(req_role, agent_id, agent_role):
+                    continue
+                roles.append(role)
 
-                # claim it
-                t["status"]     = TaskStatus.CLAIMED.value
-                t["agent_id"]   = agent_id
-                t["claimed_at"] = time.time()
-                self._write(data)
-                return Task.from_dict(t)
+            t = tx.next_ready(roles, agent_reputation)
+            if t is None:
+                return None
 
-        return None
+            # claim it
+            t["status"]     = TaskStatus.CLAIMED.value
+            t["agent_id"]   = agent_id
+            t["claimed_at"] = time.time()
+            tx.put(t)
+            return Task.from_dict(t)
 
     # ── Lifecycle ────────────────────────────────────────────────────────────
 
     def submit_for_review(self, task_id: str, result: str) -> None:
-        with self.lock:
-            data = self._read()
-            t = data.get(task_id)
+        with self._store.transaction() as tx:
+            t = tx.get(task_id)
             if not t:
                 logger.warning("submit_for_review: task %s not found", task_id)
                 return
             t["status"] = TaskStatus.REVIEW.value
             t["result"] = result
             t["review_submitted_at"] = time.time()
-            self._write(data)
+            tx.put(t)
 
     def add_review(self, task_id: str, reviewer_id: str,
                    score: int, comment: str):
-        with self.lock:
-            data = self._read()
-            t = data.get(task_id)
+        with self._store.transaction() as tx:
+            t = tx.get(task_id)
             if not t:
                 logger.warning("add_review: task %s not found", task_id)
                 return
@@ -347,7 +353,7 @@ class TaskBoard:
                 "comment":  comment,
                 "ts":       time.time(),
             })
-            self._write(data)
+            tx.put(t)
 
     def add_critique(self, task_id: str, reviewer_id: str,
                      passed: bool, suggestions: list[str], comment: str,
@@ -364,9 +370,8 @@ class TaskBoard:
             Written atomically alongside the critique to avoid race conditions
             where dashboard polls between separate writes.
         """
-        with self.lock:
-            data = self._read()
-            t = data.get(task_id)
+        with self._store.transaction() as tx:
+            t = tx.get(task_id)
             if not t:
                 logger.warning("add_critique: task %s not found", task_id)
                 return
@@ -390,98 +395,95 @@ class TaskBoard:
                 t["status"] = TaskStatus.CRITIQUE.value
                 t.setdefault("critique_round", 0)
                 t["critique_round"] += 1
-            self._write(data)
+            tx.put(t)
 
     def claim_critique(self, agent_id: str,
                        agent_role: str | None = None) -> Optional[Task]:
         """Executor claims a CRITIQUE task for targeted revision.
         Only the original executor can claim their own critique tasks."""
-        with self.lock:
-            data = self._read()
-            for tid, t in data.items():
-                if t["status"] != TaskStatus.CRITIQUE.value:
-                    continue
+        with self._store.transaction() as tx:
+            for t in tx.select(TaskStatus.CRITIQUE.value):
                 # Only the original executor can fix their own work
                 if t.get("agent_id") != agent_id:
                     continue
                 t["status"] = TaskStatus.CLAIMED.value
                 t["claimed_at"] = time.time()
-                self._write(data)
+                tx.put(t)
                 return Task.from_dict(t)
         return None
 
     def complete(self, task_id: str) -> Optional[Task]:
         """Mark task as completed. Simplified: no score-based rejection."""
-        with self.lock:
-            data = self._read()
-            t = data.get(task_id)
+        with self._store.transaction() as tx:
+            t = tx.get(task_id)
             if not t:
                 logger.warning("complete: task %s not found", task_id)
                 return None
             t["status"]       = TaskStatus.COMPLETED.value
             t["completed_at"] = time.time()
-            self._write(data)
-        self.cleanup_stream(task_id)
+            tx.put(t)
+        self.cleanup_stream(task_id, TaskStatus.COMPLETED.value)
         return Task.from_dict(t)
 
     def fail(self, task_id: str, reason: str = ""):
-        with self.lock:
-            data = self._read()
-            t = data.get(task_id)
+        with self._store.transaction() as tx:
+            t = tx.get(task_id)
             if not t:
                 logger.warning("fail: task %s not found", task_id)
                 return
             t["status"] = TaskStatus.FAILED.value
             t.setdefault("evolution_flags", []).append(f"failed:{reason}")
-            self._write(data)
-        self.cleanup_stream(task_id)
+            tx.put(t)
+        self.cleanup_stream(task_id, TaskStatus.FAILED.value)
 
     def flag(self, task_id: str, tag: str):
-        with self.lock:
-            data = self._read()
-            t = data.get(task_id)
+        with self._store.transaction() as tx:
+            t = tx.get(task_id)
             if not t:
                 return
             t.setdefault("evolution_flags", []).append(tag)
-            self._write(data)
+            tx.put(t)
 
     # ── Streaming partial results ──────────────────────────────────────────
 
     def update_partial(self, task_id: str, partial: str):
-        """Update partial result for a task (for streaming output to dashboard)."""
-        with self.lock:
-            data = self._read()
-            t = data.get(task_id)
+        """Update partial result for a task (for streaming output to dashboard).
+
+        Rewrites the board; streaming agents use ``StreamWriter``'s
+        ``.partial`` side file instead.
+        """
+        with self._store.transaction() as tx:
+            t = tx.get(task_id)
             if not t:
                 return
             t["partial_result"] = partial
-            self._write(data)
+            tx.put(t)
 
     def set_cost(self, task_id: str, cost_usd: float):
         """Record estimated cost for a task (displayed in dashboard)."""
-        with self.lock:
-            data = self._read()
-            t = data.get(task_id)
+        with self._store.transaction() as tx:
+            t = tx.get(task_id)
             if not t:
                 return
             t["cost_usd"] = round(
                 t.get("cost_usd", 0) + cost_usd, 6
             )
-            self._write(data)
+            tx.put(t)
 
     # ── Per-task SSE stream files (lockless append) ─────────────────────
 
-    STREAM_DIR = ".task_streams"
+    STREAM_DIR = STREAM_DIR
 
     @staticmethod
     def append_stream_chunk(task_id: str, chunk: str, seq: int):
         """Append a single streaming chunk to per-task stream file.
 
         Lockless: single writer (agent process), OS guarantees atomic append
-        for lines < PIPE_BUF (4 KB on macOS/Linux).
+        for lines < PIPE_BUF (4 KB on macOS/Linux).  Opens the file per
+        call — token streams should go through ``core.task_stream.StreamWriter``.
         """
-        os.makedirs(TaskBoard.STREAM_DIR, exist_ok=True)
-        path = os.path.join(TaskBoard.STREAM_DIR, f"{task_id}.stream")
+        os.makedirs(STREAM_DIR, exist_ok=True)
+        path = stream_path(task_id)
         line = json.dumps(
             {"c": chunk, "seq": seq, "ts": time.time()},
             ensure_ascii=False,
@@ -493,8 +495,12 @@ class TaskBoard:
     def read_stream_chunks(
         task_id: str, after_seq: int = -1
     ) -> list[dict]:
-        """Read stream chunks after a given sequence number (cursor-based)."""
-        path = os.path.join(TaskBoard.STREAM_DIR, f"{task_id}.stream")
+        """Read stream chunks after a given sequence number (cursor-based).
+
+        Re-parses the whole file; long-lived followers should use
+        ``core.task_stream.StreamTail`` (byte offsets + end marker).
+        """
+        path = stream_path(task_id)
         if not os.path.exists(path):
             return []
         chunks: list[dict] = []
@@ -502,6 +508,8 @@ class TaskBoard:
             for line in f:
                 try:
                     obj = json.loads(line.strip())
+                    if "end" in obj:
+                        break
                     if obj.get("seq", 0) > after_seq:
                         chunks.append(obj)
                 except (json.JSONDecodeError, ValueError):
@@ -509,21 +517,30 @@ class TaskBoard:
         return chunks
 
     @staticmethod
-    def cleanup_stream(task_id: str):
-        """Remove per-task stream file after task completes."""
-        path = os.path.join(TaskBoard.STREAM_DIR, f"{task_id}.stream")
+    def cleanup_stream(task_id: str, status: str = "done"):
+        """Close and remove the per-task stream files after a terminal state.
+
+        Appends an end marker first: followers that still hold the file
+        open (``StreamTail``) read it after the unlink and stop at once.
+        """
+        path = stream_path(task_id)
         try:
+            with open(path, "a") as f:
+                f.write(json.dumps({"end": status, "ts": time.time()}) + "\n")
             os.remove(path)
         except OSError:
             pass
+        try:
+            os.remove(partial_path(task_id))
+        except OSError:
+            pass
 
     # ── Cancel / Pause / Resume / Retry ───────────────────────────────────
 
     def cancel(self, task_id: str) -> bool:
         """Cancel a task. Returns True if cancelled, False if not cancellable."""
-        with self.lock:
-            data = self._read()
-            t = data.get(task_id)
+        with self._store.transaction() as tx:
+            t = tx.get(task_id)
             if not t:
                 return False
             # Can only cancel non-terminal tasks
@@ -533,21 +550,19 @@ class TaskBoard:
             t["status"] = TaskStatus.CANCELLED.value
             t["completed_at"] = time.time()
             t.setdefault("evolution_flags", []).append("user_cancelled")
-            self._write(data)
-        self.cleanup_stream(task_id)
+            tx.put(t)
+        self.cleanup_stream(task_id, TaskStatus.CANCELLED.value)
         return True
 
     def is_cancelled(self, task_id: str) -> bool:
         """Check if a task has been cancelled (for agent loop early exit)."""
-        data = self._read()
-        t = data.get(task_id)
+        t = self._store.get(task_id)
         return bool(t and t.get("status") == TaskStatus.CANCELLED.value)
 
     def pause(self, task_id: str) -> bool:
         """Pause a pending/claimed task. Returns True if paused."""
-        with self.lock:
-            data = self._read()
-            t = data.get(task_id)
+        with self._store.transaction() as tx:
+            t = tx.get(task_id)
             if not t:
                 return False
             if t["status"] not in (TaskStatus.PENDING.value,
@@ -555,14 +570,13 @@ class TaskBoard:
                 return False
             t["_paused_from"] = t["status"]  # remember original state
             t["status"] = TaskStatus.PAUSED.value
-            self._write(data)
+            tx.put(t)
             return True
 
     def resume(self, task_id: str) -> bool:
         """Resume a paused task back to PENDING."""
-        with self.lock:
-            data = self._read()
-            t = data.get(task_id)
+        with self._store.transaction() as tx:
+            t = tx.get(task_id)
             if not t:
                 return False
             if t["status"] != TaskStatus.PAUSED.value:
@@ -571,14 +585,13 @@ class TaskBoard:
             t["agent_id"]  = None
             t["claimed_at"] = None
             t.pop("_paused_from", None)
-            self._write(data)
+            tx.put(t)
             return True
 
     def retry(self, task_id: str) -> bool:
         """Retry a failed/cancelled task. Resets it to PENDING."""
-        with self.lock:
-            data = self._read()
-            t = data.get(task_id)
+        with self._store.transaction() as tx:
+            t = tx.get(task_id)
             if not t:
                 return False
             if t["status"] not in (TaskStatus.FAILED.value,
@@ -593,7 +606,7 @@ class TaskBoard:
             t["review_scores"] = []
             t.setdefault("retry_count", 0)
             t["retry_count"] += 1
-            self._write(data)
+            tx.put(t)
             return True
 
     # ── Timeout Recovery ──────────────────────────────────────────────────
@@ -606,10 +619,11 @@ class TaskBoard:
         """
         recovered = []
         now = time.time()
-        with self.lock:
-            data = self._read()
-            changed = False
-            for tid, t in data.items():
+        with self._store.transaction() as tx:
+            for t in tx.select(TaskStatus.CLAIMED.value,
+                               TaskStatus.REVIEW.value,
+                               TaskStatus.CRITIQUE.value):
+                tid = t["task_id"]
                 status = t.get("status")
                 # Stale CLAIMED: agent crashed or hung
                 if status == TaskStatus.CLAIMED.value:
@@ -623,7 +637,7 @@ class TaskBoard:
                         t.setdefault("evolution_flags", []).append(
                             "timeout_recovered:claimed")
                         recovered.append(tid)
-                        changed = True
+                        tx.put(t)
                         logger.warning(
                             "Recovered stale CLAIMED task %s (age=%.0fs)",
                             tid, now - claimed_at)
@@ -637,7 +651,7 @@ class TaskBoard:
                         t.setdefault("evolution_flags", []).append(
                             "timeout_recovered:review")
                         recovered.append(tid)
-                        changed = True
+                        tx.put(t)
                         logger.warning(
                             "Recovered stale REVIEW task %s (age=%.0fs)",
                             tid, now - review_at)
@@ -651,28 +665,33 @@ class TaskBoard:
                         t.setdefault("evolution_flags", []).append(
                             "timeout_recovered:critique")
                         recovered.append(tid)
-                        changed = True
+                        tx.put(t)
                         logger.warning(
                             "Recovered stale CRITIQUE task %s (age=%.0fs)",
                             tid, now - critique_ts)
-            if changed:
-                self._write(data)
         return recovered
 
     # ── Query ────────────────────────────────────────────────────────────────
 
     def get(self, task_id: str) -> Optional[Task]:
-        data = self._read()
-        raw  = data.get(task_id)
+        raw = self._store.get(task_id)
         return Task.from_dict(raw) if raw else None
 
     def list_by_agent(self, agent_id: str) -> list[Task]:
         return [Task.from_dict(t) for t in self._read().values()
                 if t.get("agent_id") == agent_id]
 
+    def status_counts(self) -> dict[str, int]:
+        """Per-status task counts, read from engine-maintained counters."""
+        return self._store.status_counts()
+
     def pending_count(self) -> int:
-        return sum(1 for t in self._read().values()
-                   if t["status"] == TaskStatus.PENDING.value)
+        return self.status_counts().get(TaskStatus.PENDING.value, 0)
+
+    def active_count(self) -> int:
+        """Number of non-terminal tasks (see ACTIVE_STATES)."""
+        counts = self.status_counts()
+        return sum(counts.get(s, 0) for s in ACTIVE_STATES)
 
     def collect_results(self, root_task_id: str) -> str:
         """Collect all completed results for a task tree (root + all subtasks).
@@ -841,33 +860,27 @@ class TaskBoard:
         """Remove all tasks. Returns count of removed tasks.
         If force=False and there are active tasks, does NOT clear and returns -1.
         """
-        with self.lock:
-            data = self._read()
+        with self._store.transaction() as tx:
             if not force:
-                active_states = {"pending", "claimed", "review", "critique", "blocked", "paused"}
-                active = sum(1 for t in data.values()
-                             if t.get("status") in active_states)
-                if active > 0:
+                if tx.select(*ACTIVE_STATES):
                     return -1  # signal: active tasks exist, need confirmation
-            count = len(data)
-            self._write({})
+            count = tx.count()
+            tx.delete_all()
             return count
 
     def cancel_all(self) -> int:
         """Cancel all non-terminal tasks. Returns count cancelled."""
         cancelled = 0
-        with self.lock:
-            data = self._read()
+        with self._store.transaction() as tx:
             terminal = {TaskStatus.COMPLETED.value, TaskStatus.CANCELLED.value,
                         TaskStatus.FAILED.value}
-            for tid, t in data.items():
+            for t in tx.select():
                 if t.get("status") not in terminal:
                     t["status"] = TaskStatus.CANCELLED.value
                     t["completed_at"] = time.time()
                     t.setdefault("evolution_flags", []).append("user_cancelled")
+                    tx.put(t)
                     cancelled += 1
-            if cancelled:
-                self._write(data)
         return cancelled
 
     def history(self, agent_id: str, last: int = 50) -> list[Task]:
@@ -878,38 +891,61 @@ class TaskBoard:
 
     # ── Internal ─────────────────────────────────────────────────────────────
 
+    def transaction(self):
+        """Row-level read-modify-write (``tx.get`` / ``tx.put``) for
+        multi-step updates that have no dedicated method.
+
+        Prefer this over ``with board.lock: _read() … _write()``: the
+        sqlite engine does not take ``board.lock`` for its own writes.
+        """
+        return self._store.transaction()
+
     def _read(self) -> dict:
-        """Read task board JSON with mtime-guarded cache.
+        """Whole-board dict view (task_id → task dict).
 
-        Returns cached data if file mtime hasn't changed, avoiding
-        redundant open() + json.load() calls (idle: 6 reads/sec → stat-only).
+        Cached by the storage engine: mtime-guarded for json,
+        ``PRAGMA data_version``-guarded for sqlite — unchanged boards cost
+        a stat / one pragma, not a full parse.
         """
-        try:
-            mtime = os.path.getmtime(self.path)
-        except FileNotFoundError:
-            return {}
-        if self._cache is not None and mtime == self._cache_mtime:
-            return self._cache
-        try:
-            with open(self.path, "r") as f:
-                data = json.load(f)
-            self._cache = data
-            self._cache_mtime = mtime
-            return data
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
+        return self._store.read_all()
 
     def _write(self, data: dict) -> None:
-        with open(self.path, "w") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        # Sync cache on write to avoid stale reads
-        self._cache = data
-        try:
-            self._cache_mtime = os.path.getmtime(self.path)
-        except FileNotFoundError:
-            self._cache_mtime = 0.0
+        """Persist a whole-board dict (sqlite writes only changed rows)."""
+        self._store.write_all(data)
+
+    def close(self) -> None:
+        """Release engine resources (sqlite connection; no-op for json)."""
+        close = getattr(self._store, "close", None)
+        if close:
+            close()
 
     @staticmethod
     def _avg_review_score(t: dict) -> float:
         scores = [r["score"] for r in t.get("review_scores", [])]
         return sum(scores) / len(scores) if scores else 100.0  # no review = pass
+
+
+# ── Read-only snapshot helper ────────────────────────────────────────────────
+
+_snapshot_stores: dict[tuple[str, str], object] = {}
+_snapshot_lock = threading.Lock()
+
+
+def read_board(path: str = BOARD_FILE) -> dict:
+    """Return the whole board (task_id → task dict) without creating it.
+
+    Engine-aware replacement for ``json.load(open(".task_board.json"))`` in
+    read-only callers (gateway, CLI).  Stores are kept per process, so
+    repeated calls reuse the engine cache.  Returns {} when no board exists.
+    """
+    engine = resolve_engine(path)
+    real = _db_path_for(path) if engine == "sqlite" else _json_path_for(path)
+    if not os.path.exists(real):
+        return {}
+    key = (engine, real)
+    with _snapshot_lock:
+        store = _snapshot_stores.get(key)
+        if store is None:
+            store = open_store(real, engine)
+            _snapshot_stores[key] = store
+    return store.read_all()
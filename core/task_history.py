@@ -86,17 +86,12 @@ def save_round(board_data: Dict[str, Any]) -> bool:
         return False
 
 
-def load_recent(n: int = 3) -> str:
-    """Load last N task rounds and format as a context string for agents.
-
-    Returns a human-readable summary string, or empty string if no history.
-    """
-    path = _history_path()
-    if not os.path.exists(path):
-        return ""
-
+def _read_rounds(path: str) -> List[Dict]:
+    """Parse every round in the history file (skips corrupt lines)."""
+    from core.prompt_cache import prompt_cache
+    prompt_cache.track(path)
+    rounds: List[Dict] = []
     try:
-        rounds: List[Dict] = []
         with open(path, "r", encoding="utf-8") as f:
             for line in f:
                 line = line.strip()
@@ -105,7 +100,24 @@ def load_recent(n: int = 3) -> str:
                         rounds.append(json.loads(line))
                     except json.JSONDecodeError:
                         continue
+    except FileNotFoundError:
+        pass
+    return rounds
+
 
+def load_recent(n: int = 3) -> str:
+    """Load last N task rounds and format as a context string for agents.
+
+    The parsed file is cached until it changes (``core.prompt_cache``);
+    only the formatting (relative timestamps) runs on every call.
+    Returns a human-readable summary string, or empty string if no history.
+    """
+    from core.prompt_cache import prompt_cache
+    path = _history_path()
+
+    try:
+        rounds = prompt_cache.section(
+            "task_history", path, lambda: _read_rounds(path))
         if not rounds:
             return ""
 
@@ -0,0 +1,995 @@
+"""
+core/task_store.py
+Pluggable storage engines for TaskBoard.
+
+  json    — single ``.task_board.json`` file, FileLock + full rewrite
+            (original behaviour, zero setup).
+  sqlite  — WAL-mode ``.task_board.db``: one row per task, indexes on
+            status / required_role / parent_id, single-row UPSERTs for
+            state transitions.  Writers serialize on SQLite's own write
+            lock for the duration of one small transaction instead of the
+            global FileLock around a multi-MB JSON rewrite.
+
+Both engines expose the same surfaces:
+  - ``read_all()`` / ``write_all(data)`` — whole-board dict view, kept for
+    the many callers that do ``board._read()`` / ``board._write(data)``.
+  - ``transaction()`` — row-level view (get / put / select / ready queue)
+    used by TaskBoard lifecycle methods.
+  - ``status_counts()`` — O(1) per-status counters.
+
+Ready queue: both engines track, per task, how many ``blocked_by`` tasks
+are still unfinished, plus a blocker → dependents index.  A task is
+*ready* when it is pending with zero unfinished blockers; ready tasks are
+bucketed by ``required_role`` and ordered by ``created_at``.  Completing a
+task decrements its dependents' counters, so claims never rescan the
+board.  sqlite persists this in ``task_deps`` / ``board_counters``;
+json keeps an in-memory ``ReadyIndex`` rebuilt whenever the file is
+(re)parsed.
+
+Ready notifications: every committed write reports the tasks it made
+ready (created, unblocked, resumed, retried, recovered) to the store's
+``on_ready`` callback as ``(task_id, required_role, min_reputation)``
+tuples.  TaskBoard uses this to signal only the agents that may claim
+them (see ``core.runtime.wakeup``).  Likewise every status transition
+(including creation) is reported to ``on_status`` as
+``(task_id, parent_id, status, required_role)`` tuples, which TaskBoard
+forwards to task-tree watchers (see ``core.task_watch``) and the lazy
+runtime's monitor (see ``core.runtime.lazy``).
+
+Migration: ``migrate_json_to_sqlite()`` copies an existing JSON board into
+a fresh database and archives the JSON file.  Once ``.task_board.db``
+exists, every ``TaskBoard()`` picks the SQLite engine automatically.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, Optional
+
+from core.protocols import FileLock
+
+logger = logging.getLogger(__name__)
+
+BOARD_FILE = ".task_board.json"
+BOARD_DB   = ".task_board.db"
+BOARD_LOCK = ".task_board.lock"
+
+ENGINE_JSON   = "json"
+ENGINE_SQLITE = "sqlite"
+ENGINES = (ENGINE_JSON, ENGINE_SQLITE)
+
+ENGINE_ENV = "CLEO_TASK_BOARD_ENGINE"
+
+# Status literals (TaskStatus lives in core.task_board, which imports us)
+_PENDING   = "pending"
+_COMPLETED = "completed"
+
+# (task_id, required_role or "", min_reputation)
+ReadyTask = tuple[str, str, int]
+
+# (task_id, parent_id or "", new status, required_role or "")
+StatusChange = tuple[str, str, str, str]
+
+
+def resolve_engine(path: str | None = None, engine: str | None = None) -> str:
+    """Pick the storage engine for a board.
+
+    Priority: explicit argument → ``CLEO_TASK_BOARD_ENGINE`` env →
+    ``.db`` path suffix → existing ``.task_board.db`` → json.
+    """
+    choice = (engine or os.environ.get(ENGINE_ENV, "")).strip().lower()
+    if choice:
+        if choice not in ENGINES:
+            logger.warning("Unknown task board engine '%s' — using json", choice)
+            return ENGINE_JSON
+        return choice
+    if path and path.endswith(".db"):
+        return ENGINE_SQLITE
+    db_path = _db_path_for(path or BOARD_FILE)
+    if os.path.exists(db_path):
+        return ENGINE_SQLITE
+    return ENGINE_JSON
+
+
+def _db_path_for(path: str) -> str:
+    """Map a board path to its SQLite database path (same directory)."""
+    if path.endswith(".db"):
+        return path
+    if os.path.basename(path) == BOARD_FILE:
+        return os.path.join(os.path.dirname(path), BOARD_DB)
+    root, _ = os.path.splitext(path)
+    return root + ".db"
+
+
+def _json_path_for(path: str) -> str:
+    """Map a board path to its legacy JSON path (same directory)."""
+    if not path.endswith(".db"):
+        return path
+    if os.path.basename(path) == BOARD_DB:
+        return os.path.join(os.path.dirname(path), BOARD_FILE)
+    root, _ = os.path.splitext(path)
+    return root + ".json"
+
+
+def _lock_path_for(path: str) -> str:
+    base = os.path.basename(path)
+    if base in (BOARD_FILE, BOARD_DB):
+        return os.path.join(os.path.dirname(path), BOARD_LOCK)
+    root, _ = os.path.splitext(path)
+    return root + ".lock"
+
+
+def _blockers_of(task: dict) -> tuple[str, ...]:
+    return tuple(sorted(set(task.get("blocked_by") or [])))
+
+
+def _notify(callback: Optional[Callable[[list], None]], items: list) -> None:
+    """Invoke an ``on_ready`` / ``on_status`` hook after commit — never
+    fails the write."""
+    if not callback or not items:
+        return
+    try:
+        callback(items)
+    except Exception as e:
+        logger.debug("[task_store] commit hook failed: %s", e)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  In-memory ready queue (json engine)
+# ══════════════════════════════════════════════════════════════════════════════
+
+class ReadyIndex:
+    """Incrementally maintained ready-set + status counters.
+
+    Per role bucket, a min-heap of ``(created_at, seq, task_id)`` with lazy
+    deletion: an entry is live only while ``_ready[task_id]`` still points
+    at it.  ``apply()`` diffs a task against its last known state, so
+    callers may pass dicts that were mutated in place.  Tasks that enter
+    the ready set are appended to ``became_ready`` and status transitions
+    to ``status_changes`` until taken.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self) -> None:
+        self._status: dict[str, str] = {}
+        self._role: dict[str, str] = {}
+        self._created: dict[str, float] = {}
+        self._min_rep: dict[str, int] = {}
+        self._blocked: dict[str, tuple[str, ...]] = {}
+        self._left: dict[str, int] = {}                 # unfinished blockers
+        self._dependents: dict[str, set[str]] = {}      # blocker → tasks
+        self._ready: dict[str, tuple[str, int]] = {}    # task → (role, seq)
+        self._heaps: dict[str, list[tuple[float, int, str]]] = {}
+        self._counts: Counter = Counter()
+        self._ready_counts: Counter = Counter()
+        self._seq = 0
+        self.became_ready: list[str] = []
+        self.status_changes: list[StatusChange] = []
+
+    def rebuild(self, data: dict) -> None:
+        self.clear()
+        for t in data.values():
+            self.apply(t)
+        self.became_ready = []   # a reload is not a transition
+        self.status_changes = []
+
+    def take_became_ready(self) -> list[ReadyTask]:
+        """Pop ``(task_id, role, min_reputation)`` for tasks that became
+        ready since the last call and are still ready."""
+        out = [(tid, self._role.get(tid, ""), self._min_rep.get(tid, 0))
+               for tid in dict.fromkeys(self.became_ready) if tid in self._ready]
+        self.became_ready = []
+        return out
+
+    def take_status_changes(self) -> list[StatusChange]:
+        out, self.status_changes = self.status_changes, []
+        return out
+
+    # ── Mutation ──────────────────────────────────────────────────────────
+
+    def apply(self, task: dict) -> None:
+        tid = task["task_id"]
+        status = task.get("status", _PENDING)
+        old_status = self._status.get(tid)
+        if old_status is not None:
+            self._counts[old_status] -= 1
+        self._counts[status] += 1
+
+        blocked = _blockers_of(task)
+        if old_status is None or self._blocked.get(tid) != blocked:
+            for b in self._blocked.get(tid, ()):
+                self._dependents.get(b, set()).discard(tid)
+            for b in blocked:
+                self._dependents.setdefault(b, set()).add(tid)
+            self._blocked[tid] = blocked
+            self._left[tid] = sum(1 for b in blocked
+                                  if self._status.get(b) != _COMPLETED)
+
+        if status != old_status:
+            self.status_changes.append(
+                (tid, task.get("parent_id") or "", status,
+                 task.get("required_role") or ""))
+        self._status[tid] = status
+        self._role[tid] = task.get("required_role") or ""
+        self._created[tid] = task.get("created_at") or 0.0
+        self._min_rep[tid] = task.get("min_reputation") or 0
+
+        was_done = old_status == _COMPLETED
+        now_done = status == _COMPLETED
+        if was_done != now_done:
+            self._shift_dependents(tid, -1 if now_done else 1)
+        self._refresh(tid)
+
+    def remove(self, tid: str) -> None:
+        status = self._status.pop(tid, None)
+        if status is None:
+            return
+        self._counts[status] -= 1
+        for b in self._blocked.pop(tid, ()):
+            self._dependents.get(b, set()).discard(tid)
+        self._left.pop(tid, None)
+        self._unready(tid)
+        if status == _COMPLETED:
+            self._shift_dependents(tid, 1)
+        for d in (self._role, self._created, self._min_rep):
+            d.pop(tid, None)
+
+    def _shift_dependents(self, tid: str, delta: int) -> None:
+        for dep in self._dependents.get(tid, ()):
+            if dep in self._left:
+                self._left[dep] += delta
+                self._refresh(dep)
+
+    def _refresh(self, tid: str) -> None:
+        ready = (self._status.get(tid) == _PENDING
+                 and self._left.get(tid, 0) <= 0)
+        role = self._role.get(tid, "")
+        current = self._ready.get(tid)
+        if not ready:
+            self._unready(tid)
+            return
+        if current is not None and current[0] == role:
+            return
+        self._unready(tid)
+        self.became_ready.append(tid)
+        self._seq += 1
+        self._ready[tid] = (role, self._seq)
+        self._ready_counts[role] += 1
+        heap = self._heaps.setdefault(role, [])
+        heapq.heappush(heap, (self._created.get(tid, 0.0), self._seq, tid))
+        # Compact buckets dominated by stale entries
+        if len(heap) > 2 * self._ready_counts[role] + 64:
+            self._heaps[role] = [e for e in heap
+                                 if self._ready.get(e[2]) == (role, e[1])]
+            heapq.heapify(self._heaps[role])
+
+    def _unready(self, tid: str) -> None:
+        current = self._ready.pop(tid, None)
+        if current is not None:
+            self._ready_counts[current[0]] -= 1
+
+    # ── Queries ───────────────────────────────────────────────────────────
+
+    def ready_roles(self) -> list[str]:
+        return [r for r, n in self._ready_counts.items() if n > 0]
+
+    def next_ready(self, roles: Iterable[str],
+                   agent_reputation: int) -> Optional[str]:
+        """Earliest-created ready task across ``roles`` the agent qualifies for."""
+        best: tuple[float, int, str] | None = None
+        for role in roles:
+            heap = self._heaps.get(role)
+            while heap and self._ready.get(heap[0][2]) != (role, heap[0][1]):
+                heapq.heappop(heap)
+            if not heap:
+                continue
+            entry = heap[0]
+            if self._min_rep.get(entry[2], 0) > agent_reputation:
+                entry = next((e for e in sorted(heap)
+                              if self._ready.get(e[2]) == (role, e[1])
+                              and self._min_rep.get(e[2], 0) <= agent_reputation),
+                             None)
+            if entry is not None and (best is None or entry < best):
+                best = entry
+        return best[2] if best else None
+
+    def counts(self) -> dict[str, int]:
+        return {s: n for s, n in self._counts.items() if n > 0}
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  JSON engine
+# ══════════════════════════════════════════════════════════════════════════════
+
+class _JsonTxn:
+    """Row view over the in-memory board dict, written back once on exit."""
+
+    def __init__(self, data: dict, index: ReadyIndex):
+        self.data = data
+        self.index = index
+        self.dirty = False
+
+    def get(self, task_id: str) -> Optional[dict]:
+        return self.data.get(task_id)
+
+    def put(self, task: dict) -> None:
+        self.data[task["task_id"]] = task
+        self.index.apply(task)
+        self.dirty = True
+
+    def delete_all(self) -> None:
+        self.data.clear()
+        self.index.clear()
+        self.dirty = True
+
+    def select(self, *statuses: str) -> list[dict]:
+        if not statuses:
+            return list(self.data.values())
+        return [t for t in self.data.values() if t.get("status") in statuses]
+
+    def ready_roles(self) -> list[str]:
+        return self.index.ready_roles()
+
+    def next_ready(self, roles: Iterable[str],
+                   agent_reputation: int) -> Optional[dict]:
+        tid = self.index.next_ready(roles, agent_reputation)
+        return self.data.get(tid) if tid else None
+
+    def count(self) -> int:
+        return len(self.data)
+
+
+class JsonTaskStore:
+    """Original single-file engine: FileLock + full JSON rewrite."""
+
+    engine = ENGINE_JSON
+
+    def __init__(self, path: str = BOARD_FILE):
+        self.path = path
+        self.lock = FileLock(_lock_path_for(path))
+        # mtime-guarded cache — avoids redundant json.load() on unchanged file
+        self._cache: dict | None = None
+        self._cache_mtime: float = 0.0
+        self._index = ReadyIndex()
+        self.on_ready: Optional[Callable[[list[ReadyTask]], None]] = None
+        self.on_status: Optional[Callable[[list[StatusChange]], None]] = None
+        # Fix TOCTOU: init under lock
+        with self.lock:
+            if not os.path.exists(path):
+                self.write_all({})
+
+    @contextmanager
+    def transaction(self) -> Iterator[_JsonTxn]:
+        with self.lock:
+            txn = _JsonTxn(self.read_all(), self._index)
+            self._index.became_ready = []
+            self._index.status_changes = []
+            yield txn
+            if txn.dirty:
+                self._dump(txn.data)
+            ready = self._index.take_became_ready()
+            changes = self._index.take_status_changes()
+        _notify(self.on_ready, ready)
+        _notify(self.on_status, changes)
+
+    def get(self, task_id: str) -> Optional[dict]:
+        return self.read_all().get(task_id)
+
+    def read_all(self) -> dict:
+        """Read task board JSON with mtime-guarded cache.
+
+        Returns cached data if file mtime hasn't changed, avoiding
+        redundant open() + json.load() calls (idle: 6 reads/sec → stat-only).
+        """
+        try:
+            mtime = os.path.getmtime(self.path)
+        except FileNotFoundError:
+            return {}
+        if self._cache is not None and mtime == self._cache_mtime:
+            return self._cache
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            self._index.rebuild(data)
+            self._cache = data
+            self._cache_mtime = mtime
+            return data
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def status_counts(self) -> dict[str, int]:
+        self.read_all()  # revalidate cache (and index) against the file
+        return self._index.counts()
+
+    def write_all(self, data: dict) -> None:
+        before = set(self._index._ready)
+        old_status = dict(self._index._status)
+        self._index.rebuild(data)
+        self._dump(data)
+        idx = self._index
+        _notify(self.on_ready, [
+            (tid, idx._role.get(tid, ""), idx._min_rep.get(tid, 0))
+            for tid in idx._ready if tid not in before])
+        _notify(self.on_status, [
+            (tid, t.get("parent_id") or "", idx._status[tid],
+             t.get("required_role") or "")
+            for tid, t in data.items() if old_status.get(tid) != idx._status[tid]])
+
+    def _dump(self, data: dict) -> None:
+        with open(self.path, "w") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        # Sync cache on write to avoid stale reads
+        self._cache = data
+        try:
+            self._cache_mtime = os.path.getmtime(self.path)
+        except FileNotFoundError:
+            self._cache_mtime = 0.0
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  SQLite engine
+# ══════════════════════════════════════════════════════════════════════════════
+
+SCHEMA_VERSION = 2
+
+_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS tasks (
+        seq            INTEGER PRIMARY KEY AUTOINCREMENT,
+        task_id        TEXT NOT NULL UNIQUE,
+        status         TEXT NOT NULL,
+        required_role  TEXT,
+        parent_id      TEXT,
+        agent_id       TEXT,
+        created_at     REAL,
+        min_reputation INTEGER NOT NULL DEFAULT 0,
+        blocked_by     TEXT NOT NULL DEFAULT '',
+        blockers_left  INTEGER NOT NULL DEFAULT 0,
+        data           TEXT NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_status        ON tasks(status)",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_required_role ON tasks(required_role)",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_parent_id     ON tasks(parent_id)",
+    """CREATE INDEX IF NOT EXISTS idx_tasks_ready
+        ON tasks(status, blockers_left, required_role, created_at)""",
+    # blocker → dependent edges (blocker may not exist yet)
+    """CREATE TABLE IF NOT EXISTS task_deps (
+        blocker_id TEXT NOT NULL,
+        task_id    TEXT NOT NULL,
+        PRIMARY KEY (blocker_id, task_id)
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_task_deps_task ON task_deps(task_id)",
+    # 'status:<s>' and 'ready:<role>' counters, maintained by triggers.
+    # NOT EXISTS instead of INSERT OR IGNORE: the outer UPSERT's conflict
+    # policy would override OR IGNORE inside the trigger body.
+    """CREATE TABLE IF NOT EXISTS board_counters (
+        key TEXT PRIMARY KEY,
+        n   INTEGER NOT NULL
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS trg_tasks_count_ins AFTER INSERT ON tasks
+    BEGIN
+        INSERT INTO board_counters (key, n)
+            SELECT 'status:' || NEW.status, 0 WHERE NOT EXISTS
+                (SELECT 1 FROM board_counters WHERE key = 'status:' || NEW.status);
+        UPDATE board_counters SET n = n + 1
+            WHERE key = 'status:' || NEW.status;
+        INSERT INTO board_counters (key, n)
+            SELECT 'ready:' || COALESCE(NEW.required_role, ''), 0
+            WHERE NEW.status = 'pending' AND NEW.blockers_left = 0
+              AND NOT EXISTS (SELECT 1 FROM board_counters WHERE
+                  key = 'ready:' || COALESCE(NEW.required_role, ''));
+        UPDATE board_counters SET n = n + 1
+            WHERE NEW.status = 'pending' AND NEW.blockers_left = 0
+              AND key = 'ready:' || COALESCE(NEW.required_role, '');
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_tasks_count_del AFTER DELETE ON tasks
+    BEGIN
+        UPDATE board_counters SET n = n - 1
+            WHERE key = 'status:' || OLD.status;
+        UPDATE board_counters SET n = n - 1
+            WHERE OLD.status = 'pending' AND OLD.blockers_left = 0
+              AND key = 'ready:' || COALESCE(OLD.required_role, '');
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_tasks_count_upd
+    AFTER UPDATE OF status, blockers_left, required_role ON tasks
+    BEGIN
+        UPDATE board_counters SET n = n - 1
+            WHERE key = 'status:' || OLD.status;
+        UPDATE board_counters SET n = n - 1
+            WHERE OLD.status = 'pending' AND OLD.blockers_left = 0
+              AND key = 'ready:' || COALESCE(OLD.required_role, '');
+        INSERT INTO board_counters (key, n)
+            SELECT 'status:' || NEW.status, 0 WHERE NOT EXISTS
+                (SELECT 1 FROM board_counters WHERE key = 'status:' || NEW.status);
+        UPDATE board_counters SET n = n + 1
+            WHERE key = 'status:' || NEW.status;
+        INSERT INTO board_counters (key, n)
+            SELECT 'ready:' || COALESCE(NEW.required_role, ''), 0
+            WHERE NEW.status = 'pending' AND NEW.blockers_left = 0
+              AND NOT EXISTS (SELECT 1 FROM board_counters WHERE
+                  key = 'ready:' || COALESCE(NEW.required_role, ''));
+        UPDATE board_counters SET n = n + 1
+            WHERE NEW.status = 'pending' AND NEW.blockers_left = 0
+              AND key = 'ready:' || COALESCE(NEW.required_role, '');
+    END""",
+]
+
+# Columns added after the first sqlite layout (schema version 1)
+_V2_COLUMNS = (
+    ("min_reputation", "INTEGER NOT NULL DEFAULT 0"),
+    ("blocked_by",     "TEXT NOT NULL DEFAULT ''"),
+    ("blockers_left",  "INTEGER NOT NULL DEFAULT 0"),
+)
+
+_UPSERT = """
+INSERT INTO tasks (task_id, status, required_role, parent_id, agent_id,
+                   created_at, min_reputation, blocked_by, blockers_left, data)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(task_id) DO UPDATE SET
+    status         = excluded.status,
+    required_role  = excluded.required_role,
+    parent_id      = excluded.parent_id,
+    agent_id       = excluded.agent_id,
+    created_at     = excluded.created_at,
+    min_reputation = excluded.min_reputation,
+    blocked_by     = excluded.blocked_by,
+    blockers_left  = excluded.blockers_left,
+    data           = excluded.data
+"""
+
+_SHIFT_DEPENDENTS = """
+UPDATE tasks SET blockers_left = MAX(0, blockers_left + ?)
+WHERE task_id IN (SELECT task_id FROM task_deps WHERE blocker_id = ?)
+"""
+
+
+# Earliest ready task in one role bucket: equality on (status,
+# blockers_left, required_role) lets idx_tasks_ready seek straight to the
+# bucket and walk it in created_at order — a LIMIT 1 with no sort
+_NEXT_READY = (
+    "SELECT created_at, seq, data FROM tasks "
+    "WHERE status = 'pending' AND blockers_left = 0 "
+    "AND required_role {} AND min_reputation <= ? "
+    "ORDER BY created_at, seq LIMIT 1")
+
+
+def _encode(task: dict) -> str:
+    return json.dumps(task, ensure_ascii=False)
+
+
+def _count_unfinished(conn: sqlite3.Connection, blocked: tuple[str, ...]) -> int:
+    if not blocked:
+        return 0
+    marks = ",".join("?" * len(blocked))
+    done = conn.execute(
+        f"SELECT COUNT(*) FROM tasks WHERE status = ? AND task_id IN ({marks})",
+        (_COMPLETED, *blocked)).fetchone()[0]
+    return len(blocked) - done
+
+
+def _put_row(conn: sqlite3.Connection, task: dict, encoded: str,
+             changes: Optional[list[StatusChange]] = None) -> list[ReadyTask]:
+    """Upsert one task and keep the dependency counters consistent.
+
+    Returns the tasks this write made ready — the row itself and/or
+    dependents whose last unfinished blocker just completed.  A status
+    transition is appended to ``changes``.
+    """
+    tid = task["task_id"]
+    status = task.get("status", _PENDING)
+    blocked = _blockers_of(task)
+    blocked_key = ",".join(blocked)
+    prev = conn.execute(
+        "SELECT status, blocked_by, blockers_left FROM tasks WHERE task_id = ?",
+        (tid,)).fetchone()
+    if prev is None or prev[1] != blocked_key:
+        conn.execute("DELETE FROM task_deps WHERE task_id = ?", (tid,))
+        conn.executemany("INSERT OR IGNORE INTO task_deps VALUES (?, ?)",
+                         [(b, tid) for b in blocked])
+        left = _count_unfinished(conn, blocked)
+    else:
+        left = prev[2]
+    conn.execute(_UPSERT, (
+        tid, status, task.get("required_role"), task.get("parent_id"),
+        task.get("agent_id"), task.get("created_at"),
+        task.get("min_reputation") or 0, blocked_key, left, encoded))
+    if changes is not None and (prev is None or prev[0] != status):
+        changes.append((tid, task.get("parent_id") or "", status,
+                        task.get("required_role") or ""))
+    ready: list[ReadyTask] = []
+    was_ready = prev is not None and prev[0] == _PENDING and prev[2] <= 0
+    if status == _PENDING and left <= 0 and not was_ready:
+        ready.append((tid, task.get("required_role") or "",
+                      task.get("min_reputation") or 0))
+    was_done = prev is not None and prev[0] == _COMPLETED
+    now_done = status == _COMPLETED
+    if was_done != now_done:
+        conn.execute(_SHIFT_DEPENDENTS, (-1 if now_done else 1, tid))
+        if now_done:
+            ready.extend(
+                (dep, role or "", rep or 0) for dep, role, rep in conn.execute(
+                    "SELECT task_id, required_role, min_reputation FROM tasks "
+                    "WHERE status = ? AND blockers_left = 0 AND task_id IN "
+                    "(SELECT task_id FROM task_deps WHERE blocker_id = ?)",
+                    (_PENDING, tid)))
+    return ready
+
+
+def _delete_row(conn: sqlite3.Connection, tid: str) -> None:
+    prev = conn.execute(
+        "SELECT status FROM tasks WHERE task_id = ?", (tid,)).fetchone()
+    if prev is None:
+        return
+    conn.execute("DELETE FROM tasks WHERE task_id = ?", (tid,))
+    conn.execute("DELETE FROM task_deps WHERE task_id = ?", (tid,))
+    if prev[0] == _COMPLETED:
+        conn.execute(_SHIFT_DEPENDENTS, (1, tid))
+
+
+def _rebuild_derived(conn: sqlite3.Connection) -> None:
+    """Recompute dependency edges, blocker counts and counters from ``data``."""
+    conn.execute("DELETE FROM task_deps")
+    rows = [(tid, json.loads(encoded)) for tid, encoded in
+            conn.execute("SELECT task_id, data FROM tasks")]
+    done = {tid for tid, t in rows if t.get("status") == _COMPLETED}
+    for tid, t in rows:
+        blocked = _blockers_of(t)
+        conn.executemany("INSERT OR IGNORE INTO task_deps VALUES (?, ?)",
+                         [(b, tid) for b in blocked])
+        conn.execute(
+            "UPDATE tasks SET min_reputation = ?, blocked_by = ?, "
+            "blockers_left = ? WHERE task_id = ?",
+            (t.get("min_reputation") or 0, ",".join(blocked),
+             sum(1 for b in blocked if b not in done), tid))
+    conn.execute("DELETE FROM board_counters")
+    conn.execute(
+        "INSERT INTO board_counters (key, n) "
+        "SELECT 'status:' || status, COUNT(*) FROM tasks GROUP BY status")
+    conn.execute(
+        "INSERT INTO board_counters (key, n) "
+        "SELECT 'ready:' || COALESCE(required_role, ''), COUNT(*) FROM tasks "
+        "WHERE status = 'pending' AND blockers_left = 0 "
+        "GROUP BY COALESCE(required_role, '')")
+
+
+def _ensure_schema(conn: sqlite3.Connection) -> None:
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        conn.execute(_SCHEMA[0])
+        if version < SCHEMA_VERSION:
+            cols = {r[1] for r in conn.execute("PRAGMA table_info(tasks)")}
+            for name, ddl in _V2_COLUMNS:
+                if name not in cols:
+                    conn.execute(f"ALTER TABLE tasks ADD COLUMN {name} {ddl}")
+        for stmt in _SCHEMA[1:]:
+            conn.execute(stmt)
+        if version < SCHEMA_VERSION:
+            _rebuild_derived(conn)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+class _SqliteTxn:
+    """Row view inside one ``BEGIN IMMEDIATE`` transaction."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.written: dict[str, str] = {}   # task_id → encoded row
+        self.cleared = False
+        self.ready: list[ReadyTask] = []
+        self.changes: list[StatusChange] = []
+
+    def get(self, task_id: str) -> Optional[dict]:
+        row = self.conn.execute(
+            "SELECT data FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, task: dict) -> None:
+        encoded = _encode(task)
+        self.ready.extend(_put_row(self.conn, task, encoded, self.changes))
+        self.written[task["task_id"]] = encoded
+
+    def delete_all(self) -> None:
+        self.conn.execute("DELETE FROM tasks")
+        self.conn.execute("DELETE FROM task_deps")
+        self.conn.execute("DELETE FROM board_counters")
+        self.written.clear()
+        self.cleared = True
+
+    def select(self, *statuses: str) -> list[dict]:
+        if not statuses:
+            rows = self.conn.execute("SELECT data FROM tasks ORDER BY seq")
+        else:
+            marks = ",".join("?" * len(statuses))
+            rows = self.conn.execute(
+                f"SELECT data FROM tasks WHERE status IN ({marks}) ORDER BY seq",
+                statuses)
+        return [json.loads(r[0]) for r in rows]
+
+    def ready_roles(self) -> list[str]:
+        return [key[6:] for key, in self.conn.execute(
+            "SELECT key FROM board_counters WHERE key LIKE 'ready:%' AND n > 0")]
+
+    def next_ready(self, roles: Iterable[str],
+                   agent_reputation: int) -> Optional[dict]:
+        """Earliest-created ready task across ``roles`` — one indexed
+        ``LIMIT 1`` probe per role bucket."""
+        best: tuple | None = None
+        for role in roles:
+            # The unassigned bucket is two equality probes (NULL and '') —
+            # an OR would defeat the index seek
+            probes = ([("IS NULL", ()), ("= ''", ())] if not role
+                      else [("= ?", (role,))])
+            for role_clause, params in probes:
+                row = self.conn.execute(
+                    _NEXT_READY.format(role_clause),
+                    (*params, agent_reputation)).fetchone()
+                if row and (best is None or (row[0] or 0, row[1]) < best[:2]):
+                    best = (row[0] or 0, row[1], row[2])
+        return json.loads(best[2]) if best else None
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+
+class SqliteTaskStore:
+    """WAL-mode SQLite engine with row-level writes.
+
+    One connection per process (re-opened after fork), guarded by a
+    thread lock so threaded servers can share a board instance.
+    The whole-board ``read_all()`` cache is validated with
+    ``PRAGMA data_version`` — a no-I/O check that changes only when
+    another connection commits.
+    """
+
+    engine = ENGINE_SQLITE
+
+    def __init__(self, path: str = BOARD_DB):
+        self.path = path
+        # Kept for callers that still do ``with board.lock: _read/_write``
+        self.lock = FileLock(_lock_path_for(path))
+        self._mu = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+        self._pid = 0
+        self._cache: dict | None = None
+        self._cache_rows: dict[str, str] = {}
+        self._cache_version: int = -1
+        # Row encodings the last ``read_all`` returned (or ``write_all``
+        # persisted) — the baseline ``write_all`` diffs and deletes against
+        self._seen_rows: dict[str, str] = {}
+        self.on_ready: Optional[Callable[[list[ReadyTask]], None]] = None
+        self.on_status: Optional[Callable[[list[StatusChange]], None]] = None
+        self._connect()
+
+    # ── Connection ────────────────────────────────────────────────────────
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None and self._pid == os.getpid():
+            return self._conn
+        d = os.path.dirname(self.path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30.0,
+                               isolation_level=None,
+                               check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _ensure_schema(conn)
+        self._conn = conn
+        self._pid = os.getpid()
+        self._cache = None
+        return conn
+
+    def _data_version(self, conn: sqlite3.Connection) -> int:
+        return conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self) -> None:
+        with self._mu:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+            self._cache = None
+
+    # ── Row-level access ──────────────────────────────────────────────────
+
+    @contextmanager
+    def transaction(self) -> Iterator[_SqliteTxn]:
+        with self._mu:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            version = self._data_version(conn)
+            txn = _SqliteTxn(conn)
+            try:
+                yield txn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            self._after_commit(txn, version)
+        _notify(self.on_ready, txn.ready)
+        _notify(self.on_status, txn.changes)
+
+    def _after_commit(self, txn: _SqliteTxn, version: int) -> None:
+        """Patch the whole-board cache with our own writes.
+
+        Our own commits do not bump ``data_version`` on this connection, so
+        the cache stays valid only if nobody else committed since it was
+        loaded; otherwise drop it and reload lazily.
+        """
+        if self._cache is None:
+            return
+        if version != self._cache_version:
+            self._cache = None
+            return
+        if self._cache_rows is self._seen_rows:
+            # Keep the ``write_all`` baseline as of the caller's read
+            self._cache_rows = dict(self._cache_rows)
+        if txn.cleared:
+            self._cache.clear()
+            self._cache_rows.clear()
+        for tid, encoded in txn.written.items():
+            self._cache[tid] = json.loads(encoded)
+            self._cache_rows[tid] = encoded
+
+    def get(self, task_id: str) -> Optional[dict]:
+        """Single-row lookup — no transaction, no whole-board load."""
+        with self._mu:
+            conn = self._connect()
+            if self._cache is not None and \
+                    self._data_version(conn) == self._cache_version:
+                return self._cache.get(task_id)
+            row = conn.execute(
+                "SELECT data FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    # ── Whole-board access (compat) ───────────────────────────────────────
+
+    def read_all(self) -> dict:
+        with self._mu:
+            conn = self._connect()
+            version = self._data_version(conn)
+            if self._cache is not None and version == self._cache_version:
+                self._seen_rows = self._cache_rows
+                return self._cache
+            data: dict = {}
+            rows: dict[str, str] = {}
+            for tid, encoded in conn.execute(
+                    "SELECT task_id, data FROM tasks ORDER BY seq"):
+                try:
+                    data[tid] = json.loads(encoded)
+                except json.JSONDecodeError:
+                    continue
+                rows[tid] = encoded
+            self._cache = data
+            self._cache_rows = self._seen_rows = rows
+            self._cache_version = version
+            return data
+
+    def write_all(self, data: dict) -> None:
+        """Persist a whole-board dict, writing only rows that changed.
+
+        Rows are diffed against the encodings seen at the last
+        ``read_all`` / ``write_all``, so a read-modify-write of one task
+        costs one UPSERT.  Only tasks from that baseline that are missing
+        from ``data`` are deleted; rows created or updated since by
+        ``transaction()`` writers (other threads or processes) are left
+        untouched.
+        """
+        with self._mu:
+            conn = self._connect()
+            known = self._seen_rows
+            written: dict[str, str] = {}
+            ready: list[ReadyTask] = []
+            changes: list[StatusChange] = []
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for tid in [k for k in known if k not in data]:
+                    _delete_row(conn, tid)
+                for tid, t in data.items():
+                    encoded = written[tid] = _encode(t)
+                    if known.get(tid) == encoded:
+                        continue
+                    ready.extend(_put_row(conn, t, encoded, changes))
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            self._seen_rows = written
+            # Another process may have written rows meanwhile — reload lazily
+            self._cache = None
+        _notify(self.on_ready, ready)
+        _notify(self.on_status, changes)
+
+    def status_counts(self) -> dict[str, int]:
+        """Per-status task counts from trigger-maintained counters."""
+        with self._mu:
+            conn = self._connect()
+            return {key[7:]: n for key, n in conn.execute(
+                "SELECT key, n FROM board_counters "
+                "WHERE key LIKE 'status:%' AND n > 0")}
+
+    def query_ids(self, status: str | None = None,
+                  parent_id: str | None = None) -> list[str]:
+        """Indexed id lookup by status and/or parent_id."""
+        clauses, params = [], []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if parent_id is not None:
+            clauses.append("parent_id = ?")
+            params.append(parent_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._mu:
+            conn = self._connect()
+            return [r[0] for r in conn.execute(
+                f"SELECT task_id FROM tasks {where} ORDER BY seq", params)]
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Factory + migration
+# ══════════════════════════════════════════════════════════════════════════════
+
+def open_store(path: str = BOARD_FILE, engine: str | None = None):
+    """Open the storage engine for ``path`` (see ``resolve_engine``).
+
+    Explicitly requesting sqlite while only a JSON board exists performs
+    the one-shot migration first.
+    """
+    chosen = resolve_engine(path, engine)
+    if chosen == ENGINE_SQLITE:
+        db_path = _db_path_for(path)
+        json_path = _json_path_for(path)
+        if not os.path.exists(db_path) and os.path.exists(json_path):
+            migrate_json_to_sqlite(json_path, db_path)
+        return SqliteTaskStore(db_path)
+    return JsonTaskStore(_json_path_for(path))
+
+
+def migrate_json_to_sqlite(json_path: str = BOARD_FILE,
+                           db_path: str | None = None,
+                           archive: bool = True) -> int:
+    """Copy every task from a JSON board into a SQLite board.
+
+    Runs under the board FileLock so no agent writes the JSON file mid-copy.
+    With ``archive=True`` the JSON file is renamed to ``<name>.migrated``
+    afterwards so auto-detection switches every process to SQLite.
+    Returns the number of migrated tasks.
+    """
+    db_path = db_path or _db_path_for(json_path)
+    lock = FileLock(_lock_path_for(json_path))
+    with lock:
+        try:
+            with open(json_path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Cannot migrate corrupt task board {json_path}: {e}")
+
+        store = SqliteTaskStore(db_path)
+        try:
+            with store.transaction() as txn:
+                for tid, t in data.items():
+                    t = dict(t)
+                    t.setdefault("task_id", tid)
+                    t.setdefault("status", "pending")
+                    txn.put(t)
+        finally:
+            store.close()
+
+        if archive and os.path.exists(json_path):
+            os.replace(json_path, json_path + ".migrated")
+    logger.info("Migrated %d tasks from %s to %s", len(data), json_path, db_path)
+    return len(data)
@@ -0,0 +1,463 @@
+"""
+core/task_stream.py
+Tail-following reader for per-task token streams.
+
+The agent appends one JSON line per chunk to
+``.task_streams/<task_id>.stream`` through ``StreamWriter``, which keeps
+the file open and coalesces chunks into one write every FLUSH_INTERVAL
+seconds or FLUSH_BYTES bytes, whichever comes first.  The accumulated
+text is mirrored to ``.task_streams/<task_id>.partial`` (atomic replace,
+at most every PARTIAL_INTERVAL) so dashboards can show a live preview
+without the agent rewriting the task board; ``read_partial`` /
+``task_partial`` read it back.
+When the task reaches a terminal state, ``TaskBoard.cleanup_stream``
+appends an end marker ``{"end": "<status>"}`` and unlinks both files.
+
+``StreamTail`` keeps the file open and resumes from its last byte offset,
+so each poll costs O(new bytes) instead of re-parsing the whole file.
+Readers holding the descriptor still see the end marker after the unlink,
+which is how followers learn the task finished without polling the board.
+On Linux, waits block on inotify (file growth / creation); elsewhere they
+fall back to a short sleep between reads.
+
+Usage:
+    with StreamWriter(task_id) as w:
+        for text in tokens:
+            w.write(text)
+
+    tail = StreamTail(task_id)
+    for chunk in tail.follow(idle_timeout=30):
+        ...                      # {"c": text, "seq": n, "ts": t}
+    tail.ended                   # terminal status, "timeout", or None
+
+    async for chunk in StreamTail(task_id).afollow():   # event-loop callers
+        ...
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ctypes
+import ctypes.util
+import json
+import logging
+import math
+import os
+import select
+import sys
+import time
+from typing import Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+STREAM_DIR = ".task_streams"
+POLL_INTERVAL = 0.15          # fallback wait when inotify is unavailable
+TERMINAL_CHECK_INTERVAL = 2.0  # safety-net board check while idle
+FLUSH_INTERVAL = 0.05          # max age of buffered chunks (seconds)
+FLUSH_BYTES = 4096             # flush once this many bytes are buffered
+PARTIAL_INTERVAL = 0.25        # min seconds between partial-preview rewrites
+
+# Statuses in which an agent may still be streaming
+_LIVE_STATUSES = frozenset({"claimed", "review", "critique"})
+
+
+def stream_path(task_id: str) -> str:
+    return os.path.join(STREAM_DIR, f"{task_id}.stream")
+
+
+def partial_path(task_id: str) -> str:
+    return os.path.join(STREAM_DIR, f"{task_id}.partial")
+
+
+def read_partial(task_id: str) -> str:
+    """Latest partial result written by ``StreamWriter`` ('' if none)."""
+    try:
+        with open(partial_path(task_id), encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return ""
+
+
+def task_partial(t: dict) -> str:
+    """Partial result for a task dict: legacy board field, else side file."""
+    pr = t.get("partial_result")
+    if pr:
+        return pr
+    if t.get("status") in _LIVE_STATUSES and t.get("task_id"):
+        return read_partial(t["task_id"])
+    return ""
+
+
+# ── Buffered writer ──────────────────────────────────────────────────────────
+
+class StreamWriter:
+    """Single-writer, buffered appender for one task's stream.
+
+    ``write`` only buffers; lines reach the file when the buffer is
+    FLUSH_BYTES large or its oldest chunk is FLUSH_INTERVAL old.  When
+    called from an event loop, a timer flushes a quiet buffer so a stalled
+    provider never holds the last chunks back.  ``close`` flushes
+    everything (stream and partial) and releases the file handle.
+    """
+
+    def __init__(self, task_id: str, flush_interval: float = FLUSH_INTERVAL,
+                 flush_bytes: int = FLUSH_BYTES,
+                 partial_interval: float = PARTIAL_INTERVAL):
+        self.task_id = task_id
+        self.path = stream_path(task_id)
+        self.flush_interval = flush_interval
+        self.flush_bytes = flush_bytes
+        self.partial_interval = partial_interval
+        self.seq = 0
+        self.flushes = 0            # stream-file writes issued
+        self.partial_writes = 0
+        self._fh = None
+        self._lines: list[str] = []
+        self._pending = 0           # buffered bytes (approx.)
+        self._first_ts = 0.0        # monotonic time of oldest buffered chunk
+        self._parts: list[str] = []
+        self._partial_dirty = False
+        self._partial_ts = float("-inf")
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_at = math.inf   # monotonic deadline the timer is set for
+
+    def write(self, chunk: str) -> None:
+        self.seq += 1
+        line = json.dumps({"c": chunk, "seq": self.seq, "ts": time.time()},
+                          ensure_ascii=False)
+        now = time.monotonic()
+        if not self._lines:
+            self._first_ts = now
+        self._lines.append(line)
+        self._pending += len(line) + 1
+        self._parts.append(chunk)
+        self._partial_dirty = True
+        if (self._pending >= self.flush_bytes
+                or now - self._first_ts >= self.flush_interval):
+            self.flush()
+        else:
+            self._schedule()
+
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def flush(self, partial: bool = False) -> None:
+        """Write buffered lines; refresh the partial preview when due
+        (or unconditionally with ``partial=True``)."""
+        self._cancel_timer()
+        if self._lines:
+            if self._fh is None:
+                os.makedirs(STREAM_DIR, exist_ok=True)
+                self._fh = open(self.path, "a", encoding="utf-8")
+            self._fh.write("\n".join(self._lines) + "\n")
+            self._fh.flush()
+            self.flushes += 1
+            self._lines.clear()
+            self._pending = 0
+        if not self._partial_dirty:
+            return
+        wait = self.partial_interval - (time.monotonic() - self._partial_ts)
+        if partial or wait <= 0:
+            self._write_partial()
+            self._partial_ts = time.monotonic()
+        else:
+            self._schedule()          # preview must not lag a stalled stream
+
+    def close(self) -> None:
+        try:
+            self.flush(partial=True)
+        except OSError as e:
+            logger.debug("[task_stream] final flush failed for %s: %s",
+                         self.task_id, e)
+        finally:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    def __enter__(self) -> "StreamWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _write_partial(self) -> None:
+        os.makedirs(STREAM_DIR, exist_ok=True)
+        path = partial_path(self.task_id)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.text())
+        os.replace(tmp, path)
+        self._partial_dirty = False
+        self.partial_writes += 1
+
+    def _schedule(self) -> None:
+        """Keep one timer armed for the earliest pending deadline: the
+        buffered lines' FLUSH_INTERVAL or the next partial rewrite."""
+        due = math.inf
+        if self._lines:
+            due = self._first_ts + self.flush_interval
+        if self._partial_dirty:
+            due = min(due, self._partial_ts + self.partial_interval)
+        if due == math.inf or (self._timer is not None and self._timer_at <= due):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._cancel_timer()
+        self._timer = loop.call_later(max(0.0, due - time.monotonic()),
+                                      self._on_timer)
+        self._timer_at = due
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._timer_at = math.inf
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._timer_at = math.inf
+        try:
+            self.flush()
+        except OSError as e:
+            logger.debug("[task_stream] timed flush failed for %s: %s",
+                         self.task_id, e)
+
+
+# ── inotify (Linux, via libc) ────────────────────────────────────────────────
+
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE_SELF = 0x00000400
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+_libc = None
+if sys.platform.startswith("linux"):
+    try:
+        _libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6",
+                            use_errno=True)
+        _libc.inotify_init1  # noqa: B018 — probe symbol
+    except (OSError, AttributeError):
+        _libc = None
+
+HAS_INOTIFY = _libc is not None
+
+
+class _Inotify:
+    """Minimal non-blocking inotify handle."""
+
+    def __init__(self):
+        self.fd = _libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches: dict[str, int] = {}
+
+    def watch(self, path: str, mask: int) -> bool:
+        if path in self._watches:
+            return True
+        wd = _libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            return False
+        self._watches[path] = wd
+        return True
+
+    def unwatch(self, path: str) -> None:
+        wd = self._watches.pop(path, None)
+        if wd is not None:
+            _libc.inotify_rm_watch(self.fd, wd)
+
+    def wait(self, timeout: float) -> bool:
+        """Block until any event (or timeout); drains the queue."""
+        ready, _, _ = select.select([self.fd], [], [], max(timeout, 0))
+        if not ready:
+            return False
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self) -> None:
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+# ── Tail reader ──────────────────────────────────────────────────────────────
+
+class StreamTail:
+    """Incremental reader for one task's stream file."""
+
+    def __init__(self, task_id: str, after_seq: int = -1):
+        self.task_id = task_id
+        self.path = stream_path(task_id)
+        self.last_seq = after_seq
+        self.ended: Optional[str] = None   # terminal status once seen
+        self._fh = None
+        self._buf = b""
+        self._notify: Optional[_Inotify] = None
+        if HAS_INOTIFY:
+            try:
+                self._notify = _Inotify()
+            except OSError as e:
+                logger.debug("[task_stream] inotify unavailable: %s", e)
+
+    # ── reading ──
+    def _open(self) -> bool:
+        if self._fh is not None:
+            return True
+        try:
+            self._fh = open(self.path, "rb")
+        except OSError:
+            return False
+        if self._notify:
+            self._notify.unwatch(STREAM_DIR)
+            self._notify.watch(self.path, _IN_MODIFY | _IN_CLOSE_WRITE
+                               | _IN_ATTRIB | _IN_DELETE_SELF)
+        return True
+
+    def read(self) -> list[dict]:
+        """Chunks appended since the last call (complete lines only)."""
+        if self.ended or not self._open():
+            return []
+        data = self._fh.read()
+        if not data:
+            return []
+        lines = (self._buf + data).split(b"\n")
+        self._buf = lines.pop()   # partial line at EOF — finished next read
+        chunks: list[dict] = []
+        for line in lines:
+            try:
+                obj = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            if "end" in obj:
+                self.ended = obj["end"] or "done"
+                break
+            if obj.get("seq", 0) > self.last_seq:
+                self.last_seq = obj["seq"]
+                chunks.append(obj)
+        return chunks
+
+    # ── waiting ──
+    def wait(self, timeout: float) -> None:
+        """Block until the file may have changed (or ``timeout``)."""
+        if self._notify:
+            if self._fh is None:
+                # Not created yet — watch the directory for its creation
+                os.makedirs(STREAM_DIR, exist_ok=True)
+                self._notify.watch(STREAM_DIR, _IN_CREATE | _IN_MOVED_TO)
+                if self._open():
+                    return
+            self._notify.wait(timeout)
+            return
+        time.sleep(min(timeout, POLL_INTERVAL))
+
+    def wait_end(self, timeout: float) -> bool:
+        """Consume chunks until the end marker or ``timeout``.
+
+        For callers that only care about completion (status pollers):
+        returns True as soon as the task's stream is closed.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            self.read()
+            if self.ended:
+                return True
+            left = deadline - time.monotonic()
+            if left <= 0:
+                return False
+            self.wait(left)
+
+    def follow(self, idle_timeout: float = 30.0,
+               is_terminal: Optional[Callable[[str], bool]] = None,
+               keepalive: float = 0.0) -> Iterator[Optional[dict]]:
+        """Yield chunks until the end marker, or ``idle_timeout`` of silence.
+
+        ``is_terminal`` is a safety net for tasks finalized without
+        ``cleanup_stream`` (checked at most every TERMINAL_CHECK_INTERVAL
+        while idle).  With ``keepalive`` > 0, ``None`` is yielded after
+        that many idle seconds so callers can write a heartbeat.
+        Sets ``self.ended`` to the terminal status or ``"timeout"``.
+        """
+        try:
+            last_data = last_ping = time.monotonic()
+            last_check = float("-inf")   # first idle pass checks at once
+            while True:
+                chunks = self.read()
+                for c in chunks:
+                    yield c
+                if self.ended:
+                    return
+                now = time.monotonic()
+                if chunks:
+                    last_data = last_ping = now
+                    continue
+                if is_terminal and now - last_check >= TERMINAL_CHECK_INTERVAL:
+                    last_check = now
+                    if is_terminal(self.task_id):
+                        # Drain what the writer flushed before finishing
+                        for c in self.read():
+                            yield c
+                        self.ended = self.ended or "done"
+                        return
+                if now - last_data > idle_timeout:
+                    self.ended = "timeout"
+                    return
+                if keepalive and now - last_ping >= keepalive:
+                    last_ping = now
+                    yield None
+                self.wait(min(TERMINAL_CHECK_INTERVAL,
+                              keepalive or TERMINAL_CHECK_INTERVAL))
+        finally:
+            self.close()
+
+    async def afollow(self, idle_timeout: float = 30.0,
+                      is_terminal: Optional[Callable[[str], bool]] = None):
+        """Async variant of ``follow`` for event-loop callers
+        (e.g. ChannelManager).  inotify waits run in a worker thread;
+        without inotify the loop just sleeps between reads."""
+        try:
+            last_data = time.monotonic()
+            last_check = float("-inf")
+            while True:
+                chunks = self.read()
+                for c in chunks:
+                    yield c
+                if self.ended:
+                    return
+                now = time.monotonic()
+                if chunks:
+                    last_data = now
+                    continue
+                if is_terminal and now - last_check >= TERMINAL_CHECK_INTERVAL:
+                    last_check = now
+                    if is_terminal(self.task_id):
+                        for c in self.read():
+                            yield c
+                        self.ended = self.ended or "done"
+                        return
+                if now - last_data > idle_timeout:
+                    self.ended = "timeout"
+                    return
+                if self._notify:
+                    await asyncio.to_thread(self.wait, TERMINAL_CHECK_INTERVAL)
+                else:
+                    await asyncio.sleep(POLL_INTERVAL)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        if self._notify:
+            self._notify.close()
+            self._notify = None
@@ -0,0 +1,238 @@
+"""
+core/task_watch.py
+Push-based completion subscriptions for task trees.
+
+    watcher = TaskWatcher()
+    settled = await watcher.wait_settled(root_id, timeout=4.0)
+
+A task tree (a root plus every descendant via ``parent_id``) is *settled*
+when none of its tasks is in an active state.  Instead of re-reading the
+whole board on a timer, the watcher binds a datagram socket under
+``.task_signals/watch/`` and receives every committed status transition
+from ``TaskBoard._emit_status`` (any process).  Transitions update an
+in-memory parent → children index; only the trees they touch are
+re-checked, so N waiting chats cost O(events), not O(N × board size).
+
+The index is seeded from one board read and re-synced every
+``resync_interval`` seconds while anyone is waiting — a safety net for
+dropped datagrams.  Without Unix sockets (Windows) the re-sync is the
+only update path and runs every ``POLL_FALLBACK`` seconds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import os
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Statuses that mean a tree still has work in flight (board ACTIVE_STATES
+# plus the planner's transient close-out state)
+ACTIVE_STATES = frozenset({"pending", "claimed", "review", "critique",
+                           "blocked", "paused", "synthesizing"})
+
+RESYNC_INTERVAL = 15.0   # seconds between safety re-reads while waiting
+POLL_FALLBACK = 2.0      # re-read interval when sockets are unavailable
+
+_ids = itertools.count(1)
+
+
+class TaskTreeIndex:
+    """Status + parent → children index over the board's tasks."""
+
+    def __init__(self):
+        self._status: dict[str, str] = {}
+        self._parent: dict[str, str] = {}
+        self._children: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._status)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._status
+
+    def rebuild(self, data: dict) -> None:
+        self._status.clear()
+        self._parent.clear()
+        self._children.clear()
+        for tid, t in data.items():
+            self.apply(tid, t.get("parent_id") or "", t.get("status", "pending"))
+
+    def apply(self, task_id: str, parent_id: str, status: str) -> None:
+        self._status[task_id] = status
+        if parent_id and self._parent.get(task_id) != parent_id:
+            self._parent[task_id] = parent_id
+            self._children.setdefault(parent_id, set()).add(task_id)
+
+    def roots_of(self, task_id: str) -> list[str]:
+        """``task_id`` and its ancestors, nearest first."""
+        chain = [task_id]
+        seen = {task_id}
+        parent = self._parent.get(task_id)
+        while parent and parent not in seen:
+            chain.append(parent)
+            seen.add(parent)
+            parent = self._parent.get(parent)
+        return chain
+
+    def settled(self, root_id: str) -> bool:
+        """True when ``root_id`` is known and its tree has no active task."""
+        if root_id not in self._status:
+            return False
+        stack = [root_id]
+        seen = set()
+        while stack:
+            tid = stack.pop()
+            if tid in seen:
+                continue
+            seen.add(tid)
+            if self._status.get(tid) in ACTIVE_STATES:
+                return False
+            stack.extend(self._children.get(tid, ()))
+        return True
+
+
+class TaskWatcher:
+    """Resolve awaitables when task trees settle (one per event loop)."""
+
+    def __init__(self, board_path: str | None = None,
+                 resync_interval: float = RESYNC_INTERVAL):
+        self.board_path = board_path
+        self.resync_interval = resync_interval
+        self.index = TaskTreeIndex()
+        self.events = 0
+        self.resyncs = 0
+        self._waiters: dict[str, list[asyncio.Future]] = {}
+        self._listener = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._synced_at = 0.0          # wall time of the last board read
+        self._synced_mono = float("-inf")
+        # Transitions received while a re-read is in flight, re-applied on
+        # top of it (the read may predate them)
+        self._replay: list | None = None
+
+    # ── Public ──
+
+    async def wait_settled(self, root_id: str, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds for ``root_id``'s tree to settle.
+
+        A root missing from a board read taken during this call (archived
+        or cleared) also counts as settled.
+        """
+        loop = asyncio.get_running_loop()
+        self._bind(loop)
+        interval = self.resync_interval if self._listener else POLL_FALLBACK
+        if time.monotonic() - self._synced_mono >= interval:
+            await self.resync()
+            if root_id not in self.index:
+                return True
+        if self.index.settled(root_id):
+            return True
+        fut = loop.create_future()
+        self._waiters.setdefault(root_id, []).append(fut)
+        try:
+            await asyncio.wait({fut}, timeout=min(timeout, interval))
+        finally:
+            waiters = self._waiters.get(root_id, [])
+            if fut in waiters:
+                waiters.remove(fut)
+            if not waiters:
+                self._waiters.pop(root_id, None)
+        return fut.done() or self.index.settled(root_id)
+
+    async def resync(self) -> None:
+        """Rebuild the index from one board read (off the event loop)."""
+        from core.task_board import TaskBoard
+
+        def read() -> tuple[float, dict]:
+            started = time.time()
+            board = TaskBoard(self.board_path) if self.board_path else TaskBoard()
+            return started, dict(board._read())
+
+        self._replay = []
+        try:
+            started, data = await asyncio.get_running_loop().run_in_executor(
+                None, read)
+            self.index.rebuild(data)
+            for ts, tid, parent, status in self._replay:
+                if ts >= started:
+                    self.index.apply(tid, parent, status)
+        finally:
+            self._replay = None
+        self._synced_at = started
+        self._synced_mono = time.monotonic()
+        self.resyncs += 1
+        self._resolve(list(self._waiters))
+
+    def stats(self) -> dict:
+        return {
+            "tasks": len(self.index),
+            "waiting": sum(len(w) for w in self._waiters.values()),
+            "events": self.events,
+            "resyncs": self.resyncs,
+            "push": self._listener is not None,
+        }
+
+    def close(self) -> None:
+        if self._listener is not None:
+            if self._loop is not None and not self._loop.is_closed():
+                try:
+                    self._loop.remove_reader(self._listener.fileno())
+                except (OSError, ValueError):
+                    pass
+            self._listener.close()
+            self._listener = None
+        self._loop = None
+
+    # ── Internal ──
+
+    def _bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Bind the watch socket before the first read so no transition
+        committed after that read can be missed."""
+        if self._loop is loop:
+            return
+        self.close()
+        self._loop = loop
+        self._synced_mono = float("-inf")
+        from core.runtime.wakeup import (HAS_UNIX_SOCKETS, TaskSignalListener,
+                                         watch_socket_path)
+        if not HAS_UNIX_SOCKETS:
+            return
+        name = f"{os.getpid()}-{next(_ids)}"
+        try:
+            self._listener = TaskSignalListener(name, watch_socket_path(name))
+            loop.add_reader(self._listener.fileno(), self._on_readable)
+        except (OSError, NotImplementedError) as e:
+            logger.warning("[task_watch] push unavailable, polling: %s", e)
+            if self._listener is not None:
+                self._listener.close()
+            self._listener = None
+
+    def _on_readable(self) -> None:
+        touched: set[str] = set()
+        for sig in self._listener.drain() if self._listener else ():
+            if sig.get("kind") != "status":
+                continue
+            # Committed before our last full read — already in the index
+            if not isinstance(sig.get("ts"), (int, float)) or \
+                    sig["ts"] < self._synced_at:
+                continue
+            for tid, parent, status, *_role in sig.get("tasks", ()):
+                self.index.apply(tid, parent, status)
+                if self._replay is not None:
+                    self._replay.append((sig["ts"], tid, parent, status))
+                self.events += 1
+                touched.update(self.index.roots_of(tid))
+        self._resolve([r for r in touched if r in self._waiters])
+
+    def _resolve(self, roots: list[str]) -> None:
+        for root in roots:
+            if not self.index.settled(root):
+                continue
+            for fut in self._waiters.get(root, ()):
+                if not fut.done():
+                    fut.set_result(True)
@@ -0,0 +1,254 @@
+"""
+core/token_counter.py
+Offline token counting per model family, memoized per text.
+
+    n = count_tokens(text, model)
+    n = count_messages(messages, model)
+
+``len(text) // 4`` is badly off for the mixed Chinese/English content
+agents handle: a Chinese character is ~1 token on GPT/Claude tokenizers
+and ~0.6 on Qwen/DeepSeek ones, while an English word of any length is
+1–2 tokens.  The default ``HeuristicCounter`` scans text once, classifying
+runs as CJK characters, Latin words, digit groups, symbols and line
+breaks, and weights each class with per-family ratios (``FAMILIES``).
+
+Counters are pluggable: ``register_counter(family, counter)`` installs any
+object with ``count(text) -> int`` (e.g. a wrapper around an exact BPE
+tokenizer) for a family.  ``family_of(model)`` maps model names to
+families by substring.
+
+Counts are memoized per (family, text) in a bounded LRU, so prompt
+sections that repeat across tasks (role, skills, docs) are counted once.
+
+``observe(model, estimated, reported)`` records the estimate next to the
+prompt tokens an adapter reported; ``stats()`` exposes per-family cache
+hits and estimate error (published as ``heartbeat.metrics["token_counter"]``;
+``scripts/bench_token_counter.py`` compares methods offline).  Estimates are
+deliberately not auto-corrected: prompt trimming must stay deterministic so
+the cache-layout prefix stays byte-identical.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Protocol
+
+logger = logging.getLogger(__name__)
+
+MAX_ENTRIES = 4096       # memoized (family, text) counts
+MIN_CACHED_CHARS = 64    # shorter texts are cheaper to count than to hash
+MESSAGE_OVERHEAD = 4     # role / separators per chat message
+DEFAULT_FAMILY = "default"
+
+
+class TokenCounter(Protocol):
+    def count(self, text: str) -> int: ...
+
+
+# ── Heuristic counter ────────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class Ratios:
+    cjk: float = 1.0          # tokens per CJK / kana / hangul character
+    word_chars: int = 6       # Latin word chars per token
+    digits: int = 3           # digits per token
+    symbol: float = 1.0       # tokens per punctuation / other symbol
+    newline: float = 1.0      # tokens per run of line breaks
+
+
+FAMILIES: dict[str, Ratios] = {
+    DEFAULT_FAMILY: Ratios(),
+    "openai":    Ratios(cjk=0.9),
+    "anthropic": Ratios(cjk=1.2, word_chars=5),
+    "deepseek":  Ratios(cjk=0.65),
+    "qwen":      Ratios(cjk=0.65),
+    "glm":       Ratios(cjk=0.7),
+    "minimax":   Ratios(cjk=0.7),
+    "llama":     Ratios(cjk=1.3, word_chars=5),
+}
+
+# Substring → family, checked in order against the lower-cased model name
+_FAMILY_PATTERNS: tuple[tuple[str, str], ...] = (
+    ("deepseek", "deepseek"),
+    ("qwen", "qwen"), ("qwq", "qwen"),
+    ("glm", "glm"), ("chatglm", "glm"),
+    ("minimax", "minimax"), ("abab", "minimax"),
+    ("claude", "anthropic"),
+    ("gpt", "openai"), ("o1", "openai"), ("o3", "openai"), ("o4", "openai"),
+    ("llama", "llama"), ("mistral", "llama"), ("gemma", "llama"),
+)
+
+# CJK ideographs, kana, hangul, CJK + fullwidth punctuation
+_CJK = r"\u3000-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff\uff00-\uffef"
+
+_TOKEN_RE = re.compile(
+    rf"(?P<cjk>[{_CJK}]+)"
+    rf"|(?P<word>[^\W\d_{_CJK}]+)"
+    r"|(?P<digits>\d+)"
+    r"|(?P<nl>\n+)"
+    r"|(?P<ws>\s+)"
+    r"|(?P<sym>.)",
+    re.DOTALL,
+)
+
+
+class HeuristicCounter:
+    """Single-pass, dependency-free estimate tuned per family."""
+
+    def __init__(self, ratios: Ratios = Ratios()):
+        self.ratios = ratios
+
+    def count(self, text: str) -> int:
+        r = self.ratios
+        total = 0.0
+        for m in _TOKEN_RE.finditer(text):
+            kind = m.lastgroup
+            n = m.end() - m.start()
+            if kind == "word":
+                total += math.ceil(n / r.word_chars)
+            elif kind == "cjk":
+                total += n * r.cjk
+            elif kind == "sym":
+                total += r.symbol
+            elif kind == "digits":
+                total += math.ceil(n / r.digits)
+            elif kind == "nl":
+                total += r.newline
+            # plain spaces merge into the following word
+        return int(math.ceil(total))
+
+
+# ── Registry + memo ──────────────────────────────────────────────────────────
+
+class _FamilyStats:
+    __slots__ = ("hits", "misses", "samples", "abs_err", "est_sum", "real_sum")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.samples = 0       # observe() calls with a reported count
+        self.abs_err = 0.0     # sum of |est - real| / real
+        self.est_sum = 0
+        self.real_sum = 0
+
+    def snapshot(self) -> dict:
+        out = {"hits": self.hits, "misses": self.misses}
+        if self.samples:
+            out["samples"] = self.samples
+            out["mean_abs_error"] = round(self.abs_err / self.samples, 3)
+            out["bias"] = round(self.est_sum / max(self.real_sum, 1), 3)
+        return out
+
+
+class TokenCounterRegistry:
+    """Per-family counters with a shared memo of recent counts."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._counters: dict[str, TokenCounter] = {
+            name: HeuristicCounter(r) for name, r in FAMILIES.items()}
+        self._memo: OrderedDict[tuple[str, str], int] = OrderedDict()
+        self._stats: dict[str, _FamilyStats] = {}
+        self._families: dict[str, str] = {}
+        self._mu = threading.Lock()
+
+    def register(self, family: str, counter: TokenCounter) -> None:
+        with self._mu:
+            self._counters[family] = counter
+            for key in [k for k in self._memo if k[0] == family]:
+                del self._memo[key]
+
+    def family_of(self, model: str | None) -> str:
+        if not model:
+            return DEFAULT_FAMILY
+        fam = self._families.get(model)
+        if fam is None:
+            name = model.lower()
+            fam = next((f for pat, f in _FAMILY_PATTERNS if pat in name),
+                       DEFAULT_FAMILY)
+            self._families[model] = fam
+        return fam
+
+    def count(self, text: str, model: str | None = None) -> int:
+        if not text:
+            return 0
+        family = self.family_of(model)
+        counter = self._counters.get(family) or self._counters[DEFAULT_FAMILY]
+        if len(text) < MIN_CACHED_CHARS:
+            return counter.count(text)
+        key = (family, text)
+        with self._mu:
+            stats = self._family_stats(family)
+            n = self._memo.get(key)
+            if n is not None:
+                self._memo.move_to_end(key)
+                stats.hits += 1
+                return n
+            stats.misses += 1
+        n = counter.count(text)
+        with self._mu:
+            self._memo[key] = n
+            while len(self._memo) > self.max_entries:
+                self._memo.popitem(last=False)
+        return n
+
+    def count_messages(self, messages: list[dict],
+                       model: str | None = None) -> int:
+        total = 0
+        for m in messages:
+            total += MESSAGE_OVERHEAD
+            content = m.get("content")
+            if isinstance(content, str):
+                total += self.count(content, model)
+            elif isinstance(content, list):   # content blocks
+                for block in content:
+                    if isinstance(block, dict) and isinstance(
+                            block.get("text"), str):
+                        total += self.count(block["text"], model)
+            for call in m.get("tool_calls") or ():
+                fn = call.get("function") or {}
+                total += self.count(fn.get("name", ""), model)
+                total += self.count(fn.get("arguments") or "", model)
+        return total
+
+    def observe(self, model: str | None, estimated: int, reported: int) -> None:
+        """Record an estimate against the provider-reported token count."""
+        if reported <= 0:
+            return
+        with self._mu:
+            s = self._family_stats(self.family_of(model))
+            s.samples += 1
+            s.abs_err += abs(estimated - reported) / reported
+            s.est_sum += estimated
+            s.real_sum += reported
+
+    def stats(self) -> dict:
+        with self._mu:
+            return {f: s.snapshot() for f, s in self._stats.items()}
+
+    def _family_stats(self, family: str) -> _FamilyStats:
+        s = self._stats.get(family)
+        if s is None:
+            s = self._stats[family] = _FamilyStats()
+        return s
+
+
+# Process-wide registry shared by agents, compaction and usage estimates
+token_counter = TokenCounterRegistry()
+
+
+def count_tokens(text: str, model: str | None = None) -> int:
+    return token_counter.count(text, model)
+
+
+def count_messages(messages: list[dict], model: str | None = None) -> int:
+    return token_counter.count_messages(messages, model)
+
+
+def register_counter(family: str, counter: TokenCounter) -> None:
+    token_counter.register(family, counter)
@@ -37,12 +37,14 @@ Usage in agents.yaml:
 
 from __future__ import annotations
 
+import contextvars
 import json
 import logging
 import os
 import re
 import subprocess
 import tempfile
+import threading
 import time
 import urllib.parse
 import urllib.request
@@ -3243,6 +3245,11 @@ def get_available_tools(agent_config: dict | None = None) -> list[Tool]:
     return available
 
 
+def available_tools_key() -> tuple:
+    """Env-dependent part of tool availability (prompt cache key)."""
+    return tuple(t.is_available() for t in _BUILTIN_TOOLS if t.requires_env)
+
+
 def build_tools_prompt(agent_config: dict | None = None) -> str:
     """Build the tools section for agent system prompt."""
     tools = get_available_tools(agent_config)
@@ -3708,47 +3715,184 @@ def sanitize_params(tool_name: str, params: dict,
     return params
 
 
+def _prepare_call(call: dict, available: set[str]):
+    """Resolve and sanitize one parsed call.
+
+    Returns ``(tool, params)`` or an error result dict.
+    """
+    name = call["tool"]
+    if name not in available:
+        return {"ok": False, "error": f"Tool '{name}' not available"}
+
+    tool = _registry.get(name)
+    if not tool:
+        return {"ok": False, "error": f"Unknown tool: {name}"}
+
+    # ── Sanitize parameters before execution ──
+    raw_params = call.get("params", {})
+    sanitized = sanitize_params(name, dict(raw_params), tool)
+    if isinstance(sanitized, str):
+        # sanitize_params returned an error message
+        logger.warning("Tool %s params rejected: %s (raw: %s)",
+                       name, sanitized, str(raw_params)[:200])
+        return {"ok": False, "error": f"Parameter validation: {sanitized}"}
+    return tool, sanitized
+
+
 def execute_tool_calls(calls: list[dict],
                        agent_config: dict | None = None) -> list[dict]:
-    """Execute parsed tool calls and return results.
+    """Execute parsed tool calls sequentially and return results.
 
     Returns list of {"tool": "name", "result": {...}}
     """
     available = {t.name for t in get_available_tools(agent_config)}
     results = []
     for call in calls:
-        name = call["tool"]
-        if name not in available:
-            results.append({
-                "tool": name,
-                "result": {"ok": False, "error": f"Tool '{name}' not available"},
-            })
+        prepared = _prepare_call(call, available)
+        if isinstance(prepared, dict):
+            results.append({"tool": call["tool"], "result": prepared})
             continue
+        tool, params = prepared
+        logger.info("Executing tool: %s(%s)", tool.name, str(params)[:100])
+        results.append({"tool": tool.name, "result": tool.execute(**params)})
 
-        tool = _registry.get(name)
-        if not tool:
-            results.append({
-                "tool": name,
-                "result": {"ok": False, "error": f"Unknown tool: {name}"},
-            })
-            continue
+    return results
 
-        # ── Sanitize parameters before execution ──
-        raw_params = call.get("params", {})
-        sanitized = sanitize_params(name, dict(raw_params), tool)
-        if isinstance(sanitized, str):
-            # sanitize_params returned an error message
-            logger.warning("Tool %s params rejected: %s (raw: %s)",
-                           name, sanitized, str(raw_params)[:200])
-            results.append({
-                "tool": name,
-                "result": {"ok": False, "error": f"Parameter validation: {sanitized}"},
-            })
-            continue
 
-        logger.info("Executing tool: %s(%s)", name,
-                     str(sanitized)[:100])
-        result = tool.execute(**sanitized)
-        results.append({"tool": name, "result": result})
+# ══════════════════════════════════════════════════════════════════════════════
+#  ASYNC EXECUTOR (concurrent tool rounds)
+# ══════════════════════════════════════════════════════════════════════════════
+
+# Tools without side effects on shared state: consecutive calls to these
+# run concurrently within a round.  Any other tool is a barrier — it runs
+# alone, after everything before it and before everything after it — so
+# write→read and browser sequences keep their order.
+PARALLEL_SAFE_TOOLS = {
+    "web_search", "web_fetch", "read_file", "list_dir", "memory_search",
+    "kb_search", "task_status", "cron_list", "check_skill_deps",
+    "search_skills", "list_voices", "workspace_status", "analyze_image",
+    "transcribe",
+}
+
+# Max in-flight calls per tool across the process (unlisted = pool-bound)
+TOOL_CONCURRENCY = {
+    "web_fetch": 4, "web_search": 4, "exec": 2,
+    "analyze_image": 2, "transcribe": 2,
+}
+
+# Seconds before a call is abandoned (its thread finishes in the background)
+TOOL_TIMEOUTS = {
+    "web_search": 30, "web_fetch": 60, "read_file": 15, "list_dir": 15,
+    "memory_search": 30, "kb_search": 30,
+}
+DEFAULT_TOOL_TIMEOUT = 300.0
+TOOL_POOL_WORKERS = 8
+
+# Task the running tool call belongs to (set by the agent per task) —
+# lets channel tools route files to the chat that submitted the task.
+current_task_id: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "current_task_id", default="")
 
+_tool_pool = None
+_tool_pool_lock = threading.Lock()
+_tool_semaphores: dict = {}     # (loop, tool name) → asyncio.Semaphore
+
+
+def _tool_executor():
+    """Bounded thread pool for blocking tool handlers."""
+    global _tool_pool
+    with _tool_pool_lock:
+        if _tool_pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            _tool_pool = ThreadPoolExecutor(max_workers=TOOL_POOL_WORKERS,
+                                            thread_name_prefix="tool")
+        return _tool_pool
+
+
+def _tool_timeout(name: str, params: dict) -> float:
+    timeout = float(TOOL_TIMEOUTS.get(name, DEFAULT_TOOL_TIMEOUT))
+    own = params.get("timeout")          # e.g. exec's own timeout parameter
+    if isinstance(own, (int, float)) and own + 10 > timeout:
+        timeout = float(own) + 10
+    return timeout
+
+
+def _tool_semaphore(name: str):
+    import asyncio
+    limit = TOOL_CONCURRENCY.get(name)
+    if not limit:
+        return None
+    loop = asyncio.get_running_loop()
+    for key in [k for k in _tool_semaphores if k[0].is_closed()]:
+        del _tool_semaphores[key]
+    sem = _tool_semaphores.get((loop, name))
+    if sem is None:
+        sem = _tool_semaphores[(loop, name)] = asyncio.Semaphore(limit)
+    return sem
+
+
+async def _run_tool(tool: Tool, params: dict) -> dict:
+    """Run one call — natively if async, else on the tool pool — with limits."""
+    import asyncio
+    import contextlib
+    import functools
+
+    timeout = _tool_timeout(tool.name, params)
+    sem = _tool_semaphore(tool.name)
+    async with sem or contextlib.nullcontext():
+        logger.info("Executing tool: %s(%s)", tool.name, str(params)[:100])
+        try:
+            if asyncio.iscoroutinefunction(tool.handler):
+                return await asyncio.wait_for(tool.handler(**params), timeout)
+            loop = asyncio.get_running_loop()
+            return await asyncio.wait_for(
+                loop.run_in_executor(_tool_executor(), functools.partial(
+                    contextvars.copy_context().run, tool.execute, **params)),
+                timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Tool %s timed out after %.0fs", tool.name, timeout)
+            return {"ok": False, "error": f"Tool '{tool.name}' timed out "
+                                          f"after {timeout:.0f}s"}
+        except Exception as e:
+            logger.error("Tool %s error: %s", tool.name, e)
+            return {"ok": False, "error": str(e)}
+
+
+async def aexecute_tool_calls(calls: list[dict],
+                              agent_config: dict | None = None) -> list[dict]:
+    """Async ``execute_tool_calls``: independent calls run concurrently.
+
+    Consecutive ``PARALLEL_SAFE_TOOLS`` calls form one concurrent batch;
+    other tools run alone in call order.  Results keep call order and
+    carry ``elapsed_ms`` (wall time of each call, including queueing on
+    its concurrency limit).
+    """
+    import asyncio
+
+    available = {t.name for t in get_available_tools(agent_config)}
+    results: list[dict | None] = [None] * len(calls)
+
+    async def run(i: int, tool: Tool, params: dict) -> None:
+        t0 = time.perf_counter()
+        result = await _run_tool(tool, params)
+        results[i] = {"tool": tool.name, "result": result,
+                      "elapsed_ms": round((time.perf_counter() - t0) * 1000, 1)}
+
+    batch: list = []
+    for i, call in enumerate(calls):
+        prepared = _prepare_call(call, available)
+        if isinstance(prepared, dict):
+            results[i] = {"tool": call["tool"], "result": prepared,
+                          "elapsed_ms": 0.0}
+            continue
+        tool, params = prepared
+        if tool.name in PARALLEL_SAFE_TOOLS:
+            batch.append(run(i, tool, params))
+            continue
+        if batch:
+            await asyncio.gather(*batch)
+            batch = []
+        await run(i, tool, params)
+    if batch:
+        await asyncio.gather(*batch)
     return results
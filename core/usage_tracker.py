@@ -1,26 +1,47 @@
 """
 core/usage_tracker.py
 Centralized usage tracking — token counts, costs, per-agent and per-model stats.
-File-backed JSON store, process-safe with file locks.
 Budget limits: configurable spending cap with auto-pause.
+
+Storage (``memory/usage/``), process-safe with a file lock:
+  ledger-NNNNNN.jsonl — append-only, one line per LLM call; a segment is
+                        rotated at ``SEGMENT_BYTES`` and deleted once it is
+                        older than the retention window.
+  rollups.json        — checkpoint of the incrementally maintained rollups
+                        (totals, per-agent, per-model, per-hour, last calls)
+                        plus the ledger position it covers.
+
+Each process keeps the rollups in memory and catches up by reading only
+the ledger tail past its position, so ``record()``, budget checks,
+``get_summary()`` and ``recent_calls()`` cost O(new calls), independent of
+history length.  Hourly buckets older than ``RETENTION_HOURS`` are pruned
+at checkpoint time; lifetime totals are kept.  A legacy
+``memory/usage_stats.json`` is imported once and archived as
+``usage_stats.json.migrated``.
 """
 
 from __future__ import annotations
 import json
 import logging
 import os
+import threading
 import time
-from dataclasses import dataclass, field
+from collections import deque
 from typing import Optional
 
 from core.protocols import FileLock  # shared fallback
 
 logger = logging.getLogger(__name__)
 
-USAGE_FILE = "memory/usage_stats.json"
-USAGE_LOCK = "memory/usage_stats.lock"
+USAGE_DIR = "memory/usage"
+USAGE_FILE = "memory/usage_stats.json"     # legacy single-file store
 BUDGET_FILE = "config/budget.json"
 
+SEGMENT_BYTES = 4 * 1024 * 1024    # rotate the ledger segment past this size
+CHECKPOINT_EVERY = 64              # ledger lines between rollup checkpoints
+RETENTION_HOURS = 24 * 30          # hourly buckets / ledger segments kept
+RECENT_CALLS = 50                  # calls kept for /v1/usage/recent
+
 # ── Cost estimation (per 1M tokens) ─────────────────────────────────────────
 # Approximate costs for FLock-hosted models (adjust as needed)
 MODEL_COSTS = {
@@ -50,6 +71,272 @@ def estimate_cost(model: str, prompt_tokens: int,
     return cost
 
 
+class UsageRollups:
+    """Aggregates maintained one ledger entry at a time."""
+
+    def __init__(self):
+        self.aggregate: dict = {}
+        self.by_agent: dict[str, dict] = {}
+        self.by_model: dict[str, dict] = {}
+        self.by_hour: dict[int, dict] = {}      # hour start (epoch s) → bucket
+        self.recent: deque = deque(maxlen=RECENT_CALLS)
+        # Ledger position covered: (segment number, byte offset)
+        self.segment = 1
+        self.offset = 0
+        self.unsaved = 0      # entries applied since the last checkpoint
+
+    def apply(self, e: dict) -> None:
+        prompt = e.get("prompt_tokens", 0)
+        completion = e.get("completion_tokens", 0)
+        tokens = e.get("total_tokens", prompt + completion)
+        cached = e.get("cached_tokens", 0)
+        cost = e.get("cost_usd", 0.0)
+        success = bool(e.get("success", True))
+
+        agg = self.aggregate
+        agg["total_calls"] = agg.get("total_calls", 0) + 1
+        agg["total_prompt_tokens"] = agg.get("total_prompt_tokens", 0) + prompt
+        agg["total_completion_tokens"] = agg.get("total_completion_tokens", 0) + completion
+        agg["total_tokens"] = agg.get("total_tokens", 0) + tokens
+        agg["total_cached_tokens"] = agg.get("total_cached_tokens", 0) + cached
+        agg["total_cost_usd"] = agg.get("total_cost_usd", 0) + cost
+        agg["total_retries"] = agg.get("total_retries", 0) + e.get("retries", 0)
+        agg["total_failovers"] = agg.get("total_failovers", 0) + (1 if e.get("failover") else 0)
+        if success:
+            agg["success_count"] = agg.get("success_count", 0) + 1
+        else:
+            agg["failure_count"] = agg.get("failure_count", 0) + 1
+
+        for table, key in ((self.by_agent, e.get("agent_id", "unknown")),
+                           (self.by_model, e.get("model", "unknown"))):
+            row = table.setdefault(key, {"calls": 0, "tokens": 0, "cost": 0.0})
+            row["calls"] += 1
+            row["tokens"] += tokens
+            row["cached_tokens"] = row.get("cached_tokens", 0) + cached
+            row["cost"] += cost
+
+        hour = int(e.get("ts", 0) // 3600 * 3600)
+        bucket = self.by_hour.setdefault(hour, {
+            "calls": 0, "tokens": 0, "cost": 0.0, "successes": 0,
+            "latency_ms_sum": 0.0, "latency_n": 0})
+        bucket["calls"] += 1
+        bucket["tokens"] += tokens
+        bucket["cached_tokens"] = bucket.get("cached_tokens", 0) + cached
+        bucket["cost"] += cost
+        if success:
+            bucket["successes"] += 1
+            if e.get("latency_ms", 0) > 0:
+                bucket["latency_ms_sum"] += e["latency_ms"]
+                bucket["latency_n"] += 1
+
+        self.recent.append(e)
+        self.unsaved += 1
+
+    def prune(self, now: float) -> None:
+        cutoff = now - RETENTION_HOURS * 3600
+        for hour in [h for h in self.by_hour if h + 3600 <= cutoff]:
+            del self.by_hour[hour]
+
+    def to_dict(self) -> dict:
+        return {
+            "segment": self.segment,
+            "offset": self.offset,
+            "aggregate": self.aggregate,
+            "by_agent": self.by_agent,
+            "by_model": self.by_model,
+            "by_hour": {str(h): b for h, b in self.by_hour.items()},
+            "recent": list(self.recent),
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "UsageRollups":
+        r = cls()
+        r.segment = d.get("segment", 1)
+        r.offset = d.get("offset", 0)
+        r.aggregate = d.get("aggregate", {})
+        r.by_agent = d.get("by_agent", {})
+        r.by_model = d.get("by_model", {})
+        r.by_hour = {int(h): b for h, b in d.get("by_hour", {}).items()}
+        r.recent.extend(d.get("recent", []))
+        return r
+
+
+class UsageLedger:
+    """Append-only call ledger + checkpointed rollups (one per directory)."""
+
+    def __init__(self, root: str = USAGE_DIR):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.lock = FileLock(os.path.join(root, "ledger.lock"))
+        self._mu = threading.RLock()
+        self._state: Optional[UsageRollups] = None
+        self._rollups_path = os.path.join(root, "rollups.json")
+        self._ckpt_seen = None    # stat key of the last checkpoint read/written
+
+    def segment_path(self, n: int) -> str:
+        return os.path.join(self.root, f"ledger-{n:06d}.jsonl")
+
+    def segments(self) -> list[int]:
+        try:
+            return sorted(int(f[7:13]) for f in os.listdir(self.root)
+                          if f.startswith("ledger-") and f.endswith(".jsonl"))
+        except OSError:
+            return []
+
+    # ── Reads ──
+
+    def sync(self) -> UsageRollups:
+        """Bring the in-memory rollups up to date with the ledger tail."""
+        with self._mu:
+            ckpt = self._read_checkpoint()
+            state = self._state
+            if state is None or (ckpt is not None and ckpt.segment > state.segment):
+                # First use, or another process rotated/cleared the ledger
+                state = self._state = ckpt or UsageRollups()
+            while True:
+                self._read_tail(state)
+                if not os.path.exists(self.segment_path(state.segment + 1)):
+                    return state
+                # Rotation happened after our checkpoint: the newer checkpoint
+                # covers the old segment entirely
+                ckpt = self._read_checkpoint()
+                if ckpt is None or ckpt.segment <= state.segment:
+                    return state
+                state = self._state = ckpt
+
+    def _read_tail(self, state: UsageRollups) -> None:
+        path = self.segment_path(state.segment)
+        try:
+            if os.path.getsize(path) <= state.offset:
+                return
+            with open(path, "rb") as f:
+                f.seek(state.offset)
+                chunk = f.read()
+        except OSError:
+            return
+        end = chunk.rfind(b"\n") + 1        # ignore a half-written last line
+        for line in chunk[:end].splitlines():
+            try:
+                state.apply(json.loads(line))
+            except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+                continue
+        state.offset += end
+
+    def _ckpt_key(self):
+        try:
+            st = os.stat(self._rollups_path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def _read_checkpoint(self) -> Optional[UsageRollups]:
+        """Parse the checkpoint if it changed since last seen (else None)."""
+        key = self._ckpt_key()
+        if key is None or key == self._ckpt_seen:
+            return None
+        try:
+            with open(self._rollups_path, "r") as f:
+                ckpt = UsageRollups.from_dict(json.load(f))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        self._ckpt_seen = key
+        return ckpt
+
+    # ── Writes (caller holds self.lock) ──
+
+    def append(self, entry: dict) -> UsageRollups:
+        with self._mu:
+            state = self.sync()
+            line = (json.dumps(entry, ensure_ascii=False) + "\n").encode()
+            with open(self.segment_path(state.segment), "ab") as f:
+                f.write(line)
+            state.apply(entry)
+            state.offset += len(line)
+            if state.unsaved >= CHECKPOINT_EVERY or state.offset >= SEGMENT_BYTES:
+                self.checkpoint(state)
+            return state
+
+    def checkpoint(self, state: UsageRollups) -> None:
+        """Persist rollups; rotate and compact the ledger when due."""
+        now = time.time()
+        state.prune(now)
+        if state.offset >= SEGMENT_BYTES:
+            state.segment += 1
+            state.offset = 0
+        tmp = self._rollups_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(state.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp, self._rollups_path)
+        self._ckpt_seen = self._ckpt_key()
+        state.unsaved = 0
+        cutoff = now - RETENTION_HOURS * 3600
+        for n in self.segments():
+            path = self.segment_path(n)
+            try:
+                if n < state.segment and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def reset(self) -> None:
+        with self._mu:
+            state = self.sync()
+            fresh = UsageRollups()
+            fresh.segment = state.segment + 1   # other processes reload
+            for n in self.segments():
+                try:
+                    os.remove(self.segment_path(n))
+                except OSError:
+                    pass
+            self.checkpoint(fresh)
+            self._state = fresh
+
+    def import_calls(self, calls: list[dict]) -> None:
+        """Seed an empty ledger with calls from the legacy JSON store."""
+        with self._mu:
+            state = self.sync()
+            with open(self.segment_path(state.segment), "ab") as f:
+                for call in calls:
+                    line = (json.dumps(call, ensure_ascii=False) + "\n").encode()
+                    f.write(line)
+                    state.apply(call)
+                    state.offset += len(line)
+            self.checkpoint(state)
+
+    def scan(self, since_ts: float):
+        """Yield ledger entries with ``ts >= since_ts`` (retained segments)."""
+        for n in self.segments():
+            path = self.segment_path(n)
+            try:
+                if os.path.getmtime(path) < since_ts:
+                    continue
+                with open(path, "rb") as f:
+                    for line in f:
+                        try:
+                            e = json.loads(line)
+                        except (json.JSONDecodeError, UnicodeDecodeError):
+                            continue
+                        if e.get("ts", 0) >= since_ts:
+                            yield e
+            except OSError:
+                continue
+
+
+_ledgers: dict[str, UsageLedger] = {}
+_ledgers_lock = threading.Lock()
+
+
+def _ledger_for(root: str) -> UsageLedger:
+    """Process-wide ledger per directory, so rollups stay warm across
+    short-lived ``UsageTracker()`` instances (e.g. one per HTTP request)."""
+    key = os.path.abspath(root)
+    with _ledgers_lock:
+        ledger = _ledgers.get(key)
+        if ledger is None or not os.path.isdir(key):
+            ledger = _ledgers[key] = UsageLedger(root)
+        return ledger
+
+
 class UsageTracker:
     """
     Process-safe usage statistics store.
@@ -57,10 +344,30 @@ class UsageTracker:
     Budget enforcement: checks spending against limits and raises BudgetExceeded.
     """
 
-    def __init__(self, path: str = USAGE_FILE):
+    def __init__(self, path: str = USAGE_DIR):
         self.path = path
-        self.lock = FileLock(USAGE_LOCK)
-        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.ledger = _ledger_for(path)
+        self.lock = self.ledger.lock
+        self._migrate_legacy()
+
+    def _migrate_legacy(self) -> None:
+        legacy = os.path.join(os.path.dirname(os.path.abspath(self.path)),
+                              os.path.basename(USAGE_FILE))
+        if not os.path.exists(legacy):
+            return
+        with self.lock:
+            if not os.path.exists(legacy):
+                return
+            try:
+                with open(legacy, "r") as f:
+                    calls = json.load(f).get("calls", [])
+            except (json.JSONDecodeError, AttributeError):
+                calls = []
+            if calls and not self.ledger.sync().aggregate:
+                self.ledger.import_calls(calls)
+                logger.info("[usage] imported %d calls from %s",
+                            len(calls), legacy)
+            os.replace(legacy, legacy + ".migrated")
 
     def record(
         self,
@@ -72,8 +379,11 @@ class UsageTracker:
         success: bool = True,
         retries: int = 0,
         failover: bool = False,
+        cached_tokens: int = 0,
     ) -> float:
         """Record a single LLM call's usage. Checks budget limits.
+        ``cached_tokens`` is the part of ``prompt_tokens`` the provider
+        served from its prefix cache.
         Returns the estimated cost in USD for this call."""
         total_tokens = prompt_tokens + completion_tokens
         cost = estimate_cost(model, prompt_tokens, completion_tokens)
@@ -84,6 +394,7 @@ class UsageTracker:
             "prompt_tokens":     prompt_tokens,
             "completion_tokens": completion_tokens,
             "total_tokens":      total_tokens,
+            "cached_tokens":     cached_tokens,
             "cost_usd":          cost,
             "latency_ms":        latency_ms,
             "success":           success,
@@ -93,85 +404,85 @@ class UsageTracker:
         }
 
         with self.lock:
-            data = self._read()
-            data.setdefault("calls", []).append(entry)
-            # Update aggregates
-            agg = data.setdefault("aggregate", {})
-            agg["total_calls"]        = agg.get("total_calls", 0) + 1
-            agg["total_prompt_tokens"] = agg.get("total_prompt_tokens", 0) + prompt_tokens
-            agg["total_completion_tokens"] = agg.get("total_completion_tokens", 0) + completion_tokens
-            agg["total_tokens"]       = agg.get("total_tokens", 0) + total_tokens
-            agg["total_cost_usd"]     = agg.get("total_cost_usd", 0) + cost
-            agg["total_retries"]      = agg.get("total_retries", 0) + retries
-            agg["total_failovers"]    = agg.get("total_failovers", 0) + (1 if failover else 0)
-            if success:
-                agg["success_count"]  = agg.get("success_count", 0) + 1
-            else:
-                agg["failure_count"]  = agg.get("failure_count", 0) + 1
-
-            self._write(data)
-
+            state = self.ledger.append(entry)
             # Check budget limits inside lock to prevent concurrent overspend
-            self._check_budget(agg)
+            self._check_budget(state.aggregate)
 
         return cost
 
     def get_summary(self) -> dict:
-        """Get aggregated usage summary."""
-        data = self._read()
-        agg = data.get("aggregate", {})
-
-        # Per-agent breakdown
-        by_agent: dict[str, dict] = {}
-        by_model: dict[str, dict] = {}
-
-        for call in data.get("calls", []):
-            aid = call.get("agent_id", "unknown")
-            mid = call.get("model", "unknown")
-
-            if aid not in by_agent:
-                by_agent[aid] = {"calls": 0, "tokens": 0, "cost": 0.0}
-            by_agent[aid]["calls"] += 1
-            by_agent[aid]["tokens"] += call.get("total_tokens", 0)
-            by_agent[aid]["cost"]  += call.get("cost_usd", 0)
-
-            if mid not in by_model:
-                by_model[mid] = {"calls": 0, "tokens": 0, "cost": 0.0}
-            by_model[mid]["calls"] += 1
-            by_model[mid]["tokens"] += call.get("total_tokens", 0)
-            by_model[mid]["cost"]  += call.get("cost_usd", 0)
-
+        """Get aggregated usage summary (from rollups)."""
+        state = self.ledger.sync()
+        aggregate = dict(state.aggregate)
+        prompt = aggregate.get("total_prompt_tokens", 0)
+        if prompt:
+            # Share of prompt tokens served from provider prefix caches
+            aggregate["cache_hit_ratio"] = round(
+                aggregate.get("total_cached_tokens", 0) / prompt, 4)
         return {
-            "aggregate": agg,
-            "by_agent":  by_agent,
-            "by_model":  by_model,
+            "aggregate": aggregate,
+            "by_agent":  {k: dict(v) for k, v in state.by_agent.items()},
+            "by_model":  {k: dict(v) for k, v in state.by_model.items()},
         }
 
-    def get_session_summary(self, since_ts: float = 0) -> dict:
-        """Get usage summary for calls since a timestamp."""
-        data = self._read()
-        calls = [c for c in data.get("calls", [])
-                 if c.get("ts", 0) >= since_ts]
+    def get_hourly(self, hours: int = 24) -> list[dict]:
+        """Per-hour buckets for the last ``hours`` hours, oldest first."""
+        state = self.ledger.sync()
+        since = (time.time() // 3600 - hours + 1) * 3600
+        return [{"hour": h, **b} for h, b in sorted(state.by_hour.items())
+                if h >= since]
+
+    def recent_calls(self, limit: int = RECENT_CALLS) -> list[dict]:
+        """Most recent calls, oldest first."""
+        recent = list(self.ledger.sync().recent)
+        return recent[-limit:] if limit > 0 else []
 
-        total_tokens = sum(c.get("total_tokens", 0) for c in calls)
-        total_cost = sum(c.get("cost_usd", 0) for c in calls)
-        successes = sum(1 for c in calls if c.get("success"))
-        latencies = [c.get("latency_ms", 0) for c in calls
-                     if c.get("success") and c.get("latency_ms", 0) > 0]
+    def get_session_summary(self, since_ts: float = 0) -> dict:
+        """Get usage summary for calls since a timestamp.
+
+        Whole hours come from the hourly rollups; only the partial first
+        hour is read from the ledger.
+        """
+        state = self.ledger.sync()
+        first_hour = int(since_ts // 3600 * 3600)
+        partial = since_ts > first_hour
+        calls = tokens = successes = latency_n = 0
+        cost = latency_sum = 0.0
+        for hour, b in state.by_hour.items():
+            if hour < first_hour or (partial and hour == first_hour):
+                continue
+            calls += b["calls"]
+            tokens += b["tokens"]
+            cost += b["cost"]
+            successes += b["successes"]
+            latency_sum += b["latency_ms_sum"]
+            latency_n += b["latency_n"]
+        if partial:
+            for c in self.ledger.scan(since_ts):
+                if c.get("ts", 0) >= first_hour + 3600:
+                    continue
+                calls += 1
+                tokens += c.get("total_tokens", 0)
+                cost += c.get("cost_usd", 0)
+                if c.get("success"):
+                    successes += 1
+                    if c.get("latency_ms", 0) > 0:
+                        latency_sum += c["latency_ms"]
+                        latency_n += 1
 
         return {
-            "calls":       len(calls),
-            "tokens":      total_tokens,
-            "cost_usd":    total_cost,
+            "calls":       calls,
+            "tokens":      tokens,
+            "cost_usd":    cost,
             "successes":   successes,
-            "failures":    len(calls) - successes,
-            "avg_latency": sum(latencies) / len(latencies) if latencies else 0,
+            "failures":    calls - successes,
+            "avg_latency": latency_sum / latency_n if latency_n else 0,
         }
 
     def clear(self):
         """Reset all usage data."""
         with self.lock:
-            self._write({"calls": [], "aggregate": {}})
+            self.ledger.reset()
 
     # ── Budget Management ─────────────────────────────────────────────────
 
@@ -223,14 +534,25 @@ class UsageTracker:
                 raise BudgetExceeded(
                     f"Token limit exceeded: {total_tokens:,} >= {max_tokens:,}")
 
+    _budget_cache: tuple = (None, {})    # ((path, mtime), budget)
+
     @staticmethod
     def _read_budget() -> dict:
-        """Read budget config. Returns empty dict if not configured."""
+        """Read budget config (cached by mtime). Empty dict if not configured."""
+        try:
+            key = (os.path.abspath(BUDGET_FILE), os.stat(BUDGET_FILE).st_mtime_ns)
+        except OSError:
+            return {}
+        cached_key, budget = UsageTracker._budget_cache
+        if cached_key == key:
+            return budget
         try:
             with open(BUDGET_FILE, "r") as f:
-                return json.load(f)
+                budget = json.load(f)
         except (FileNotFoundError, json.JSONDecodeError):
             return {}
+        UsageTracker._budget_cache = (key, budget)
+        return budget
 
     @staticmethod
     def set_budget(max_cost_usd: float = 0, max_tokens: int = 0,
@@ -257,22 +579,15 @@ class UsageTracker:
         except (FileNotFoundError, json.JSONDecodeError):
             budget = {"enabled": False, "max_cost_usd": 0, "max_tokens": 0}
 
-        # Add current spending
-        try:
-            with open(USAGE_FILE, "r") as f:
-                data = json.load(f)
-            agg = data.get("aggregate", {})
-            budget["current_cost_usd"] = agg.get("total_cost_usd", 0)
-            budget["current_tokens"] = agg.get("total_tokens", 0)
-            max_cost = budget.get("max_cost_usd", 0)
-            if max_cost > 0:
-                budget["percent_used"] = round(
-                    (budget["current_cost_usd"] / max_cost) * 100, 1)
-            else:
-                budget["percent_used"] = 0
-        except (FileNotFoundError, json.JSONDecodeError):
-            budget["current_cost_usd"] = 0
-            budget["current_tokens"] = 0
+        # Add current spending (from the in-memory rollups)
+        agg = UsageTracker().ledger.sync().aggregate
+        budget["current_cost_usd"] = agg.get("total_cost_usd", 0)
+        budget["current_tokens"] = agg.get("total_tokens", 0)
+        max_cost = budget.get("max_cost_usd", 0)
+        if max_cost > 0:
+            budget["percent_used"] = round(
+                (budget["current_cost_usd"] / max_cost) * 100, 1)
+        else:
             budget["percent_used"] = 0
 
         return budget
@@ -304,14 +619,3 @@ class UsageTracker:
         except FileNotFoundError:
             pass
         return alerts[-limit:]
-
-    def _read(self) -> dict:
-        try:
-            with open(self.path, "r") as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {"calls": [], "aggregate": {}}
-
-    def _write(self, data: dict):
-        with open(self.path, "w") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
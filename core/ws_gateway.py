@@ -16,7 +16,10 @@ Architecture:
 
 Protocol:
   Connect: ws://localhost:{port}?token={gateway_token}
-  Server → Client events: {"event": "state"|"task_update"|"alert", "data": {...}}
+  Server → Client events: {"event": "state"|"delta"|"task_update"|"alert", "data": {...}}
+    state/delta frames come pre-encoded from the shared
+    ``core.state_broadcast`` producer (same frames as SSE /v1/events);
+    each client receives a full ``state`` first, then only newer deltas.
   Client → Server commands: {"action": "submit_task"|"ping", "data": {...}}
 
 Dependencies:
@@ -47,6 +50,7 @@ except ImportError:
 class WSEvent:
     """WebSocket event types."""
     STATE = "state"              # Full state snapshot
+    DELTA = "delta"              # Changed tasks/agents since previous frame
     TASK_UPDATE = "task_update"  # Single task changed
     TASK_COMPLETE = "task_complete"  # Task finished
     AGENT_STATUS = "agent_status"   # Agent status change
@@ -65,7 +69,7 @@ class WebSocketGateway:
       - Broadcast to all connected clients
       - Client command handling (task submission)
       - Automatic reconnection support (client-side)
-      - Rate-limited state snapshots (max 2/sec)
+      - Shared state frames (one snapshot build per tick for all clients)
     """
 
     def __init__(self, port: int = 19790, token: str = ""):
@@ -84,7 +88,8 @@ class WebSocketGateway:
         self._server = None
         self._broadcast_task: Optional[asyncio.Task] = None
         self._running = False
-        self._last_state_hash = ""
+        # Last state-frame seq delivered to each client (see state_broadcast)
+        self._client_seq: dict[WebSocketServerProtocol, int] = {}
 
     async def start(self):
         """Start the WebSocket server."""
@@ -146,13 +151,15 @@ class WebSocketGateway:
         logger.info("[ws] Client connected: %s (%d total)",
                     client_id, len(self._clients))
 
+        from core.state_broadcast import get_broadcaster
+        broadcaster = get_broadcaster()
+        await asyncio.to_thread(broadcaster.subscribe)
         try:
             # Send initial state snapshot
-            snapshot = self._build_snapshot()
-            await websocket.send(json.dumps({
-                "event": WSEvent.STATE,
-                "data": snapshot,
-            }, ensure_ascii=False, default=str))
+            seq, frames = broadcaster.frames_since(0, fmt="ws")
+            for _, message in frames:
+                await websocket.send(message)
+            self._client_seq[websocket] = seq
 
             # Listen for client commands
             async for message in websocket:
@@ -164,6 +171,8 @@ class WebSocketGateway:
             logger.warning("[ws] Client error: %s", e)
         finally:
             self._clients.discard(websocket)
+            self._client_seq.pop(websocket, None)
+            broadcaster.unsubscribe()
             logger.info("[ws] Client disconnected: %s (%d remaining)",
                         client_id, len(self._clients))
 
@@ -216,33 +225,32 @@ class WebSocketGateway:
     # ── Broadcasting ─────────────────────────────────────────────────────
 
     async def _broadcast_loop(self):
-        """Periodically broadcast state updates to all clients."""
+        """Forward shared state frames to every connected client."""
+        from core.state_broadcast import get_broadcaster
+        broadcaster = get_broadcaster()
+        seq = 0
         while self._running:
             try:
-                if self._clients:
-                    snapshot = self._build_snapshot()
-                    state_str = json.dumps(snapshot, ensure_ascii=False, default=str)
-                    state_hash = str(hash(state_str))
-
-                    if state_hash != self._last_state_hash:
-                        self._last_state_hash = state_hash
-                        message = json.dumps({
-                            "event": WSEvent.STATE,
-                            "data": snapshot,
-                        }, ensure_ascii=False, default=str)
-
-                        # Broadcast to all connected clients
-                        disconnected = set()
-                        for ws in self._clients:
-                            try:
-                                await ws.send(message)
-                            except Exception:
-                                disconnected.add(ws)
-
-                        # Clean up disconnected clients
-                        self._clients -= disconnected
-
-                await asyncio.sleep(1.0)  # 1 Hz broadcast rate
+                if not self._clients:
+                    await asyncio.sleep(1.0)
+                    continue
+                seq, frames = await asyncio.to_thread(
+                    broadcaster.wait_frames, seq, 1.0, "ws")
+                disconnected = set()
+                for frame_seq, message in frames:
+                    for ws in list(self._clients):
+                        # Skip frames already covered by the client's
+                        # initial full snapshot
+                        if self._client_seq.get(ws, 0) >= frame_seq:
+                            continue
+                        try:
+                            await ws.send(message)
+                            self._client_seq[ws] = frame_seq
+                        except Exception:
+                            disconnected.add(ws)
+
+                # Clean up disconnected clients
+                self._clients -= disconnected
 
             except asyncio.CancelledError:
                 break
@@ -272,65 +280,6 @@ class WebSocketGateway:
                 disconnected.add(ws)
         self._clients -= disconnected
 
-    # ── State Building ───────────────────────────────────────────────────
-
-    def _build_snapshot(self) -> dict:
-        """Build the current state snapshot (same as SSE snapshot)."""
-        snapshot: dict = {"ts": time.time(), "clients": len(self._clients)}
-
-        # Task board
-        try:
-            if os.path.exists(".task_board.json"):
-                with open(".task_board.json") as f:
-                    tasks = json.load(f)
-                compact_tasks = {}
-                for tid, t in tasks.items():
-                    compact_tasks[tid] = {
-                        "s": t.get("status", "?"),
-                        "a": t.get("agent_id", ""),
-                        "d": (t.get("description", ""))[:60],
-                        "ca": t.get("claimed_at"),
-                        "co": t.get("completed_at"),
-                        "rc": t.get("retry_count", 0),
-                    }
-                    scores = t.get("review_scores", [])
-                    if scores:
-                        avg = sum(r["score"] for r in scores) / len(scores)
-                        compact_tasks[tid]["rs"] = int(avg)
-                    pr = t.get("partial_result", "")
-                    if pr:
-                        compact_tasks[tid]["pr"] = pr[-200:]
-                    cost = t.get("cost_usd")
-                    if cost is not None:
-                        compact_tasks[tid]["cost"] = round(cost, 4)
-                    pid = t.get("parent_id")
-                    if pid:
-                        compact_tasks[tid]["pid"] = pid
-                    cs = t.get("critique_spec")
-                    if cs:
-                        compact_tasks[tid]["cs"] = cs
-                snapshot["tasks"] = compact_tasks
-        except Exception:
-            snapshot["tasks"] = {}
-
-        # Agent status from context bus
-        try:
-            if os.path.exists(".context_bus.json"):
-                with open(".context_bus.json") as f:
-                    ctx = json.load(f)
-                agents = {}
-                for aid, info in ctx.get("agents", {}).items():
-                    agents[aid] = {
-                        "status": info.get("status", "idle"),
-                        "current_task": info.get("current_task_id", ""),
-                        "last_active": info.get("last_active", 0),
-                    }
-                snapshot["agents"] = agents
-        except Exception:
-            snapshot["agents"] = {}
-
-        return snapshot
-
     # ── Task Submission ──────────────────────────────────────────────────
 
     async def _submit_task(self, description: str) -> dict:
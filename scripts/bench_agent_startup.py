@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Benchmark agent process start: cold ``mp.Process`` vs zygote fork.
+
+Measures, per start, the time until the new process has the agent stack
+imported (``core.runtime.zygote.PRELOAD_MODULES``) — the part of
+``_agent_process`` start-up that the zygote removes — and, on Linux, the
+proportional set size (PSS) of each child, which counts pages shared with
+the zygote only fractionally.
+
+  cold     ``mp.get_context("spawn")`` process importing the stack
+  zygote   ``os.fork()`` from a process that imported it once
+
+Real agents report the full startup-to-first-claim time as
+``heartbeat.metrics["startup"]`` (``mode``, ``ready_ms``,
+``first_claim_ms``).
+
+Usage:
+  python3 scripts/bench_agent_startup.py [--rounds 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.runtime.zygote import PRELOAD_MODULES, _preload  # noqa: E402
+
+
+def pss_kb(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def _child(conn) -> None:
+    _preload(PRELOAD_MODULES)
+    conn.send(time.time())
+    conn.recv()                       # stay alive until measured
+
+
+def cold(rounds: int) -> list[tuple[float, int]]:
+    ctx = mp.get_context("spawn")
+    out = []
+    for _ in range(rounds):
+        parent, child = ctx.Pipe()
+        t0 = time.time()
+        p = ctx.Process(target=_child, args=(child,))
+        p.start()
+        ready = parent.recv()
+        out.append((ready - t0, pss_kb(p.pid)))
+        parent.send("done")
+        p.join()
+    return out
+
+
+def zygote(rounds: int) -> list[tuple[float, int]]:
+    t0 = time.time()
+    _preload(PRELOAD_MODULES)
+    print(f"zygote preload: {(time.time() - t0) * 1000:.0f} ms (once)")
+    out = []
+    for _ in range(rounds):
+        r, w = os.pipe()
+        t0 = time.time()
+        pid = os.fork()
+        if pid == 0:
+            os.close(r)
+            os.write(w, repr(time.time()).encode())
+            time.sleep(0.5)           # stay alive until measured
+            os._exit(0)
+        os.close(w)
+        ready = float(os.read(r, 64))
+        os.close(r)
+        out.append((ready - t0, pss_kb(pid)))
+        os.waitpid(pid, 0)
+    return out
+
+
+def report(name: str, samples: list[tuple[float, int]]) -> None:
+    times = sorted(s[0] for s in samples)
+    pss = [s[1] for s in samples if s[1]]
+    print(f"{name:>7}: median {times[len(times) // 2] * 1000:8.1f} ms  "
+          f"max {times[-1] * 1000:8.1f} ms"
+          + (f"  pss {sum(pss) / len(pss) / 1024:6.1f} MB" if pss else ""))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Agent startup benchmark")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    if not hasattr(os, "fork"):
+        print("os.fork unavailable — the zygote runtime is not supported here")
+        return 1
+    report("cold", cold(args.rounds))
+    report("zygote", zygote(args.rounds))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
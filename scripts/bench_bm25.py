@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Benchmark BM25Index add/open/query latency against collection size.
+
+Builds a segment-backed index of N synthetic memories in a temporary
+directory (Zipf-distributed vocabulary, so
+common terms have long postings lists and rare terms short ones), then
+times queries mixing a near-ubiquitous, a mid-frequency and a rare term
+— the shape of real recall queries — and reports per-query p50 / p99.
+
+Usage:
+  python3 scripts/bench_bm25.py                       # 1k, 10k, 100k
+  python3 scripts/bench_bm25.py --sizes 1000 50000 --queries 500
+
+"open" is a cold ``BM25Index.open`` (manifest + tail replay) and
+"first" the first query after it, which maps the segment files.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from adapters.memory.hybrid import BM25Index  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+VOCAB = 50_000
+DOC_LEN = 24
+
+
+def make_docs(n: int, rng: random.Random) -> list[str]:
+    words = [f"w{i}" for i in range(VOCAB)]
+    cum, total = [], 0.0
+    for i in range(VOCAB):
+        total += 1.0 / (i + 1)
+        cum.append(total)
+    return [" ".join(rng.choices(words, cum_weights=cum, k=DOC_LEN))
+            for _ in range(n)]
+
+
+def percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run_one(size: int, queries: int, rng: random.Random) -> dict:
+    docs = make_docs(size, rng)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bm25")
+        idx = BM25Index.open(path)
+        t0 = time.perf_counter()
+        for i, doc in enumerate(docs):
+            idx.add(f"m{i}", doc)
+        add_us = (time.perf_counter() - t0) / size * 1e6
+        idx.close()
+
+        def query() -> str:
+            return (f"w{rng.randrange(0, 5)} w{rng.randrange(50, 500)} "
+                    f"w{rng.randrange(1000, VOCAB)}")
+
+        t0 = time.perf_counter()
+        idx = BM25Index.open(path)
+        open_ms = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        idx.search(query(), n_results=6)
+        first_ms = (time.perf_counter() - t0) * 1000
+
+        latencies = []
+        for _ in range(queries):
+            q = query()
+            t0 = time.perf_counter()
+            idx.search(q, n_results=6)
+            latencies.append((time.perf_counter() - t0) * 1000)
+        idx.close()
+    return {"size": size, "add_us": add_us, "open": open_ms, "first": first_ms,
+            "p50": percentile(latencies, 0.50),
+            "p99": percentile(latencies, 0.99)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="BM25 index benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'docs':>8}  {'add/doc':>10}  {'open':>10}  {'first':>10}  "
+          f"{'query p50':>10}  {'query p99':>10}")
+    for size in args.sizes:
+        r = run_one(size, args.queries, rng)
+        print(f"{r['size']:>8}  {r['add_us']:>8.1f}us  {r['open']:>8.2f}ms  "
+              f"{r['first']:>8.2f}ms  {r['p50']:>8.3f}ms  {r['p99']:>8.3f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Load test: /v1/status latency while many SSE clients are attached.
+
+Starts the gateway server in-process on a free port (temporary working
+directory, no auth), seeds a task board, attaches N ``/v1/events``
+clients, then times sequential ``GET /v1/status`` requests and reports
+p50 / p99 / max latency.
+
+Usage:
+  python3 scripts/bench_gateway.py                      # 200 SSE clients
+  python3 scripts/bench_gateway.py --clients 500 --requests 500
+  python3 scripts/bench_gateway.py --workers 8 --tasks 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import os
+import selectors
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core import gateway  # noqa: E402
+from core.task_board import TaskBoard  # noqa: E402
+
+
+def attach_sse_clients(port: int, n: int) -> tuple[list[socket.socket], threading.Event]:
+    """Open ``n`` /v1/events streams; one selector thread drains them all."""
+    sel = selectors.DefaultSelector()
+    socks = []
+    for _ in range(n):
+        s = socket.create_connection(("127.0.0.1", port), timeout=10)
+        s.sendall(b"GET /v1/events HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        s.setblocking(False)
+        sel.register(s, selectors.EVENT_READ)
+        socks.append(s)
+    stop = threading.Event()
+
+    def drain():
+        while not stop.is_set():
+            for key, _ in sel.select(timeout=0.2):
+                try:
+                    if not key.fileobj.recv(65536):
+                        sel.unregister(key.fileobj)
+                except (BlockingIOError, OSError):
+                    pass
+
+    threading.Thread(target=drain, daemon=True).start()
+    return socks, stop
+
+
+def percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Gateway concurrency load test")
+    parser.add_argument("--clients", type=int, default=200,
+                        help="concurrent SSE clients (default: 200)")
+    parser.add_argument("--requests", type=int, default=200,
+                        help="timed /v1/status requests (default: 200)")
+    parser.add_argument("--tasks", type=int, default=200,
+                        help="tasks seeded on the board (default: 200)")
+    parser.add_argument("--workers", type=int, default=gateway.DEFAULT_WORKERS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            board = TaskBoard()
+            for i in range(args.tasks):
+                board.create(f"bench task {i}")
+
+            server = gateway._GatewayServer(
+                ("127.0.0.1", 0), gateway._Handler, workers=args.workers,
+                max_streams=max(args.clients + 16, gateway.DEFAULT_MAX_STREAMS))
+            port = server.server_address[1]
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+
+            socks, stop = attach_sse_clients(port, args.clients)
+            deadline = time.time() + 10
+            while server.open_streams < args.clients and time.time() < deadline:
+                time.sleep(0.05)
+            attached = server.open_streams
+
+            latencies: list[float] = []
+            errors = 0
+            for _ in range(args.requests):
+                t0 = time.perf_counter()
+                try:
+                    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+                    conn.request("GET", "/v1/status")
+                    resp = conn.getresponse()
+                    resp.read()
+                    conn.close()
+                    if resp.status != 200:
+                        errors += 1
+                except OSError:
+                    errors += 1
+                latencies.append((time.perf_counter() - t0) * 1000)
+
+            stop.set()
+            for s in socks:
+                s.close()
+            server.shutdown()
+            server.server_close()
+        finally:
+            os.chdir(cwd)
+
+    print(f"SSE clients attached : {attached}/{args.clients}")
+    print(f"/v1/status requests  : {len(latencies)} ({errors} errors)")
+    print(f"  p50  {percentile(latencies, 0.50):8.2f} ms")
+    print(f"  p99  {percentile(latencies, 0.99):8.2f} ms")
+    print(f"  max  {max(latencies):8.2f} ms")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
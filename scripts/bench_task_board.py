@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Benchmark TaskBoard storage engines (json vs sqlite).
+
+Seeds a board with N historical (completed) tasks plus a small batch of
+pending ones, then measures:
+  claim   — claim_next() throughput
+  update  — update_partial() throughput (streaming partial results)
+
+Each engine runs in its own temporary directory; nothing in the working
+tree is touched.
+
+Usage:
+  python3 scripts/bench_task_board.py                        # 1k, 10k, 100k
+  python3 scripts/bench_task_board.py --sizes 1000 10000 --ops 50
+  python3 scripts/bench_task_board.py --engines sqlite
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.task_board import Task, TaskBoard, TaskStatus  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+DEFAULT_OPS = 20
+
+
+def seed(board: TaskBoard, history: int, pending: int) -> None:
+    """Bulk-load ``history`` completed tasks and ``pending`` open ones."""
+    now = time.time()
+    data: dict = {}
+    for i in range(history):
+        t = Task(task_id=str(uuid.uuid4()),
+                 description=f"historical task {i} " + "x" * 200,
+                 status=TaskStatus.COMPLETED, agent_id="jerry",
+                 result="done " * 40, created_at=now - history + i,
+                 completed_at=now)
+        data[t.task_id] = t.to_dict()
+    for i in range(pending):
+        t = Task(task_id=str(uuid.uuid4()), description=f"pending task {i}",
+                 required_role="implement", created_at=now + i)
+        data[t.task_id] = t.to_dict()
+    board._write(data)
+
+
+def run_one(engine: str, size: int, ops: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            board = TaskBoard(engine=engine)
+            seed(board, size, ops)
+
+            t0 = time.perf_counter()
+            claimed = []
+            for _ in range(ops):
+                task = board.claim_next("jerry", agent_role="Implementation agent")
+                if task:
+                    claimed.append(task.task_id)
+            claim_s = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            for i, tid in enumerate(claimed):
+                board.update_partial(tid, "partial " * (i + 1))
+            update_s = time.perf_counter() - t0
+
+            board.close()
+            return {
+                "engine": engine, "size": size, "ops": len(claimed),
+                "claim_per_s": len(claimed) / claim_s if claim_s else 0.0,
+                "update_per_s": len(claimed) / update_s if update_s else 0.0,
+            }
+        finally:
+            os.chdir(cwd)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="TaskBoard engine benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="historical task counts (default: 1k 10k 100k)")
+    parser.add_argument("--ops", type=int, default=DEFAULT_OPS,
+                        help="claims/updates per measurement (default: 20)")
+    parser.add_argument("--engines", nargs="+", default=["json", "sqlite"],
+                        choices=["json", "sqlite"])
+    args = parser.parse_args()
+
+    print(f"{'ENGINE':8}  {'TASKS':>8}  {'OPS':>4}  {'CLAIM/s':>10}  {'UPDATE/s':>10}")
+    print("-" * 50)
+    for size in args.sizes:
+        for engine in args.engines:
+            r = run_one(engine, size, args.ops)
+            print(f"{r['engine']:8}  {r['size']:>8}  {r['ops']:>4}  "
+                  f"{r['claim_per_s']:>10.1f}  {r['update_per_s']:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Benchmark token-count estimates against provider-reported counts.
+
+Compares three estimators — ``len // 4``, ``len // 3`` (the old agent and
+compaction rules) and ``core.token_counter`` for the sample's model family
+— and reports mean absolute error and bias (estimate / reported) for each,
+plus cold vs memoized counting time.
+
+Reference counts come from:
+  --samples FILE   JSONL of {"model", "messages" | "text", "prompt_tokens"},
+                   e.g. prompts logged next to the ``usage.prompt_tokens``
+                   an adapter returned
+  tiktoken         when installed, the built-in mixed Chinese/English corpus
+                   is counted with ``o200k_base`` (model "gpt-4o")
+
+Usage:
+  python3 scripts/bench_token_counter.py
+  python3 scripts/bench_token_counter.py --samples usage_samples.jsonl
+
+Live accuracy from real traffic is also published per family as
+``heartbeat.metrics["token_counter"]`` (``mean_abs_error``, ``bias``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.token_counter import (MESSAGE_OVERHEAD, TokenCounterRegistry,  # noqa: E402
+                                count_messages)
+
+CORPUS = [
+    "Summarize the quarterly report and list the three biggest risks.",
+    "请帮我总结这份季度报告，并列出三个最大的风险。",
+    "部署 pipeline 在 staging 环境失败了，错误是 `ConnectionRefusedError: [Errno 111]`，"
+    "请检查 docker-compose.yml 里的 redis 配置。",
+    "def fib(n):\n    return n if n < 2 else fib(n - 1) + fib(n - 2)\n",
+    "## 任务\n1. 读取 workspace/report.md\n2. 提取 KPI（收入、毛利率、DAU）\n"
+    "3. 输出 JSON：{\"revenue\": 1234567, \"margin\": 0.42}\n",
+    "The agent recalled 12 episodes; 3 were relevant (score ≥ 0.8).",
+    "用户意图：把英文文档 translate 成中文，保留 Markdown 格式和 code blocks。",
+]
+
+
+def load_samples(path: str) -> list[dict]:
+    samples = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                obj = json.loads(line)
+                if "text" in obj:
+                    obj["messages"] = [{"role": "user", "content": obj["text"]}]
+                samples.append(obj)
+    return samples
+
+
+def tiktoken_samples() -> list[dict]:
+    try:
+        import tiktoken
+        enc = tiktoken.get_encoding("o200k_base")
+    except Exception as e:     # not installed / no cached BPE files
+        print(f"tiktoken reference unavailable ({e.__class__.__name__}); "
+              "pass --samples for reported counts")
+        return []
+    return [{"model": "gpt-4o",
+             "messages": [{"role": "user", "content": text}],
+             "prompt_tokens": len(enc.encode(text)) + MESSAGE_OVERHEAD}
+            for text in CORPUS]
+
+
+def chars_rule(div: int):
+    def est(messages, _model):
+        return sum(len(m.get("content") or "") for m in messages) // div \
+            + MESSAGE_OVERHEAD * len(messages)
+    return est
+
+
+def accuracy(samples: list[dict]) -> None:
+    methods = {"len//4": chars_rule(4), "len//3": chars_rule(3),
+               "token_counter": count_messages}
+    print(f"{'method':>14} {'mean |err|':>11} {'bias':>7}")
+    for name, est in methods.items():
+        err = bias_e = bias_r = 0.0
+        for s in samples:
+            e, r = est(s["messages"], s.get("model")), s["prompt_tokens"]
+            err += abs(e - r) / r
+            bias_e += e
+            bias_r += r
+        print(f"{name:>14} {err / len(samples):>10.1%} {bias_e / bias_r:>7.2f}")
+
+
+def timing(rounds: int) -> None:
+    text = "\n\n".join(CORPUS) * 40        # ~ a skills/docs section
+    reg = TokenCounterRegistry()
+    t0 = time.perf_counter()
+    for i in range(rounds):
+        reg.count(text + str(i), "qwen-max")
+    cold = (time.perf_counter() - t0) / rounds
+    reg.count(text, "qwen-max")
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        reg.count(text, "qwen-max")
+    warm = (time.perf_counter() - t0) / rounds
+    print(f"\n{len(text)} chars: cold {cold * 1e6:.0f} us, "
+          f"memoized {warm * 1e6:.1f} us")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Token counter benchmark")
+    parser.add_argument("--samples", help="JSONL with reported prompt_tokens")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    samples = load_samples(args.samples) if args.samples else tiktoken_samples()
+    if samples:
+        print(f"{len(samples)} samples")
+        accuracy(samples)
+    timing(args.rounds)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
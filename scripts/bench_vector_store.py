@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Benchmark the built-in vector store (and ChromaDB, when installed).
+
+Builds a synthetic clustered corpus of random unit vectors, then reports
+per backend: batched add time, query latency (p50 / p95) and recall@k
+against brute-force ground truth.  Backends:
+
+  exact    built-in store, exact scan (NumPy matmul, or pure Python)
+  ivf      built-in store with the IVF index (NumPy only; forced by
+           setting ``ivf_threshold`` to 0)
+  chroma   chromadb ``PersistentClient`` (HNSW), when importable
+
+Usage:
+  python3 scripts/bench_vector_store.py
+  python3 scripts/bench_vector_store.py --rows 200000 --dim 384 --nprobe 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from adapters.memory.vector_store import HAS_NUMPY, VectorStore  # noqa: E402
+
+
+def corpus(rows: int, dim: int, clusters: int, seed: int = 0):
+    rnd = random.Random(seed)
+    centres = [[rnd.gauss(0, 1) for _ in range(dim)] for _ in range(clusters)]
+    for i in range(rows):
+        c = centres[i % clusters]
+        yield [x + rnd.gauss(0, 0.6) for x in c]
+
+
+def unit(v):
+    n = math.sqrt(sum(x * x for x in v)) or 1.0
+    return [x / n for x in v]
+
+
+def truth(vecs, queries, k):
+    out = []
+    for q in queries:
+        scored = sorted(range(len(vecs)), reverse=True,
+                        key=lambda r: sum(a * b for a, b in zip(vecs[r], q)))
+        out.append({str(r) for r in scored[:k]})
+    return out
+
+
+def run(name, coll, vecs, queries, expected, k, batch):
+    t0 = time.perf_counter()
+    for i in range(0, len(vecs), batch):
+        chunk = vecs[i:i + batch]
+        coll.add(ids=[str(r) for r in range(i, i + len(chunk))],
+                 documents=[""] * len(chunk), embeddings=chunk)
+    add_s = time.perf_counter() - t0
+    coll.query(query_embeddings=[queries[0]], n_results=k)   # warm-up / index
+    lat, hits = [], 0
+    for q, exp in zip(queries, expected):
+        t0 = time.perf_counter()
+        res = coll.query(query_embeddings=[q], n_results=k)
+        lat.append(time.perf_counter() - t0)
+        hits += len(exp & set(res["ids"][0]))
+    lat.sort()
+    print(f"{name:>7} {add_s:>8.2f}s {lat[len(lat) // 2] * 1e3:>8.2f} "
+          f"{lat[int(len(lat) * 0.95)] * 1e3:>8.2f} "
+          f"{hits / (k * len(queries)):>9.1%}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Vector store benchmark")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, default=8)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    clusters = max(8, int(math.sqrt(args.rows)))
+    vecs = [unit(v) for v in corpus(args.rows, args.dim, clusters)]
+    queries = [unit(v) for v in corpus(args.queries, args.dim, clusters, 1)]
+    expected = truth(vecs, queries, args.k)
+    print(f"{args.rows} rows x {args.dim}d, {args.queries} queries, "
+          f"k={args.k}, numpy={'yes' if HAS_NUMPY else 'no'}")
+    print(f"{'backend':>7} {'add':>9} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'recall@k':>9}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        run("exact", VectorStore(os.path.join(tmp, "exact"))
+            .get_or_create_collection("bench", embedding_function=lambda t: []),
+            vecs, queries, expected, args.k, args.batch)
+        if HAS_NUMPY:
+            run("ivf", VectorStore(os.path.join(tmp, "ivf"), ivf_threshold=0,
+                                   nprobe=args.nprobe)
+                .get_or_create_collection("bench",
+                                          embedding_function=lambda t: []),
+                vecs, queries, expected, args.k, args.batch)
+        try:
+            import chromadb
+        except Exception as e:      # not installed / broken build
+            print(f" chroma  skipped ({e.__class__.__name__})")
+        else:
+            client = chromadb.PersistentClient(path=os.path.join(tmp, "chroma"))
+            run("chroma", client.get_or_create_collection(
+                "bench", metadata={"hnsw:space": "cosine"}),
+                vecs, queries, expected, args.k, args.batch)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
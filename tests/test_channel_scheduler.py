@@ -0,0 +1,135 @@
+"""
+tests/test_channel_scheduler.py — Concurrent per-session channel processing.
+
+Tests:
+  - Sessions run concurrently up to the global limit, in order within one
+  - Round-robin across channels; backpressure holds dispatch
+  - Per-channel queue-wait / processing metrics
+  - Tools resolve the chat of their own task tree; archival keeps live trees
+"""
+
+import asyncio
+import time
+
+
+def _run_scheduler(items, max_concurrent=2, delay=0.05, pressure=None):
+    """Submit (channel, session, label) items; return (start order, sched)."""
+    from adapters.channels.scheduler import SessionScheduler
+    started, running, peak = [], set(), [0]
+
+    async def handler(item):
+        _, session, label = item
+        assert session not in running          # one in flight per session
+        running.add(session)
+        peak[0] = max(peak[0], len(running))
+        started.append(label)
+        await asyncio.sleep(delay)
+        running.discard(session)
+        if label == "boom":
+            raise RuntimeError("boom")
+
+    async def main():
+        sched = SessionScheduler(handler, max_concurrent=max_concurrent,
+                                 pressure=pressure, pressure_interval=0.02)
+        aheads = [sched.submit(ch, sess, (ch, sess, label))
+                  for ch, sess, label in items]
+        runner = asyncio.create_task(sched.run())
+        while sched.in_flight or any(sched.pending(s) for _, s, _ in items):
+            await asyncio.sleep(0.01)
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+        return aheads, sched
+
+    aheads, sched = asyncio.run(main())
+    return started, aheads, peak[0], sched
+
+
+class TestSessionScheduler:
+
+    def test_session_order_and_global_limit(self):
+        items = [("telegram", "tg:1", "a1"), ("telegram", "tg:1", "a2"),
+                 ("telegram", "tg:2", "b1"), ("telegram", "tg:3", "c1"),
+                 ("telegram", "tg:1", "boom")]
+        t0 = time.perf_counter()
+        started, aheads, peak, sched = _run_scheduler(items, max_concurrent=2)
+        wall = time.perf_counter() - t0
+
+        assert aheads == [0, 1, 0, 0, 2]
+        assert peak == 2
+        assert wall < 0.25                      # sequential would be 0.25s+
+        own = [label for label in started if label in ("a1", "a2", "boom")]
+        assert own == ["a1", "a2", "boom"]
+
+        stats = sched.stats("telegram")
+        assert stats["completed"] == 4 and stats["failed"] == 1
+        assert stats["queued"] == 0 and stats["in_flight"] == 0
+        assert stats["queue_wait_ms"]["count"] == 5
+        assert stats["processing_ms"]["count"] == 5
+
+    def test_round_robin_across_channels(self):
+        items = [("slack", f"sl:{i}", f"s{i}") for i in range(4)]
+        items.append(("discord", "dc:1", "d1"))
+        started, _, _, _ = _run_scheduler(items, max_concurrent=1, delay=0.01)
+        assert started.index("d1") == 1        # not behind the slack burst
+
+    def test_backpressure_defers_dispatch(self):
+        calls = []
+
+        def pressure():
+            calls.append(1)
+            return len(calls) < 4               # saturated for three checks
+
+        started, _, _, sched = _run_scheduler(
+            [("telegram", "tg:1", "a")], pressure=pressure)
+        assert started == ["a"]
+        assert sched.deferrals == 3
+        assert sched.stats("telegram")["queue_wait_ms"]["avg_ms"] >= 40
+
+
+class TestChannelTaskRouting:
+
+    def _msg(self, chat_id):
+        from adapters.channels.base import ChannelMessage
+        return ChannelMessage(channel="telegram", chat_id=chat_id,
+                              user_id="u" + chat_id, user_name="n",
+                              text="hi")
+
+    def test_tools_resolve_session_of_their_task(self, tmp_workdir):
+        from adapters.channels.manager import ChannelManager
+        from core.task_board import TaskBoard
+        from core.tools import current_task_id
+
+        mgr = ChannelManager({"channels": {}})
+        mgr._save_active_session(self._msg("2"))          # last message
+        mgr._save_task_session("root1", self._msg("1"))
+        board = TaskBoard()
+        with board.lock:
+            board._write({
+                "root1": {"task_id": "root1", "status": "claimed"},
+                "sub1": {"task_id": "sub1", "status": "claimed",
+                         "parent_id": "root1"},
+            })
+
+        async def tool_call():
+            current_task_id.set("sub1")
+            return ChannelManager.get_active_session()
+
+        assert asyncio.run(tool_call())["chat_id"] == "1"
+        assert ChannelManager.get_active_session()["chat_id"] == "2"
+
+    def test_archive_keeps_unfinished_and_awaited_trees(self, tmp_workdir):
+        from adapters.channels.manager import ChannelManager
+        from core.task_board import TaskBoard
+
+        board = TaskBoard()
+        tasks = {
+            "a": {"status": "claimed"},
+            "a1": {"status": "completed", "parent_id": "a"},
+            "b": {"status": "completed"},
+            "c": {"status": "completed"},
+            "c1": {"status": "failed", "parent_id": "c"},
+        }
+        with board.lock:
+            board._write({k: {"task_id": k, **v} for k, v in tasks.items()})
+        ChannelManager._archive_completed_tasks(board, keep={"b"})
+        assert set(board._read()) == {"a", "a1", "b"}
@@ -0,0 +1,106 @@
+"""
+tests/test_context_bus.py — ContextBus storage engines and read cache.
+
+Tests:
+  - Layers, TTL and legacy plain strings behave the same on json and sqlite
+  - Unchanged bus reads are served from cache; foreign writes invalidate it
+  - TTL heap expires entries in memory; cleanup purges them once
+  - JSON → SQLite migration and auto-detection
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+ENGINES = ["json", "sqlite"]
+
+
+class TestContextBus:
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_layers_and_clear(self, tmp_workdir, engine):
+        from core.context_bus import (LAYER_LONG, LAYER_TASK, ContextBus)
+        bus = ContextBus(engine=engine)
+        assert bus.engine == engine
+        bus.publish("leo", "plan", "p1")
+        bus.publish("leo", "goal", "g", layer=LAYER_TASK)
+        bus.publish("alic", "fact", "f", layer=LAYER_LONG)
+        bus.publish("leo", "plan", "p2")
+
+        assert bus.get("leo", "plan") == "p2"
+        assert bus.get("nobody", "x") == ""
+        assert bus.snapshot_for_agent("leo") == {"leo:plan": "p2",
+                                                 "leo:goal": "g"}
+        assert len(bus.snapshot()) == 3
+
+        bus.clear_task_layer()
+        assert set(bus.snapshot()) == {"leo:plan", "alic:fact"}
+        bus.clear()
+        assert bus.snapshot() == {}
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_cached_reads_and_foreign_writes(self, tmp_workdir, engine):
+        from core.context_bus import ContextBus, JsonBusStore, SqliteBusStore
+        bus = ContextBus(engine=engine)
+        bus.publish("leo", "k", "v1")
+        bus.get("leo", "k")
+        store = bus._store
+        reloads = store.reloads
+        for _ in range(50):
+            assert bus.snapshot_for_agent("leo") == {"leo:k": "v1"}
+            assert bus.get("leo", "k") == "v1"
+        assert store.reloads == reloads
+
+        # A separate store stands in for another process
+        other = (SqliteBusStore(bus.path) if engine == "sqlite"
+                 else JsonBusStore(bus.path))
+        other.put("alic:k", {"v": "v2", "layer": 2, "ttl": None,
+                             "ts": time.time()})
+        if engine == "json":
+            time.sleep(0.01)
+        assert bus.get("alic", "k") == "v2"
+        assert store.reloads == reloads + 1
+        other.close()
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_ttl_expiry_and_cleanup(self, tmp_workdir, engine):
+        from core.context_bus import LAYER_SESSION, ContextBus
+        bus = ContextBus(engine=engine)
+        bus.publish("leo", "short", "s", layer=LAYER_SESSION, ttl=0.05)
+        bus.publish("leo", "keep", "k", layer=LAYER_SESSION)
+        assert bus.cleanup_expired() == 0
+        assert bus.get("leo", "short") == "s"
+
+        time.sleep(0.1)
+        reloads = bus._store.reloads
+        assert bus.get("leo", "short") == ""
+        assert bus.snapshot_for_agent("leo") == {"leo:keep": "k"}
+        assert bus._store.reloads == reloads      # expired in memory
+        assert bus.cleanup_expired() == 1
+        assert bus.cleanup_expired() == 0
+
+        # Re-published keys are not expired by their stale heap entry
+        bus.publish("leo", "short", "again", ttl=60)
+        assert bus.get("leo", "short") == "again"
+
+    def test_migrate_json_to_sqlite(self, tmp_workdir):
+        from core.context_bus import ContextBus
+        with open(".context_bus.json", "w") as f:
+            json.dump({
+                "leo:legacy": "plain",
+                "leo:task": {"v": "t", "layer": 0, "ttl": None,
+                             "ts": time.time()},
+                "leo:old": {"v": "o", "layer": 1, "ttl": 1, "ts": 0},
+            }, f)
+        bus = ContextBus(engine="sqlite")
+        assert os.path.exists(".context_bus.db")
+        assert os.path.exists(".context_bus.json.migrated")
+        assert bus.snapshot() == {"leo:legacy": "plain", "leo:task": "t"}
+
+        auto = ContextBus()
+        assert auto.engine == "sqlite"
+        assert auto.cleanup_expired() == 1
+        auto.clear_task_layer()
+        assert bus.snapshot() == {"leo:legacy": "plain"}
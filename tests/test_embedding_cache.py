@@ -0,0 +1,123 @@
+"""
+tests/test_embedding_cache.py — Persistent content-addressed embedding cache.
+
+Tests:
+  - Repeated / duplicate texts reach the provider once; order is preserved
+  - A second cache instance (another process) sees the vectors
+  - LRU eviction under the size cap; zero vectors are never cached
+  - Stats (hit rate, saved tokens / USD) and the factory wrapping
+"""
+
+from adapters.memory.embedding import (CachedEmbeddingProvider,
+                                       EmbeddingProvider)
+
+
+class FakeProvider(EmbeddingProvider):
+    def __init__(self, name="openai:text-embedding-3-small", dim=4):
+        self._name, self._dim = name, dim
+        self.calls = []
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def dimensions(self):
+        return self._dim
+
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t)), 1.0, 0.5, -2.0][:self._dim] if t != "fail"
+                else [0.0] * self._dim for t in texts]
+
+
+class TestEmbeddingCache:
+
+    def test_hits_dedupe_and_order(self, tmp_workdir):
+        inner = FakeProvider()
+        p = CachedEmbeddingProvider(inner, directory="cache")
+        assert p.embed(["alpha", "be", "alpha"]) == [
+            [5.0, 1.0, 0.5, -2.0], [2.0, 1.0, 0.5, -2.0], [5.0, 1.0, 0.5, -2.0]]
+        assert inner.calls == [["alpha", "be"]]
+
+        fn = p.as_chromadb_function()
+        assert fn(["be", "gamma"])[1] == [5.0, 1.0, 0.5, -2.0]
+        assert inner.calls[-1] == ["gamma"]
+
+        st = p.stats()
+        assert st["entries"] == 3 and st["hits"] == 1 and st["misses"] == 3
+        assert st["saved_tokens"] == 1 and st["saved_usd"] > 0
+
+    def test_shared_across_instances(self, tmp_workdir):
+        from adapters.memory.embedding_cache import EmbeddingCache
+        a = EmbeddingCache("local:m", 3, directory="cache")
+        a.put_many({"hello": [1.0, 2.0, 3.0]})
+        b = EmbeddingCache("local:m", 3, directory="cache")  # other process
+        assert b.get_many(["hello", "nope"]) == {"hello": [1.0, 2.0, 3.0]}
+        # Another provider/model never shares entries
+        c = EmbeddingCache("local:other", 3, directory="cache")
+        assert c.get_many(["hello"]) == {}
+        for cache in (a, b, c):
+            cache.close()
+
+    def test_concurrent_processes(self, tmp_workdir):
+        import multiprocessing as mp
+        from adapters.memory.embedding_cache import EmbeddingCache
+
+        def worker(seed):
+            cache = EmbeddingCache("local:m", 2, directory="cache", max_mb=0.001)
+            for i in range(60):
+                t = f"t{(i * seed) % 90}"
+                got = cache.get_many([t])
+                if t in got:
+                    assert got[t] == [float(t[1:]), 1.0]
+                else:
+                    cache.put_many({t: [float(t[1:]), 1.0]})
+
+        ctx = mp.get_context("fork")
+        procs = [ctx.Process(target=worker, args=(s,)) for s in (1, 7, 11)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join(30)
+        assert [p.exitcode for p in procs] == [0, 0, 0]
+        cache = EmbeddingCache("local:m", 2, directory="cache", max_mb=0.001)
+        st = cache.stats()
+        assert st["hits"] + st["misses"] == 180 and st["evictions"] > 0
+        cache.close()
+
+    def test_lru_eviction_and_zero_vectors(self, tmp_workdir):
+        from adapters.memory.embedding_cache import EmbeddingCache
+        dim = 2
+        slot = 8 + 4 * dim
+        cache = EmbeddingCache("local:m", dim, directory="cache",
+                               max_mb=3 * slot / (1024 * 1024))
+        assert cache.capacity == 3
+        cache.put_many({"a": [1.0, 1.0], "b": [2.0, 2.0], "c": [3.0, 3.0]})
+        cache.get_many(["a"])                          # a is now most recent
+        cache.put_many({"d": [4.0, 4.0]})              # evicts b
+        assert set(cache.get_many(["a", "b", "c", "d"])) == {"a", "c", "d"}
+        cache.put_many({"zero": [0.0, 0.0], "short": [1.0]})
+        assert cache.get_many(["zero", "short"]) == {}
+        assert cache.stats()["evictions"] == 1
+        cache.close()
+
+    def test_factory_wraps_and_cli_stats(self, tmp_workdir, monkeypatch):
+        from adapters.memory import embedding
+        from adapters.memory.embedding_cache import cache_stats
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+        cfg = {"memory": {"embedding": {"provider": "openai",
+                                        "cache_max_mb": 1}}}
+        p = embedding.get_embedding_provider(cfg)
+        assert isinstance(p, CachedEmbeddingProvider)
+        assert p.cache.capacity == 1024 * 1024 // (8 + 4 * 1536)
+        cfg["memory"]["embedding"]["cache"] = False
+        assert isinstance(embedding.get_embedding_provider(cfg),
+                          embedding.OpenAIEmbeddingProvider)
+
+        inner = FakeProvider()
+        cached = CachedEmbeddingProvider(inner)
+        cached.embed(["q"])
+        cached.embed(["q"])
+        st = cache_stats()["openai_text-embedding-3-small-4d"]
+        assert st["hit_rate"] == 0.5 and st["entries"] == 1
@@ -0,0 +1,209 @@
+"""
+tests/test_gateway.py — Gateway server concurrency.
+
+Tests:
+  - Request/response routes stay responsive while SSE streams are open
+  - Stream cap returns 503 instead of exhausting threads
+  - Shared snapshot broadcaster: full/delta frames, resync, fan-out
+  - /v1/stream/:id follows the stream file and ends on the end marker
+"""
+
+import http.client
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture
+def gateway_server(tmp_workdir):
+    from core import gateway
+    servers = []
+
+    def _start(**kwargs):
+        server = gateway._GatewayServer(("127.0.0.1", 0), gateway._Handler,
+                                        **kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield _start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _open_sse(port: int) -> socket.socket:
+    s = socket.create_connection(("127.0.0.1", port), timeout=5)
+    s.sendall(b"GET /v1/events HTTP/1.1\r\nHost: localhost\r\n\r\n")
+    return s
+
+
+def _get(port: int, path: str) -> tuple[int, float]:
+    t0 = time.perf_counter()
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    conn.request("GET", path)
+    resp = conn.getresponse()
+    resp.read()
+    conn.close()
+    return resp.status, time.perf_counter() - t0
+
+
+def _wait_streams(server, n: int) -> None:
+    deadline = time.time() + 5
+    while server.open_streams < n and time.time() < deadline:
+        time.sleep(0.02)
+
+
+class TestGatewayConcurrency:
+
+    def test_status_responsive_with_open_streams(self, gateway_server):
+        server = gateway_server(workers=4)
+        port = server.server_address[1]
+        streams = [_open_sse(port) for _ in range(40)]
+        try:
+            # Far more streams than workers — each must have detached
+            _wait_streams(server, len(streams))
+            assert server.open_streams == len(streams)
+            for path in ("/health", "/v1/status"):
+                status, elapsed = _get(port, path)
+                assert status == 200
+                assert elapsed < 1.0
+        finally:
+            for s in streams:
+                s.close()
+
+    def test_stream_cap_returns_503(self, gateway_server):
+        server = gateway_server(workers=2, max_streams=1)
+        port = server.server_address[1]
+        first = _open_sse(port)
+        try:
+            _wait_streams(server, 1)
+            status, _ = _get(port, "/v1/events")
+            assert status == 503
+        finally:
+            first.close()
+
+
+class TestSnapshotBroadcaster:
+
+    def _broadcaster(self, states, **kwargs):
+        from core.state_broadcast import SnapshotBroadcaster
+        it = iter(states)
+        last = {}
+
+        def builder():
+            nonlocal last
+            last = next(it, last)
+            return {"ts": 0, **last}
+
+        return SnapshotBroadcaster(interval=3600, builder=builder, **kwargs)
+
+    @staticmethod
+    def _decode(frames):
+        out = []
+        for _, data in frames:
+            event, payload = data.decode().strip().split("\n")
+            out.append((event[len("event: "):],
+                        json.loads(payload[len("data: "):])))
+        return out
+
+    def test_first_frame_is_full_then_deltas(self):
+        b = self._broadcaster([
+            {"tasks": {"a": {"s": "pending"}, "b": {"s": "pending"}}},
+            {"tasks": {"a": {"s": "claimed"}, "b": {"s": "pending"}}},
+            {"tasks": {"a": {"s": "claimed"}}},
+        ])
+        b.subscribe()
+        seq, frames = b.frames_since(0)
+        assert self._decode(frames)[0][0] == "state"
+
+        b._publish()
+        b._publish()
+        seq2, frames = b.frames_since(seq)
+        events = self._decode(frames)
+        assert [e for e, _ in events] == ["delta", "delta"]
+        assert events[0][1]["tasks"] == {"a": {"s": "claimed"}}
+        assert events[1][1]["removed"] == ["b"]
+        assert seq2 == seq + 2
+        b.unsubscribe()
+
+    def test_unchanged_snapshot_emits_nothing(self):
+        b = self._broadcaster([{"tasks": {"a": {"s": "pending"}}}])
+        b.subscribe()
+        seq, _ = b.frames_since(0)
+        b._publish()
+        assert b.frames_since(seq) == (seq, [])
+        assert b.wait_frames(seq, timeout=0.01) == (seq, [])
+        b.unsubscribe()
+
+    def test_periodic_full_resync(self):
+        states = [{"tasks": {"a": {"n": i}}} for i in range(5)]
+        b = self._broadcaster(states, resync_every=2)
+        b.subscribe()
+        seq, _ = b.frames_since(0)
+        for _ in range(4):
+            b._publish()
+        events = [e for e, _ in self._decode(b.frames_since(seq)[1])]
+        assert events == ["delta", "delta", "state", "delta"]
+        b.unsubscribe()
+
+    def test_frames_encoded_once_for_all_subscribers(self):
+        b = self._broadcaster([{"tasks": {}}, {"tasks": {"a": {"s": "x"}}}])
+        for _ in range(50):
+            b.subscribe()
+        seq, _ = b.frames_since(0)
+        b._publish()
+        first = b.frames_since(seq, fmt="ws")[1]
+        second = b.frames_since(seq, fmt="ws")[1]
+        assert first[0][1] is second[0][1]
+        assert json.loads(first[0][1])["event"] == "delta"
+        assert b.builds == 2
+
+    def test_sse_clients_receive_state_frame(self, gateway_server):
+        server = gateway_server(workers=2)
+        port = server.server_address[1]
+        s = _open_sse(port)
+        try:
+            buf = b""
+            deadline = time.time() + 5
+            while b"event: state" not in buf and time.time() < deadline:
+                buf += s.recv(65536)
+            assert b"event: state" in buf
+        finally:
+            s.close()
+
+
+class TestTaskStreamEndpoint:
+
+    def test_task_stream_pushes_chunks_then_done(self, gateway_server):
+        from core.task_board import TaskBoard
+        server = gateway_server(workers=2)
+        port = server.server_address[1]
+        board = TaskBoard()
+        t = board.create("stream me")
+        s = socket.create_connection(("127.0.0.1", port), timeout=5)
+        s.sendall(f"GET /v1/stream/{t.task_id} HTTP/1.1\r\n"
+                  "Host: localhost\r\n\r\n".encode())
+        try:
+            _wait_streams(server, 1)
+            TaskBoard.append_stream_chunk(t.task_id, "hi", 1)
+            buf = b""
+            deadline = time.time() + 5
+            # Complete only once the chunk is out: completing removes the
+            # stream file, which a follower that has not opened it yet
+            # would never see
+            while b'"c": "hi"' not in buf and time.time() < deadline:
+                buf += s.recv(65536)
+            assert b'"c": "hi"' in buf
+            board.complete(t.task_id)
+            while b"event: done" not in buf and time.time() < deadline:
+                data = s.recv(65536)
+                if not data:
+                    break
+                buf += data
+            assert b"event: done" in buf
+        finally:
+            s.close()
@@ -0,0 +1,125 @@
+"""
+tests/test_memory_writer.py — Write-behind memory persistence.
+
+Tests:
+  - submit() returns while the handler is busy; queued records batch up
+  - Unacknowledged journal records are replayed by the next writer
+  - close() drains the queue; the journal is empty afterwards
+  - BaseAgent stores through the writer with one batched vector add
+  - Cached recall is invalidated after the writes, not before
+"""
+
+import os
+import threading
+from types import SimpleNamespace
+
+from core.memory_writer import MemoryWriter
+
+
+class TestMemoryWriter:
+
+    def test_submit_does_not_wait_and_batches(self, tmp_workdir):
+        gate = threading.Event()
+        batches = []
+
+        def handler(records):
+            gate.wait(5)
+            batches.append([r["n"] for r in records])
+
+        w = MemoryWriter("a", {"episode": handler}, directory="wb", linger=0)
+        w.start()
+        w.submit("episode", n=0)
+        for n in range(1, 6):                  # handler still blocked
+            w.submit("episode", n=n)
+        assert w.pending == 6
+        gate.set()
+        assert w.flush(5)
+        assert [n for b in batches for n in b] == list(range(6))
+        assert len(batches) < 6 and w.stats()["max_batch"] >= 5
+        assert w.close()
+        assert os.path.getsize("wb/a.journal") == 0
+
+    def test_replays_unacknowledged_records(self, tmp_workdir):
+        gate = threading.Event()
+        stuck = MemoryWriter("a", {"extract": lambda r: gate.wait(5)},
+                             directory="wb")
+        stuck.start()
+        for n in range(3):
+            stuck.submit("extract", n=n)       # process "dies" here
+        with open("wb/a.ack", "w") as f:
+            f.write("1")                       # seq 1 was applied
+
+        seen = []
+        w = MemoryWriter("a", {"extract": lambda rs: seen.extend(rs)},
+                         directory="wb")
+        w.start()
+        assert w.flush(5)
+        assert [r["n"] for r in seen] == [1, 2]
+        assert w.stats()["replayed"] == 2
+        w.submit("extract", n=9)
+        assert w.flush(5) and seen[-1]["seq"] == 4   # seq continues
+        gate.set()
+        w.close()
+        stuck.close()
+
+    def test_close_flushes_and_handler_errors(self, tmp_workdir):
+        applied = []
+
+        def boom(records):
+            raise RuntimeError("disk full")
+
+        w = MemoryWriter("a", {"episode": applied.extend, "extract": boom},
+                         directory="wb", linger=1.0)
+        w.start()
+        w.submit("episode", n=1)
+        w.submit("extract", n=2)
+        w.submit("unknown", n=3)
+        assert w.close()                       # does not wait out the linger
+        assert [r["n"] for r in applied] == [1]
+        assert w.stats()["failed"] == 1 and w.stats()["pending"] == 0
+
+    def test_agent_store_goes_through_writer(self, tmp_workdir):
+        from core.agent import AgentConfig, BaseAgent
+
+        class _Memory:
+            def __init__(self):
+                self.batches = []
+
+            def add_many(self, collection, documents, metadatas):
+                self.batches.append((collection, [m["id"] for m in metadatas]))
+
+        memory = _Memory()
+        agent = BaseAgent(AgentConfig(agent_id="a", role="r", model="m"),
+                          llm=None, memory=memory, skill_loader=None,
+                          chain=None)
+        agent.writer = MemoryWriter("a", {"episode": agent._persist_episodes},
+                                    directory="wb", batch_max=4, linger=5)
+        agent.writer.start()
+        for tid in ("t1", "t2", "t3", "t2"):
+            agent._store_to_memory(SimpleNamespace(task_id=tid,
+                                                   description="d"), "ok")
+        assert memory.batches == []            # returned before persisting
+        assert agent.writer.flush(5)
+        # One batch, one add_many; the re-stored task keeps its latest record
+        assert memory.batches == [("agent_a", ["t1", "t2", "t3"])]
+        agent.writer.close()
+
+    def test_recall_invalidated_after_writes(self, tmp_workdir):
+        from core.agent import AgentConfig, BaseAgent
+
+        class _Memory:
+            def __init__(self):
+                self.adds = 0
+
+            def add_many(self, collection, documents, metadatas):
+                self.adds += 1
+
+        memory = _Memory()
+        agent = BaseAgent(AgentConfig(agent_id="a", role="r", model="m"),
+                          llm=None, memory=memory, skill_loader=None,
+                          chain=None)
+        seen = []
+        agent._recall.invalidate = lambda: seen.append(memory.adds)
+        agent._persist_episodes([{"task_id": "t1", "description": "d",
+                                  "result": "ok", "outcome": "success"}])
+        assert seen == [1]
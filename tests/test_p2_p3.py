@@ -176,6 +176,99 @@ class TestMemoryLifecycle:
         assert result["archived"] == 0
 
 
+class TestEpisodicIndex:
+
+    def _mem(self):
+        from adapters.memory.episodic import EpisodicMemory
+        return EpisodicMemory(agent_id="idx_agent", base_dir="memory/agents")
+
+    def _episode(self, mem, task_id, desc, outcome, date, ts):
+        from adapters.memory.episodic import make_episode
+        ep = make_episode("idx_agent", task_id, desc, "result " + desc,
+                          outcome=outcome, tags=["t"])
+        ep.update(date=date, ts=ts)
+        mem.save_episode(ep)
+
+    def test_migrates_existing_directory_layout(self, tmp_workdir):
+        base = "memory/agents/idx_agent"
+        os.makedirs(f"{base}/episodes/2026-01-02")
+        os.makedirs(f"{base}/cases")
+        with open(f"{base}/episodes/2026-01-02/t1.json", "w") as f:
+            json.dump({"task_id": "t1", "title": "deploy broke",
+                       "description": "deploy broke on staging",
+                       "outcome": "failure", "ts": 1.0,
+                       "result_full": "full"}, f)
+        with open(f"{base}/cases/c1.json", "w") as f:
+            json.dump({"id": "c1", "problem": "flaky deploy",
+                       "solution": "pin the image", "tags": []}, f)
+        mem = self._mem()
+        assert os.path.exists(f"{base}/episodic.db")
+        assert mem.stats()["episodes"] == 1
+        assert mem.load_episode("t1", level=1)["date"] == "2026-01-02"
+        assert mem.load_episode("t1", level=2)["result_full"] == "full"
+        assert mem.search_cases("deploy")[0]["id"] == "c1"
+
+    def test_queries_served_from_index(self, tmp_workdir):
+        mem = self._mem()
+        self._episode(mem, "a", "fix the login timeout", "failure", "2026-01-01", 1)
+        self._episode(mem, "b", "write docs", "success", "2026-01-02", 2)
+        self._episode(mem, "c", "login page crashes", "needs_improvement",
+                      "2026-01-03", 3)
+        self._episode(mem, "d", "db migration ok", "failure", "2026-01-03", 4)
+
+        assert [e["task_id"] for e in mem.list_episodes(limit=3)] == ["d", "c", "b"]
+        assert [e["task_id"] for e in
+                mem.query_error_patterns(["LOGIN"])] == ["c", "a"]
+        assert [e["task_id"] for e in mem.query_error_patterns(["db"])] == ["d"]
+        assert mem.update_episode_score("a", 90)
+        assert mem.load_episode("a", level=0)["score"] == 90
+        assert mem.load_episode("a", date="2026-01-02") is None
+
+        # Files stay canonical: a rebuilt index sees the same data
+        assert mem.reindex()["episodes"] == 4
+        assert mem.load_episode("a", level=2)["score"] == 90
+
+    def test_cases_and_patterns(self, tmp_workdir):
+        mem = self._mem()
+        first = mem.save_case("redis connection refused", "restart redis",
+                              tags=["infra"])
+        mem.save_case("slow query", "add an index", tags=["db"])
+        hits = mem.search_cases("redis infra")
+        assert hits[0]["id"] == first and hits[0]["_match_score"] == 2
+        mem.increment_use_count(first)
+        assert mem.list_cases()[-1]["use_count"] == 1
+        assert "restart redis" in mem.generate_memory_md()
+
+        mem.save_pattern("retry on 429", ["t1"])
+        mem.save_pattern("retry on 429", ["t2"])
+        assert mem.list_patterns()[0]["evidence"] == ["t1", "t2"]
+
+    def test_without_trigram_tokenizer(self, tmp_workdir, monkeypatch):
+        from adapters.memory import episodic, episodic_index
+        self._episode(self._mem(), "a", "fix the login timeout", "failure",
+                      "2026-01-01", 1)
+
+        # Older SQLite: the FTS triggers are detached, lookups scan
+        monkeypatch.setattr(episodic, "_indexes", {})
+        monkeypatch.setattr(episodic_index, "_trigram", False)
+        mem = self._mem()
+        assert not mem.index.fts
+        self._episode(mem, "b", "login page crashes", "failure", "2026-01-02", 2)
+        mem.save_case("redis connection refused", "restart redis")
+        assert [e["task_id"] for e in
+                mem.query_error_patterns(["login"])] == ["b", "a"]
+        assert mem.search_cases("redis")[0]["_match_score"] == 1
+
+        # Back on a trigram build: the FTS index is rebuilt from the tables
+        monkeypatch.setattr(episodic, "_indexes", {})
+        monkeypatch.setattr(episodic_index, "_trigram", None)
+        mem = self._mem()
+        if mem.index.fts:
+            assert mem.index._query(
+                "SELECT rowid FROM episodes_fts WHERE episodes_fts MATCH ?",
+                ('"crashes"',))
+
+
 # ── P3-3: BM25 persistence ──────────────────────────────────────────────────
 
 class TestBM25Persistence:
@@ -216,6 +309,190 @@ class TestBM25Persistence:
         assert ids.index("b") < ids.index("a")
 
 
+class TestBM25InvertedIndex:
+
+    @staticmethod
+    def _reference_scores(idx, query):
+        """Brute-force BM25 over every document (pre-postings algorithm)."""
+        import math
+        from collections import Counter
+        from adapters.memory.hybrid import _tokenize
+        n = len(idx.doc_ids)
+        docs = [Counter(_tokenize(d)) for d in idx.docs]
+        df = Counter(t for tf in docs for t in tf)
+        avg = sum(idx.doc_lens) / n
+        scores = {}
+        for i, tf in enumerate(docs):
+            s = 0.0
+            for term in _tokenize(query):
+                if term in tf:
+                    idf = math.log(1 + (n - df[term] + 0.5) / (df[term] + 0.5))
+                    s += idf * tf[term] * 2.5 / (
+                        tf[term] + 1.5 * (0.25 + 0.75 * idx.doc_lens[i] / max(avg, 1)))
+            if s > 0:
+                scores[i] = s
+        return scores
+
+    def test_scores_match_full_scan(self, tmp_workdir):
+        from adapters.memory.hybrid import BM25Index
+        idx = BM25Index()
+        words = ["alpha", "beta", "gamma", "delta", "omega", "sigma"]
+        for i in range(60):
+            idx.add(f"d{i}", " ".join(words[j % 6] for j in range(i % 7, i % 7 + i % 5 + 1)))
+        ref = self._reference_scores(idx, "alpha gamma gamma")
+        hits = idx.search("alpha gamma gamma", n_results=10)
+        assert len(hits) == 10
+        for row, score in hits:
+            assert score == pytest.approx(ref[row])
+        assert [s for _, s in hits] == pytest.approx(
+            sorted(ref.values(), reverse=True)[:10])
+
+    def test_legacy_format_rebuilds_postings(self, tmp_workdir):
+        import json
+        from adapters.memory.hybrid import BM25Index
+        with open("legacy.json", "w") as f:
+            json.dump({"docs": ["foo bar", "bar baz"], "doc_ids": ["a", "b"],
+                       "doc_metadata": [{}, {}], "doc_lens": [2, 2],
+                       "doc_freqs": [{"foo": 1, "bar": 1}, {"bar": 1, "baz": 1}],
+                       "idf": {}, "avg_dl": 2.0, "df": {}}, f)
+        idx = BM25Index.load("legacy.json")
+        assert idx.df("bar") == 2
+        assert idx.search("baz")[0][0] == 1
+
+    def test_hybrid_query_resolves_docs_by_id(self, tmp_workdir):
+        from adapters.memory.hybrid import HybridMemory
+        mem = HybridMemory(persist_dir="memory/chroma")
+        mem._has_chroma = False
+        mem.add("notes", "deploy pipeline uses blue green", {"id": "n1", "density": "HIGH"})
+        mem.add("notes", "lunch menu on friday", {"id": "n2"})
+        res = mem.query("notes", "pipeline deploy", n_results=2)
+        assert res["documents"][0] == ["deploy pipeline uses blue green"]
+        assert res["metadatas"][0][0]["id"] == "n1"
+
+
+class TestBM25Segments:
+
+    @staticmethod
+    def _docs(n):
+        words = ["alpha", "beta", "gamma", "delta", "omega", "sigma", "kappa"]
+        return [(f"d{i}", " ".join(words[(i * j) % 7] for j in range(1, i % 6 + 2)),
+                 {"i": i}) for i in range(n)]
+
+    def test_sealed_segments_match_in_memory(self, tmp_workdir, monkeypatch):
+        from adapters.memory import hybrid
+        from adapters.memory.hybrid import BM25Index
+        monkeypatch.setattr(hybrid, "SEAL_DOCS", 4)
+        disk, mem = BM25Index.open("memory/bm25/c"), BM25Index()
+        for doc in self._docs(70):
+            disk.add(*doc)
+            mem.add(*doc)
+        # 17 seals of 4 docs → tiered merges keep the segment count small
+        assert len(disk._segments) <= 6
+        assert disk._tail.n == 2
+        disk.close()
+
+        reopened = BM25Index.open("memory/bm25/c")
+        assert len(reopened) == 70
+        for q in ("alpha", "gamma kappa", "omega sigma beta"):
+            got = reopened.search(q, n_results=8)
+            want = mem.search(q, n_results=8)
+            assert [s for _, s in got] == pytest.approx([s for _, s in want])
+        assert reopened.row_of("d33") == 33
+        assert reopened.docs[33] == mem.docs[33]
+        assert reopened.doc_metadata[69] == {"i": 69}
+        reopened.close()
+
+    def test_seal_syncs_segments_before_manifest(self, tmp_workdir,
+                                                 monkeypatch):
+        from adapters.memory import bm25_segments, hybrid
+        from adapters.memory.hybrid import BM25Index
+        monkeypatch.setattr(hybrid, "SEAL_DOCS", 2)
+        events = []
+        real_sync, real_manifest = (bm25_segments._fsync_path,
+                                    bm25_segments.write_manifest)
+
+        def sync(path):
+            events.append(os.path.basename(path))
+            real_sync(path)
+
+        def manifest(directory, m):
+            events.append("manifest")
+            real_manifest(directory, m)
+
+        monkeypatch.setattr(bm25_segments, "_fsync_path", sync)
+        monkeypatch.setattr(hybrid, "write_manifest", manifest)
+        idx = BM25Index.open("memory/bm25/s")
+        events.clear()
+        idx.add("a", "first note", {})
+        idx.add("b", "second note", {})
+        idx.close()
+        synced = events[:events.index("manifest")]
+        assert {f"seg-000001{ext}" for ext in bm25_segments.SEGMENT_FILES} \
+            <= set(synced)
+
+    def test_tail_log_replay_drops_torn_line(self, tmp_workdir):
+        from adapters.memory.hybrid import BM25Index
+        idx = BM25Index.open("memory/bm25/t")
+        idx.add("a", "first note", {})
+        idx.add("b", "second note", {})
+        idx.close()
+        with open("memory/bm25/t/tail-000000.jsonl", "a") as f:
+            f.write('["c", "torn wri')
+        idx = BM25Index.open("memory/bm25/t")
+        assert list(idx.doc_ids) == ["a", "b"]
+        idx.add("c", "third note", {})
+        idx.close()
+        assert BM25Index.open("memory/bm25/t").doc_ids == ["a", "b", "c"]
+
+    def test_hybrid_migrates_legacy_json(self, tmp_workdir):
+        import json
+        from adapters.memory.hybrid import HybridMemory
+        os.makedirs("memory/chroma/bm25")
+        with open("memory/chroma/bm25/notes.json", "w") as f:
+            json.dump({"docs": ["rollback the canary deploy"], "doc_ids": ["n1"],
+                       "doc_metadata": [{"id": "n1"}]}, f)
+        mem = HybridMemory(persist_dir="memory/chroma")
+        mem._has_chroma = False
+        res = mem.query("notes", "canary", n_results=1)
+        assert res["documents"][0] == ["rollback the canary deploy"]
+        assert os.path.exists("memory/chroma/bm25/notes.json.migrated")
+        assert os.path.isdir("memory/chroma/bm25/notes")
+
+    def test_hybrid_content_ids_are_stable(self, tmp_workdir):
+        import hashlib
+        from adapters.memory.hybrid import HybridMemory
+        mem = HybridMemory(persist_dir="memory/chroma")
+        mem._has_chroma = False
+        mem.add_many("notes", ["rollback the canary deploy"], [{}])
+        mem.add("notes", "rollback the canary deploy", {})
+        assert set(mem._get_bm25("notes").doc_ids) == {
+            hashlib.sha1(b"rollback the canary deploy").hexdigest()}
+
+    def test_hybrid_opens_one_index_under_concurrency(self, tmp_workdir,
+                                                      monkeypatch):
+        import threading
+        from adapters.memory.hybrid import BM25Index, HybridMemory
+        mem = HybridMemory(persist_dir="memory/chroma")
+        opened = []
+        real_open = BM25Index.open
+
+        def slow_open(path):
+            time.sleep(0.05)
+            opened.append(path)
+            return real_open(path)
+
+        monkeypatch.setattr(BM25Index, "open", staticmethod(slow_open))
+        got = []
+        threads = [threading.Thread(target=lambda: got.append(
+            mem._get_bm25("notes"))) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(opened) == 1
+        assert all(idx is got[0] for idx in got)
+
+
 # ── P3-4: Config version control ────────────────────────────────────────────
 
 class TestConfigVersionControl:
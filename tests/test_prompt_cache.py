@@ -0,0 +1,187 @@
+"""
+tests/test_prompt_cache.py — Prompt-section cache and cache-friendly layout.
+
+Tests:
+  - Unchanged skills / docs are served without re-reading any file
+  - Edits, new files and deleted files hot-reload on the next call
+  - Task history and workspace sections follow their files
+  - Per-section hit / miss / changed counters
+  - Nested sections inherit dependencies of cached inner sections
+  - "cache" layout keeps a byte-identical stable prefix; adapter hints
+"""
+
+import builtins
+import os
+
+import pytest
+
+
+@pytest.fixture
+def opens(monkeypatch):
+    """Count files opened through builtins.open."""
+    seen = []
+    real_open = builtins.open
+
+    def counting_open(path, *a, **kw):
+        seen.append(str(path))
+        return real_open(path, *a, **kw)
+
+    monkeypatch.setattr(builtins, "open", counting_open)
+    return seen
+
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+class TestPromptCache:
+
+    def test_skills_cached_until_files_change(self, tmp_workdir, opens):
+        from core.prompt_cache import PromptCache
+        from core.skill_loader import SkillLoader
+
+        _write("skills/planning.md", "---\nname: Plan\n---\nstep by step")
+        _write("skills/agents/leo/private.md", "secret sauce")
+        cache = PromptCache()
+        loader = SkillLoader(cache=cache)
+
+        first = loader.load(["planning"], "leo")
+        assert "### Skill: Plan" in first and "secret sauce" in first
+        opens.clear()
+        assert loader.load(["planning"], "leo") == first
+        assert opens == []
+
+        # Edit, add and remove files → each is visible on the next call
+        _write("skills/planning.md", "v2 planning")
+        assert "v2 planning" in loader.load(["planning"], "leo")
+        _write("skills/agent_overrides/leo.md", "override!")
+        assert "override!" in loader.load(["planning"], "leo")
+        os.remove("skills/agents/leo/private.md")
+        assert "secret sauce" not in loader.load(["planning"], "leo")
+
+        stats = cache.stats()["skills"]
+        assert stats["hits"] == 1 and stats["misses"] == 4
+        assert stats["changed"] == 4
+
+    def test_nested_hit_propagates_deps(self, tmp_workdir):
+        from core.prompt_cache import PromptCache
+        _write("a.md", "v1")
+        cache = PromptCache()
+
+        def inner():
+            cache.track("a.md")
+            with open("a.md") as f:
+                return f.read()
+
+        assert cache.section("inner", 0, inner) == "v1"
+        # Outer is built while inner is a cache hit — it must still
+        # depend on a.md
+        assert cache.section("outer", 0,
+                             lambda: cache.section("inner", 0, inner)) == "v1"
+        _write("a.md", "v2 longer")
+        assert cache.section("outer", 0,
+                             lambda: cache.section("inner", 0, inner)) == "v2 longer"
+
+    def test_docs_history_and_workspace(self, tmp_workdir, opens):
+        from core.agent import BaseAgent
+        from core.prompt_cache import prompt_cache
+        from core.skill_loader import SkillLoader
+        from core.task_history import load_recent, save_round
+
+        _write("docs/_shared/guide.md", "read me")
+        loader = SkillLoader()
+        assert "read me" in loader.load_docs("leo")
+
+        assert load_recent() == ""
+        save_round({"t1": {"status": "done", "description": "first",
+                           "result": "ok", "claimed_by": "jerry"}})
+        assert "first" in load_recent()
+
+        assert BaseAgent._workspace_section("workspace") == ""
+        _write("workspace/report.md", "x")
+        assert "report.md" in BaseAgent._workspace_section("workspace")
+
+        opens.clear()
+        loader.load_docs("leo")
+        load_recent()
+        BaseAgent._workspace_section("workspace")
+        assert opens == []
+
+        stats = prompt_cache.stats()
+        assert stats["docs"]["hits"] >= 1
+        assert stats["task_history"]["hits"] >= 1
+        assert stats["workspace"]["hit_rate"] > 0
+
+
+class TestPromptLayout:
+
+    def _agent(self, layout, budget=16000):
+        from core.agent import AgentConfig, BaseAgent
+        cfg = AgentConfig(agent_id="leo", role="planner", model="m",
+                          prompt_layout=layout,
+                          max_system_prompt_tokens=budget)
+        return BaseAgent(cfg, llm=None, memory=None, skill_loader=None,
+                         chain=None)
+
+    def _prompt(self, agent, n):
+        return agent._budget_system_prompt(
+            role_section="planner", soul_section="\n\n## Soul\ncalm",
+            intent_section=f"\n\n## Original User Intent\nask {n}",
+            tools_md_section="", user_section="",
+            skills_text="skill " * 300, tools_section="\n\n## Tools",
+            docs_section="\n\n## Reference Documents\n" + "doc " * 3000,
+            memory_block=f"\n\nrecall {n} " * (50 * n),
+            history_section=f"\n\n## Recent Task History\nround {n}",
+            workspace_section="", context_snap=f'{{"n": {n}}}')
+
+    @pytest.mark.parametrize("budget", [0, 4000])
+    def test_cache_layout_keeps_prefix_identical(self, tmp_workdir, budget):
+        agent = self._agent("cache", budget)
+        (p1, n1), (p2, n2) = self._prompt(agent, 1), self._prompt(agent, 9)
+        assert n1 == n2 > 0 and p1[:n1] == p2[:n2]
+        stable, tail = p1[:n1], p1[n1:]
+        assert "## Soul" in stable and "doc doc" in stable
+        assert "Original User Intent" in tail and "round 1" in tail
+        assert tail.rstrip().endswith('{"n": 1}')
+
+        classic, n = self._prompt(self._agent("classic", budget), 1)
+        assert n == 0
+        assert classic.index("Original User Intent") < classic.index("## Skills")
+
+    def test_run_marks_prefix_and_adapters_apply_hints(self, tmp_workdir):
+        import asyncio
+        from adapters.llm.cache_hints import (CACHE_PREFIX_KEY,
+                                              apply_cache_hints, parse_usage)
+        from core.context_bus import ContextBus
+        from core.skill_loader import SkillLoader
+        from core.task_board import Task
+
+        agent = self._agent("cache")
+        agent.skill_loader = SkillLoader()
+        agent.cfg.long_term = False
+        sent = []
+
+        async def fake_llm(messages, task, tools_schemas=None):
+            sent.append(messages[0])
+            return "done"
+
+        agent._call_llm_streaming = fake_llm
+        for i in range(2):
+            asyncio.run(agent.run(Task(task_id=f"t{i}", description=f"q{i}"),
+                                  ContextBus()))
+        n = sent[0][CACHE_PREFIX_KEY]
+        assert sent[0]["content"][:n] == sent[1]["content"][:n]
+        assert agent.prompt_stats()["reused"] == 1
+
+        plain = apply_cache_hints(sent[:1])
+        assert plain[0] == {"role": "system", "content": sent[0]["content"]}
+        blocks = apply_cache_hints(sent[:1], cache_control=True)[0]["content"]
+        assert blocks[0]["cache_control"] == {"type": "ephemeral"}
+        assert "".join(b["text"] for b in blocks) == sent[0]["content"]
+        assert CACHE_PREFIX_KEY in sent[0]            # input untouched
+
+        assert parse_usage({"prompt_tokens": 10, "prompt_tokens_details":
+                            {"cached_tokens": 6}})["cached_tokens"] == 6
+        assert parse_usage({"cache_read_input_tokens": 4})["cached_tokens"] == 4
@@ -0,0 +1,97 @@
+"""
+tests/test_recall.py — Concurrent long-term recall pipeline.
+
+Tests:
+  - Sources run concurrently; sections keep source order
+  - Sources missing the deadline are skipped, then served from cache
+  - Cache hits, invalidation, failing sources
+  - BaseAgent._recall_long_term fans out over its memory layers
+"""
+
+import time
+
+
+def _slow(text, delay):
+    def fn(query):
+        time.sleep(delay)
+        return f"{text}:{query}"
+    return fn
+
+
+class TestRecallPipeline:
+
+    def test_sources_run_concurrently_in_order(self):
+        from core.recall import RecallPipeline
+        p = RecallPipeline(timeout=2.0)
+        t0 = time.perf_counter()
+        out = p.run("q", [("a", _slow("A", 0.2)), ("b", _slow("B", 0.05)),
+                          ("c", _slow("C", 0.2))])
+        assert time.perf_counter() - t0 < 0.4
+        assert out == ["A:q", "B:q", "C:q"]
+        stats = p.stats()["sources"]
+        assert set(stats) == {"a", "b", "c"}
+        assert stats["a"]["count"] == 1
+
+    def test_late_source_skipped_then_cached(self):
+        from core.recall import RecallPipeline
+        p = RecallPipeline(timeout=0.1)
+        sources = [("fast", _slow("F", 0)), ("slow", _slow("S", 0.3))]
+        assert p.run("q", sources) == ["F:q"]
+        time.sleep(0.35)   # slow source finishes in the background
+        assert p.stats()["sources"]["slow"]["missed"] == 1
+        assert p.run("q", sources) == ["F:q", "S:q"]
+        assert p.cache_hits == 2
+
+    def test_invalidate_and_failures(self):
+        from core.recall import RecallPipeline
+        calls = []
+
+        def counted(query):
+            calls.append(query)
+            return "x"
+
+        def broken(query):
+            raise RuntimeError("boom")
+
+        p = RecallPipeline(timeout=1.0)
+        assert p.run("q", [("c", counted), ("e", broken)]) == ["x"]
+        p.run("q", [("c", counted)])
+        assert len(calls) == 1
+        p.invalidate()
+        p.run("q", [("c", counted)])
+        assert len(calls) == 2
+        assert p.stats()["sources"]["e"]["errors"] == 1
+
+
+class TestAgentRecall:
+
+    def test_recall_long_term_merges_sources(self, tmp_workdir):
+        import os
+        from core.agent import AgentConfig, BaseAgent
+
+        class _Episodic:
+            def recall(self, query, token_budget):
+                time.sleep(0.1)
+                return "## Episodes\n- e1"
+
+            def query_error_patterns(self, keywords, limit):
+                return [{"title": "t", "outcome": "failure",
+                         "error_type": "timeout", "result_preview": "p"}]
+
+        class _KB:
+            def recall(self, query, agent_id, token_budget):
+                return "## Team Knowledge\n- k1"
+
+        os.makedirs("memory/agents/a")
+        with open("memory/agents/a/MEMORY.md", "w") as f:
+            f.write("P0: always test")
+        agent = BaseAgent(AgentConfig(agent_id="a", role="r", model="m",
+                                      recall_top_k=0),
+                          llm=None, memory=None, skill_loader=None, chain=None,
+                          episodic=_Episodic(), kb=_KB())
+        out = agent._recall_long_term("fix the flaky deploy")
+        sections = [line for line in out.splitlines() if line.startswith("## ")]
+        assert sections == ["## Persistent Memory", "## Episodes",
+                            "## Past Failures (similar tasks)", "## Team Knowledge"]
+        assert set(agent.recall_stats()["sources"]) >= {
+            "memory_md", "episodic", "error_patterns", "kb", "fts"}
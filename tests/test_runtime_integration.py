@@ -6,10 +6,14 @@ Tests:
   - ProcessRuntime basic interface
   - InProcessRuntime basic interface
   - LazyRuntime basic interface + on-demand start
+  - LazyRuntime monitor: per-role pending counts, task events, idle timers
+  - ZygoteRuntime forks agents from a pre-warmed zygote
   - AgentRuntime ABC contract
   - Runtime mode configuration
 """
 
+import socket
+
 import pytest
 
 
@@ -186,6 +190,205 @@ class TestLazyRuntime:
         runtime.stop_all()
 
 
+class _FakeDelegate:
+    """Delegate runtime that only records starts and stops."""
+
+    def __init__(self):
+        self.alive: dict[str, float] = {}
+        self.stopped: list[str] = []
+
+    def start(self, agent_def, config, wakeup=None):
+        import time
+        self.alive[agent_def["id"]] = time.time()
+
+    def is_alive(self, agent_id):
+        return agent_id in self.alive
+
+    def stop(self, agent_id):
+        self.alive.pop(agent_id, None)
+        self.stopped.append(agent_id)
+
+    def stop_all(self):
+        self.alive.clear()
+
+
+class TestLazyMonitor:
+    """Event-driven monitor: task events start agents, exact idle timers."""
+
+    pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"),
+                                    reason="AF_UNIX sockets unavailable")
+
+    def _runtime(self, idle_shutdown=300):
+        from core.runtime.lazy import LazyRuntime
+        runtime = LazyRuntime(TestLazyRuntime()._make_config(
+            idle_shutdown=idle_shutdown))
+        runtime._delegate = _FakeDelegate()
+        return runtime
+
+    def _until(self, cond, timeout=3.0):
+        import time
+        deadline = time.time() + timeout
+        while not cond() and time.time() < deadline:
+            time.sleep(0.01)
+        return cond()
+
+    def test_pending_by_role_counts(self):
+        from core.runtime.lazy import PendingByRole
+        pending = PendingByRole()
+        pending.rebuild({"a": {"status": "pending", "required_role": "review"},
+                         "b": {"status": "claimed", "required_role": "review"},
+                         "c": {"status": "pending"}})
+        assert pending.counts() == {"review": 1}
+        assert pending.apply("d", "pending", "implement") is True
+        assert pending.apply("d", "pending", "implement") is False
+        pending.apply("a", "claimed", "review")
+        assert pending.counts() == {"implement": 1}
+        pending.apply("d", "completed", "implement")
+        assert pending.roles() == []
+
+    def test_task_event_starts_agent(self, tmp_workdir):
+        import time
+        from core.task_board import TaskBoard
+        runtime = self._runtime()
+        runtime.start_all(runtime._config)
+        try:
+            assert self._until(lambda: runtime.resyncs == 1)
+            assert not runtime.is_alive("jerry")
+            t0 = time.monotonic()
+            TaskBoard().create("build it", required_role="implement")
+            assert self._until(lambda: runtime.is_alive("jerry"))
+            assert time.monotonic() - t0 < 1.0      # not a 2 s poll
+            assert runtime.monitor_stats()["pending_by_role"] == {
+                "implement": 1}
+            assert runtime.resyncs == 1             # no board re-read
+            assert not runtime.is_alive("alic")
+        finally:
+            runtime.stop_all()
+        assert not runtime._monitor_thread.is_alive()
+
+    def test_idle_agent_stopped_at_deadline(self, tmp_workdir):
+        import time
+        runtime = self._runtime(idle_shutdown=0.3)
+        runtime.start_all(runtime._config)
+        try:
+            t0 = time.monotonic()
+            runtime.ensure_running("jerry")
+            assert self._until(lambda: not runtime.is_alive("jerry"))
+            assert 0.25 < time.monotonic() - t0 < 1.5
+            assert runtime._delegate.stopped == ["jerry"]
+            assert runtime.is_alive("leo")          # always_on
+        finally:
+            runtime.stop_all()
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  ZygoteRuntime Tests
+# ══════════════════════════════════════════════════════════════════════════════
+
+def _record_start(agent_cfg_dict, agent_def, config, wakeup=None,
+                  started_at=None, start_mode="process"):
+    """Stand-in for ``_agent_process``: records how it was started."""
+    import json, os, time
+    path = f"started-{agent_def['id']}.json"
+    with open(path + ".tmp", "w") as f:
+        json.dump({"mode": start_mode, "ppid": os.getppid(),
+                   "started_at": started_at}, f)
+    os.replace(path + ".tmp", path)             # readers never see it half-written
+    time.sleep(config.get("hold", 0))
+
+
+def _wait_for(path, timeout=10.0):
+    import json, os, time
+    deadline = time.time() + timeout
+    while not os.path.exists(path) and time.time() < deadline:
+        time.sleep(0.02)
+    with open(path) as f:
+        return json.load(f)
+
+
+@pytest.mark.skipif(not hasattr(__import__("os"), "fork"), reason="needs fork")
+class TestZygoteRuntime:
+    """Agents forked from a pre-warmed zygote process."""
+
+    AGENT = {"id": "jerry", "role": "executor", "model": "mock"}
+
+    def test_forks_agents_from_zygote(self, tmp_workdir, monkeypatch):
+        from core import orchestrator
+        from core.runtime.zygote import ZygoteRuntime
+        monkeypatch.setattr(orchestrator, "_agent_process", _record_start)
+        runtime = ZygoteRuntime()
+        try:
+            runtime.warm()
+            zygote_pid = runtime.zygote_info["pid"]
+            runtime.start(self.AGENT, {"hold": 0.5})
+            runtime.start({"id": "alic", "role": "reviewer", "model": "mock"},
+                          {})
+            jerry = _wait_for("started-jerry.json")
+            alic = _wait_for("started-alic.json")
+            assert jerry["mode"] == alic["mode"] == "zygote"
+            assert jerry["ppid"] == alic["ppid"] == zygote_pid
+            assert jerry["started_at"] > 0
+            assert runtime.is_alive("jerry")
+            for p in runtime.procs:
+                p.join(5)
+            assert runtime.all_alive() == {"jerry": False, "alic": False}
+        finally:
+            runtime.stop_all()
+        assert runtime._zygote is None
+
+    def test_exit_reported_and_terminate_goes_through_zygote(
+            self, tmp_workdir, monkeypatch):
+        import signal
+        from core import orchestrator
+        from core.runtime.zygote import ZygoteRuntime
+        monkeypatch.setattr(orchestrator, "_agent_process", _record_start)
+        runtime = ZygoteRuntime()
+        try:
+            runtime.warm()
+            runtime.start(self.AGENT, {"hold": 30})
+            _wait_for("started-jerry.json")
+            (handle,) = runtime.procs
+            assert handle.is_alive() and handle.exitcode is None
+            handle.terminate()
+            handle.join(5)
+            assert not handle.is_alive()
+            assert handle.exitcode == -signal.SIGTERM
+        finally:
+            runtime.stop_all()
+
+    def test_falls_back_to_fresh_process(self, tmp_workdir, monkeypatch):
+        from core import orchestrator
+        from core.runtime.zygote import ZygoteRuntime
+        monkeypatch.setattr(orchestrator, "_agent_process", _record_start)
+        runtime = ZygoteRuntime()
+        runtime.start(self.AGENT, {})           # never warmed
+        assert _wait_for("started-jerry.json")["mode"] == "process"
+        assert runtime._zygote is None
+        runtime.stop_all()
+
+    def test_dead_zygote_is_not_reforked(self, tmp_workdir, monkeypatch):
+        from core import orchestrator
+        from core.runtime.zygote import ZygoteRuntime
+        monkeypatch.setattr(orchestrator, "_agent_process", _record_start)
+        runtime = ZygoteRuntime()
+        try:
+            runtime.warm()
+            runtime._zygote.terminate()
+            runtime._zygote.join(5)
+            runtime.start(self.AGENT, {})
+            assert _wait_for("started-jerry.json")["mode"] == "process"
+            assert runtime._zygote is None
+        finally:
+            runtime.stop_all()
+
+    def test_lazy_delegate(self):
+        from core.runtime.lazy import LazyRuntime
+        from core.runtime.zygote import ZygoteRuntime
+        runtime = LazyRuntime({"runtime": {"mode": "lazy",
+                                           "delegate": "zygote"}})
+        assert isinstance(runtime._delegate, ZygoteRuntime)
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 #  Config Integration Tests
 # ══════════════════════════════════════════════════════════════════════════════
@@ -230,3 +433,104 @@ agents:
             }
             runtime = create_runtime(config)
             assert runtime is not None, f"Failed to create runtime mode={mode}"
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  Socket WakeupBus Tests
+# ══════════════════════════════════════════════════════════════════════════════
+
+class TestSocketWakeup:
+    """Task signal sockets: role-filtered, event-driven agent wakeup."""
+
+    pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"),
+                                    reason="AF_UNIX sockets unavailable")
+
+    def _drain_all(self, bus, *agent_ids):
+        return {aid: bus.listen(aid).drain() for aid in agent_ids}
+
+    def test_wake_ends_wait_and_records_latency(self, tmp_workdir):
+        import asyncio
+        import time
+        from core.runtime.wakeup import DualWakeupBus
+        bus = DualWakeupBus(mode="socket")
+        bus.register("jerry")
+        bus.listen("jerry")
+
+        async def run():
+            asyncio.get_running_loop().call_later(0.05, bus.wake, "jerry")
+            t0 = time.monotonic()
+            woke = await bus.async_wait("jerry", timeout=5.0)
+            return woke, time.monotonic() - t0
+
+        woke, elapsed = asyncio.run(run())
+        assert woke is True
+        assert elapsed < 2.0
+        stats = bus.latency_stats("jerry")
+        assert stats["count"] == 1
+        assert stats["max_ms"] < 1000
+        bus.close()
+
+    def test_wait_times_out_without_signal(self, tmp_workdir):
+        import asyncio
+        from core.runtime.wakeup import DualWakeupBus
+        bus = DualWakeupBus(mode="socket")
+        assert asyncio.run(bus.async_wait("jerry", timeout=0.05)) is False
+        bus.close()
+
+    def test_create_signals_only_matching_roles(self, tmp_workdir):
+        from core.runtime.wakeup import DualWakeupBus
+        from core.task_board import TaskBoard
+        bus = DualWakeupBus(mode="socket")
+        for aid in ("leo", "jerry", "alic"):
+            bus.listen(aid)
+        board = TaskBoard()
+        t = board.create("build it", required_role="implement")
+        got = self._drain_all(bus, "leo", "jerry", "alic")
+        assert [s["task_ids"] for s in got["jerry"]] == [[t.task_id]]
+        assert got["leo"] == [] and got["alic"] == []
+
+        r = board.create("check it", required_role="review")
+        got = self._drain_all(bus, "leo", "jerry", "alic")
+        assert [s["task_ids"] for s in got["alic"]] == [[r.task_id]]
+        assert got["jerry"] == []
+        bus.close()
+
+    @pytest.mark.parametrize("engine", ["json", "sqlite"])
+    def test_unblocked_dependent_is_signalled(self, tmp_workdir, engine):
+        from core.runtime.wakeup import DualWakeupBus
+        from core.task_board import TaskBoard
+        bus = DualWakeupBus(mode="socket")
+        board = TaskBoard(engine=engine)
+        a = board.create("first", required_role="implement")
+        b = board.create("second", required_role="implement",
+                         blocked_by=[a.task_id])
+        jerry = bus.listen("jerry")
+        claimed = board.claim_next("jerry", agent_role="Implementation")
+        assert claimed.task_id == a.task_id
+        assert jerry.drain() == []          # claiming readies nothing
+        board.complete(a.task_id)
+        assert [s["task_ids"] for s in jerry.drain()] == [[b.task_id]]
+        board.close()
+        bus.close()
+
+    def test_bus_pickles_without_listeners(self, tmp_workdir):
+        import pickle
+        from core.runtime.wakeup import DualWakeupBus
+        bus = DualWakeupBus(mode="socket")
+        bus.register("jerry")
+        bus.listen("jerry")
+        clone = pickle.loads(pickle.dumps(bus))
+        assert clone.mode == "socket" and clone.latency_stats("jerry") == {}
+        bus.close()
+
+    def test_dead_listener_socket_is_pruned(self, tmp_workdir):
+        import os
+        from core.runtime.wakeup import (send_signal, signal_listeners,
+                                         signal_socket_path)
+        os.makedirs(".task_signals", exist_ok=True)
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        s.bind(signal_socket_path("ghost"))
+        s.close()  # file remains, nobody listening
+        assert "ghost" in signal_listeners()
+        assert send_signal("ghost", {"kind": "wake"}) is False
+        assert "ghost" not in signal_listeners()
@@ -3,6 +3,7 @@ tests/test_task_board.py
 Core TaskBoard tests — lifecycle, timeout recovery, cancel/pause/retry.
 """
 
+import os
 import time
 import pytest
 from core.task_board import (
@@ -412,3 +413,447 @@ class TestCritiqueFlow:
         """claim_critique returns None when no critique tasks exist."""
         board = TaskBoard()
         assert board.claim_critique("jerry") is None
+
+
+class TestSqliteEngine:
+    """SQLite storage engine: same lifecycle, row-level writes, migration."""
+
+    def test_lifecycle(self, tmp_workdir):
+        board = TaskBoard(engine="sqlite")
+        assert board.engine == "sqlite"
+        task = board.create("test task")
+        claimed = board.claim_next("jerry")
+        assert claimed.task_id == task.task_id
+        board.submit_for_review(task.task_id, "result")
+        board.update_partial(task.task_id, "partial")
+        board.set_cost(task.task_id, 0.01)
+        assert board.complete(task.task_id).status == TaskStatus.COMPLETED
+        raw = board._read()[task.task_id]
+        assert raw["partial_result"] == "partial"
+        assert raw["cost_usd"] == 0.01
+
+    def test_blocked_by_respected(self, tmp_workdir):
+        board = TaskBoard(engine="sqlite")
+        first = board.create("first")
+        second = board.create("second", blocked_by=[first.task_id])
+        assert board.claim_next("jerry").task_id == first.task_id
+        assert board.claim_next("jerry") is None
+        board.complete(first.task_id)
+        assert board.claim_next("jerry").task_id == second.task_id
+
+    def test_raw_write_visible_to_other_instance(self, tmp_workdir):
+        a = TaskBoard(engine="sqlite")
+        b = TaskBoard()  # auto-detects the database
+        assert b.engine == "sqlite"
+        task = a.create("shared")
+        assert task.task_id in b._read()
+        data = b._read()
+        data[task.task_id]["complexity"] = "simple"
+        b._write(data)
+        assert a._read()[task.task_id]["complexity"] == "simple"
+
+    def test_migrate_from_json(self, tmp_workdir):
+        import os
+        legacy = TaskBoard(engine="json")
+        t1 = legacy.create("old 1")
+        t2 = legacy.create("old 2")
+        legacy.claim_next("jerry")
+
+        board = TaskBoard(engine="sqlite")
+        assert not os.path.exists(".task_board.json")
+        assert os.path.exists(".task_board.json.migrated")
+        data = board._read()
+        assert list(data) == [t1.task_id, t2.task_id]
+        assert board.get(t1.task_id).status == TaskStatus.CLAIMED
+        assert board.claim_next("jerry").task_id == t2.task_id
+
+    def test_clear(self, tmp_workdir):
+        board = TaskBoard(engine="sqlite")
+        board.create("task 1")
+        assert board.clear(force=False) == -1
+        assert board.clear(force=True) == 1
+        assert board._read() == {}
+
+    def test_next_ready_plan_is_indexed_limit_one(self, tmp_workdir):
+        from core.task_store import _NEXT_READY
+        board = TaskBoard(engine="sqlite")
+        for i in range(20):
+            board.create(f"task {i}", required_role="implement" if i % 2 else None)
+        conn = board._store._connect()
+        for clause, params in (("= ?", ("implement",)), ("IS NULL", ()),
+                               ("= ''", ())):
+            plan = " ".join(r[3] for r in conn.execute(
+                "EXPLAIN QUERY PLAN " + _NEXT_READY.format(clause),
+                (*params, 100)))
+            assert "idx_tasks_ready" in plan
+            assert "required_role=" in plan
+            assert "TEMP B-TREE" not in plan
+
+    def test_delete_after_consecutive_writes(self, tmp_workdir):
+        board = TaskBoard(engine="sqlite")
+        keep = board.create("keep")
+        drop = board.create("drop")
+        data = board._read()
+        data[keep.task_id]["complexity"] = "simple"
+        board._write(data)
+        board._write(data)  # no read in between — engine cache is cold
+        del data[drop.task_id]
+        board._write(data)
+        assert list(TaskBoard(engine="sqlite")._read()) == [keep.task_id]
+
+    def test_write_keeps_rows_changed_after_read(self, tmp_workdir):
+        import copy
+        board = TaskBoard(engine="sqlite")
+        edited = board.create("edited via _write", required_role="review")
+        t1 = board.create("claimed meanwhile")
+        data = copy.deepcopy(board._read())
+        data[edited.task_id]["complexity"] = "simple"
+        # Row-level writers between the read and the write (same store)
+        t2 = board.create("created meanwhile")
+        assert board.claim_next("jerry").task_id == t1.task_id
+        board._write(data)
+        fresh = TaskBoard(engine="sqlite")
+        assert fresh.get(edited.task_id).complexity == "simple"
+        assert fresh.get(t2.task_id) is not None
+        claimed = fresh.get(t1.task_id)
+        assert claimed.status == TaskStatus.CLAIMED
+        assert claimed.agent_id == "jerry"
+
+
+@pytest.mark.parametrize("engine", ["json", "sqlite"])
+class TestReadyQueue:
+    """Incremental ready-set: dependency counts, role buckets, O(1) counters."""
+
+    def test_dependents_unblock_on_complete(self, tmp_workdir, engine):
+        board = TaskBoard(engine=engine)
+        a = board.create("a")
+        b = board.create("b")
+        c = board.create("c", blocked_by=[a.task_id, b.task_id])
+        assert board.claim_next("jerry").task_id == a.task_id
+        board.complete(a.task_id)
+        assert board.claim_next("jerry").task_id == b.task_id
+        assert board.claim_next("jerry") is None  # c still waits on b
+        board.complete(b.task_id)
+        assert board.claim_next("jerry").task_id == c.task_id
+
+    def test_missing_blocker_keeps_task_blocked(self, tmp_workdir, engine):
+        board = TaskBoard(engine=engine)
+        board.create("orphan", blocked_by=["does-not-exist"])
+        assert board.claim_next("jerry") is None
+
+    def test_oldest_ready_task_first_across_roles(self, tmp_workdir, engine):
+        board = TaskBoard(engine=engine)
+        first = board.create("generic")
+        board.create("impl", required_role="implement")
+        board.create("review", required_role="review")
+        assert board.claim_next("jerry").task_id == first.task_id
+        assert board.claim_next("jerry").description == "impl"
+        assert board.claim_next("jerry") is None
+        assert board.claim_next("alic").description == "review"
+
+    def test_min_reputation_skips_to_next(self, tmp_workdir, engine):
+        board = TaskBoard(engine=engine)
+        board.create("elite", min_reputation=90)
+        easy = board.create("easy")
+        assert board.claim_next("jerry", agent_reputation=50).task_id == easy.task_id
+
+    def test_status_counters(self, tmp_workdir, engine):
+        board = TaskBoard(engine=engine)
+        t1 = board.create("one")
+        board.create("two")
+        assert board.pending_count() == 2
+        board.claim_next("jerry")
+        board.complete(t1.task_id)
+        assert board.status_counts() == {"pending": 1, "completed": 1}
+        assert board.active_count() == 1
+        board.cancel_all()
+        assert board.active_count() == 0
+
+    def test_raw_write_updates_queue(self, tmp_workdir, engine):
+        board = TaskBoard(engine=engine)
+        blocker = board.create("blocker")
+        dep = board.create("dep", blocked_by=[blocker.task_id])
+        data = board._read()
+        data[blocker.task_id]["status"] = "completed"
+        board._write(data)
+        assert board.claim_next("jerry").task_id == dep.task_id
+        assert board.pending_count() == 0
+
+
+
+@pytest.mark.parametrize("engine", ["json", "sqlite"])
+class TestTaskWatch:
+    """Push-based task-tree completion (core.task_watch)."""
+
+    def test_status_hook_reports_transitions(self, tmp_workdir, engine):
+        board = TaskBoard(engine=engine)
+        seen = []
+        board._store.on_status = seen.extend
+        root = board.create("root")
+        sub = board.create("sub", parent_id=root.task_id)
+        board.claim_next("jerry")
+        data = board._read()
+        data[root.task_id]["status"] = "completed"
+        data[root.task_id]["result"] = "x"
+        board._write(data)
+        board._write(board._read())                  # no transition
+        assert seen == [(root.task_id, "", "pending", ""),
+                        (sub.task_id, root.task_id, "pending", ""),
+                        (root.task_id, "", "claimed", ""),
+                        (root.task_id, "", "completed", "")]
+
+    def test_wait_settled_resolves_on_push(self, tmp_workdir, engine):
+        import asyncio
+        from core.task_watch import TaskWatcher
+        board = TaskBoard(engine=engine)
+        root = board.create("root")
+        sub = board.create("sub", parent_id=root.task_id)
+        other = board.create("other")
+        watcher = TaskWatcher(resync_interval=60)
+
+        async def main():
+            assert not await watcher.wait_settled(root.task_id, timeout=0.05)
+            loop = asyncio.get_running_loop()
+            loop.call_later(0.05, board.complete, root.task_id)
+            loop.call_later(0.10, board.complete, other.task_id)
+            loop.call_later(0.15, board.fail, sub.task_id)
+            t0 = time.perf_counter()
+            assert await watcher.wait_settled(root.task_id, timeout=5)
+            return time.perf_counter() - t0
+
+        try:
+            assert asyncio.run(main()) < 1.0
+        finally:
+            watcher.close()
+        assert watcher.resyncs == 1           # seeded once, then push only
+        assert watcher.stats()["events"] >= 3
+
+    def test_missing_root_counts_as_settled(self, tmp_workdir, engine):
+        import asyncio
+        from core.task_watch import TaskWatcher
+        TaskBoard(engine=engine)
+        watcher = TaskWatcher()
+        try:
+            assert asyncio.run(watcher.wait_settled("gone", timeout=1))
+        finally:
+            watcher.close()
+
+
+class TestStreamTail:
+    """Offset-based task stream following (core.task_stream)."""
+
+    def test_reads_only_new_lines(self, tmp_workdir):
+        from core.task_stream import StreamTail
+        TaskBoard.append_stream_chunk("t1", "a", 1)
+        tail = StreamTail("t1")
+        assert [c["c"] for c in tail.read()] == ["a"]
+        assert tail.read() == []
+        TaskBoard.append_stream_chunk("t1", "b", 2)
+        TaskBoard.append_stream_chunk("t1", "c", 3)
+        assert [c["seq"] for c in tail.read()] == [2, 3]
+        tail.close()
+
+    def test_partial_line_is_buffered(self, tmp_workdir):
+        from core.task_stream import StreamTail, stream_path
+        os.makedirs(".task_streams", exist_ok=True)
+        with open(stream_path("t1"), "w") as f:
+            f.write('{"c": "x", "se')
+        tail = StreamTail("t1")
+        assert tail.read() == []
+        with open(stream_path("t1"), "a") as f:
+            f.write('q": 1}\n')
+        assert [c["c"] for c in tail.read()] == ["x"]
+        tail.close()
+
+    def test_after_seq_skips_seen_chunks(self, tmp_workdir):
+        from core.task_stream import StreamTail
+        for i in range(1, 4):
+            TaskBoard.append_stream_chunk("t1", str(i), i)
+        tail = StreamTail("t1", after_seq=2)
+        assert [c["seq"] for c in tail.read()] == [3]
+        tail.close()
+
+    def test_end_marker_survives_unlink(self, tmp_workdir):
+        from core.task_stream import StreamTail
+        board = TaskBoard()
+        t = board.create("stream me")
+        TaskBoard.append_stream_chunk(t.task_id, "hello", 1)
+        tail = StreamTail(t.task_id)
+        assert tail.read()[0]["c"] == "hello"
+        TaskBoard.append_stream_chunk(t.task_id, " world", 2)
+        board.complete(t.task_id)
+        assert not os.path.exists(tail.path)
+        # Open descriptor still sees the tail of the file + end marker
+        assert [c["c"] for c in tail.read()] == [" world"]
+        assert tail.ended == "completed"
+        tail.close()
+
+    def test_follow_stops_on_end_marker_from_other_thread(self, tmp_workdir):
+        import threading
+        from core.task_stream import StreamTail
+        board = TaskBoard()
+        t = board.create("stream me")
+
+        def writer():
+            for i in range(1, 6):
+                TaskBoard.append_stream_chunk(t.task_id, f"c{i}", i)
+                time.sleep(0.01)
+            board.fail(t.task_id, "boom")
+
+        # Follower starts before the file exists
+        tail = StreamTail(t.task_id)
+        th = threading.Thread(target=writer)
+        th.start()
+        t0 = time.monotonic()
+        got = [c["c"] for c in tail.follow(idle_timeout=5.0)]
+        th.join()
+        assert got == [f"c{i}" for i in range(1, 6)]
+        assert tail.ended == "failed"
+        assert time.monotonic() - t0 < 2.0
+
+    def test_follow_uses_terminal_check_when_no_stream(self, tmp_workdir):
+        from core.task_stream import StreamTail
+        tail = StreamTail("never-streamed")
+        chunks = list(tail.follow(idle_timeout=5.0, is_terminal=lambda tid: True))
+        assert chunks == [] and tail.ended == "done"
+
+    def test_afollow_from_event_loop(self, tmp_workdir):
+        import asyncio
+        from core.task_stream import StreamTail
+        board = TaskBoard()
+        t = board.create("stream me")
+
+        async def main():
+            async def writer():
+                for i in range(1, 4):
+                    TaskBoard.append_stream_chunk(t.task_id, f"c{i}", i)
+                    await asyncio.sleep(0.01)
+                board.complete(t.task_id)
+
+            tail = StreamTail(t.task_id)
+            task = asyncio.create_task(writer())
+            got = [c["c"] async for c in tail.afollow(idle_timeout=5.0)]
+            await task
+            return tail, got
+
+        tail, got = asyncio.run(main())
+        assert got == ["c1", "c2", "c3"]
+        assert tail.ended == "completed"
+
+    def test_afollow_idle_timeout_and_terminal_check(self, tmp_workdir):
+        import asyncio
+        from core.task_stream import StreamTail
+
+        async def drain(tail, **kw):
+            return [c async for c in tail.afollow(**kw)]
+
+        tail = StreamTail("quiet")
+        assert asyncio.run(drain(tail, idle_timeout=0.1)) == []
+        assert tail.ended == "timeout"
+        tail = StreamTail("never-streamed")
+        assert asyncio.run(drain(tail, idle_timeout=5.0,
+                                 is_terminal=lambda tid: True)) == []
+        assert tail.ended == "done"
+
+    def test_wait_end_returns_on_end_marker(self, tmp_workdir):
+        import threading
+        from core.task_stream import StreamTail
+        board = TaskBoard()
+        t = board.create("stream me")
+        TaskBoard.append_stream_chunk(t.task_id, "a", 1)
+        tail = StreamTail(t.task_id)
+        timer = threading.Timer(0.05, board.complete, (t.task_id,))
+        timer.start()
+        t0 = time.monotonic()
+        assert tail.wait_end(5.0) is True
+        timer.join()
+        assert tail.ended == "completed"
+        assert time.monotonic() - t0 < 2.0
+        tail.close()
+
+    def test_wait_end_times_out(self, tmp_workdir):
+        from core.task_stream import StreamTail
+        TaskBoard.append_stream_chunk("t1", "a", 1)
+        tail = StreamTail("t1")
+        t0 = time.monotonic()
+        assert tail.wait_end(0.2) is False
+        assert time.monotonic() - t0 >= 0.2
+        assert tail.ended is None and tail.last_seq == 1
+        tail.close()
+
+    def test_read_stream_chunks_ignores_end_marker(self, tmp_workdir):
+        TaskBoard.append_stream_chunk("t1", "a", 1)
+        with open(os.path.join(".task_streams", "t1.stream"), "a") as f:
+            f.write('{"end": "completed"}\n')
+        assert [c["c"] for c in TaskBoard.read_stream_chunks("t1")] == ["a"]
+
+
+class TestStreamWriter:
+    """Buffered stream writer + partial side file (core.task_stream)."""
+
+    def test_coalesces_chunks_and_tail_sees_all(self, tmp_workdir):
+        from core.task_stream import StreamTail, StreamWriter, read_partial
+        w = StreamWriter("t1", flush_interval=60, flush_bytes=4096)
+        for i in range(200):
+            w.write(f"tok{i} ")
+        assert 0 < w.flushes < 10
+        w.close()
+        tail = StreamTail("t1")
+        chunks = tail.read()
+        tail.close()
+        assert [c["seq"] for c in chunks] == list(range(1, 201))
+        assert "".join(c["c"] for c in chunks) == w.text()
+        assert read_partial("t1") == w.text()
+        assert [c["seq"] for c in TaskBoard.read_stream_chunks("t1", 198)] \
+            == [199, 200]
+
+    def test_partial_side_file_skips_board(self, tmp_workdir):
+        from core.task_stream import StreamWriter, partial_path, task_partial
+        board = TaskBoard()
+        t = board.create("stream me")
+        before = os.stat(board.path).st_mtime_ns
+        with StreamWriter(t.task_id, flush_interval=0,
+                          partial_interval=0) as w:
+            w.write("hello")
+            w.write(" world")
+        assert os.stat(board.path).st_mtime_ns == before
+        raw = board._read()[t.task_id]
+        assert "partial_result" not in raw
+        assert task_partial(dict(raw, status="claimed")) == "hello world"
+        assert task_partial(dict(raw, status="completed")) == ""
+        board.complete(t.task_id)
+        assert not os.path.exists(partial_path(t.task_id))
+
+    def test_timer_flushes_quiet_buffer(self, tmp_workdir):
+        import asyncio
+        from core.task_stream import StreamWriter, read_partial, stream_path
+
+        async def run():
+            w = StreamWriter("t1", flush_interval=0.02, partial_interval=0.02)
+            w.write("only")
+            assert not os.path.exists(stream_path("t1"))
+            await asyncio.sleep(0.1)
+            assert w.flushes == 1 and read_partial("t1") == "only"
+            w.close()
+
+        asyncio.run(run())
+
+    def test_flush_bound_holds_while_partial_timer_armed(self, tmp_workdir):
+        import asyncio
+        from core.task_stream import FLUSH_INTERVAL, StreamWriter
+
+        async def run():
+            # Long preview interval: a chunk held until the preview timer
+            # would miss the FLUSH_INTERVAL bound by far
+            w = StreamWriter("t1", partial_interval=1.0)
+            w.write("a")
+            await asyncio.sleep(FLUSH_INTERVAL * 2)     # flush + first preview
+            w.write("b")
+            await asyncio.sleep(FLUSH_INTERVAL * 2)     # flush; preview timer armed
+            assert w.flushes == 2
+            w.write("c")
+            await asyncio.sleep(FLUSH_INTERVAL * 2)
+            assert w.flushes == 3, "chunk waited for the partial interval"
+            w.close()
+
+        asyncio.run(run())
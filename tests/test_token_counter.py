@@ -0,0 +1,88 @@
+"""
+tests/test_token_counter.py — Offline token counting per model family.
+
+Tests:
+  - CJK text counts per character, English per word, by family
+  - Repeated sections are served from the memo
+  - Pluggable counters and message overhead / content blocks
+  - Compaction and ResilientLLM usage estimates use the counter
+"""
+
+import asyncio
+
+
+class TestTokenCounter:
+
+    def test_family_ratios_and_mixed_text(self):
+        from core.token_counter import TokenCounterRegistry
+        reg = TokenCounterRegistry()
+        assert reg.family_of("deepseek-v3.2") == "deepseek"
+        assert reg.family_of("Qwen3-235B") == "qwen"
+        assert reg.family_of("claude-sonnet") == "anthropic"
+        assert reg.family_of("gpt-4o-mini") == "openai"
+        assert reg.family_of("unknown-model") == reg.family_of(None) == "default"
+
+        zh = "请帮我总结这份季度报告并列出三个最大风险" * 10   # 200 chars
+        assert reg.count(zh) == 200
+        assert reg.count(zh, "qwen-max") == 130
+        assert len(zh) // 4 == 50       # the old rule under-counts 4x
+
+        en = "Summarize the quarterly report and list the risks. " * 10
+        assert 90 <= reg.count(en, "gpt-4o") <= 110
+        assert reg.count("") == 0
+
+    def test_memoized_sections(self):
+        from core.token_counter import TokenCounterRegistry
+        reg = TokenCounterRegistry(max_entries=2)
+        calls = []
+
+        class Exact:
+            def count(self, text):
+                calls.append(text)
+                return 7
+
+        reg.register("default", Exact())
+        section = "skill text " * 20
+        assert reg.count(section) == reg.count(section) == 7
+        assert len(calls) == 1
+        assert reg.stats()["default"] == {"hits": 1, "misses": 1}
+        reg.count("a" * 100)
+        reg.count("b" * 100)                 # evicts the oldest entry
+        reg.count(section)
+        assert len(calls) == 4
+
+    def test_messages_blocks_and_observe(self):
+        from core.token_counter import MESSAGE_OVERHEAD, TokenCounterRegistry
+        reg = TokenCounterRegistry()
+        msgs = [
+            {"role": "system", "content": [{"type": "text", "text": "你好"},
+                                           {"type": "text", "text": "世界"}]},
+            {"role": "assistant", "content": None, "tool_calls": [
+                {"function": {"name": "read_file", "arguments": '{"p": 1}'}}]},
+        ]
+        n = reg.count_messages(msgs)
+        assert n == 2 * MESSAGE_OVERHEAD + 4 + reg.count("read_file") \
+            + reg.count('{"p": 1}')
+
+        reg.observe("qwen-max", 90, 100)
+        reg.observe("qwen-max", 110, 100)
+        assert reg.stats()["qwen"]["mean_abs_error"] == 0.1
+        assert reg.stats()["qwen"]["bias"] == 1.0
+
+    def test_compaction_and_usage_estimates(self):
+        from adapters.llm.resilience import ResilientLLM
+        from core.compaction import needs_compaction
+
+        zh = [{"role": "user", "content": "风险" * 3000}]
+        assert needs_compaction(zh, max_tokens=5000)
+        assert not needs_compaction(zh, max_tokens=5000, model="qwen-max")
+
+        class NoUsage:
+            async def chat(self, messages, model, **kw):
+                return "完成了"
+
+        llm = ResilientLLM(adapter=NoUsage())
+        asyncio.run(llm.chat([{"role": "user", "content": "你好"}], "gpt-4o"))
+        rec = llm.usage_log[-1]
+        assert rec.estimated and rec.completion_tokens == 3
+        assert rec.prompt_tokens > 0
@@ -0,0 +1,118 @@
+"""
+tests/test_tool_executor.py — Async, concurrent tool execution.
+
+Tests:
+  - Parallel-safe calls overlap; other tools act as ordered barriers
+  - Results keep call order and carry elapsed_ms
+  - Async handlers run natively; per-tool timeouts and concurrency limits
+  - BaseAgent._tool_loop records per-tool latency in the transcript
+"""
+
+import asyncio
+import json
+import os
+import time
+
+import pytest
+
+
+@pytest.fixture
+def fake_tools(monkeypatch):
+    """Replace a few registry entries with instrumented handlers."""
+    from core import tools
+    events = []
+
+    def blocking(name, delay):
+        def handler(**params):
+            events.append(("start", name))
+            time.sleep(delay)
+            events.append(("end", name))
+            return {"ok": True, "tool": name, **params}
+        return handler
+
+    async def async_search(**params):
+        events.append(("start", "memory_search"))
+        await asyncio.sleep(0.2)
+        events.append(("end", "memory_search"))
+        return {"ok": True, "tool": "memory_search"}
+
+    specs = {
+        "web_search": blocking("web_search", 0.2),
+        "memory_search": async_search,
+        "write_file": blocking("write_file", 0.05),
+    }
+    for name, handler in specs.items():
+        monkeypatch.setitem(tools._registry, name, tools.Tool(
+            name, "", {}, handler))
+    return events
+
+
+class TestAsyncToolExecutor:
+
+    def test_concurrent_batches_with_ordered_barriers(self, fake_tools):
+        from core.tools import aexecute_tool_calls
+        calls = [
+            {"tool": "web_search", "params": {"query": "a"}},
+            {"tool": "web_search", "params": {"query": "b"}},
+            {"tool": "memory_search", "params": {"query": "c"}},
+            {"tool": "write_file", "params": {"path": "workspace/x.txt",
+                                              "content": "x"}},
+            {"tool": "web_search", "params": {"query": "d"}},
+            {"tool": "nope", "params": {}},
+        ]
+        t0 = time.perf_counter()
+        results = asyncio.run(aexecute_tool_calls(calls))
+        wall = time.perf_counter() - t0
+
+        assert wall < 0.6          # sequential would be ~0.85s
+        assert [r["tool"] for r in results] == [c["tool"] for c in calls]
+        assert [r["result"].get("query") for r in results[:2]] == ["a", "b"]
+        assert results[-1]["result"]["ok"] is False
+        assert all("elapsed_ms" in r for r in results)
+        assert results[0]["elapsed_ms"] >= 150
+
+        barrier = fake_tools.index(("start", "write_file"))
+        assert sum(1 for e in fake_tools[:barrier] if e[0] == "end") == 3
+        assert fake_tools[barrier + 1] == ("end", "write_file")
+
+    def test_timeout_and_concurrency_limit(self, fake_tools, monkeypatch):
+        from core import tools
+        calls = [{"tool": "web_search", "params": {"query": q}} for q in "ab"]
+
+        monkeypatch.setitem(tools.TOOL_CONCURRENCY, "web_search", 1)
+        t0 = time.perf_counter()
+        asyncio.run(tools.aexecute_tool_calls(calls))
+        assert time.perf_counter() - t0 >= 0.4
+
+        monkeypatch.setitem(tools.TOOL_TIMEOUTS, "web_search", 0.05)
+        results = asyncio.run(tools.aexecute_tool_calls(calls[:1]))
+        assert "timed out" in results[0]["result"]["error"]
+
+
+class TestToolLoopTranscript:
+
+    def test_tool_round_logged_with_latency(self, tmp_workdir, fake_tools):
+        from core.agent import AgentConfig, BaseAgent
+        from core.task_board import Task
+
+        agent = BaseAgent(AgentConfig(agent_id="a", role="r", model="m"),
+                          llm=None, memory=None, skill_loader=None, chain=None)
+
+        async def follow_up(messages, task, tools_schemas=None):
+            return "done"
+
+        agent._call_llm_streaming = follow_up
+        call = json.dumps({"tool": "web_search", "params": {"query": "q"}})
+        out = asyncio.run(agent._tool_loop(
+            [], Task(task_id="t1", description="d"),
+            f"<tool_code>\n{call}\n</tool_code>"))
+        assert out == "done"
+
+        path = os.path.join("memory", "transcripts", "session_transcript.jsonl")
+        with open(path) as f:
+            entries = [json.loads(line) for line in f]
+        rounds = [e for e in entries if e["event"] == "tool_round"]
+        assert len(rounds) == 1
+        meta = rounds[0]["metadata"]
+        assert meta["tools"][0]["tool"] == "web_search"
+        assert meta["tools"][0]["elapsed_ms"] >= 150
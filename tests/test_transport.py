@@ -0,0 +1,98 @@
+"""
+tests/test_transport.py — Pooled LLM HTTP transport.
+
+Tests:
+  - One client per (loop, origin); reused across leases, dropped by aclose()
+  - Leases inject per-request timeout and a trace hook
+  - Trace events count connections, TLS handshakes, reuse and TTFB
+  - configure() validates keys
+"""
+
+import asyncio
+
+import pytest
+
+
+class _FakeClient:
+    def __init__(self):
+        self.is_closed = False
+        self.calls = []
+
+    async def post(self, url, **kwargs):
+        self.calls.append((url, kwargs))
+        trace = kwargs["extensions"]["trace"]
+        if len(self.calls) == 1:      # first request opens the connection
+            for event in ("connection.connect_tcp.started",
+                          "connection.connect_tcp.complete",
+                          "connection.start_tls.complete"):
+                await trace(event, {})
+        await trace("http11.send_request_headers.started", {})
+        await trace("http11.receive_response_headers.complete", {})
+        return "ok"
+
+    async def aclose(self):
+        self.is_closed = True
+
+
+@pytest.fixture
+def fake_pool(monkeypatch):
+    from adapters.llm import transport
+    created = []
+
+    def _new_client(origin):
+        transport._stats.setdefault(origin, transport.OriginStats(False))
+        created.append(_FakeClient())
+        return created[-1]
+
+    monkeypatch.setattr(transport, "_new_client", _new_client)
+    monkeypatch.setattr(transport, "_clients", {})
+    monkeypatch.setattr(transport, "_stats", {})
+    return created
+
+
+class TestTransport:
+
+    def test_client_shared_per_origin_and_closed(self, fake_pool):
+        from adapters.llm import transport
+
+        async def main():
+            async with transport.lease("https://api.x.io/v1", timeout=5) as c:
+                await c.post("https://api.x.io/v1/chat/completions", json={})
+            async with transport.lease("https://api.x.io/v2") as c:
+                await c.post("https://api.x.io/v2/chat", timeout=9)
+            async with transport.lease("http://localhost:11434") as c:
+                await c.post("http://localhost:11434/api/chat")
+            assert len(fake_pool) == 2
+            await transport.aclose()
+            assert all(c.is_closed for c in fake_pool)
+
+        asyncio.run(main())
+        first = fake_pool[0].calls
+        assert first[0][1]["timeout"] == 5
+        assert first[1][1]["timeout"] == 9
+
+        s = transport.stats()["https://api.x.io"]
+        assert s["requests"] == 2
+        assert s["connections"] == 1 and s["tls_handshakes"] == 1
+        assert s["reused"] == 1 and s["reuse_ratio"] == 0.5
+        assert s["ttfb_ms"]["count"] == 2
+        assert s["connect_ms"]["count"] == 1
+
+    def test_new_loop_gets_new_client(self, fake_pool):
+        from adapters.llm import transport
+
+        async def one():
+            async with transport.lease("https://api.x.io") as c:
+                await c.post("https://api.x.io/ping")
+
+        asyncio.run(one())
+        asyncio.run(one())
+        assert len(fake_pool) == 2
+        assert len(transport._clients) == 1     # closed loop purged
+
+    def test_configure(self, monkeypatch):
+        from adapters.llm import transport
+        monkeypatch.setattr(transport, "_config", dict(transport.DEFAULTS))
+        transport.configure(max_connections="8", bogus=1)
+        assert transport._config["max_connections"] == 8
+        assert "bogus" not in transport._config
@@ -34,6 +34,18 @@ class TestUsageTracking:
         assert summary["by_agent"]["leo"]["tokens"] == 150
         assert summary["by_agent"]["jerry"]["tokens"] == 300
 
+    def test_cached_prompt_tokens(self, tmp_workdir):
+        tracker = UsageTracker()
+        tracker.record("leo", "m", prompt_tokens=1000, completion_tokens=10,
+                       cached_tokens=800)
+        tracker.record("leo", "m", prompt_tokens=1000, completion_tokens=10)
+
+        summary = tracker.get_summary()
+        assert summary["aggregate"]["total_cached_tokens"] == 800
+        assert summary["aggregate"]["cache_hit_ratio"] == 0.4
+        assert summary["by_agent"]["leo"]["cached_tokens"] == 800
+        assert tracker.get_hourly(1)[-1]["cached_tokens"] == 800
+
     def test_clear(self, tmp_workdir):
         tracker = UsageTracker()
         tracker.record("jerry", "model", prompt_tokens=100, completion_tokens=50)
@@ -92,3 +104,65 @@ class TestBudgetEnforcement:
         budget = UsageTracker.get_budget()
         assert budget["current_cost_usd"] > 0
         assert budget["percent_used"] > 0
+
+
+class TestUsageLedger:
+    """Append-only ledger with incrementally maintained rollups."""
+
+    def test_other_process_catches_up_from_tail(self, tmp_workdir):
+        from core.usage_tracker import UsageLedger
+        writer = UsageTracker()
+        reader = UsageLedger(writer.path)        # separate in-memory state
+        writer.record("leo", "m", prompt_tokens=10, completion_tokens=5)
+        assert reader.sync().aggregate["total_calls"] == 1
+        writer.record("jerry", "m", prompt_tokens=1, completion_tokens=1)
+        state = reader.sync()
+        assert state.aggregate["total_tokens"] == 17
+        assert state.by_agent["jerry"]["calls"] == 1
+        assert [c["agent_id"] for c in writer.recent_calls()] == ["leo", "jerry"]
+
+    def test_rotation_checkpoint_and_retention(self, tmp_workdir, monkeypatch):
+        from core import usage_tracker as ut
+        monkeypatch.setattr(ut, "SEGMENT_BYTES", 600)
+        tracker = UsageTracker()
+        for i in range(12):
+            tracker.record("jerry", "m", prompt_tokens=i, completion_tokens=1)
+        segments = tracker.ledger.segments()
+        assert len(segments) > 1
+        assert os.path.exists(os.path.join(tracker.path, "rollups.json"))
+
+        fresh = ut.UsageLedger(tracker.path)     # checkpoint + current tail
+        assert fresh.sync().aggregate["total_calls"] == 12
+
+        old = tracker.ledger.segment_path(segments[0])
+        os.utime(old, (0, 0))
+        state = tracker.ledger.sync()
+        state.by_hour[0] = {"calls": 1}
+        tracker.ledger.checkpoint(state)
+        assert not os.path.exists(old)
+        assert 0 not in state.by_hour
+        assert tracker.get_summary()["aggregate"]["total_calls"] == 12
+
+    def test_session_summary_and_hourly(self, tmp_workdir):
+        import time
+        tracker = UsageTracker()
+        tracker.record("leo", "m", prompt_tokens=100, latency_ms=10)
+        since = time.time()
+        tracker.record("leo", "m", prompt_tokens=50, latency_ms=30)
+        tracker.record("leo", "m", prompt_tokens=5, success=False)
+        s = tracker.get_session_summary(since)
+        assert s["calls"] == 2 and s["tokens"] == 55
+        assert s["failures"] == 1 and s["avg_latency"] == 30
+        assert tracker.get_session_summary(0)["calls"] == 3
+        assert sum(h["calls"] for h in tracker.get_hourly(2)) == 3
+
+    def test_legacy_store_is_migrated(self, tmp_workdir):
+        calls = [{"agent_id": "leo", "model": "m", "total_tokens": 7,
+                  "cost_usd": 0.5, "success": True, "ts": 1.0}]
+        with open("memory/usage_stats.json", "w") as f:
+            json.dump({"calls": calls, "aggregate": {}}, f)
+        summary = UsageTracker().get_summary()
+        assert summary["aggregate"]["total_tokens"] == 7
+        assert summary["by_model"]["m"]["cost"] == 0.5
+        assert os.path.exists("memory/usage_stats.json.migrated")
+        assert not os.path.exists("memory/usage_stats.json")
@@ -0,0 +1,106 @@
+"""
+tests/test_vector_store.py — Built-in vector store (chromadb fallback).
+
+Tests:
+  - Batched add + cosine top-k in the Chroma response shape
+  - Re-added ids mask their old row; rows appended by another instance
+    are visible on the next query
+  - Dimension mismatches are rejected; ivf_threshold below 16 is rejected
+  - Ids derived from content are stable across processes
+  - IVF index (NumPy only) on a small collection
+  - ChromaAdapter / HybridMemory / _build_memory use it without chromadb
+"""
+
+import pytest
+
+from adapters.memory.vector_store import VectorMemory, VectorStore
+
+
+def unit_fn(texts):
+    # "x:y" → 2-d vector
+    return [[float(v) for v in t.split(":")] for t in texts]
+
+
+class TestVectorStore:
+
+    def test_add_query_chroma_shape(self, tmp_workdir):
+        coll = VectorStore("mem").get_or_create_collection(
+            "notes", embedding_function=unit_fn)
+        coll.add(ids=["a", "b", "c"], documents=["1:0", "0:1", "1:1"],
+                 metadatas=[{"k": 1}, {"k": 2}, {"k": 3}])
+        assert coll.count() == 3
+
+        res = coll.query(query_texts=["1:0.1"], n_results=2)
+        assert res["ids"] == [["a", "c"]]
+        assert res["metadatas"][0][0] == {"k": 1}
+        assert res["distances"][0][0] < res["distances"][0][1]
+        assert coll.get(ids=["b", "zz"])["documents"] == ["0:1"]
+
+    def test_readd_and_cross_instance_refresh(self, tmp_workdir):
+        a = VectorStore("mem").get_or_create_collection(
+            "notes", embedding_function=unit_fn)
+        b = VectorStore("mem").get_or_create_collection(
+            "notes", embedding_function=unit_fn)     # e.g. another process
+        a.add(ids=["x"], documents=["1:0"])
+        assert b.query(query_texts=["1:0"], n_results=5)["ids"] == [["x"]]
+
+        b.add(ids=["x", "y"], documents=["0:1", "1:0"])
+        res = a.query(query_texts=["1:0"], n_results=5)
+        assert res["ids"] == [["y", "x"]]
+        assert res["documents"][0][1] == "0:1"        # latest version only
+        assert a.count() == 2
+
+    def test_dimension_mismatch(self, tmp_workdir):
+        coll = VectorStore("mem").get_or_create_collection(
+            "notes", embedding_function=unit_fn)
+        coll.add(ids=["a"], documents=["1:0"])
+        with pytest.raises(ValueError):
+            coll.add(ids=["b"], documents=["1:0:1"])
+
+    def test_ivf_threshold_validated(self, tmp_workdir):
+        with pytest.raises(ValueError):
+            VectorStore("mem", ivf_threshold=4)
+
+    def test_content_ids_are_stable(self, tmp_workdir):
+        import hashlib
+        mem = VectorMemory("mem", embedding_fn=unit_fn)
+        mem.add_many("kb", ["1:0"], [{}])
+        assert mem.query("kb", "1:0", 1)["ids"] == [
+            [hashlib.sha1(b"1:0").hexdigest()]]
+
+    def test_ivf_small_collection(self, tmp_workdir):
+        np = pytest.importorskip("numpy")
+        rng = np.random.default_rng(1)
+        vecs = rng.normal(size=(40, 8)).tolist()
+        coll = VectorStore("mem", ivf_threshold=16).get_or_create_collection(
+            "notes", embedding_function=unit_fn)
+        coll.add(ids=[f"r{i}" for i in range(40)],
+                 documents=[str(i) for i in range(40)], embeddings=vecs)
+        res = coll.query(query_embeddings=[vecs[7]], n_results=3)
+        assert res["ids"][0][0] == "r7"
+        assert coll._ivf is not None
+        assert len(coll._ivf["centroids"]) == 16
+
+    def test_default_hashing_embeddings(self, tmp_workdir):
+        mem = VectorMemory("mem")
+        mem.add_many("kb", ["deploy the redis cluster", "季度报告风险总结",
+                            "bake sourdough bread"],
+                     [{"id": "ops"}, {"id": "zh"}, {"id": "food"}])
+        assert mem.query("kb", "redis cluster deploy", 1)["ids"] == [["ops"]]
+        assert mem.query("kb", "报告风险", 1)["ids"] == [["zh"]]
+
+    def test_fallback_wiring(self, tmp_workdir):
+        from adapters.memory import chroma
+        from adapters.memory.hybrid import HybridMemory
+        from core.orchestrator import _build_memory
+
+        if not chroma._HAS_CHROMA:
+            assert isinstance(chroma.ChromaAdapter("mem"), VectorMemory)
+            hybrid = HybridMemory(persist_dir="mem2")
+            hybrid.add("kb", "redis cluster outage", {"id": "r1"})
+            assert hybrid.query("kb", "redis outage", 1)["documents"] == [
+                ["redis cluster outage"]]
+
+        mem = _build_memory({"memory": {"backend": "vector",
+                                        "vector": {"nprobe": 2}}})
+        assert isinstance(mem, VectorMemory) and mem.client.nprobe == 2